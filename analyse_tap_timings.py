@@ -0,0 +1,370 @@
+import os
+import sys
+import glob
+import json
+import struct
+import argparse
+
+import numpy as np
+
+import generate_morse_files as morse
+
+# --- Constants ---
+# Tap logs are written by the Tap Timing Recorder in src/js/visualTapper.js; keep the format in step with it.
+TAP_LOG_MAGIC = b"MTAP"
+TAP_LOG_VERSION = 1
+TAP_LOG_HEADER = struct.Struct("<4sB")
+TAP_LOG_SUFFIX = ".mtap"
+TAP_LOG_TICKS_PER_MS = 10
+KIND_PRESS, KIND_RELEASE, KIND_SESSION, KIND_LETTER = range(4)
+APP_DASH_UNITS = 1.5 # visualTapper.js: a press of DOT_THRESHOLD_MS = 1.5 units or more is a dash
+APP_LETTER_GAP_UNITS = 3 # ... and LETTER_SPACE_SILENCE_MS = 3 units of silence ends the letter
+DEFAULT_DASH_FACTORS = (1.5, 2.0, 2.5, 3.0) # Candidate dot/dash thresholds, in estimated units
+DEFAULT_GAP_FACTORS = (2.0, 3.0, 4.0, 5.0) # Candidate letter-end thresholds, in estimated spacing units
+PAUSE_UNITS = 20 # Silences this many units or longer are pauses, left out of the space clusters
+KMEANS_ITERATIONS = 50
+MAX_SIGNAL_LENGTH = max(len(signal) for signal in morse.MORSE_CODE_MAP.values())
+
+# --- Reading Logs ---
+# Every record is a 32-bit little-endian word: the kind in the low 2 bits and the payload above them.
+# Press and release payloads are 0.1 ms ticks since the previous press or release (or session start), so
+# absolute times are a cumulative sum that restarts at every session record.
+def read_tap_log(data: bytes) -> dict:
+    """Parses a tap log into arrays: kinds, payloads and times (ms since the start of each record's session)."""
+    if len(data) < TAP_LOG_HEADER.size:
+        raise ValueError("Tap log is too short for its header.")
+    magic, version = TAP_LOG_HEADER.unpack_from(data)
+    if magic != TAP_LOG_MAGIC or version != TAP_LOG_VERSION:
+        raise ValueError(f"Not a version {TAP_LOG_VERSION} tap log (magic {magic!r}, version {version}).")
+    record_bytes = (len(data) - TAP_LOG_HEADER.size) // 4 * 4
+    records = np.frombuffer(data, dtype='<u4', count=record_bytes // 4, offset=TAP_LOG_HEADER.size)
+    kinds = (records & 3).astype(np.uint8)
+    payloads = (records >> 2).astype(np.int64)
+    is_timed = kinds <= KIND_RELEASE
+    elapsed = np.cumsum(np.where(is_timed, payloads, 0))
+    session = np.cumsum(kinds == KIND_SESSION)
+    # Subtract the elapsed time at each record's session start.
+    session_starts = np.flatnonzero(kinds == KIND_SESSION)
+    origin = np.concatenate(([0], elapsed[session_starts]))[session]
+    return {"kinds": kinds, "payloads": payloads, "session": session,
+            "timesMs": (elapsed - origin) / TAP_LOG_TICKS_PER_MS}
+
+def write_tap_log(records) -> bytes:
+    """Encodes (kind, payload) records as a tap log; used by the self-tests to synthesise logs."""
+    words = np.array([(payload << 2) | kind for kind, payload in records], dtype='<u4')
+    return TAP_LOG_HEADER.pack(TAP_LOG_MAGIC, TAP_LOG_VERSION) + words.tobytes()
+
+def tap_events(log: dict) -> dict:
+    """Marks (press to release) and spaces (release to next press) with the letter each belongs to.
+
+    Letter and session records end the letter being keyed; a letter record also carries the character
+    the book game expected and the one the app decoded.
+    """
+    kinds, payloads, times, session = log["kinds"], log["payloads"], log["timesMs"], log["session"]
+    letter_of = np.cumsum(kinds >= KIND_SESSION) # Records up to the next letter/session record share a letter
+    # A mark is a press directly followed by a release (a press without one was never completed).
+    is_mark = (kinds[:-1] == KIND_PRESS) & (kinds[1:] == KIND_RELEASE)
+    mark_index = np.flatnonzero(is_mark)
+    # A space runs from a release to the next press of the same session, with letter records in between.
+    timed = np.flatnonzero(kinds <= KIND_RELEASE)
+    pairs = (kinds[timed[:-1]] == KIND_RELEASE) & (kinds[timed[1:]] == KIND_PRESS) & (session[timed[:-1]] == session[timed[1:]])
+    space_from, space_to = timed[:-1][pairs], timed[1:][pairs]
+    # Letter records label the letter before them.
+    letter_records = np.flatnonzero(kinds >= KIND_SESSION)
+    letter_count = len(letter_records) + 1
+    expected = np.zeros(letter_count, dtype=np.int64)
+    decoded = np.zeros(letter_count, dtype=np.int64)
+    is_letter = kinds[letter_records] == KIND_LETTER
+    expected[letter_of[letter_records][is_letter] - 1] = payloads[letter_records][is_letter] >> 8
+    decoded[letter_of[letter_records][is_letter] - 1] = payloads[letter_records][is_letter] & 0xFF
+    return {
+        "markMs": times[mark_index + 1] - times[mark_index], "markLetter": letter_of[mark_index],
+        "spaceMs": times[space_to] - times[space_from],
+        "spaceWithinLetter": letter_of[space_from] == letter_of[space_to],
+        "spaceAfterLetter": letter_of[space_from],
+        "expected": expected, "decoded": decoded,
+        "unitMs": payloads[kinds == KIND_SESSION],
+    }
+
+# --- Clustering ---
+# Durations are clustered on a log scale, where dots and dashes (1 and 3 units) or element and letter gaps
+# (1 and 3 spacing units) are the same distance apart at any speed. One-dimensional k-means with quantile
+# starting points converges in a handful of vectorised passes.
+def kmeans_1d(values: np.ndarray, k: int, iterations: int = KMEANS_ITERATIONS):
+    """Returns (centres, labels) of k clusters of values, centres ascending. Empty input gives empty centres."""
+    if len(values) == 0:
+        return np.array([]), np.zeros(0, dtype=np.int64)
+    k = min(k, len(np.unique(values)))
+    centres = np.quantile(values, (np.arange(k) + 0.5) / k)
+    labels = np.zeros(len(values), dtype=np.int64)
+    for _ in range(iterations):
+        labels = np.argmin(np.abs(values[:, None] - centres[None, :]), axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.bincount(labels, weights=values, minlength=k)
+        updated = np.where(counts > 0, sums / np.maximum(counts, 1), centres)
+        if np.allclose(updated, centres):
+            break
+        centres = updated
+    order = np.argsort(centres)
+    return centres[order], np.argsort(order)[labels]
+
+def estimate_timing(events: dict) -> dict:
+    """Estimates a user's unit, WPM and Farnsworth spacing from their marks and spaces."""
+    marks = events["markMs"][events["markMs"] > 0]
+    if len(marks) < 2:
+        return None
+    mark_centres, mark_labels = kmeans_1d(np.log(marks), 2)
+    dots, dashes = marks[mark_labels == 0], marks[mark_labels == 1]
+    if len(mark_centres) < 2: # Only one length keyed: dots if short for the recorded setting, else dashes
+        recorded_unit_ms = np.median(events["unitMs"]) if len(events["unitMs"]) else np.inf
+        dots, dashes = (marks, marks[:0]) if np.median(marks) < APP_DASH_UNITS * recorded_unit_ms else (marks[:0], marks)
+    # The unit is the user's dot; dashes are often keyed shorter than three of them, which is what the
+    # replay's dash thresholds are for.
+    unit_ms = dots.mean() if len(dots) else dashes.mean() / 3
+    spaces = events["spaceMs"][(events["spaceMs"] > 0) & (events["spaceMs"] < PAUSE_UNITS * unit_ms)]
+    spacing_unit_ms = unit_ms
+    element_gap_ms = letter_gap_ms = letter_end_ms = None
+    if len(spaces) >= 2:
+        space_centres, space_labels = kmeans_1d(np.log(spaces), 2)
+        element_gap_ms = float(spaces[space_labels == 0].mean())
+        if len(space_centres) == 2:
+            letter_gap_ms = float(spaces[space_labels == 1].mean())
+            spacing_unit_ms = max(unit_ms, letter_gap_ms / 3)
+            letter_end_ms = float(np.exp(space_centres.mean()))
+    return {
+        "unitMs": float(unit_ms), "wpm": 1200 / unit_ms, "farnsworthWpm": 1200 / spacing_unit_ms,
+        "spacingUnitMs": float(spacing_unit_ms), "dotMs": float(dots.mean()) if len(dots) else None,
+        "dashMs": float(dashes.mean()) if len(dashes) else None,
+        "elementGapMs": element_gap_ms, "letterGapMs": letter_gap_ms,
+        # Boundaries between the clusters (geometric means of their centres), a threshold pair fitted to the user.
+        "dashThresholdMs": float(np.exp(mark_centres.mean())) if len(dots) and len(dashes) else None,
+        "letterEndMs": letter_end_ms,
+    }
+
+# --- Replay ---
+# Each letter the book game expected is decoded again under candidate thresholds: it is right when it has
+# as many marks as the expected signal, every mark falls on the expected side of the dash threshold, no
+# silence inside it reaches the letter-end threshold (which would split it) and the silence after it does
+# (otherwise it would run into the next letter). All candidates are evaluated at once by broadcasting.
+def _expected_dash_table():
+    """Per character code: the signal length and, per element position, whether it is a dash."""
+    lengths = np.zeros(256, dtype=np.int64)
+    dashes = np.zeros((256, MAX_SIGNAL_LENGTH), dtype=bool)
+    for char, signal in morse.MORSE_CODE_MAP.items():
+        if char == ' ':
+            continue
+        lengths[ord(char)] = len(signal)
+        dashes[ord(char), :len(signal)] = [element == '-' for element in signal]
+    return lengths, dashes
+
+EXPECTED_SIGNAL_LENGTHS, EXPECTED_DASHES = _expected_dash_table()
+
+def replay_errors(events: dict, dash_thresholds_ms: np.ndarray, gap_thresholds_ms: np.ndarray) -> np.ndarray:
+    """Errors over the labelled letters for every (dash threshold, gap threshold) pair, shape (dash, gap)."""
+    expected, letter_count = events["expected"], len(events["expected"])
+    mark_letter = events["markLetter"]
+    marks_per_letter = np.bincount(mark_letter, minlength=letter_count)
+    labelled = (expected > 0) & (EXPECTED_SIGNAL_LENGTHS[expected] > 0) & (marks_per_letter > 0)
+    count_ok = marks_per_letter == EXPECTED_SIGNAL_LENGTHS[expected]
+
+    # Marks of letters with the right number of marks, against the element expected at their position.
+    first_mark = np.concatenate(([0], np.cumsum(marks_per_letter)[:-1]))
+    position = np.arange(len(mark_letter)) - first_mark[mark_letter]
+    checked = count_ok[mark_letter] & labelled[mark_letter]
+    expected_dash = EXPECTED_DASHES[expected[mark_letter[checked]], position[checked]]
+    is_dash = events["markMs"][checked][None, :] >= dash_thresholds_ms[:, None] # (dash candidates, marks)
+    mark_errors = np.zeros((len(dash_thresholds_ms), letter_count), dtype=np.int64)
+    for candidate in range(len(dash_thresholds_ms)):
+        mark_errors[candidate] = np.bincount(mark_letter[checked], weights=is_dash[candidate] != expected_dash, minlength=letter_count)
+
+    # Longest silence inside each letter and the silence that followed it.
+    longest_inside = np.zeros(letter_count)
+    np.maximum.at(longest_inside, events["spaceAfterLetter"][events["spaceWithinLetter"]], events["spaceMs"][events["spaceWithinLetter"]])
+    following = np.full(letter_count, np.inf) # The last letter of a session ends however long the threshold
+    between = ~events["spaceWithinLetter"]
+    following[events["spaceAfterLetter"][between]] = events["spaceMs"][between]
+    gap_ok = (longest_inside[None, :] < gap_thresholds_ms[:, None]) & (following[None, :] >= gap_thresholds_ms[:, None])
+
+    letter_ok = (mark_errors == 0)[:, None, :] & gap_ok[None, :, :] & count_ok[None, None, :]
+    return (~letter_ok & labelled[None, None, :]).sum(axis=2)
+
+def analyse_user(name: str, log: dict, dash_factors, gap_factors) -> dict:
+    events = tap_events(log)
+    timing = estimate_timing(events)
+    labelled = events["expected"] > 0
+    result = {"name": name, "records": int(len(log["kinds"])), "marks": int(len(events["markMs"])),
+              "letters": int(labelled.sum()), "timing": timing,
+              "recordedErrors": int((labelled & (events["expected"] != events["decoded"])).sum())}
+    if timing is None or not labelled.any():
+        return result
+    dash_thresholds = np.array(dash_factors) * timing["unitMs"]
+    gap_thresholds = np.array(gap_factors) * timing["spacingUnitMs"]
+    errors = replay_errors(events, dash_thresholds, gap_thresholds)
+    result["candidates"] = [{"dashUnits": d, "gapUnits": g, "errors": int(errors[i, j])}
+                            for i, d in enumerate(dash_factors) for j, g in enumerate(gap_factors)]
+    if timing["dashThresholdMs"] is not None and timing["letterEndMs"] is not None:
+        result["clusterBoundaryErrors"] = int(replay_errors(events, np.array([timing["dashThresholdMs"]]),
+                                                            np.array([timing["letterEndMs"]]))[0, 0])
+    # The app's fixed rule, from the unit time each session was recorded with.
+    recorded_units = np.unique(events["unitMs"])
+    if len(recorded_units) == 1:
+        fixed_errors = replay_errors(events, np.array([APP_DASH_UNITS * recorded_units[0]]),
+                                     np.array([APP_LETTER_GAP_UNITS * recorded_units[0]]))
+        result["fixedRuleErrors"] = int(fixed_errors[0, 0])
+    return result
+
+# --- Report ---
+def print_report(results: list, dash_factors, gap_factors):
+    print("\n--- Users ---")
+    print(f"{'User':<28}{'Marks':>9}{'Letters':>9}{'WPM':>7}{'Farns.':>8}{'Dot ms':>8}{'Dash ms':>9}{'App err':>9}")
+    for result in results:
+        timing = result["timing"] or {}
+        def number(key, digits=0):
+            value = timing.get(key)
+            return f"{value:.{digits}f}" if value is not None else "-"
+        app_errors = f"{result['recordedErrors'] / result['letters']:.1%}" if result["letters"] else "-"
+        print(f"{result['name'][:27]:<28}{result['marks']:>9}{result['letters']:>9}{number('wpm', 1):>7}"
+              f"{number('farnsworthWpm', 1):>8}{number('dotMs'):>8}{number('dashMs'):>9}{app_errors:>9}")
+
+    scored = [result for result in results if "candidates" in result]
+    letters = sum(result["letters"] for result in scored)
+    if not letters:
+        print("\nNo letters labelled with the book game's target; nothing to replay.")
+        return
+    print(f"\n--- Replay: letter error rate over {letters} labelled letters ---")
+    print("Thresholds adapt to each user's estimated units: dash at D units, letter end at G spacing units.")
+    print(f"{'D / G':<8}" + ''.join(f"{g:>9}" for g in gap_factors))
+    totals = np.zeros((len(dash_factors), len(gap_factors)), dtype=np.int64)
+    for result in scored:
+        for candidate in result["candidates"]:
+            totals[dash_factors.index(candidate["dashUnits"]), gap_factors.index(candidate["gapUnits"])] += candidate["errors"]
+    for i, d in enumerate(dash_factors):
+        print(f"{d:<8}" + ''.join(f"{totals[i, j] / letters:>9.1%}" for j in range(len(gap_factors))))
+    for key, label in (("fixedRuleErrors", f"App's fixed rule ({APP_DASH_UNITS} / {APP_LETTER_GAP_UNITS} set units)"),
+                       ("clusterBoundaryErrors", "Each user's cluster boundaries")):
+        compared = [result for result in scored if key in result]
+        if compared:
+            compared_letters = sum(result["letters"] for result in compared)
+            print(f"{label}: {sum(result[key] for result in compared) / compared_letters:.1%} over {compared_letters} letters")
+    best = np.unravel_index(np.argmin(totals), totals.shape)
+    print(f"Best candidate: dash at {dash_factors[best[0]]} units, letter end at {gap_factors[best[1]]} spacing units "
+          f"({totals[best] / letters:.1%}).")
+
+def find_logs(paths: list) -> list:
+    """Tap log files among paths; directories are searched for *.mtap."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", f"*{TAP_LOG_SUFFIX}"), recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+def _synthetic_log(letters: str, unit_ms: float, spacing_unit_ms: float, dash_units: float = 3, jitter: float = 0.0,
+                   recorded_unit_ms: int = 150, seed: int = 0) -> bytes:
+    """A tap log of letters keyed at the given timing, each labelled as expected, for the self-tests."""
+    rng = np.random.default_rng(seed)
+    records = [(KIND_SESSION, recorded_unit_ms)]
+    ticks = lambda ms: int(round(ms * (1 + jitter * rng.standard_normal()) * TAP_LOG_TICKS_PER_MS))
+    gap_ms = 0
+    for char in letters:
+        for e, element in enumerate(morse.MORSE_CODE_MAP[char]):
+            records.append((KIND_PRESS, ticks(gap_ms) if records[-1][0] != KIND_SESSION else 0))
+            records.append((KIND_RELEASE, ticks(unit_ms if element == '.' else dash_units * unit_ms)))
+            gap_ms = unit_ms
+        records.append((KIND_LETTER, ord(char) << 8 | ord(char)))
+        gap_ms = 3 * spacing_unit_ms
+    return write_tap_log(records)
+
+def run_self_tests() -> bool:
+    print("Running tap timing analyser self-tests...")
+    all_tests_passed = True
+    letters = "THEQUICKBROWNFOXJUMPSOVERTHELAZYDOG1234567890" * 4
+
+    # Times restart at each session; marks and spaces come out with their letters.
+    log = read_tap_log(write_tap_log([(KIND_SESSION, 100), (KIND_PRESS, 0), (KIND_RELEASE, 1000), (KIND_PRESS, 1000),
+                                      (KIND_RELEASE, 3000), (KIND_LETTER, ord('A') << 8 | ord('A')), (KIND_PRESS, 3000),
+                                      (KIND_RELEASE, 1000), (KIND_SESSION, 50), (KIND_PRESS, 500), (KIND_RELEASE, 500),
+                                      (KIND_LETTER, ord('E') << 8)]))
+    events = tap_events(log)
+    parse_ok = (list(log["timesMs"]) == [0, 0, 100, 200, 500, 500, 800, 900, 0, 50, 100, 100]
+                and list(events["markMs"]) == [100, 300, 100, 50] and list(events["markLetter"]) == [1, 1, 2, 3]
+                and list(events["spaceMs"]) == [100, 300] and list(events["spaceWithinLetter"]) == [True, False]
+                and list(events["expected"]) == [0, ord('A'), 0, ord('E'), 0] and list(events["decoded"]) == [0, ord('A'), 0, 0, 0])
+    try:
+        read_tap_log(b"RIFF\x01")
+        parse_ok = False
+    except ValueError:
+        pass
+    if not parse_ok: all_tests_passed = False
+    print(f"  Tap log parsing --- {'OK' if parse_ok else 'FAIL'}")
+
+    # Clustering recovers 20 wpm characters with 10 wpm Farnsworth spacing through 10% jitter.
+    timing = estimate_timing(tap_events(read_tap_log(_synthetic_log(letters, 60, 120, jitter=0.1))))
+    timing_ok = (timing is not None and abs(timing["wpm"] - 20) < 1 and abs(timing["farnsworthWpm"] - 10) < 1
+                 and abs(timing["dashMs"] / timing["dotMs"] - 3) < 0.3)
+    even = estimate_timing(tap_events(read_tap_log(_synthetic_log(letters, 60, 60, jitter=0.05))))
+    timing_ok = timing_ok and even is not None and abs(even["farnsworthWpm"] - even["wpm"]) < 1
+    if not timing_ok: all_tests_passed = False
+    print(f"  Unit, WPM and Farnsworth estimates --- {'OK' if timing_ok else 'FAIL'}")
+
+    # A user keying 20 wpm with short dashes (2 units) against the app's 150 ms setting: the fixed rule
+    # misreads most letters; thresholds adapted to the user's own units decode them all.
+    result = analyse_user("short-dashes", read_tap_log(_synthetic_log(letters, 60, 60, dash_units=2)),
+                          list(DEFAULT_DASH_FACTORS), list(DEFAULT_GAP_FACTORS))
+    errors = {(c["dashUnits"], c["gapUnits"]): c["errors"] for c in result.get("candidates", [])}
+    replay_ok = (result["letters"] == len(letters) and result["recordedErrors"] == 0
+                 and result.get("fixedRuleErrors", 0) > len(letters) // 2
+                 and errors.get((1.5, 3.0)) == 0 and errors.get((3.0, 3.0), 0) > 0 and errors.get((1.5, 5.0), 0) > 0
+                 and result.get("clusterBoundaryErrors") == 0)
+    if not replay_ok: all_tests_passed = False
+    print(f"  Threshold replay --- {'OK' if replay_ok else 'FAIL'}")
+
+    if all_tests_passed: print("All tap timing analyser self-tests PASSED.\n")
+    else: print("Some tap timing analyser self-tests FAILED.\n")
+    return all_tests_passed
+
+def parse_factors(text: str) -> list:
+    return [float(factor) for factor in text.split(',') if factor.strip()]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyses tap timing logs recorded by the visual tapper (*.mtap): "
+                                                 "estimates each user's speed and replays their letters through candidate thresholds.")
+    parser.add_argument("logs", nargs="+", help="Tap log files, or directories searched for *.mtap. Each file is one user.")
+    parser.add_argument("--dash-factors", type=parse_factors, default=list(DEFAULT_DASH_FACTORS),
+                        help="Candidate dot/dash thresholds in estimated units, comma-separated (default: 1.5,2,2.5,3).")
+    parser.add_argument("--gap-factors", type=parse_factors, default=list(DEFAULT_GAP_FACTORS),
+                        help="Candidate letter-end silences in estimated spacing units, comma-separated (default: 2,3,4,5).")
+    parser.add_argument("--json", metavar="PATH", help="Also write the per-user results as JSON to PATH.")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not run_self_tests():
+        return 1
+    paths = find_logs(args.logs)
+    if not paths:
+        print("Error: No tap logs found.")
+        return 1
+    results = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            log = read_tap_log(data)
+        except ValueError as e:
+            print(f"Warning: Skipping {path}: {e}")
+            continue
+        results.append(analyse_user(os.path.basename(path).removesuffix(TAP_LOG_SUFFIX), log, args.dash_factors, args.gap_factors))
+    if not results:
+        print("Error: None of the tap logs could be read.")
+        return 1
+    print_report(results, args.dash_factors, args.gap_factors)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,347 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import functools
+import threading
+import contextlib
+import http.server
+import urllib.request
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import WebDriverException
+
+# --- Constants ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ROOT_DIR = os.path.join(SCRIPT_DIR, "src")
+RESULTS_VERSION = 1
+DEFAULT_RUNS = 5
+DEFAULT_INPUT_CHARS = 50
+DEFAULT_TIMEOUT_SECONDS = 60
+METRICS = ("timeToFirstTargetMs", "timeToFirstDecodedLetterMs", "inputLatencyMs")
+
+# --- Static Server ---
+# The app is served from this process on a free port, so the harness needs no server of its own and
+# runs can never hit a stale one left on localhost:8000.
+class _QuietRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def static_server(root_dir: str):
+    """Serves root_dir over HTTP on 127.0.0.1 from a background thread. Yields the base URL."""
+    handler = functools.partial(_QuietRequestHandler, directory=root_dir)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+# --- Browser Runs ---
+# One run opens a book the way a player does (library cover, then "Start Deciphering") and times, with
+# performance.now() inside the page:
+#   timeToFirstTargetMs        from the click on "Start Deciphering" until the first target letter is highlighted;
+#   timeToFirstDecodedLetterMs from the same click until that letter, tapped as soon as it is highlighted,
+#                              is shown deciphered;
+#   inputLatencyMs             for each of the following letters, from dispatching its tap until the next
+#                              target is highlighted (or the book completes).
+# Taps are 'visualTapperInput' events carrying the target's own signal, as the shared tapper sends them.
+# The book's saved progress is cleared first, so every run starts at the first letter.
+RUN_SCRIPT = r"""
+const [bookId, inputChars, timeoutMs, done] = arguments;
+const now = () => performance.now();
+// Resolves with check()'s value once it is truthy, re-checking after every DOM change.
+const waitFor = (check, what) => new Promise((resolve, reject) => {
+    const value = check();
+    if (value) return resolve(value);
+    const timer = setTimeout(() => { observer.disconnect(); reject(new Error(`Timed out waiting for ${what}`)); }, timeoutMs);
+    const observer = new MutationObserver(() => {
+        const value = check();
+        if (value) { observer.disconnect(); clearTimeout(timer); resolve(value); }
+    });
+    observer.observe(document.body, { childList: true, subtree: true, characterData: true, attributes: true, attributeFilter: ['class'] });
+});
+const currentTarget = () => document.querySelector('#full-book-morse-display .current-morse-target');
+const letterSpan = (wordIdx, letterIdx) =>
+    document.querySelector(`#full-book-morse-display .morse-char-span[data-word-idx="${wordIdx}"][data-letter-idx="${letterIdx}"]`);
+const isBookComplete = () => (document.getElementById('current-decoded-char') || {}).textContent === '✓';
+const tap = signal => document.dispatchEvent(new CustomEvent('visualTapperInput', { detail: { type: 'char', value: signal } }));
+(async () => {
+    localStorage.removeItem(`bookCipherProgress_${bookId}`);
+    showTab('book-cipher-tab');
+    const cover = await waitFor(() => document.querySelector(`#book-library-container .book-cover-item[data-book-id="${bookId}"]`), `the cover of ${bookId}`);
+    cover.click();
+    const startButton = await waitFor(() => document.getElementById('start-deciphering-btn'), 'the Start Deciphering button');
+    const start = now();
+    startButton.click();
+    let target = await waitFor(currentTarget, 'the first target');
+    const timeToFirstTargetMs = now() - start;
+    const { wordIdx, letterIdx } = target.dataset;
+    tap(target.textContent.trim());
+    await waitFor(() => { const span = letterSpan(wordIdx, letterIdx); return span && span.classList.contains('deciphered-char'); }, 'the first decoded letter');
+    const timeToFirstDecodedLetterMs = now() - start;
+    const inputLatencyMs = [];
+    for (let i = 0; i < inputChars && !isBookComplete(); i++) {
+        target = await waitFor(currentTarget, 'the next target');
+        const previous = target;
+        const tapTime = now();
+        tap(target.textContent.trim());
+        await waitFor(() => isBookComplete() || (currentTarget() && currentTarget() !== previous), 'the target after a tap');
+        inputLatencyMs.push(now() - tapTime);
+    }
+    return { timeToFirstTargetMs, timeToFirstDecodedLetterMs, inputLatencyMs };
+})().then(done, error => done({ error: String(error) }));
+"""
+
+# --- Performance Entries ---
+# bookCipher.js records a User Timing measure named 'bookCipher:<stage>' for each fetch, Morse parse, render of
+# the Morse display, setNextTargetMorseSignal, handleBookCipherInput and saveProgress (see Performance Marks
+# there). After a run, the durations of every stage are read from the page, and Chrome's own counters are read
+# over the DevTools protocol (Performance.getMetrics). Counters that accumulate (layouts, style recalcs, script
+# and task time) are reported as the change during the run; the heap and node counts as their value at its end.
+PERF_STAGE_PREFIX = "bookCipher:"
+COLLECT_STAGES_SCRIPT = """
+return performance.getEntriesByType('measure')
+    .filter(entry => entry.name.startsWith(arguments[0]))
+    .map(entry => [entry.name.slice(arguments[0].length), entry.duration]);
+"""
+CDP_CUMULATIVE_METRICS = ("LayoutCount", "RecalcStyleCount", "LayoutDuration", "RecalcStyleDuration", "ScriptDuration", "TaskDuration")
+CDP_CURRENT_METRICS = ("JSHeapUsedSize", "JSHeapTotalSize", "Nodes")
+
+def collect_stage_timings(driver) -> dict:
+    """Durations (ms) of the app's measures by stage, in the order they were recorded."""
+    stages = {}
+    for stage, duration in driver.execute_script(COLLECT_STAGES_SCRIPT, PERF_STAGE_PREFIX):
+        stages.setdefault(stage, []).append(duration)
+    return stages
+
+def cdp_metrics(driver) -> dict:
+    """Chrome's performance counters for the current page (Performance.enable must have been sent)."""
+    return {metric["name"]: metric["value"] for metric in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+
+def cdp_metric_changes(before: dict, after: dict) -> dict:
+    """Cumulative counters as their change from before to after, the others as their value after."""
+    changes = {name: after[name] - before.get(name, 0) for name in CDP_CUMULATIVE_METRICS if name in after}
+    changes.update({name: after[name] for name in CDP_CURRENT_METRICS if name in after})
+    return changes
+
+def make_driver(profile_dir: str = None, debugging_port: int = None):
+    """Headless Chrome. Browsers running side by side each need their own profile directory and debugging port."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    if profile_dir:
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    if debugging_port:
+        chrome_options.add_argument(f"--remote-debugging-port={debugging_port}")
+    chrome_options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+    return webdriver.Chrome(options=chrome_options)
+
+def severe_console_errors(entries: list) -> list:
+    """The SEVERE messages among browser console entries, ignoring the missing favicon."""
+    return [entry['message'] for entry in entries
+            if entry['level'] == 'SEVERE' and "favicon.ico" not in entry['message']]
+
+def measure_run(driver, base_url: str, book_id: str, input_chars: int, timeout_seconds: float, console_log: list = None) -> dict:
+    """Loads the app in driver and measures one run on book_id. Returns the run's timings (or its error).
+
+    Every browser console entry of the run is appended to console_log when one is given."""
+    driver.set_script_timeout(timeout_seconds * 3) # Every wait in the page has timeout_seconds of its own
+    try:
+        driver.get(f"{base_url}/index.html")
+        WebDriverWait(driver, timeout_seconds).until(lambda d: d.execute_script(
+            "return document.readyState === 'complete' && typeof window.initializeAndStartBookGame === 'function' && typeof window.showTab === 'function';"))
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metrics_before = cdp_metrics(driver)
+        run = driver.execute_async_script(RUN_SCRIPT, book_id, input_chars, int(timeout_seconds * 1000))
+        run["stages"] = collect_stage_timings(driver)
+        run["cdpMetrics"] = cdp_metric_changes(metrics_before, cdp_metrics(driver))
+    except WebDriverException as e: # Includes timeouts; the other runs still count
+        run = {"error": f"{type(e).__name__}: {e.msg}"}
+    entries = driver.get_log("browser") # Reading the log clears it, so the next run starts empty
+    if console_log is not None:
+        console_log.extend(entries)
+    run["consoleErrors"] = severe_console_errors(entries)
+    return run
+
+def cold_runs(base_url: str, book_id: str, runs: int, input_chars: int, timeout_seconds: float) -> list:
+    """Each run in a fresh browser, so nothing is cached (HTTP cache, parsed scripts, localStorage)."""
+    results = []
+    for _ in range(runs):
+        driver = make_driver()
+        try:
+            results.append(measure_run(driver, base_url, book_id, input_chars, timeout_seconds))
+        finally:
+            driver.quit()
+    return results
+
+def warm_runs(base_url: str, book_id: str, runs: int, input_chars: int, timeout_seconds: float) -> list:
+    """All runs in one browser after an unmeasured run, so the app and the book's first pages are cached."""
+    driver = make_driver()
+    try:
+        measure_run(driver, base_url, book_id, input_chars, timeout_seconds)
+        return [measure_run(driver, base_url, book_id, input_chars, timeout_seconds) for _ in range(runs)]
+    finally:
+        driver.quit()
+
+# --- Summary ---
+def percentile(values: list, fraction: float) -> float:
+    """Linear-interpolated percentile of values (fraction 0.5 = median)."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(values: list) -> dict:
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "max": None}
+    return {"count": len(values), "p50": percentile(values, 0.5), "p95": percentile(values, 0.95), "max": max(values)}
+
+def summarize_runs(runs: list) -> dict:
+    """p50/p95/max of every metric over the successful runs; input latencies and stage durations are pooled."""
+    completed = [run for run in runs if "error" not in run]
+    stage_names = sorted({stage for run in completed for stage in run.get("stages", {})})
+    cdp_names = sorted({name for run in completed for name in run.get("cdpMetrics", {})})
+    return {
+        "timeToFirstTargetMs": summarize([run["timeToFirstTargetMs"] for run in completed]),
+        "timeToFirstDecodedLetterMs": summarize([run["timeToFirstDecodedLetterMs"] for run in completed]),
+        "inputLatencyMs": summarize([latency for run in completed for latency in run["inputLatencyMs"]]),
+        "stagesMs": {stage: summarize([duration for run in completed for duration in run.get("stages", {}).get(stage, [])])
+                     for stage in stage_names},
+        "cdpMetrics": {name: summarize([run["cdpMetrics"][name] for run in completed if name in run.get("cdpMetrics", {})])
+                       for name in cdp_names},
+        "failedRuns": len(runs) - len(completed),
+    }
+
+def _milliseconds(value) -> str:
+    return f"{value:.1f}" if value is not None else "-"
+
+def _counter(value) -> str:
+    return f"{value:.4g}" if value is not None else "-"
+
+def print_report(books: dict):
+    print(f"\n{'book':28} {'cache':5} {'metric':26} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for book_id, book in books.items():
+        for cache, summary in book["summary"].items():
+            rows = [(metric, summary[metric]) for metric in METRICS]
+            rows += [(f"stage {stage}", stats) for stage, stats in summary["stagesMs"].items()]
+            for metric, stats in rows:
+                print(f"{book_id:28} {cache:5} {metric:26} {stats['count']:>5} {_milliseconds(stats['p50']):>9} "
+                      f"{_milliseconds(stats['p95']):>9} {_milliseconds(stats['max']):>9}")
+    # Chrome's counters per run (durations in seconds, sizes in bytes), see Performance Entries.
+    print(f"\n{'book':28} {'cache':5} {'Chrome metric per run':26} {'n':>5} {'p50':>9} {'p95':>9} {'max':>9}")
+    for book_id, book in books.items():
+        for cache, summary in book["summary"].items():
+            for name, stats in summary["cdpMetrics"].items():
+                print(f"{book_id:28} {cache:5} {name:26} {stats['count']:>5} {_counter(stats['p50']):>9} "
+                      f"{_counter(stats['p95']):>9} {_counter(stats['max']):>9}")
+
+def run_self_tests() -> bool:
+    print("Running load benchmark self-tests...")
+    all_tests_passed = True
+
+    # Percentiles interpolate between neighbouring values, like numpy's default.
+    summary = summarize([40.0, 10.0, 30.0, 20.0, 50.0])
+    summary_ok = (summary["p50"] == 30.0 and abs(summary["p95"] - 48.0) < 1e-9 and summary["max"] == 50.0
+                  and summarize([7.0]) == {"count": 1, "p50": 7.0, "p95": 7.0, "max": 7.0}
+                  and summarize([])["p50"] is None)
+    runs = [{"timeToFirstTargetMs": 5.0, "timeToFirstDecodedLetterMs": 6.0, "inputLatencyMs": [1.0, 2.0],
+             "stages": {"render": [3.0], "saveProgress": [0.5, 0.25]}, "cdpMetrics": {"LayoutCount": 4}},
+            {"timeToFirstTargetMs": 7.0, "timeToFirstDecodedLetterMs": 8.0, "inputLatencyMs": [3.0],
+             "stages": {"render": [1.0]}, "cdpMetrics": {"LayoutCount": 6}},
+            {"error": "Timed out waiting for the first target"}]
+    run_summary = summarize_runs(runs)
+    summary_ok = (summary_ok and run_summary["inputLatencyMs"]["count"] == 3 and run_summary["failedRuns"] == 1
+                  and run_summary["stagesMs"]["render"]["p50"] == 2.0 and run_summary["stagesMs"]["saveProgress"]["count"] == 2
+                  and run_summary["cdpMetrics"]["LayoutCount"]["max"] == 6)
+    # Cumulative Chrome counters are reported as their change over the run, the heap as its final size.
+    summary_ok = summary_ok and cdp_metric_changes({"LayoutCount": 10, "ScriptDuration": 0.5, "JSHeapUsedSize": 100},
+                                                   {"LayoutCount": 13, "ScriptDuration": 0.75, "JSHeapUsedSize": 80, "Other": 1}) == \
+        {"LayoutCount": 3, "ScriptDuration": 0.25, "JSHeapUsedSize": 80}
+    if not summary_ok: all_tests_passed = False
+    print(f"  Percentile summary --- {'OK' if summary_ok else 'FAIL'}")
+
+    # The in-process server must serve the app's files.
+    server_ok = True
+    try:
+        with static_server(DEFAULT_ROOT_DIR) as base_url:
+            with urllib.request.urlopen(f"{base_url}/index.html", timeout=10) as response:
+                server_ok = response.status == 200 and b"book-cipher-tab" in response.read()
+    except OSError as e:
+        server_ok = False
+        print(f"  Static server error: {e}")
+    if not server_ok: all_tests_passed = False
+    print(f"  In-process static server --- {'OK' if server_ok else 'FAIL'}")
+
+    if all_tests_passed: print("All load benchmark self-tests PASSED.\n")
+    else: print("Some load benchmark self-tests FAILED.\n")
+    return all_tests_passed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measures book load time and input latency in headless Chrome.")
+    parser.add_argument("books", nargs="+", help="Book ids to measure (keys of bookData.js, e.g. passage_1).")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Measured runs per book and cache state (default: %(default)s).")
+    parser.add_argument("--cache", choices=("cold", "warm", "both"), default="both",
+                        help="cold: a fresh browser per run; warm: one browser after a warm-up run (default: both).")
+    parser.add_argument("--input-chars", type=int, default=DEFAULT_INPUT_CHARS,
+                        help="Letters tapped after the first one to measure input latency (default: %(default)s).")
+    parser.add_argument("--root", default=DEFAULT_ROOT_DIR, help="Directory to serve (default: src).")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help="Seconds to wait for each step of a run (default: %(default)s).")
+    parser.add_argument("--json", dest="json_path", help="Write the runs and their summary to this JSON file.")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not run_self_tests():
+        return 1
+    cache_states = ("cold", "warm") if args.cache == "both" else (args.cache,)
+    run_functions = {"cold": cold_runs, "warm": warm_runs}
+    books = {}
+    with static_server(args.root) as base_url:
+        print(f"Serving {args.root} at {base_url}")
+        try:
+            make_driver().quit() # Fail once, clearly, when Chrome or its driver is missing
+        except WebDriverException as e:
+            print(f"Error: Could not start headless Chrome: {e.msg}")
+            return 1
+        for book_id in args.books:
+            book = {"runs": {}, "summary": {}}
+            for cache in cache_states:
+                print(f"Measuring {book_id} ({cache}, {args.runs} run(s))...")
+                started = time.perf_counter()
+                runs = run_functions[cache](base_url, book_id, args.runs, args.input_chars, args.timeout)
+                for run in runs:
+                    if "error" in run:
+                        print(f"  Run failed: {run['error']}")
+                    for message in run["consoleErrors"]:
+                        print(f"  SEVERE console error: {message}")
+                book["runs"][cache] = runs
+                book["summary"][cache] = summarize_runs(runs)
+                print(f"  Done in {time.perf_counter() - started:.1f} s.")
+            books[book_id] = book
+    print_report(books)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": RESULTS_VERSION, "runsPerBook": args.runs, "inputChars": args.input_chars,
+                       "python": platform.python_version(), "platform": platform.platform(), "books": books}, f, indent=2)
+        print(f"Results written to {args.json_path}")
+    failed_runs = sum(summary["failedRuns"] for book in books.values() for summary in book["summary"].values())
+    if failed_runs:
+        print(f"{failed_runs} run(s) failed.")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,443 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import resource
+import itertools
+import tempfile
+import contextlib
+import subprocess
+import tracemalloc
+import concurrent.futures
+
+import generate_morse_files as morse
+
+# --- Constants ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_DIR = os.path.join(SCRIPT_DIR, ".morse_benchmark_corpus")
+RESULTS_VERSION = 1
+DEFAULT_SEED = 1
+DEFAULT_MIN_SECONDS = 0.2 # Each encoder path is repeated until it has run at least this long
+DEFAULT_THRESHOLD = 0.10 # Slowdown (or memory growth) relative to the baseline that counts as a regression
+SIZE_PRESETS = {
+    "quick": "1K,64K,1M,8M",
+    "full": "1K,64K,1M,16M,128M,500M",
+}
+MEGABYTE = 1 << 20 # MB in the report is 2^20 bytes, as in the size arguments (see parse_byte_size)
+
+# --- Synthetic Corpus ---
+# Books are generated from a seed, so every run (and every machine) benchmarks the same text. Words come
+# from a seeded vocabulary with English word-length and letter frequencies, drawn with a Zipf distribution,
+# and are set in sentences and paragraphs with the punctuation, digits, markdown and non-ASCII characters
+# (dropped by the encoder) of the real sources. Text is generated in blocks ending at a paragraph break;
+# books larger than SYNTHETIC_DISTINCT_BLOCKS blocks cycle through them, which keeps a 500 MB book cheap to
+# generate without changing what the encoder sees. Bump SYNTHETIC_CORPUS_VERSION when the text changes.
+SYNTHETIC_CORPUS_VERSION = 1
+SYNTHETIC_BLOCK_CHARS = 1 << 20
+SYNTHETIC_DISTINCT_BLOCKS = 16
+SYNTHETIC_VOCABULARY_WORDS = 8000
+# Share of English words by length (1 to 15 letters) and of letters in English text.
+WORD_LENGTH_WEIGHTS = [3, 17, 21, 16, 11, 9, 8, 6, 4, 2.5, 1.2, 0.7, 0.3, 0.2, 0.1]
+LETTER_WEIGHTS = {
+    'e': 12.7, 't': 9.1, 'a': 8.2, 'o': 7.5, 'i': 7.0, 'n': 6.7, 's': 6.3, 'h': 6.1, 'r': 6.0, 'd': 4.3,
+    'l': 4.0, 'c': 2.8, 'u': 2.8, 'm': 2.4, 'w': 2.4, 'f': 2.2, 'g': 2.0, 'y': 2.0, 'p': 1.9, 'b': 1.5,
+    'v': 1.0, 'k': 0.8, 'j': 0.15, 'x': 0.15, 'q': 0.1, 'z': 0.07,
+}
+ACCENTED_LETTERS = {'e': 'é', 'i': 'ï', 'u': 'ü', 'a': 'à', 'o': 'ö'}
+SENTENCE_ENDINGS = ['.', '.', '.', '.', '.', '?', '!']
+CHAPTER_EVERY_PARAGRAPHS = 40
+
+def synthetic_vocabulary(seed: int) -> list:
+    """Returns the seeded vocabulary, most frequent word first."""
+    rng = random.Random(f"vocabulary:{seed}")
+    letters, letter_weights = zip(*LETTER_WEIGHTS.items())
+    vocabulary = []
+    seen = set()
+    while len(vocabulary) < SYNTHETIC_VOCABULARY_WORDS:
+        length = rng.choices(range(1, len(WORD_LENGTH_WEIGHTS) + 1), WORD_LENGTH_WEIGHTS)[0]
+        word = ''.join(rng.choices(letters, letter_weights, k=length))
+        if rng.random() < 0.005: # A few loanwords whose accented letter has no Morse signal
+            position = rng.randrange(length)
+            word = word[:position] + ACCENTED_LETTERS.get(word[position], word[position]) + word[position + 1:]
+        elif rng.random() < 0.03:
+            word += "'s"
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+def synthetic_block(seed: int, block_number: int, vocabulary: list, cum_weights: list, block_chars: int = SYNTHETIC_BLOCK_CHARS) -> str:
+    """Returns about block_chars characters of markdown paragraphs, ending with a paragraph break."""
+    rng = random.Random(f"block:{seed}:{block_number}")
+    paragraphs = []
+    chars = 0
+    while chars < block_chars:
+        if len(paragraphs) % CHAPTER_EVERY_PARAGRAPHS == 0:
+            paragraphs.append(f"## Chapter {block_number * 1000 + len(paragraphs) // CHAPTER_EVERY_PARAGRAPHS + 1}")
+        sentences = []
+        for _ in range(rng.randint(2, 7)):
+            words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(4, 24))
+            for i, word in enumerate(words):
+                roll = rng.random()
+                if roll < 0.015:
+                    words[i] = str(rng.randint(1, 2024))
+                elif roll < 0.025:
+                    words[i] = f"*{word}*"
+                elif roll < 0.105 and i + 1 < len(words):
+                    words[i] = word + ','
+                elif roll < 0.115 and i + 1 < len(words):
+                    words[i] = word + ' —' # Em dash: dropped by the encoder
+            sentence = ' '.join(words)
+            sentence = sentence[0].upper() + sentence[1:] + rng.choice(SENTENCE_ENDINGS)
+            roll = rng.random()
+            if roll < 0.05:
+                sentence = f'"{sentence}"'
+            elif roll < 0.10:
+                sentence = f'“{sentence}”' # Curly quotes: dropped by the encoder
+            sentences.append(sentence)
+        paragraphs.append(' '.join(sentences))
+        chars += len(paragraphs[-1]) + 2
+    return '\n\n'.join(paragraphs) + '\n\n'
+
+def iter_synthetic_markdown(size_bytes: int, seed: int = DEFAULT_SEED, block_chars: int = SYNTHETIC_BLOCK_CHARS):
+    """Yields the content_markdown of a synthetic book of size_bytes UTF-8 bytes (up to 3 fewer if a character is cut)."""
+    vocabulary = synthetic_vocabulary(seed)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    blocks = {}
+    remaining = size_bytes
+    block_number = 0
+    while remaining > 0:
+        distinct_block = block_number % SYNTHETIC_DISTINCT_BLOCKS
+        if distinct_block not in blocks:
+            blocks[distinct_block] = synthetic_block(seed, distinct_block, vocabulary, cum_weights, block_chars).encode('utf-8')
+        block = blocks[distinct_block]
+        if len(block) > remaining:
+            block = block[:remaining]
+        remaining -= len(block)
+        yield block.decode('utf-8', 'ignore')
+        block_number += 1
+
+def format_size(size_bytes: int) -> str:
+    """Formats a byte count the way parse_byte_size reads it, e.g. 1048576 -> '1M'."""
+    for suffix, multiplier in (("G", 1 << 30), ("M", 1 << 20), ("K", 1 << 10)):
+        if size_bytes >= multiplier and size_bytes % multiplier == 0:
+            return f"{size_bytes // multiplier}{suffix}"
+    return str(size_bytes)
+
+def write_synthetic_book(path: str, size_bytes: int, seed: int = DEFAULT_SEED):
+    """Writes a synthetic English source in the format of english_sources/*.json, streaming its content."""
+    header = {
+        "title": f"Synthetic Book {format_size(size_bytes)} (seed {seed})",
+        "author": "Benchmark Generator",
+        "description": "Deterministic synthetic text for encoder benchmarks.",
+        "isPro": False,
+        "genre": "Benchmark",
+        "lengthCategory": "Long",
+    }
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header, indent=4)[:-2] + f',\n    "{morse.CONTENT_MARKDOWN_KEY}": "')
+        for chunk in iter_synthetic_markdown(size_bytes, seed):
+            f.write(json.dumps(chunk, ensure_ascii=False)[1:-1])
+        f.write('"\n}\n')
+    os.replace(temp_path, path) # Never leave a truncated book in the corpus cache
+
+def ensure_synthetic_book(corpus_dir: str, size_bytes: int, seed: int = DEFAULT_SEED) -> str:
+    """Returns the path of the synthetic book of this size and seed, generating it on first use."""
+    book_dir = os.path.join(corpus_dir, f"v{SYNTHETIC_CORPUS_VERSION}")
+    os.makedirs(book_dir, exist_ok=True)
+    path = os.path.join(book_dir, f"synthetic_{format_size(size_bytes)}_seed{seed}.json")
+    if not os.path.exists(path):
+        print(f"Generating synthetic book {os.path.basename(path)}...")
+        write_synthetic_book(path, size_bytes, seed)
+    return path
+
+# --- Encoder Paths ---
+# Each path is a context manager that prepares its input outside the timed region (reading and normalising
+# the source for the in-memory encoders, starting the worker pool for the sharded one) and yields the call
+# to time. "build" runs the whole generator (--force) on a scratch copy of the project holding only the
+# synthetic book, so it includes the self-tests and every asset a real build writes.
+def _read_content(source_path: str) -> str:
+    _, content_member_index = morse.read_book_metadata(source_path)
+    return ''.join(morse.iter_book_content(source_path, content_member_index))
+
+@contextlib.contextmanager
+def _reference_path(source_path: str, work_dir: str, jobs: int):
+    text = morse.normalize_markdown_for_morse(_read_content(source_path))
+    yield lambda: morse.english_to_morse_reference(text)
+
+@contextlib.contextmanager
+def _bulk_path(source_path: str, work_dir: str, jobs: int):
+    text = morse.normalize_markdown_for_morse(_read_content(source_path))
+    yield lambda: morse.english_to_morse(text)
+
+@contextlib.contextmanager
+def _batch_path(source_path: str, work_dir: str, jobs: int):
+    paragraphs = [morse.normalize_markdown_for_morse(paragraph) for paragraph in _read_content(source_path).split('\n\n')]
+    yield lambda: morse.english_to_morse_many(paragraphs)
+
+@contextlib.contextmanager
+def _stream_path(source_path: str, work_dir: str, jobs: int):
+    _, content_member_index = morse.read_book_metadata(source_path)
+    morse_path = os.path.join(work_dir, "stream_morse.txt")
+    yield lambda: morse.write_morse_file(morse.iter_morse_chunks(morse.iter_normalized_chunks(
+        morse.iter_book_content(source_path, content_member_index))), morse_path)
+
+@contextlib.contextmanager
+def _sharded_path(source_path: str, work_dir: str, jobs: int):
+    _, content_member_index = morse.read_book_metadata(source_path)
+    morse_path = os.path.join(work_dir, "sharded_morse.txt")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield lambda: morse.write_morse_file(morse.iter_sharded_morse_chunks(
+            morse.iter_book_content(source_path, content_member_index), executor,
+            jobs * morse.SHARD_PENDING_PER_JOB), morse_path)
+
+@contextlib.contextmanager
+def _build_path(source_path: str, work_dir: str, jobs: int):
+    tree_dir = os.path.join(work_dir, "build")
+    sources_dir = os.path.join(tree_dir, os.path.relpath(morse.ENGLISH_SOURCES_DIR, SCRIPT_DIR))
+    os.makedirs(sources_dir)
+    os.makedirs(os.path.dirname(os.path.join(tree_dir, os.path.relpath(morse.BOOK_DATA_JS_PATH, SCRIPT_DIR))), exist_ok=True)
+    shutil.copy(morse.__file__, tree_dir)
+    book_path = os.path.join(sources_dir, os.path.basename(source_path))
+    try:
+        os.link(source_path, book_path)
+    except OSError:
+        shutil.copyfile(source_path, book_path)
+    command = [sys.executable, os.path.join(tree_dir, os.path.basename(morse.__file__)), "--force", "--jobs", str(jobs), "--no-compress",
+               "--skip-self-tests"]
+    yield lambda: subprocess.run(command, cwd=tree_dir, stdout=subprocess.DEVNULL, check=True)
+
+# Name -> (context manager, largest size run by default). The per-character reference encoder and the
+# encoders that hold a whole book (and its Morse) in memory are skipped for larger books unless
+# --no-size-limits is given.
+IN_MEMORY_MAX_BYTES = 128 << 20
+ENCODER_PATHS = {
+    "reference": (_reference_path, 1 << 20),
+    "bulk": (_bulk_path, IN_MEMORY_MAX_BYTES),
+    "batch": (_batch_path, IN_MEMORY_MAX_BYTES),
+    "stream": (_stream_path, None),
+    "sharded": (_sharded_path, None),
+    "build": (_build_path, None),
+}
+
+# --- Measurement ---
+# Every (path, size) is measured in a fresh child process (this script with --measure), so peak RSS belongs
+# to that path alone and nothing is shared with the previous measurement. The child times the path, then
+# measures its tracemalloc peak in a second child, since tracing slows allocation-heavy paths down.
+def _peak_rss_bytes() -> int:
+    """Largest peak RSS of a single process: this one or one of its finished children (a pool worker, the build).
+
+    The kernel keeps the maximum over children, not their sum, so with --jobs > 1 the workers' combined
+    footprint is not included.
+    """
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak if sys.platform == 'darwin' else peak * 1024 # ru_maxrss is in bytes on macOS, KiB on Linux
+
+def measure_path(path_name: str, source_path: str, jobs: int, min_seconds: float, trace: bool) -> dict:
+    """Times one encoder path on one book (or only traces its Python allocations) in this process."""
+    path_context, _ = ENCODER_PATHS[path_name]
+    with tempfile.TemporaryDirectory() as work_dir:
+        with path_context(source_path, work_dir, jobs) as run:
+            if trace:
+                tracemalloc.start()
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                return {"tracemallocPeakBytes": peak}
+            calls = 0
+            start = time.perf_counter()
+            elapsed = 0.0
+            while elapsed < min_seconds or not calls:
+                run()
+                calls += 1
+                elapsed = time.perf_counter() - start
+    return {"seconds": elapsed / calls, "calls": calls, "peakRssBytes": _peak_rss_bytes()}
+
+def run_measurement(path_name: str, source_path: str, jobs: int, min_seconds: float, trace: bool) -> dict:
+    """Runs measure_path in a child process and returns its result."""
+    command = [sys.executable, os.path.abspath(__file__), "--measure", path_name, source_path,
+               "--jobs", str(jobs), "--min-seconds", str(min_seconds)] + (["--trace"] if trace else [])
+    completed = subprocess.run(command, stdout=subprocess.PIPE, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def benchmark(path_names: list, sizes: list, corpus_dir: str, seed: int, jobs: int, min_seconds: float,
+              trace: bool = True, size_limits: bool = True) -> list:
+    """Measures every path on a synthetic book of every size. Returns one result dict per measurement."""
+    results = []
+    for size_bytes in sizes:
+        source_path = ensure_synthetic_book(corpus_dir, size_bytes, seed)
+        for path_name in path_names:
+            max_bytes = ENCODER_PATHS[path_name][1]
+            if size_limits and max_bytes is not None and size_bytes > max_bytes:
+                print(f"  {path_name:10} {format_size(size_bytes):>6}  skipped (above {format_size(max_bytes)}, see --no-size-limits)")
+                continue
+            result = {"path": path_name, "sizeBytes": size_bytes}
+            result.update(run_measurement(path_name, source_path, jobs, min_seconds, trace=False))
+            result["megabytesPerSecond"] = size_bytes / MEGABYTE / result["seconds"] if result["seconds"] else None
+            # The build runs in its own process, invisible to tracemalloc.
+            result["tracemallocPeakBytes"] = (run_measurement(path_name, source_path, jobs, min_seconds, trace=True)["tracemallocPeakBytes"]
+                                              if trace and path_name != "build" else None)
+            print(f"  {path_name:10} {format_size(size_bytes):>6}  {result['seconds']:.4f} s  {result['megabytesPerSecond']:.2f} MB/s")
+            results.append(result)
+    return results
+
+# --- Baseline Comparison ---
+# A result regresses when it takes longer, or peaks higher in RSS or tracemalloc, than the baseline
+# measurement of the same path and size by more than the threshold (0.10 = 10%).
+COMPARED_METRICS = ("seconds", "peakRssBytes", "tracemallocPeakBytes")
+
+def compare_with_baseline(results: list, baseline_results: list, threshold: float) -> list:
+    """Returns (result, metric, baseline value, value) for every regression."""
+    baseline = {(result["path"], result["sizeBytes"]): result for result in baseline_results}
+    regressions = []
+    for result in results:
+        baseline_result = baseline.get((result["path"], result["sizeBytes"]))
+        if baseline_result is None:
+            continue
+        for metric in COMPARED_METRICS:
+            value, baseline_value = result.get(metric), baseline_result.get(metric)
+            if value is not None and baseline_value and value > baseline_value * (1 + threshold):
+                regressions.append((result, metric, baseline_value, value))
+    return regressions
+
+def _ratio(numerator, denominator) -> str:
+    return f"{numerator / denominator:.2f}x" if numerator is not None and denominator else "-"
+
+def _megabytes(value) -> str:
+    return f"{value / MEGABYTE:.1f}" if value is not None else "-"
+
+def _format_metric(metric: str, value) -> str:
+    return f"{value:.4f} s" if metric == "seconds" else f"{_megabytes(value)} MB"
+
+def print_report(results: list, baseline_results: list = None):
+    baseline = {(result["path"], result["sizeBytes"]): result for result in baseline_results or []}
+    print(f"\n{'path':10} {'size':>6} {'s/call':>10} {'MB/s':>9} {'maxRSS MB':>9} {'trace MB':>8} {'time/base':>9} {'rss/base':>8}")
+    for result in results:
+        base = baseline.get((result["path"], result["sizeBytes"]), {})
+        print(f"{result['path']:10} {format_size(result['sizeBytes']):>6} {result['seconds']:>10.4f} "
+              f"{result['megabytesPerSecond']:>9.2f} {_megabytes(result['peakRssBytes']):>9} {_megabytes(result['tracemallocPeakBytes']):>8} "
+              f"{_ratio(result['seconds'], base.get('seconds')):>9} {_ratio(result['peakRssBytes'], base.get('peakRssBytes')):>8}")
+    print("MB = 2^20 bytes; MB/s counts content_markdown bytes; maxRSS = peak of the largest single process;\n"
+          "*/base = relative to the baseline (lower is better).")
+
+def load_results(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def run_self_tests() -> bool:
+    print("Running benchmark self-tests...")
+    all_tests_passed = True
+
+    # The corpus must be the same for the same seed, differ between seeds, and have the requested size,
+    # also when the book spans more blocks than are distinct.
+    corpus_ok = True
+    for size_bytes in (1, 1000, 3 * 1024, 40 * 1024):
+        text = ''.join(iter_synthetic_markdown(size_bytes, seed=7, block_chars=512))
+        if (text != ''.join(iter_synthetic_markdown(size_bytes, seed=7, block_chars=512))
+                or not size_bytes - 3 <= len(text.encode('utf-8')) <= size_bytes):
+            corpus_ok = False
+            print(f"  Synthetic book of {size_bytes} bytes --- FAIL")
+    if ''.join(iter_synthetic_markdown(4096, seed=7)) == ''.join(iter_synthetic_markdown(4096, seed=8)):
+        corpus_ok = False
+        print("  Synthetic books of different seeds are equal --- FAIL")
+    # The written source must read back through the generator's own streaming reader.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        book_path = os.path.join(temp_dir, "book.json")
+        write_synthetic_book(book_path, 64 * 1024, seed=7)
+        data, _ = morse.read_book_metadata(book_path)
+        if _read_content(book_path) != ''.join(iter_synthetic_markdown(64 * 1024, seed=7)) or data.get("title") is None:
+            corpus_ok = False
+            print("  Synthetic book source round trip --- FAIL")
+    if not corpus_ok: all_tests_passed = False
+    print(f"  Deterministic synthetic corpus --- {'OK' if corpus_ok else 'FAIL'}")
+
+    # Only slowdowns and memory growth beyond the threshold count as regressions.
+    baseline_results = [{"path": "bulk", "sizeBytes": 1024, "seconds": 1.0, "peakRssBytes": 100, "tracemallocPeakBytes": None}]
+    results = [{"path": "bulk", "sizeBytes": 1024, "seconds": 1.05, "peakRssBytes": 150, "tracemallocPeakBytes": 10},
+               {"path": "bulk", "sizeBytes": 2048, "seconds": 9.0, "peakRssBytes": 100, "tracemallocPeakBytes": 10}]
+    regressions = [(result["sizeBytes"], metric) for result, metric, _, _ in compare_with_baseline(results, baseline_results, 0.10)]
+    compare_ok = regressions == [(1024, "peakRssBytes")]
+    if not compare_ok: all_tests_passed = False
+    print(f"  Baseline comparison --- {'OK' if compare_ok else 'FAIL'}")
+
+    if all_tests_passed: print("All benchmark self-tests PASSED.\n")
+    else: print("Some benchmark self-tests FAILED.\n")
+    return all_tests_passed
+
+def parse_sizes(text: str) -> list:
+    return [morse.parse_byte_size(size) for size in SIZE_PRESETS.get(text, text).split(',') if size.strip()]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the Morse encoder paths on deterministic synthetic books.")
+    parser.add_argument("--sizes", default="quick",
+                        help=f"Comma-separated book sizes (e.g. 1K,1M,500M) or a preset: "
+                             f"{', '.join(f'{name} ({sizes})' for name, sizes in SIZE_PRESETS.items())}. Default: quick.")
+    parser.add_argument("--paths", default=','.join(ENCODER_PATHS),
+                        help=f"Comma-separated encoder paths to measure (default: all of {', '.join(ENCODER_PATHS)}).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the synthetic books (default: %(default)s).")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR,
+                        help="Where generated books are cached between runs (default: .morse_benchmark_corpus).")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Worker processes of the sharded and build paths (0 = one per CPU; default: 0).")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Minimum time spent timing each path per size.")
+    parser.add_argument("--no-trace", dest="trace", action="store_false",
+                        help="Skip the tracemalloc run of each measurement (halves the running time).")
+    parser.add_argument("--no-size-limits", dest="size_limits", action="store_false",
+                        help="Also run the reference and in-memory encoders on books above their default limits.")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file (usable as a later --baseline).")
+    parser.add_argument("--baseline", help="Compare with the results in this JSON file and fail on regressions.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown or memory growth counted as a regression (default: %(default)s).")
+    parser.add_argument("--measure", nargs=2, metavar=("PATH", "SOURCE"), help=argparse.SUPPRESS) # Child process mode
+    parser.add_argument("--trace", dest="trace_only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.measure:
+        print(json.dumps(measure_path(*args.measure, args.jobs, args.min_seconds, args.trace_only)))
+        return 0
+    if not run_self_tests():
+        return 1
+    path_names = [name.strip() for name in args.paths.split(',') if name.strip()]
+    unknown_paths = [name for name in path_names if name not in ENCODER_PATHS]
+    if unknown_paths:
+        print(f"Unknown encoder path(s): {', '.join(unknown_paths)}. Choose from {', '.join(ENCODER_PATHS)}.")
+        return 1
+    sizes = parse_sizes(args.sizes)
+    baseline = load_results(args.baseline) if args.baseline else None
+    if baseline and (baseline.get("seed"), baseline.get("corpusVersion")) != (args.seed, SYNTHETIC_CORPUS_VERSION):
+        print(f"Warning: {args.baseline} was measured on a different synthetic corpus; comparing anyway.")
+
+    print(f"Benchmarking {', '.join(path_names)} on {', '.join(map(format_size, sizes))} (seed {args.seed}, jobs {args.jobs}).")
+    results = benchmark(path_names, sizes, args.corpus_dir, args.seed, args.jobs, args.min_seconds, args.trace, args.size_limits)
+    print_report(results, baseline["results"] if baseline else None)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": RESULTS_VERSION, "seed": args.seed, "corpusVersion": SYNTHETIC_CORPUS_VERSION,
+                       "encoderVersion": morse.ENCODER_VERSION, "jobs": args.jobs, "python": platform.python_version(),
+                       "platform": platform.platform(), "cpuCount": os.cpu_count(), "results": results}, f, indent=2)
+        print(f"Results written to {args.json_path}")
+    if baseline:
+        regressions = compare_with_baseline(results, baseline["results"], args.threshold)
+        for result, metric, baseline_value, value in regressions:
+            print(f"Regression: {result['path']} at {format_size(result['sizeBytes'])}: {metric} "
+                  f"{_format_metric(metric, baseline_value)} -> {_format_metric(metric, value)} "
+                  f"({_ratio(value, baseline_value)}, threshold {args.threshold:.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
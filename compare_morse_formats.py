@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+import tempfile
+
+import generate_morse_files as morse
+
+# --- Constants ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_DIR = os.path.join(SCRIPT_DIR, "www", "assets", "book_cipher_texts")
+DEFAULT_MIN_SECONDS = 0.2 # Each decoder is repeated until it has run at least this long
+
+def morse_sequence_from_text(morse_text: str) -> list:
+    """Python equivalent of the text decoding in bookCipher.js (split on '/', then on spaces)."""
+    return [letters for letters in ([signal for signal in word.strip().split(' ') if signal]
+                                    for word in morse_text.strip().split('/')) if letters]
+
+def time_decoder(decode, data, min_seconds: float) -> float:
+    """Returns the mean seconds per call of decode(data), repeating it for at least min_seconds."""
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds or not calls:
+        decode(data)
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / calls
+
+def compare_file(morse_path: str, temp_dir: str, min_seconds: float) -> dict:
+    """Builds the binary and dictionary-coded forms of one Morse file and compares sizes and decode times."""
+    binary_path = os.path.join(temp_dir, os.path.basename(morse_path) + ".bin")
+    dictionary_path = os.path.join(temp_dir, os.path.basename(morse_path) + ".dict.bin")
+    morse.write_morse_binary(morse_path, binary_path)
+    morse.write_morse_dictionary(morse_path, dictionary_path)
+    with open(morse_path, 'rb') as f:
+        text_bytes = f.read()
+    with open(binary_path, 'rb') as f:
+        binary_bytes = f.read()
+    with open(dictionary_path, 'rb') as f:
+        dictionary_bytes = f.read()
+    text = text_bytes.decode('ascii')
+    expected_words = morse_sequence_from_text(text)
+    if expected_words != morse.read_morse_binary(binary_bytes):
+        raise ValueError(f"binary form of {morse_path} does not decode to the same words")
+    if expected_words != morse.read_morse_dictionary(dictionary_bytes):
+        raise ValueError(f"dictionary-coded form of {morse_path} does not decode to the same words")
+    return {
+        "file": os.path.basename(morse_path),
+        "textBytes": len(text_bytes),
+        "binaryBytes": len(binary_bytes),
+        "dictionaryBytes": len(dictionary_bytes),
+        "textDecodeSeconds": time_decoder(morse_sequence_from_text, text, min_seconds),
+        "binaryDecodeSeconds": time_decoder(morse.read_morse_binary, binary_bytes, min_seconds),
+        "dictionaryDecodeSeconds": time_decoder(morse.read_morse_dictionary, dictionary_bytes, min_seconds),
+    }
+
+def _ratio(numerator: float, denominator: float) -> str:
+    return f"{numerator / denominator:.2f}x" if denominator else "-"
+
+def _report_row(name: str, result: dict) -> str:
+    return (f"{name:40} {result['textBytes']:>10} {result['binaryBytes']:>10} {result['dictionaryBytes']:>10} "
+            f"{_ratio(result['binaryBytes'], result['textBytes']):>7} {_ratio(result['dictionaryBytes'], result['textBytes']):>7} "
+            f"{result['textDecodeSeconds'] * 1000:>9.3f} {result['binaryDecodeSeconds'] * 1000:>9.3f} "
+            f"{result['dictionaryDecodeSeconds'] * 1000:>9.3f}")
+
+def print_report(results: list):
+    print(f"{'file':40} {'text B':>10} {'binary B':>10} {'dict B':>10} {'bin/txt':>7} {'dict/txt':>7} "
+          f"{'text ms':>9} {'binary ms':>9} {'dict ms':>9}")
+    for result in results:
+        print(_report_row(result['file'], result))
+    totals = {key: sum(result[key] for result in results) for key in results[0] if key != "file"}
+    print(_report_row('TOTAL', totals))
+    print("bin/txt and dict/txt = asset bytes relative to the Morse text (lower is better); ms = decode time per file.")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compares the size and decode speed of text, binary and dictionary-coded Morse assets.")
+    parser.add_argument("corpus_dir", nargs="?", default=DEFAULT_CORPUS_DIR,
+                        help="Directory of *_morse.txt files (default: www/assets/book_cipher_texts).")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Minimum time spent timing each decoder per file.")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file.")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    morse_paths = sorted(glob.glob(os.path.join(args.corpus_dir, f"*{morse.MORSE_FILE_SUFFIX}")))
+    if not morse_paths:
+        print(f"No *{morse.MORSE_FILE_SUFFIX} files found in {args.corpus_dir}.")
+        return 1
+    print(f"Comparing {len(morse_paths)} Morse file(s) in {args.corpus_dir}.")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results = [compare_file(morse_path, temp_dir, args.min_seconds) for morse_path in morse_paths]
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json_path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
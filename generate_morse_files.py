@@ -1,7 +1,27 @@
 import os
+import sys
 import json
 import glob # For scanning directories
+import io
+import gzip
+import hashlib
 import re # For markdown pre-processing
+import array
+import heapq
+import random
+import struct
+import string
+import itertools
+import tempfile
+import argparse
+import contextlib
+import collections
+import concurrent.futures
+
+try:
+    import brotli # Optional: without it only .gz siblings are written
+except ImportError:
+    brotli = None
 
 # --- Constants ---
 # Absolute path to the directory where this script is located
@@ -12,6 +32,16 @@ SRC_DIR = os.path.join(SCRIPT_DIR, "src")
 ENGLISH_SOURCES_DIR = os.path.join(SRC_DIR, "assets", "book_cipher_texts", "english_sources")
 MORSE_CODE_BASE_DIR = os.path.join(SRC_DIR, "assets", "book_cipher_texts")
 BOOK_DATA_JS_PATH = os.path.join(SRC_DIR, "js", "data", "bookData.js")
+# bookData.js only carries what the library view needs; the rest of each entry goes to a
+# per-book detail shard (<book>_details.json) that the game fetches when the book is opened.
+CATALOGUE_SUMMARY_KEYS = ("title", "genre", "lengthCategory", "isPro")
+BOOK_DETAILS_SUFFIX = "_details.json"
+BOOK_DETAILS_PATH_PLACEHOLDER = "{book}"
+BOOK_SEARCH_INDEX_PATH = os.path.join(SRC_DIR, "js", "data", "bookSearchIndex.json")
+PRECACHE_MANIFEST_PATH = os.path.join(SRC_DIR, "precache-manifest.js")
+MORSE_TABLES_JS_PATH = os.path.join(SRC_DIR, "js", "data", "morseTables.js")
+MORSE_PREFIX_INDEX_JS_PATH = os.path.join(SRC_DIR, "js", "data", "morsePrefixIndex.js")
+KOCH_DRILLS_JS_PATH = os.path.join(SRC_DIR, "js", "data", "kochDrills.js")
 
 MORSE_CODE_MAP = {
     'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.', 'G': '--.', 'H': '....',
@@ -26,9 +56,83 @@ MORSE_CODE_MAP = {
     ' ': '/'  # English space maps to a single slash for word separation marker
 }
 
+# --- Precompiled Encoder Tables ---
+# Every supported character is ASCII, so the bulk encoder works on ASCII bytes. Each character's
+# Morse signal plus its trailing letter separator is laid out in a fixed-width slot padded with
+# a filler byte. One 256-entry bytes.translate table per slot position ("symbol plane") is built
+# once from MORSE_CODE_MAP; encoding is then a handful of C-level translate/slice operations
+# instead of one dict lookup per character.
+MORSE_SLOT_WIDTH = max(len(signal) for signal in MORSE_CODE_MAP.values()) + 1 # Longest signal + separator
+MORSE_SLOT_FILLER = b'\x00' # Padding byte, deleted after the planes are interleaved
+# Byte used to join texts in english_to_morse_many. It can never appear in ASCII-encoded input,
+# and its plane entry emits a newline, which is never part of the Morse output itself.
+BATCH_DELIMITER_BYTE = 0x80
+BATCH_DELIMITER_OUTPUT = b'\n'
+
+def _build_symbol_planes(code_map: dict) -> list:
+    """Builds the per-slot bytes.translate tables used by the bulk encoder."""
+    slots = [MORSE_SLOT_FILLER * MORSE_SLOT_WIDTH] * 256
+    for char, signal in code_map.items():
+        slots[ord(char)] = (signal + ' ').encode('ascii').ljust(MORSE_SLOT_WIDTH, MORSE_SLOT_FILLER)
+    slots[BATCH_DELIMITER_BYTE] = BATCH_DELIMITER_OUTPUT.ljust(MORSE_SLOT_WIDTH, MORSE_SLOT_FILLER)
+    return [bytes(slot[position] for slot in slots) for position in range(MORSE_SLOT_WIDTH)]
+
+MORSE_SYMBOL_PLANES = _build_symbol_planes(MORSE_CODE_MAP)
+
+def _encode_ascii_bytes(data: bytes) -> bytes:
+    """Encodes upper-cased ASCII bytes to Morse; every emitted signal is followed by one space."""
+    width = MORSE_SLOT_WIDTH
+    slots = bytearray(len(data) * width)
+    for position, plane in enumerate(MORSE_SYMBOL_PLANES):
+        slots[position::width] = data.translate(plane)
+    return bytes(slots).translate(None, MORSE_SLOT_FILLER)
+
+def _prepare_text(text: str) -> bytes:
+    """Upper-cases text and drops non-ASCII characters, none of which have a Morse signal."""
+    # Upper-casing first keeps parity with the reference encoder for characters such as 'ß' -> 'SS'.
+    return text.upper().encode('ascii', 'ignore')
+
+# --- Precompiled Decoder Tables ---
+# Decoding walks the dichotomic (binary) Morse tree stored as a heap-indexed array: the root is
+# index 1, a dot moves from index i to 2 * i and a dash to 2 * i + 1, so every signal of up to
+# seven symbols has a unique slot below 256. The bulk decoder flattens the tree once into a
+# signal -> character dict so whole tokens are resolved by C-level lookups.
+MORSE_DECODE_UNKNOWN = '\ufffd' # Emitted for tokens that are not a Morse signal
+MORSE_WORD_SEPARATOR = b' / '
+MORSE_WORD_CACHE_LIMIT = 1 << 16 # Distinct Morse words memoised per decoder before the cache is reset
+# Line breaks and tabs (e.g. a trailing newline in a hand-written asset) separate tokens like spaces.
+MORSE_WHITESPACE_TRANSLATION = bytes.maketrans(b'\t\n\x0b\x0c\r', b'     ')
+
+def _build_dichotomic_table(code_map: dict) -> list:
+    """Builds the heap-indexed Morse tree; unused slots hold None."""
+    table = [None] * (1 << MORSE_SLOT_WIDTH)
+    for char, signal in code_map.items():
+        if char == ' ': # The word separator is a token of its own, not a tree node
+            continue
+        index = 1
+        for symbol in signal:
+            index = 2 * index + (symbol == '-')
+        table[index] = char
+    return table
+
+MORSE_DICHOTOMIC_TABLE = _build_dichotomic_table(MORSE_CODE_MAP)
+
+def _build_token_decode_map(table: list) -> dict:
+    """Flattens the dichotomic table into a dict from ASCII signal bytes to characters."""
+    # The signal of heap index i is the binary form of i without its leading 1 (0 = dot, 1 = dash).
+    decode_map = {bin(index)[3:].replace('0', '.').replace('1', '-').encode('ascii'): char
+                  for index, char in enumerate(table) if char is not None}
+    decode_map[MORSE_CODE_MAP[' '].encode('ascii')] = ' '
+    decode_map[b''] = '' # Produced by an empty input
+    return decode_map
+
+MORSE_TOKEN_DECODE_MAP = _build_token_decode_map(MORSE_DICHOTOMIC_TABLE)
+# Bytes that english_to_morse drops, used to compute what a round trip should give back.
+MORSE_UNENCODABLE_BYTES = bytes(byte for byte in range(256) if chr(byte) not in MORSE_CODE_MAP)
+
 # --- Helper Functions ---
-def english_to_morse(text: str) -> str:
-    """Converts English text to Morse code."""
+def english_to_morse_reference(text: str) -> str:
+    """Converts English text to Morse code one character at a time (reference implementation)."""
     if not text:
         return ""
     morse_parts = []
@@ -38,6 +142,1017 @@ def english_to_morse(text: str) -> str:
             morse_parts.append(morse_signal)
     return " ".join(morse_parts).strip()
 
+def english_to_morse(text: str) -> str:
+    """Converts English text to Morse code using the precompiled symbol planes."""
+    if not text:
+        return ""
+    # Drop the separator that follows the last signal.
+    return _encode_ascii_bytes(_prepare_text(text))[:-1].decode('ascii')
+
+def english_to_morse_many(texts) -> list:
+    """Converts many English texts (books, paragraphs) to Morse code in a single bulk pass."""
+    texts = list(texts)
+    if not texts:
+        return []
+    delimiter = bytes([BATCH_DELIMITER_BYTE])
+    encoded = _encode_ascii_bytes(delimiter.join(_prepare_text(text) for text in texts))
+    # Each piece still ends with the separator of its last signal (or is empty).
+    return [piece[:-1].decode('ascii') for piece in encoded.split(BATCH_DELIMITER_OUTPUT)]
+
+def morse_signal_to_char(signal: str) -> str:
+    """Decodes one Morse signal by walking the dichotomic table. Returns '' for unknown signals."""
+    if signal == MORSE_CODE_MAP[' ']:
+        return ' '
+    if not signal:
+        return ''
+    index = 1
+    for symbol in signal:
+        if symbol not in '.-':
+            return ''
+        index = 2 * index + (symbol == '-')
+        if index >= len(MORSE_DICHOTOMIC_TABLE):
+            return ''
+    return MORSE_DICHOTOMIC_TABLE[index] or ''
+
+def _decode_morse_word(word: bytes) -> str:
+    """Decodes the letters of one Morse word (it may still contain '/' tokens)."""
+    return ''.join([MORSE_TOKEN_DECODE_MAP.get(token, MORSE_DECODE_UNKNOWN) for token in word.split(b' ')])
+
+def _decode_morse_bytes(data: bytes, word_cache: dict) -> str:
+    """Decodes ASCII Morse, memoising whole words since books repeat the same words constantly."""
+    words = data.split(MORSE_WORD_SEPARATOR)
+    missing = set(words).difference(word_cache)
+    if len(word_cache) + len(missing) > MORSE_WORD_CACHE_LIMIT:
+        word_cache.clear() # Keeps memory bounded on text with an unbounded vocabulary
+    for word in missing:
+        word_cache[word] = _decode_morse_word(word)
+    return ' '.join(map(word_cache.__getitem__, words))
+
+def iter_morse_to_english(morse_chunks):
+    """Streaming decoder: yields the text of ASCII Morse chunks cut at arbitrary positions."""
+    word_cache = {}
+    pending = b'' # Trailing token that may continue into the next chunk
+    for chunk in morse_chunks:
+        data = pending + chunk.translate(MORSE_WHITESPACE_TRANSLATION)
+        # Tokens are separated by single spaces, so the text decodes independently on both
+        # sides of any space.
+        cut = data.rfind(b' ')
+        if cut < 0:
+            pending = data
+            continue
+        pending = data[cut + 1:]
+        yield _decode_morse_bytes(data[:cut], word_cache)
+    if pending:
+        yield _decode_morse_bytes(pending, word_cache)
+
+def morse_to_english(morse: str) -> str:
+    """Converts Morse code (letters separated by spaces, words by ' / ') back to upper-case text."""
+    if not morse:
+        return ""
+    # Non-ASCII characters become '?' and, with it, an unknown token.
+    return ''.join(iter_morse_to_english([morse.encode('ascii', 'replace')]))
+
+def encodable_text(text: str) -> str:
+    """Returns what a round trip through english_to_morse and morse_to_english gives back."""
+    return _prepare_text(text).translate(None, MORSE_UNENCODABLE_BYTES).decode('ascii')
+
+# --- Streaming Pipeline ---
+# Books are read, normalised, encoded and written in bounded chunks so that peak memory does not
+# depend on the size of the book.
+CONTENT_MARKDOWN_KEY = "content_markdown"
+STREAM_CHUNK_CHARS = 1 << 18 # Characters read from a source file per refill
+STREAM_WRITE_BUFFER_BYTES = 1 << 20 # Buffer size of the Morse output writer
+DECODE_CHUNK_BYTES = 1 << 20 # Bytes of a Morse file decoded per step
+
+NEWLINE_WHITESPACE_PATTERN = re.compile(r'\s*[\r\n]+\s*')
+JSON_SCALAR_END_PATTERN = re.compile(r'[,}\]\s]')
+HIGH_SURROGATE_ESCAPE_PATTERN = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}$')
+
+def normalize_markdown_for_morse(content_markdown: str) -> str:
+    """Collapses every whitespace run containing a newline into one space and strips the ends."""
+    # This helps ensure paragraph breaks in markdown become word separations for Morse.
+    # Optional: remove other markdown syntax if necessary, though Morse converter ignores unknown chars
+    # text_for_morse_conversion = re.sub(r'[#*_`]', '', text_for_morse_conversion)
+    return NEWLINE_WHITESPACE_PATTERN.sub(' ', content_markdown).strip()
+
+def iter_normalized_chunks(chunks):
+    """Streaming equivalent of normalize_markdown_for_morse over an iterable of text chunks."""
+    pending_whitespace = '' # Trailing whitespace that may continue into the next chunk
+    at_start = True
+    for chunk in chunks:
+        text = pending_whitespace + chunk
+        body = text.rstrip()
+        pending_whitespace = text[len(body):]
+        if '\n' in pending_whitespace or '\r' in pending_whitespace:
+            pending_whitespace = '\n' # The whole run collapses to one space; keep it bounded
+        if not body:
+            continue
+        # body ends with a non-whitespace character, so no whitespace run inside it is cut short.
+        normalized = NEWLINE_WHITESPACE_PATTERN.sub(' ', body)
+        if at_start:
+            normalized = normalized.lstrip()
+            at_start = False
+        yield normalized
+    # Whatever whitespace is still pending trails the text and is stripped.
+
+class _JsonTextStream:
+    """Sliding window over a JSON document that is refilled from a text file on demand."""
+
+    def __init__(self, f, chunk_chars=STREAM_CHUNK_CHARS):
+        self.f = f
+        self.chunk_chars = chunk_chars
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Reads the next chunk, dropping consumed text. Returns False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_chars)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buf, self.pos)
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\n\r':
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def read_value(self):
+        """Decodes one complete JSON value, reading more text until it parses."""
+        if self.peek() not in '"{[':
+            # Numbers and literals have no closing delimiter of their own; buffer the whole token.
+            while not JSON_SCALAR_END_PATTERN.search(self.buf, self.pos) and self.fill():
+                pass
+        decoder = json.JSONDecoder()
+        while True:
+            try:
+                value, self.pos = decoder.raw_decode(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    def iter_string(self):
+        """Yields the decoded pieces of the JSON string value starting at the current position."""
+        self.expect('"')
+        while True:
+            end = self._find_closing_quote()
+            if end is not None:
+                raw, self.pos = self.buf[self.pos:end], end + 1
+                if raw:
+                    yield json.loads('"' + raw + '"')
+                return
+            raw = self.buf[self.pos:self._safe_cut()]
+            if raw:
+                self.pos += len(raw)
+                yield json.loads('"' + raw + '"')
+            if not self.fill():
+                raise self.error("Unterminated string")
+
+    def skip_string(self):
+        """Moves past the JSON string value starting at the current position without decoding it."""
+        self.expect('"')
+        while True:
+            end = self._find_closing_quote()
+            if end is not None:
+                self.pos = end + 1
+                return
+            self.pos = self._safe_cut()
+            if not self.fill():
+                raise self.error("Unterminated string")
+
+    def _find_closing_quote(self):
+        """Returns the index of the unescaped quote closing the current string, if buffered."""
+        search_from = self.pos
+        while True:
+            quote = self.buf.find('"', search_from)
+            if quote == -1:
+                return None
+            backslashes = 0
+            while quote - backslashes - 1 >= self.pos and self.buf[quote - backslashes - 1] == '\\':
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return quote
+            search_from = quote + 1
+
+    def _safe_cut(self) -> int:
+        """Returns a buffer index that does not split an escape sequence or a surrogate pair."""
+        cut = len(self.buf)
+        # The longest escape is \\uXXXX; hold back any backslash run that starts near the end.
+        backslash = self.buf.find('\\', max(self.pos, cut - 12))
+        if backslash != -1:
+            while backslash > self.pos and self.buf[backslash - 1] == '\\':
+                backslash -= 1
+            cut = backslash
+        # A high surrogate must be decoded together with the low surrogate that follows it.
+        tail = self.buf[max(self.pos, cut - 6):cut]
+        if HIGH_SURROGATE_ESCAPE_PATTERN.search(tail) and len(tail) == 6:
+            cut -= 6
+        return cut
+
+def _iter_object_members(stream):
+    """Yields (key, stream) for each top-level member; the caller must consume the value."""
+    stream.expect('{')
+    if stream.peek() == '}':
+        stream.pos += 1
+    else:
+        while True:
+            if stream.peek() != '"':
+                raise stream.error("Expecting property name enclosed in double quotes")
+            key = stream.read_value()
+            stream.expect(':')
+            stream.peek()
+            yield key
+            separator = stream.peek()
+            stream.pos += 1
+            if separator == '}':
+                break
+            if separator != ',':
+                raise stream.error("Expecting ',' delimiter")
+    if stream.peek() != '':
+        raise stream.error("Extra data")
+
+def read_book_metadata(json_path: str):
+    """Reads every top-level field of a book source except a string-valued content_markdown.
+
+    The content is skipped without being decoded. Returns the metadata together with the
+    ordinal of the member holding the content (None when there is no string content), so
+    iter_book_content can stream exactly that member; like json.load, the last duplicate wins.
+    """
+    metadata = {}
+    content_member_index = None
+    with open(json_path, 'r', encoding='utf-8') as f:
+        stream = _JsonTextStream(f)
+        for member_index, key in enumerate(_iter_object_members(stream)):
+            if key == CONTENT_MARKDOWN_KEY and stream.peek() == '"':
+                stream.skip_string()
+                metadata.pop(key, None)
+                content_member_index = member_index
+            else:
+                metadata[key] = stream.read_value()
+                if key == CONTENT_MARKDOWN_KEY:
+                    content_member_index = None
+    return metadata, content_member_index
+
+def iter_book_content(json_path: str, content_member_index: int, chunk_chars=STREAM_CHUNK_CHARS):
+    """Yields the decoded content_markdown of a book source in bounded pieces."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        stream = _JsonTextStream(f, chunk_chars)
+        for member_index, key in enumerate(_iter_object_members(stream)):
+            if member_index == content_member_index:
+                yield from stream.iter_string()
+            elif stream.peek() == '"':
+                stream.skip_string()
+            else:
+                stream.read_value()
+
+def iter_morse_chunks(text_chunks):
+    """Encodes text chunks to Morse, keeping letter separators correct across chunk boundaries."""
+    separator_pending = False
+    for chunk in text_chunks:
+        encoded = _encode_ascii_bytes(_prepare_text(chunk))
+        if not encoded:
+            continue
+        if separator_pending:
+            yield b' '
+        # Hold back the separator after the last signal; it is only needed if more Morse follows.
+        yield encoded[:-1]
+        separator_pending = True
+
+def write_morse_file(morse_chunks, output_path: str):
+    """Writes Morse chunks through a buffered writer, replacing output_path atomically."""
+    temp_path = output_path + ".tmp"
+    try:
+        with open(temp_path, 'wb', buffering=STREAM_WRITE_BUFFER_BYTES) as f_morse:
+            for chunk in morse_chunks:
+                f_morse.write(chunk)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def iter_file_chunks(path: str, chunk_bytes: int = DECODE_CHUNK_BYTES):
+    """Yields the bytes of a file in bounded pieces."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                return
+            yield chunk
+
+# --- Word/Letter Index ---
+# Next to every Morse file the generator writes a pre-tokenised index so the game never has to
+# split the Morse text. Each letter is one character of "letters" (its symbol id; "symbols" maps
+# ids to Morse signals), and word w is letters[wordStarts[w]:wordStarts[w + 1]], which gives O(1)
+# access to any word. Words hold at least one letter, exactly like the words bookCipher.js gets
+# from splitting the Morse text on '/' and ' '.
+MORSE_INDEX_SUFFIX = "_morse_index.json"
+MORSE_INDEX_VERSION = 1
+MORSE_INDEX_WRITE_BATCH = 1 << 16 # wordStarts entries formatted per write
+SYMBOL_ID_ALPHABET = string.ascii_uppercase + string.ascii_lowercase + string.digits
+# Ids follow MORSE_CODE_MAP order, so they are the same in every book.
+MORSE_SYMBOL_IDS = dict(zip((char for char in MORSE_CODE_MAP if char != ' '), SYMBOL_ID_ALPHABET))
+MORSE_SYMBOL_ID_TRANSLATION = str.maketrans(MORSE_SYMBOL_IDS)
+
+def _morse_index_symbols() -> dict:
+    """Maps every symbol id to its Morse signal."""
+    return {symbol_id: MORSE_CODE_MAP[char] for char, symbol_id in MORSE_SYMBOL_IDS.items()}
+
+def iter_morse_words(morse_path: str, chunk_bytes: int = DECODE_CHUNK_BYTES):
+    """Reads a Morse file back and yields lists of its words, each word a string of symbol ids."""
+    partial_word = '' # Word that continues into the next decoded chunk
+    for text in iter_morse_to_english(iter_file_chunks(morse_path, chunk_bytes)):
+        words = text.translate(MORSE_SYMBOL_ID_TRANSLATION).split(' ')
+        if len(words) == 1:
+            partial_word += words[0]
+            continue
+        words[0] = partial_word + words[0]
+        partial_word = words.pop()
+        # Runs of spaces leave empty words behind; they are not words of the book.
+        yield [word for word in words if word]
+    if partial_word:
+        yield [partial_word]
+
+def _write_word_starts(f, word_starts):
+    """Writes a JSON array of word offsets in bounded batches."""
+    f.write('[')
+    for batch_start in range(0, len(word_starts), MORSE_INDEX_WRITE_BATCH):
+        if batch_start:
+            f.write(',')
+        f.write(','.join(map(str, word_starts[batch_start:batch_start + MORSE_INDEX_WRITE_BATCH])))
+    f.write(']')
+
+def write_morse_index(morse_path: str, index_path: str, chunk_bytes: int = DECODE_CHUNK_BYTES):
+    """Writes the word/letter index of a Morse file, replacing index_path atomically.
+
+    Returns how often each character (see Predictive Display Index) and each distinct word, as a
+    string of symbol ids (see Koch Drill Banks), occurs in the book."""
+    word_starts = array.array('L', [0]) # 4+ bytes per word; the only part of the index kept in memory
+    symbol_id_counts = collections.Counter()
+    word_counts = collections.Counter() # One entry per distinct word, so bounded by the book's vocabulary
+    temp_path = index_path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', buffering=STREAM_WRITE_BUFFER_BYTES) as f_index:
+            f_index.write(f'{{"version": {MORSE_INDEX_VERSION}, "symbols": {json.dumps(_morse_index_symbols())}, "letters": "')
+            for words in iter_morse_words(morse_path, chunk_bytes):
+                letters = ''.join(words)
+                f_index.write(letters)
+                symbol_id_counts.update(letters)
+                word_counts.update(words)
+                word_starts.extend(itertools.islice(itertools.accumulate(map(len, words), initial=word_starts[-1]), 1, None))
+            f_index.write(f'", "wordCount": {len(word_starts) - 1}, "wordStarts": ')
+            _write_word_starts(f_index, word_starts)
+            f_index.write('}\n')
+        os.replace(temp_path, index_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    letter_counts = {char: symbol_id_counts[symbol_id] for char, symbol_id in MORSE_SYMBOL_IDS.items() if symbol_id_counts[symbol_id]}
+    return letter_counts, word_counts
+
+# --- Binary Morse Format ---
+# <book>_morse.bin stores the same words as the Morse text in about a quarter of the size:
+#   4 bytes  magic b"MRSB"
+#   1 byte   format version
+#   4 bytes  word count (unsigned little-endian)
+# and then one byte per letter, its 1-based code in MORSE_BINARY_SYMBOLS, with a 0 byte between
+# words. The code table is fixed by the format version (bookCipher.js holds the same table), so the
+# header stays smaller than most of the short passages.
+MORSE_BINARY_SUFFIX = "_morse.bin"
+MORSE_BINARY_MAGIC = b"MRSB"
+MORSE_BINARY_VERSION = 1
+MORSE_BINARY_WORD_SEPARATOR = 0
+MORSE_BINARY_HEADER = struct.Struct('<4sBI')
+# Letter codes follow the symbol ids, so code c is the signal of SYMBOL_ID_ALPHABET[c - 1].
+MORSE_BINARY_SYMBOLS = tuple(MORSE_CODE_MAP[char] for char in MORSE_SYMBOL_IDS)
+MORSE_BINARY_CODE_TRANSLATION = str.maketrans({symbol_id: chr(code) for code, symbol_id in enumerate(MORSE_SYMBOL_IDS.values(), 1)})
+
+def write_morse_binary(morse_path: str, binary_path: str, chunk_bytes: int = DECODE_CHUNK_BYTES):
+    """Writes the binary form of a Morse file, replacing binary_path atomically."""
+    temp_path = binary_path + ".tmp"
+    separator = chr(MORSE_BINARY_WORD_SEPARATOR)
+    word_count = 0
+    try:
+        with open(temp_path, 'wb', buffering=STREAM_WRITE_BUFFER_BYTES) as f_binary:
+            f_binary.write(MORSE_BINARY_HEADER.pack(MORSE_BINARY_MAGIC, MORSE_BINARY_VERSION, 0))
+            for words in iter_morse_words(morse_path, chunk_bytes):
+                if not words:
+                    continue
+                body = separator.join(words).translate(MORSE_BINARY_CODE_TRANSLATION)
+                f_binary.write((separator + body if word_count else body).encode('latin-1'))
+                word_count += len(words)
+            f_binary.seek(0) # The word count is only known at the end
+            f_binary.write(MORSE_BINARY_HEADER.pack(MORSE_BINARY_MAGIC, MORSE_BINARY_VERSION, word_count))
+        os.replace(temp_path, binary_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def read_morse_binary(data: bytes) -> list:
+    """Decodes a binary Morse asset into its words, each a list of Morse signals."""
+    magic, version, word_count = MORSE_BINARY_HEADER.unpack_from(data)
+    if magic != MORSE_BINARY_MAGIC or version != MORSE_BINARY_VERSION:
+        raise ValueError("Not a supported binary Morse asset")
+    if not word_count:
+        return []
+    symbols = (None,) + MORSE_BINARY_SYMBOLS # Code 0 separates words
+    body = data[MORSE_BINARY_HEADER.size:]
+    return [[symbols[code] for code in word] for word in body.split(bytes([MORSE_BINARY_WORD_SEPARATOR]))]
+
+# --- Dictionary-coded Morse Format ---
+# Optional (--dictionary) <book>_morse_dict.bin stores every distinct word once and the book as a
+# stream of word ids, since literary text repeats a small vocabulary over and over:
+#   4 bytes  magic b"MRSD"
+#   1 byte   format version
+#   4 bytes  word count, 4 bytes dictionary size (unsigned little-endian)
+#   dictionary entries, most frequent word first: varint letter count, then one letter code
+#     (as in the binary format) per letter
+#   one varint word id per word of the book
+# Varints are little-endian base 128 (7 bits per byte, high bit set on all but the last byte),
+# so the most frequent 128 words cost a single byte each.
+MORSE_DICTIONARY_SUFFIX = "_morse_dict.bin"
+MORSE_DICTIONARY_MAGIC = b"MRSD"
+MORSE_DICTIONARY_VERSION = 1
+MORSE_DICTIONARY_HEADER = struct.Struct('<4sBII')
+
+def encode_varint(value: int) -> bytes:
+    """Encodes a non-negative integer as a little-endian base-128 varint."""
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+def _read_varint(data: bytes, offset: int):
+    """Decodes the varint at offset. Returns (value, offset after it)."""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def write_morse_dictionary(morse_path: str, dictionary_path: str, chunk_bytes: int = DECODE_CHUNK_BYTES):
+    """Writes the dictionary-coded form of a Morse file, replacing dictionary_path atomically."""
+    # First pass: word frequencies, so the most frequent words get the shortest ids. Ties keep
+    # the order of first appearance, which keeps the output deterministic.
+    word_frequencies = collections.Counter()
+    for words in iter_morse_words(morse_path, chunk_bytes):
+        word_frequencies.update(words)
+    dictionary = [word for word, _ in word_frequencies.most_common()]
+    word_ids = {word: encode_varint(word_id) for word_id, word in enumerate(dictionary)}
+    word_count = sum(word_frequencies.values())
+    del word_frequencies
+
+    temp_path = dictionary_path + ".tmp"
+    try:
+        with open(temp_path, 'wb', buffering=STREAM_WRITE_BUFFER_BYTES) as f_dictionary:
+            f_dictionary.write(MORSE_DICTIONARY_HEADER.pack(MORSE_DICTIONARY_MAGIC, MORSE_DICTIONARY_VERSION,
+                                                            word_count, len(dictionary)))
+            for word in dictionary:
+                f_dictionary.write(encode_varint(len(word)) + word.translate(MORSE_BINARY_CODE_TRANSLATION).encode('latin-1'))
+            # Second pass: the word id stream.
+            for words in iter_morse_words(morse_path, chunk_bytes):
+                f_dictionary.write(b''.join(map(word_ids.__getitem__, words)))
+        os.replace(temp_path, dictionary_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def read_morse_dictionary(data: bytes) -> list:
+    """Decodes a dictionary-coded Morse asset; repeated words share one list of Morse signals."""
+    magic, version, word_count, dictionary_size = MORSE_DICTIONARY_HEADER.unpack_from(data)
+    if magic != MORSE_DICTIONARY_MAGIC or version != MORSE_DICTIONARY_VERSION:
+        raise ValueError("Not a supported dictionary-coded Morse asset")
+    symbols = (None,) + MORSE_BINARY_SYMBOLS
+    offset = MORSE_DICTIONARY_HEADER.size
+    dictionary = []
+    for _ in range(dictionary_size):
+        length, offset = _read_varint(data, offset)
+        dictionary.append([symbols[code] for code in data[offset:offset + length]])
+        offset += length
+    sequence = []
+    for _ in range(word_count):
+        word_id, offset = _read_varint(data, offset)
+        sequence.append(dictionary[word_id])
+    return sequence
+
+# --- Paged Book Assets ---
+# Books are also split into pages of MORSE_PAGE_WORDS words so the game only fetches the page
+# holding the current word (and prefetches the next one). A page uses the index layout above for
+# its own words; the small page manifest gives the word count, the page size, the symbols and the
+# path pattern of the pages, so its size does not depend on the length of the book.
+MORSE_PAGES_SUFFIX = "_pages"
+MORSE_PAGE_MANIFEST_NAME = "manifest.json"
+MORSE_PAGE_WORDS = 512
+MORSE_PAGE_PATH_PLACEHOLDER = "{page}"
+
+def _page_filename(page_number: int) -> str:
+    return f"{page_number}.json"
+
+# --- Playback Schedules ---
+# Next to each page, <page>.schedule.json holds the playback schedule of its words, so playback can
+# schedule a whole page against the audio clock instead of timing each element as it goes. Onsets
+# are counted in two kinds of unit, as Farnsworth timing stretches the gaps only:
+#   onset seconds = onsetUnits * unit + onsetSpacing * spacing unit
+# where unit is the dot length and the spacing unit (3 per letter gap, 7 per word gap) is the dot
+# length at the Farnsworth speed. An element ends 1 (dot) or 3 (dash) units after its onset.
+# totalUnits/totalSpacing give the length of the page; every page but the last ends with a word
+# gap, so the next page starts exactly where this one ends. Files store the schedule packed, as
+# the tones and the gap after each of them ('1' unit, '3'/'7' spacing units, '0' at the end):
+# about two bytes per element instead of the twenty of the expanded arrays, which the game
+# rebuilds in one pass (unpackMorseSchedule in bookCipher.js).
+MORSE_SCHEDULE_SUFFIX = ".schedule.json"
+
+def _schedule_filename(page_number: int) -> str:
+    return f"{page_number}{MORSE_SCHEDULE_SUFFIX}"
+
+def morse_schedule(words, trailing_word_gap: bool = False) -> dict:
+    """Reference playback timing of words (lists of Morse signals), as the game plays them.
+
+    Returns the tones ('.'/'-' per element), their onsets and the word and letter index each
+    element belongs to (wordIds relative to the first word, letterIds within their word).
+    """
+    tones, onset_units, onset_spacing, word_ids, letter_ids = [], [], [], [], []
+    units = spacing = 0 # Time elapsed so far, in units and spacing units
+    for word_index, word in enumerate(words):
+        if word_index:
+            spacing += 7
+        for letter_index, signal in enumerate(word):
+            if letter_index:
+                spacing += 3
+            for element_index, tone in enumerate(signal):
+                if element_index:
+                    units += 1
+                tones.append(tone)
+                onset_units.append(units)
+                onset_spacing.append(spacing)
+                word_ids.append(word_index)
+                letter_ids.append(letter_index)
+                units += 1 if tone == '.' else 3
+    if trailing_word_gap and tones:
+        spacing += 7
+    return {"tones": ''.join(tones), "onsetUnits": onset_units, "onsetSpacing": onset_spacing,
+            "wordIds": word_ids, "letterIds": letter_ids, "totalUnits": units, "totalSpacing": spacing}
+
+def pack_morse_schedule(schedule: dict) -> dict:
+    """Packs a schedule from morse_schedule() into its tones and the gap after each element."""
+    tones, word_ids, letter_ids = schedule["tones"], schedule["wordIds"], schedule["letterIds"]
+    gaps = []
+    for i in range(len(tones) - 1):
+        if word_ids[i + 1] != word_ids[i]:
+            gaps.append('7')
+        else:
+            gaps.append('3' if letter_ids[i + 1] != letter_ids[i] else '1')
+    if tones: # Only a trailing word gap adds spacing after the last onset
+        gaps.append('7' if schedule["totalSpacing"] > schedule["onsetSpacing"][-1] else '0')
+    return {"tones": tones, "gaps": ''.join(gaps), "totalUnits": schedule["totalUnits"], "totalSpacing": schedule["totalSpacing"]}
+
+_SCHEDULE_TONE_TRANSLATION = str.maketrans(_morse_index_symbols())
+# Each letter's gaps: one unit between its elements, then a letter gap (replaced by the word gap after a word's last letter).
+_SCHEDULE_GAP_TRANSLATION = str.maketrans({symbol_id: '1' * (len(signal) - 1) + '3' for symbol_id, signal in _morse_index_symbols().items()})
+
+def pack_page_schedule(words, trailing_word_gap: bool = False) -> dict:
+    """Packed schedule of words given as strings of symbol ids, built with translate instead of per element."""
+    tones = ''.join(words).translate(_SCHEDULE_TONE_TRANSLATION)
+    gaps = '7'.join(word.translate(_SCHEDULE_GAP_TRANSLATION)[:-1] for word in words)
+    if tones:
+        gaps += '7' if trailing_word_gap else '0'
+    total_units = tones.count('.') + 3 * tones.count('-') + gaps.count('1')
+    total_spacing = 3 * gaps.count('3') + 7 * gaps.count('7')
+    return {"tones": tones, "gaps": gaps, "totalUnits": total_units, "totalSpacing": total_spacing}
+
+def unpack_morse_schedule(packed: dict) -> dict:
+    """Expands a packed schedule back into the arrays of morse_schedule()."""
+    onset_units, onset_spacing, word_ids, letter_ids = [], [], [], []
+    units = spacing = word_id = letter_id = 0
+    for tone, gap in zip(packed["tones"], packed["gaps"]):
+        onset_units.append(units)
+        onset_spacing.append(spacing)
+        word_ids.append(word_id)
+        letter_ids.append(letter_id)
+        units += 1 if tone == '.' else 3
+        if gap == '1':
+            units += 1
+        elif gap == '3':
+            spacing += 3
+            letter_id += 1
+        elif gap == '7':
+            spacing += 7
+            word_id += 1
+            letter_id = 0
+    return {"tones": packed["tones"], "onsetUnits": onset_units, "onsetSpacing": onset_spacing,
+            "wordIds": word_ids, "letterIds": letter_ids, "totalUnits": packed["totalUnits"], "totalSpacing": packed["totalSpacing"]}
+
+def schedule_seconds(schedule: dict, unit: float, spacing_unit: float):
+    """Returns ([(onset, offset)] in seconds, total seconds) of a schedule at the given unit lengths."""
+    times = [(units * unit + spacing * spacing_unit, (units + (1 if tone == '.' else 3)) * unit + spacing * spacing_unit)
+             for tone, units, spacing in zip(schedule["tones"], schedule["onsetUnits"], schedule["onsetSpacing"])]
+    return times, schedule["totalUnits"] * unit + schedule["totalSpacing"] * spacing_unit
+
+# --- Source Alignment ---
+# Next to each page, <page>.align.json maps the page's letters back to the English source, so the
+# game can show exactly the revealed text (or any window of it) by slicing the source instead of
+# decoding Morse. Offsets count UTF-16 code units, as JavaScript strings index them, into the
+# original content_markdown ("markdown") and into the normalised text the encoder reads ("source",
+# with newline runs collapsed and the ends stripped). Each letter points at the character it was
+# encoded from; characters the encoder dropped (markdown markers, glyphs without a Morse signal,
+# extra whitespace) belong to no letter and lie between the letters around them. Letters come
+# from one character each, but one character can give several letters ('ß' -> 'SS', 'ﬁ' -> 'FI'),
+# which then share its offset.
+# The page lists "wordStarts" (as the Morse page) and "runs": letters whose offsets both advance by
+# one form a run, stored as a flat list of [letters, markdown, source] steps from the previous run
+# start, the first from [0, markdownBefore, sourceBefore]. markdownBefore/sourceBefore is where the
+# last letter before the page ends, so the revealed prefix up to any letter needs only its page.
+MORSE_ALIGNMENT_SUFFIX = ".align.json"
+_ENCODABLE_CHARS = {char for char in MORSE_CODE_MAP if char != ' '}
+_ASCII_LETTER_CHARS = ''.join(char for char in map(chr, range(128)) if char.upper() in _ENCODABLE_CHARS)
+# Other characters that upper-case to encodable letters (no astral character does, so every letter's
+# character is one UTF-16 code unit wide).
+_EXPANDING_LETTER_CHARS = {char: ''.join(upper for upper in char.upper() if upper in _ENCODABLE_CHARS)
+                           for char in map(chr, range(128, 0x10000)) if any(upper in _ENCODABLE_CHARS for upper in char.upper())}
+ALIGNMENT_TOKEN_PATTERN = re.compile(r'(\s+)|([' + re.escape(_ASCII_LETTER_CHARS) + r']+)|(['
+                                     + re.escape(''.join(_EXPANDING_LETTER_CHARS)) + r'])|([\U00010000-\U0010FFFF])')
+
+def _alignment_filename(page_number: int) -> str:
+    return f"{page_number}{MORSE_ALIGNMENT_SUFFIX}"
+
+# Next to the alignment, <page>.md holds the content_markdown the page covers: from its markdownBefore
+# (0 for the first page) to the next page's (the end of the text for the last page). The pages in
+# order give content_markdown back, so the revealed text is read from the pages it spans instead of
+# fetching and parsing the whole source.
+MORSE_MARKDOWN_SUFFIX = ".md"
+
+def _markdown_filename(page_number: int) -> str:
+    return f"{page_number}{MORSE_MARKDOWN_SUFFIX}"
+
+class _Utf16TextCutter:
+    """Keeps text chunks as they are read and cuts them at UTF-16 offsets, as the alignment counts them."""
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0 # UTF-16 offset of the kept text
+
+    def tee(self, chunks):
+        for chunk in chunks:
+            self.chunks.append(chunk)
+            yield chunk
+
+    def cut(self, end: int = None) -> str:
+        """Removes and returns the kept text up to UTF-16 offset end (all of it for None)."""
+        text = ''.join(self.chunks)
+        rest = ''
+        if end is not None:
+            length = end - self.offset
+            if text.isascii():
+                text, rest = text[:length], text[length:]
+            else:
+                units = text.encode('utf-16-le', 'surrogatepass')
+                text, rest = (units[:2 * length].decode('utf-16-le', 'surrogatepass'),
+                              units[2 * length:].decode('utf-16-le', 'surrogatepass'))
+        self.chunks = [rest] if rest else []
+        self.offset += len(text) if text.isascii() else len(text.encode('utf-16-le', 'surrogatepass')) // 2
+        return text
+
+def iter_aligned_letter_runs(content_chunks):
+    """Yields (markdown offset, source offset, letters, starts_word) for the letters of a book source.
+
+    Mirrors normalize_markdown_for_morse and the encoder over raw content_markdown chunks, so the
+    letters come out exactly as in the Morse file, in runs of consecutive characters.
+    """
+    markdown_offset = 0 # UTF-16 offset of the current chunk
+    removed = 0 # Code units normalisation removed before the current position
+    at_start = True # Only whitespace seen so far (stripped)
+    whitespace = None # Open whitespace run: [length, has newline, has space]
+    word_break = False
+    for chunk in content_chunks:
+        astral = 0 # Astral characters so far in this chunk (two code units each)
+        previous_end = 0
+        for match in ALIGNMENT_TOKEN_PATTERN.finditer(chunk):
+            start = match.start()
+            kind = match.lastindex
+            if start > previous_end or kind != 1: # Non-whitespace ends an open whitespace run
+                if whitespace:
+                    length, has_newline, has_space = whitespace
+                    if at_start:
+                        removed += length
+                    else:
+                        removed += length - 1 if has_newline else 0
+                        word_break = word_break or has_newline or has_space
+                    whitespace = None
+                at_start = False
+            previous_end = match.end()
+            text = match.group()
+            if kind == 1:
+                has_newline = '\n' in text or '\r' in text
+                if whitespace:
+                    whitespace = [whitespace[0] + len(text), whitespace[1] or has_newline, whitespace[2] or ' ' in text]
+                else:
+                    whitespace = [len(text), has_newline, ' ' in text]
+            elif kind == 4:
+                astral += 1
+            else:
+                offset = markdown_offset + start + astral
+                if kind == 2:
+                    yield offset, offset - removed, text.upper(), word_break
+                else:
+                    for letter in _EXPANDING_LETTER_CHARS[text]:
+                        yield offset, offset - removed, letter, word_break
+                        word_break = False
+                word_break = False
+        if len(chunk) > previous_end: # Trailing non-whitespace
+            if whitespace:
+                length, has_newline, has_space = whitespace
+                removed += length if at_start else (length - 1 if has_newline else 0)
+                word_break = word_break or (not at_start and (has_newline or has_space))
+                whitespace = None
+            at_start = False
+        markdown_offset += len(chunk) + astral
+
+def iter_alignment_pages(content_chunks, page_words: int = MORSE_PAGE_WORDS):
+    """Groups the aligned letters of a book source into pages of page_words words (see above)."""
+    page = None
+    word_count = 0
+    letter_count = 0 # Letters in the current page
+    markdown_end = source_end = 0 # Where the last letter so far ends
+    run = None # [first letter, markdown, source, letters] of the open run
+
+    def close_run():
+        page["runs"].extend((run[0] - page["_run"][0], run[1] - page["_run"][1], run[2] - page["_run"][2]))
+        page["_run"] = run[:3]
+
+    def finish_page():
+        close_run()
+        del page["_run"]
+        return page
+
+    for markdown, source, letters, starts_word in iter_aligned_letter_runs(content_chunks):
+        if starts_word or page is None:
+            if page is not None and len(page["wordStarts"]) == page_words:
+                yield finish_page()
+                page = None
+            if page is None:
+                page = {"firstWord": word_count, "markdownBefore": markdown_end, "sourceBefore": source_end,
+                        "wordStarts": [], "runs": [], "_run": [0, markdown_end, source_end]}
+                letter_count = 0
+                run = None
+            page["wordStarts"].append(letter_count)
+            word_count += 1
+        # Letters continue the open run when both offsets advance by exactly one per letter.
+        if run and markdown == run[1] + run[3] and source == run[2] + run[3]:
+            run[3] += len(letters)
+        else:
+            if run:
+                close_run()
+            run = [letter_count, markdown, source, len(letters)]
+        letter_count += len(letters)
+        # ASCII runs give one letter per character; expanded characters are yielded one letter at a time.
+        markdown_end = markdown + len(letters)
+        source_end = source + len(letters)
+    if page is not None:
+        yield finish_page()
+
+def write_morse_pages(morse_path: str, pages_dir: str, pages_dir_for_js: str,
+                      page_words: int = MORSE_PAGE_WORDS, chunk_bytes: int = DECODE_CHUNK_BYTES,
+                      content_chunks=None) -> list:
+    """Writes the pages, page schedules and page manifest of a Morse file into pages_dir. Returns the files written.
+
+    Given the content_markdown chunks of its source, the pages also get their source alignment and markdown.
+    """
+    os.makedirs(pages_dir, exist_ok=True)
+    written_paths = []
+    book_units = book_spacing = 0
+    # Hash of the word stream alone (independent of the page size), so saved progress can tell whether its
+    # word and letter indices still point into the same text.
+    content_digest = hashlib.sha256()
+    markdown_cutter = _Utf16TextCutter()
+    alignment_pages = iter_alignment_pages(markdown_cutter.tee(content_chunks), page_words) if content_chunks is not None else None
+
+    def write_markdown(page_number: int, markdown: str):
+        # Written one page late: the page's markdown ends where the next page's alignment starts.
+        markdown_path = os.path.join(pages_dir, _markdown_filename(page_number))
+        write_if_changed(markdown_path, markdown)
+        written_paths.append(markdown_path)
+
+    def write_page(page_number: int, words: list):
+        word_starts = list(itertools.accumulate(map(len, words), initial=0))
+        page_path = os.path.join(pages_dir, _page_filename(page_number))
+        page = {"firstWord": page_number * page_words, "wordCount": len(words),
+                "letters": ''.join(words), "wordStarts": word_starts}
+        content_digest.update((' '.join(words) + ' ').encode('ascii'))
+        write_if_changed(page_path, json.dumps(page, separators=(',', ':')) + "\n")
+        written_paths.append(page_path)
+        if alignment_pages is not None:
+            alignment = next(alignment_pages, None)
+            if alignment is None or alignment["firstWord"] != page["firstWord"] or alignment["wordStarts"] != word_starts[:-1]:
+                raise ValueError(f"source alignment of page {page_number} does not match {morse_path}")
+            alignment_path = os.path.join(pages_dir, _alignment_filename(page_number))
+            write_if_changed(alignment_path, json.dumps(alignment, separators=(',', ':')) + "\n")
+            written_paths.append(alignment_path)
+            if page_number:
+                write_markdown(page_number - 1, markdown_cutter.cut(alignment["markdownBefore"]))
+
+    def write_schedule(page_number: int, words: list, is_last_page: bool):
+        # Written one page late: only the next page tells whether this one ends the book.
+        nonlocal book_units, book_spacing
+        schedule = pack_page_schedule(words, trailing_word_gap=not is_last_page)
+        book_units += schedule["totalUnits"]
+        book_spacing += schedule["totalSpacing"]
+        schedule_path = os.path.join(pages_dir, _schedule_filename(page_number))
+        write_if_changed(schedule_path, json.dumps({"firstWord": page_number * page_words, **schedule}, separators=(',', ':')) + "\n")
+        written_paths.append(schedule_path)
+
+    page_number = 0
+    word_count = 0
+    pending_words = []
+    previous_page = None # (page number, words) whose schedule is not written yet
+    for words in iter_morse_words(morse_path, chunk_bytes):
+        word_count += len(words)
+        pending_words.extend(words)
+        full_pages = len(pending_words) // page_words
+        for page_offset in range(0, full_pages * page_words, page_words):
+            page = pending_words[page_offset:page_offset + page_words]
+            write_page(page_number, page)
+            if previous_page:
+                write_schedule(*previous_page, is_last_page=False)
+            previous_page = (page_number, page)
+            page_number += 1
+        del pending_words[:full_pages * page_words]
+    if pending_words:
+        write_page(page_number, pending_words)
+        if previous_page:
+            write_schedule(*previous_page, is_last_page=False)
+        previous_page = (page_number, pending_words)
+        page_number += 1
+    if previous_page:
+        write_schedule(*previous_page, is_last_page=True)
+    if alignment_pages is not None:
+        if next(alignment_pages, None) is not None:
+            raise ValueError(f"source alignment has more pages than {morse_path}")
+        if page_number:
+            write_markdown(page_number - 1, markdown_cutter.cut()) # The source is read to its end by now
+
+    manifest_path = os.path.join(pages_dir, MORSE_PAGE_MANIFEST_NAME)
+    manifest = {"version": MORSE_INDEX_VERSION, "wordCount": word_count, "pageWords": page_words,
+                "pageCount": page_number, "pagePath": f"{pages_dir_for_js}/{MORSE_PAGE_PATH_PLACEHOLDER}.json",
+                "schedulePath": f"{pages_dir_for_js}/{MORSE_PAGE_PATH_PLACEHOLDER}{MORSE_SCHEDULE_SUFFIX}",
+                "totalUnits": book_units, "totalSpacing": book_spacing,
+                "contentHash": content_digest.hexdigest(), "symbols": _morse_index_symbols()}
+    if alignment_pages is not None:
+        manifest["alignmentPath"] = f"{pages_dir_for_js}/{MORSE_PAGE_PATH_PLACEHOLDER}{MORSE_ALIGNMENT_SUFFIX}"
+        manifest["markdownPath"] = f"{pages_dir_for_js}/{MORSE_PAGE_PATH_PLACEHOLDER}{MORSE_MARKDOWN_SUFFIX}"
+    write_if_changed(manifest_path, json.dumps(manifest, indent=2) + "\n")
+    written_paths.append(manifest_path)
+
+    # Drop pages left over from a longer earlier version of the book.
+    written = set(written_paths)
+    for stale_path in glob.glob(os.path.join(pages_dir, "*.json")) + glob.glob(os.path.join(pages_dir, f"*{MORSE_MARKDOWN_SUFFIX}")):
+        if stale_path not in written:
+            os.remove(stale_path)
+    return written_paths
+
+# --- Precompressed Assets ---
+# Every generated asset (and each English source, which the game fetches as well) gets .gz and .br
+# siblings at maximum compression, so static hosts can serve them without compressing per request.
+# A sibling is only kept when it is smaller than the asset itself.
+GZIP_SUFFIX = ".gz"
+BROTLI_SUFFIX = ".br"
+PRECOMPRESSED_SUFFIXES = (GZIP_SUFFIX, BROTLI_SUFFIX)
+COMPRESS_CHUNK_BYTES = 1 << 20
+
+class _BrotliWriter:
+    """Minimal file-like wrapper so brotli streams like gzip.GzipFile."""
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.compressor = brotli.Compressor(quality=11)
+
+    def write(self, data: bytes):
+        self.fileobj.write(self.compressor.process(data))
+
+    def close(self):
+        self.fileobj.write(self.compressor.finish())
+
+def _open_compressor(suffix: str, fileobj):
+    if suffix == GZIP_SUFFIX:
+        return gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=fileobj, mtime=0) # mtime=0 keeps builds reproducible
+    return _BrotliWriter(fileobj)
+
+def available_precompressed_suffixes() -> tuple:
+    return PRECOMPRESSED_SUFFIXES if brotli is not None else (GZIP_SUFFIX,)
+
+def write_precompressed(path: str, suffixes: tuple = None) -> list:
+    """Writes the .gz/.br siblings of path that are smaller than it. Returns the sibling paths kept."""
+    asset_size = os.path.getsize(path)
+    kept_paths = []
+    for suffix in suffixes or available_precompressed_suffixes():
+        sibling_path = path + suffix
+        temp_path = sibling_path + ".tmp"
+        try:
+            with open(path, 'rb') as f_asset, open(temp_path, 'wb') as f_sibling:
+                compressor = _open_compressor(suffix, f_sibling)
+                for chunk in iter(lambda: f_asset.read(COMPRESS_CHUNK_BYTES), b''):
+                    compressor.write(chunk)
+                compressor.close()
+            if os.path.getsize(temp_path) < asset_size:
+                os.replace(temp_path, sibling_path)
+                kept_paths.append(sibling_path)
+            elif os.path.exists(sibling_path):
+                os.remove(sibling_path) # Left over from an earlier, more compressible version
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return kept_paths
+
+def remove_precompressed(path: str):
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+# --- Parallel Build ---
+# Books are encoded concurrently in a process pool. Sources larger than SHARD_SOURCE_BYTES are
+# additionally split at paragraph boundaries so a single giant book is spread across workers.
+SHARD_SOURCE_BYTES = 8 << 20 # Source files at least this large are sharded
+SHARD_TARGET_CHARS = 4 << 20 # Approximate size of one shard of content_markdown
+SHARD_PENDING_PER_JOB = 2 # Shards in flight per worker; bounds the parent's memory
+
+def iter_paragraph_shards(content_chunks, shard_chars=SHARD_TARGET_CHARS):
+    """Regroups content pieces into shards that end at a line break.
+
+    Every cut falls inside a whitespace run containing a newline, which the normaliser turns
+    into a word separator anyway, so shards can be normalised and encoded independently.
+    """
+    pending = []
+    pending_chars = 0
+    for chunk in content_chunks:
+        pending.append(chunk)
+        pending_chars += len(chunk)
+        if pending_chars < shard_chars:
+            continue
+        text = ''.join(pending)
+        cut = max(text.rfind('\n\n'), text.rfind('\n'), text.rfind('\r'))
+        if cut <= 0:
+            pending = [text] # No line break yet; keep growing this shard
+            continue
+        yield text[:cut]
+        pending = [text[cut:]]
+        pending_chars = len(pending[0])
+    if pending:
+        yield ''.join(pending)
+
+def encode_shard(text: str):
+    """Normalises and encodes one shard. Returns (has_text, morse)."""
+    normalized = normalize_markdown_for_morse(text)
+    if not normalized:
+        return False, ''
+    return True, english_to_morse(normalized)
+
+def iter_sharded_morse_chunks(content_chunks, executor, max_pending: int, shard_chars=SHARD_TARGET_CHARS):
+    """Encodes paragraph shards on executor and yields their Morse in source order."""
+    pending = collections.deque()
+    first_shard_with_text = True
+    wrote_morse = False
+
+    def merge(result):
+        # Shards are joined by the word separator ('/') their cut replaced. Whitespace-only
+        # shards vanish, exactly as they would in the unsharded text.
+        nonlocal first_shard_with_text, wrote_morse
+        has_text, morse = result
+        if not has_text:
+            return b''
+        tokens = [morse] if first_shard_with_text else ['/', morse]
+        first_shard_with_text = False
+        merged = []
+        for token in tokens:
+            if token:
+                merged.append(' ' + token if wrote_morse else token)
+                wrote_morse = True
+        return ''.join(merged).encode('ascii')
+
+    for shard in iter_paragraph_shards(content_chunks, shard_chars):
+        pending.append(executor.submit(encode_shard, shard))
+        if len(pending) >= max_pending:
+            yield merge(pending.popleft().result())
+    while pending:
+        yield merge(pending.popleft().result())
+
 def format_js_string(value):
     """Formats a Python string for a JavaScript string literal, escaping necessary characters."""
     if value is None:
@@ -58,7 +1173,667 @@ def format_js_value(value):
 
 
 # --- Main Script Logic ---
-def main():
+# Result of building one book: its bookData.js key and entry, every file written for it, how often each
+# character occurs in it and its most frequent words per Koch level.
+BuiltBook = collections.namedtuple("BuiltBook", ["book_key", "entry", "outputs", "letter_counts", "koch_words"])
+
+def build_book(json_path: str, shard_executor=None, max_pending_shards: int = 1, build_options: dict = None):
+    """Streams one English source into its Morse file. Returns a BuiltBook, or None on failure.
+
+    With a shard_executor the content is split at paragraph boundaries and the shards (and the
+    precompressed siblings) are produced on that executor instead of in this process.
+    build_options selects the optional outputs ("dictionary", "compress"), as stored in the manifest.
+    """
+    build_options = build_options or {}
+    book_key = os.path.splitext(os.path.basename(json_path))[0]
+    print(f"\nProcessing book: {book_key} (from {json_path})")
+
+    try:
+        data, content_member_index = read_book_metadata(json_path)
+    except FileNotFoundError:
+        print(f"  Error: JSON file disappeared or is not accessible: {json_path}")
+        return None
+    except json.JSONDecodeError:
+        print(f"  Error: Could not decode JSON from {json_path}")
+        return None
+    except Exception as e:
+        print(f"  Error reading JSON file {json_path}: {e}")
+        return None
+
+    # Validate required fields from JSON
+    title = data.get("title")
+
+    if title is None:
+        print(f"  Warning: 'title' is missing in {json_path}. Skipping this book.")
+        return None
+    if content_member_index is None: # Allow empty string for content_markdown, but not missing key
+        if data.get(CONTENT_MARKDOWN_KEY) is not None:
+            print(f"  Error: 'content_markdown' in {json_path} is not a string. Skipping this book.")
+            return None
+        print(f"  Warning: 'content_markdown' key is missing in {json_path}. Using empty content for Morse generation.")
+
+    morse_filename = f"{book_key}_morse.txt"
+    # Ensure MORSE_CODE_BASE_DIR exists
+    if not os.path.exists(MORSE_CODE_BASE_DIR):
+        os.makedirs(MORSE_CODE_BASE_DIR, exist_ok=True)
+        print(f"  Created directory: {MORSE_CODE_BASE_DIR}")
+
+    morse_file_path_abs = os.path.join(MORSE_CODE_BASE_DIR, morse_filename)
+    morse_index_path_abs = os.path.join(MORSE_CODE_BASE_DIR, f"{book_key}{MORSE_INDEX_SUFFIX}")
+    morse_binary_path_abs = os.path.join(MORSE_CODE_BASE_DIR, f"{book_key}{MORSE_BINARY_SUFFIX}")
+    morse_dictionary_path_abs = os.path.join(MORSE_CODE_BASE_DIR, f"{book_key}{MORSE_DICTIONARY_SUFFIX}")
+    morse_pages_dir_abs = os.path.join(MORSE_CODE_BASE_DIR, f"{book_key}{MORSE_PAGES_SUFFIX}")
+    morse_pages_dir_for_js = os.path.relpath(morse_pages_dir_abs, SRC_DIR).replace(os.sep, '/')
+
+    # Pre-process markdown for Morse generation (newline runs become spaces), encode and write,
+    # one bounded chunk at a time.
+    content_chunks = iter_book_content(json_path, content_member_index) if content_member_index is not None else ()
+    if shard_executor is not None:
+        morse_chunks = iter_sharded_morse_chunks(content_chunks, shard_executor, max_pending_shards)
+    else:
+        morse_chunks = iter_morse_chunks(iter_normalized_chunks(content_chunks))
+    try:
+        write_morse_file(morse_chunks, morse_file_path_abs)
+        print(f"  Successfully wrote Morse code to: {morse_file_path_abs}")
+        letter_counts, word_counts = write_morse_index(morse_file_path_abs, morse_index_path_abs)
+        koch_words = koch_drill_words(word_counts, from_symbol_ids=True)
+        print(f"  Successfully wrote word/letter index to: {morse_index_path_abs}")
+        write_morse_binary(morse_file_path_abs, morse_binary_path_abs)
+        print(f"  Successfully wrote binary Morse to: {morse_binary_path_abs}")
+        if build_options.get("dictionary"):
+            write_morse_dictionary(morse_file_path_abs, morse_dictionary_path_abs)
+            print(f"  Successfully wrote dictionary-coded Morse to: {morse_dictionary_path_abs}")
+        # The source is read once more, to align the letters of each page with it.
+        page_paths = write_morse_pages(morse_file_path_abs, morse_pages_dir_abs, morse_pages_dir_for_js, content_chunks=(
+            iter_book_content(json_path, content_member_index) if content_member_index is not None else ()))
+        print(f"  Successfully wrote {(len(page_paths) - 1) // 4} page(s) with schedules, source alignment and markdown and the page manifest to: {morse_pages_dir_abs}")
+    except json.JSONDecodeError:
+        print(f"  Error: Could not decode JSON from {json_path}")
+        return None
+    except ValueError as e:
+        print(f"  Error: {e}")
+        return None
+    except IOError as e:
+        print(f"  Error writing Morse files for {book_key}: {e}")
+        return None # Skip adding this book to bookData.js if Morse file fails
+
+    # Prepare data for bookData.js
+    # Derive paths relative to where bookData.js expects them (relative to `src/`), e.g.
+    # 'assets/book_cipher_texts/key_morse.txt' and 'assets/book_cipher_texts/english_sources/key.json'.
+    relative_english_source_path = os.path.relpath(json_path, SRC_DIR).replace(os.sep, '/')
+    derived_morse_filePath_for_js = os.path.relpath(morse_file_path_abs, SRC_DIR).replace(os.sep, '/')
+    derived_morse_indexPath_for_js = os.path.relpath(morse_index_path_abs, SRC_DIR).replace(os.sep, '/')
+    derived_morse_binaryPath_for_js = os.path.relpath(morse_binary_path_abs, SRC_DIR).replace(os.sep, '/')
+
+    book_entry_for_js = {
+        "title": title,
+        "author": data.get("author", "Unknown Author"),
+        "description": data.get("description", "No description available."),
+        "isPro": data.get("isPro", False), # Default to False if not specified
+        "genre": data.get("genre", "General"),
+        "lengthCategory": data.get("lengthCategory", "Medium"),
+        "imagePath": data.get("imagePath", f"assets/images/covers/{book_key}_placeholder.png"), # Default placeholder
+        "filePath": derived_morse_filePath_for_js, # Path to the generated Morse .txt file
+        "morseIndexPath": derived_morse_indexPath_for_js, # Pre-tokenised word/letter index of the Morse file
+        "morseBinaryPath": derived_morse_binaryPath_for_js, # Compact binary copy of the Morse file
+        "pageManifestPath": f"{morse_pages_dir_for_js}/{MORSE_PAGE_MANIFEST_NAME}", # Paged copy of the index
+        "englishSourcePath": relative_english_source_path # Path to its own JSON source
+    }
+    outputs = [morse_file_path_abs, morse_index_path_abs, morse_binary_path_abs] + page_paths
+    if build_options.get("dictionary"):
+        book_entry_for_js["morseDictionaryPath"] = os.path.relpath(morse_dictionary_path_abs, SRC_DIR).replace(os.sep, '/')
+        outputs.append(morse_dictionary_path_abs)
+    book_details_path_abs = os.path.join(MORSE_CODE_BASE_DIR, f"{book_key}{BOOK_DETAILS_SUFFIX}")
+    try:
+        write_if_changed(book_details_path_abs, json.dumps(book_entry_for_js, indent=2, ensure_ascii=False) + "\n")
+    except IOError as e:
+        print(f"  Error writing book details for {book_key}: {e}")
+        return None
+    outputs.append(book_details_path_abs)
+    if build_options.get("compress"):
+        try:
+            paths_to_compress = outputs + [json_path]
+            if shard_executor is not None:
+                # One task per asset and format, so the slow brotli pass over the largest asset
+                # overlaps with everything else.
+                compressed_paths = list(shard_executor.map(write_precompressed, *zip(*(
+                    (path, (suffix,)) for path in paths_to_compress for suffix in available_precompressed_suffixes()))))
+            else:
+                compressed_paths = list(map(write_precompressed, paths_to_compress))
+        except IOError as e:
+            print(f"  Error writing precompressed files for {book_key}: {e}")
+            return None
+        outputs.extend(itertools.chain.from_iterable(compressed_paths))
+        print(f"  Successfully wrote {sum(map(len, compressed_paths))} precompressed sibling(s) for {book_key}")
+    return BuiltBook(book_key, book_entry_for_js, outputs, letter_counts, koch_words)
+
+def build_books(json_file_paths, jobs: int = 1, build_options: dict = None) -> list:
+    """Builds the given books, in parallel when jobs > 1. Returns BuiltBook/None results in path order."""
+    if jobs <= 1 or not json_file_paths:
+        return [build_book(json_path, build_options=build_options) for json_path in json_file_paths]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Regular books are built whole by the workers; giant ones are driven from this
+        # process and only their paragraph shards are sent to the pool.
+        futures = {}
+        for json_path in json_file_paths:
+            if os.path.getsize(json_path) < SHARD_SOURCE_BYTES:
+                futures[json_path] = executor.submit(build_book, json_path, build_options=build_options)
+        sharded_books = {json_path: build_book(json_path, executor, jobs * SHARD_PENDING_PER_JOB, build_options)
+                         for json_path in json_file_paths if json_path not in futures}
+        # Merge in path order so the output does not depend on which worker finished first.
+        return [futures[json_path].result() if json_path in futures else sharded_books[json_path]
+                for json_path in json_file_paths]
+
+# --- Incremental Build Manifest ---
+# The manifest remembers, per source, a content hash, the encoder version and the files written,
+# so unchanged books are skipped, outputs of deleted sources are pruned and shared files are
+# only rewritten when their content changes.
+BUILD_MANIFEST_PATH = os.path.join(SCRIPT_DIR, ".morse_build_manifest.json")
+BUILD_MANIFEST_VERSION = 1
+# Bump whenever the generated assets or bookData.js entries change for unchanged sources.
+ENCODER_VERSION = 11
+HASH_BLOCK_BYTES = 1 << 20
+
+def _project_relpath(path: str) -> str:
+    if path.startswith(SCRIPT_DIR + os.sep): # Fast path for the paths this script builds itself
+        return path[len(SCRIPT_DIR) + 1:].replace(os.sep, '/')
+    return os.path.relpath(path, SCRIPT_DIR).replace(os.sep, '/')
+
+def _project_abspath(relpath: str) -> str:
+    return os.path.join(SCRIPT_DIR, *relpath.split('/'))
+
+def hash_file(path: str) -> str:
+    """Returns the SHA-256 hex digest of a file, read in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_build_manifest(manifest_path: str = BUILD_MANIFEST_PATH) -> dict:
+    """Loads the per-book build records, or returns an empty dict if there is no usable manifest."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Warning: Ignoring unreadable build manifest {manifest_path}: {e}")
+        return {}
+    if manifest.get("manifestVersion") != BUILD_MANIFEST_VERSION:
+        return {}
+    return manifest.get("books", {})
+
+def write_if_changed(path: str, content: str) -> bool:
+    """Writes a UTF-8 text file only if its content differs, keeping mtimes of unchanged files."""
+    encoded = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == encoded:
+                return False
+    except FileNotFoundError:
+        pass
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(encoded)
+    os.replace(temp_path, path)
+    return True
+
+def save_build_manifest(book_records: dict, manifest_path: str = BUILD_MANIFEST_PATH):
+    # Entry keys keep their insertion order, which is the field order of bookData.js. No indent,
+    # so the C encoder is used; the manifest of a large library is several megabytes.
+    manifest = {"manifestVersion": BUILD_MANIFEST_VERSION, "books": dict(sorted(book_records.items()))}
+    write_if_changed(manifest_path, json.dumps(manifest) + "\n")
+
+def _source_fingerprint(json_path: str) -> dict:
+    source_stat = os.stat(json_path)
+    return {"sourceSize": source_stat.st_size, "sourceMtimeNs": source_stat.st_mtime_ns}
+
+def is_book_record_current(record: dict, json_path: str, fingerprint: dict, build_options: dict) -> bool:
+    """Checks whether a manifest record still describes the source, the build options and the outputs on disk.
+
+    Size and mtime are checked first; the source is only hashed when they differ, so a
+    no-op rebuild costs one stat per source and output.
+    """
+    if not record or record.get("encoderVersion") != ENCODER_VERSION or record.get("buildOptions") != build_options:
+        return False
+    for output_relpath, output_size in record.get("outputs", {}).items():
+        try:
+            if os.path.getsize(_project_abspath(output_relpath)) != output_size:
+                return False
+        except OSError:
+            return False
+    if all(record.get(key) == value for key, value in fingerprint.items()):
+        return True
+    if record.get("sourceSha256") != hash_file(json_path):
+        return False
+    record.update(fingerprint) # Touched but unchanged; remember the new mtime
+    return True
+
+def make_book_record(built_book: BuiltBook, source_sha256: str, fingerprint: dict, build_options: dict) -> dict:
+    record = {
+        "bookKey": built_book.book_key,
+        "entry": built_book.entry,
+        "encoderVersion": ENCODER_VERSION,
+        "buildOptions": build_options,
+        "sourceSha256": source_sha256,
+        "outputs": {_project_relpath(path): os.path.getsize(path) for path in built_book.outputs},
+        "letterCounts": built_book.letter_counts,
+        "kochWords": built_book.koch_words,
+    }
+    record.update(fingerprint)
+    return record
+
+def prune_stale_outputs(previous_records: dict, current_records: dict):
+    """Removes outputs no longer produced: those of removed (or failed) sources and dropped optional outputs."""
+    kept_outputs = {output for record in current_records.values() for output in record.get("outputs", {})}
+    for source_relpath, record in previous_records.items():
+        for output_relpath in record.get("outputs", {}):
+            output_path = _project_abspath(output_relpath)
+            if output_relpath not in kept_outputs and os.path.exists(output_path):
+                os.remove(output_path)
+                print(f"  Pruned stale output of {source_relpath}: {output_path}")
+                output_dir = os.path.dirname(output_path)
+                if output_dir != MORSE_CODE_BASE_DIR and not os.listdir(output_dir):
+                    os.rmdir(output_dir) # Page directory of the removed book
+
+def render_book_data_js(all_book_data_for_js: dict) -> str:
+    """Renders bookData.js: the detail shard path pattern and the window.bookCipherBooks catalogue summary.
+
+    Each book is one line holding only CATALOGUE_SUMMARY_KEYS, so the script the app parses at
+    startup stays small however long the descriptions are; bookCipher.js fetches the rest from
+    the book's detail shard when it is needed.
+    """
+    details_path_for_js = os.path.relpath(os.path.join(MORSE_CODE_BASE_DIR, BOOK_DETAILS_PATH_PLACEHOLDER + BOOK_DETAILS_SUFFIX),
+                                          SRC_DIR).replace(os.sep, '/')
+    js_object_parts = []
+    for key, book_obj in all_book_data_for_js.items():
+        js_book_entry_parts = [f"'{js_key}': {format_js_value(book_obj[js_key])}"  # Ensure keys are quoted
+                               for js_key in CATALOGUE_SUMMARY_KEYS if js_key in book_obj]
+        js_object_parts.append(f"    '{key}': {{{', '.join(js_book_entry_parts)}}}")
+
+    search_index_path_for_js = os.path.relpath(BOOK_SEARCH_INDEX_PATH, SRC_DIR).replace(os.sep, '/')
+    book_data_js_content = f"window.bookCipherBookDetailsPath = {format_js_string(details_path_for_js)};\n"
+    book_data_js_content += f"window.bookCipherSearchIndexPath = {format_js_string(search_index_path_for_js)};\n"
+    book_data_js_content += "window.bookCipherBooks = {\n"
+    book_data_js_content += ",\n".join(js_object_parts)
+    book_data_js_content += "\n};\n"
+    return book_data_js_content
+
+# --- Catalogue Search Index ---
+# bookSearchIndex.json lets the library filter and search without scanning the catalogue:
+#   ids       book ids in catalogue (display) order; every list below holds sorted positions into it
+#   terms     sorted distinct tokens of SEARCH_INDEX_FIELDS, postings[i] the books containing terms[i]
+#   facets    per SEARCH_FACET_FIELDS field, its values (sorted) with their book count and positions
+# Tokens are lowercased runs of letters and digits, matching searchTokens() in bookCipher.js.
+BOOK_SEARCH_INDEX_VERSION = 1
+SEARCH_INDEX_FIELDS = ("title", "author", "description", "genre")
+SEARCH_FACET_FIELDS = ("genre", "lengthCategory", "isPro")
+SEARCH_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+def search_tokens(text: str) -> list:
+    return SEARCH_TOKEN_PATTERN.findall(text.lower())
+
+def build_search_index(all_book_data_for_js: dict) -> dict:
+    """Builds the inverted index and facet lists for the books, in their bookData.js order."""
+    book_ids = list(all_book_data_for_js)
+    postings = collections.defaultdict(list)
+    facets = {field: collections.defaultdict(list) for field in SEARCH_FACET_FIELDS}
+    for position, book_id in enumerate(book_ids):
+        entry = all_book_data_for_js[book_id]
+        tokens = set()
+        for field in SEARCH_INDEX_FIELDS:
+            if isinstance(entry.get(field), str):
+                tokens.update(search_tokens(entry[field]))
+        for token in tokens:
+            postings[token].append(position) # Positions are visited in order, so every list is sorted
+        for field in SEARCH_FACET_FIELDS:
+            if entry.get(field) is not None:
+                facets[field][entry[field]].append(position)
+    terms = sorted(postings)
+    return {
+        "version": BOOK_SEARCH_INDEX_VERSION,
+        "ids": book_ids,
+        "terms": terms,
+        "postings": [postings[term] for term in terms],
+        "facets": {field: [{"value": value, "count": len(values[value]), "ids": values[value]}
+                           for value in sorted(values, key=str)]
+                   for field, values in facets.items()},
+    }
+
+def render_search_index_json(all_book_data_for_js: dict) -> str:
+    return json.dumps(build_search_index(all_book_data_for_js), ensure_ascii=False, separators=(',', ':')) + "\n"
+
+# --- Runtime Morse Tables ---
+# MORSE_CODE_MAP is the one alphabet of the project. js/data/morseTables.js carries it to the app as
+# window.morseCode (character -> signal, for encoding and the reference table) and as window.morseDecodeTree,
+# MORSE_DICHOTOMIC_TABLE as a string: node 1 is the root, a dot leads from node i to 2 * i and a dash to
+# 2 * i + 1, and each node holds the character whose signal ends there (MORSE_DECODE_TREE_EMPTY where none
+# does). The tapper walks the tree one element at a time instead of looking up the finished signal.
+# Other copies of the alphabet cannot be generated from here; check_morse_tables() compares them with it:
+# the binary asset symbols in bookCipher.js and the converter of the iOS Messages extension.
+MORSE_DECODE_TREE_EMPTY = '*'
+BOOK_CIPHER_JS_PATH = os.path.join(SRC_DIR, "js", "bookCipher.js")
+SWIFT_MORSE_CONVERTER_PATH = os.path.join(SCRIPT_DIR, "TapperMessagesExtension", "MorseCodeConverter.swift")
+JS_BINARY_SYMBOLS_PATTERN = re.compile(r"const MORSE_BINARY_SYMBOLS = \[(.*?)\];")
+KOCH_METHOD_JS_PATH = os.path.join(SRC_DIR, "js", "kochMethod.js")
+JS_KOCH_ORDER_PATTERN = re.compile(r"const kochCharacterOrder = \[(.*?)\];", re.DOTALL)
+SWIFT_DICTIONARY_PATTERN = re.compile(r"morseCodeDictionary: \[String: String\] = \[(.*?)\n\s*\]", re.DOTALL)
+SWIFT_ENTRY_PATTERN = re.compile(r'"([.-]+)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+# Characters the Swift converter deliberately keys differently from MORSE_CODE_MAP. The extension sends
+# plain messages to other people, so it keeps the ITU '@' (.--.-.); the app's .--.-.- is baked into the
+# binary assets and only changes with a MORSE_BINARY_VERSION bump.
+SWIFT_MORSE_KNOWN_DIFFERENCES = {'@': '.--.-.'}
+
+def morse_decode_tree_string() -> str:
+    return ''.join(char or MORSE_DECODE_TREE_EMPTY for char in MORSE_DICHOTOMIC_TABLE)
+
+def render_morse_tables_js() -> str:
+    pairs = ", ".join(f"{format_js_string(char)}: {format_js_string(signal)}" for char, signal in MORSE_CODE_MAP.items())
+    return ("// Generated by generate_morse_files.py from MORSE_CODE_MAP; change the alphabet there.\n"
+            f"window.morseCode = {{ {pairs} }};\n"
+            "// Heap-indexed Morse tree: root 1, dot i -> 2 * i, dash i -> 2 * i + 1; morseDecodeTreeEmpty where no character ends.\n"
+            f"window.morseDecodeTree = {format_js_string(morse_decode_tree_string())};\n"
+            f"window.morseDecodeTreeEmpty = {format_js_string(MORSE_DECODE_TREE_EMPTY)};\n")
+
+def swift_morse_signals(swift_source: str) -> dict:
+    """Signal -> text entries of the Swift converter's morseCodeDictionary."""
+    match = SWIFT_DICTIONARY_PATTERN.search(swift_source)
+    if not match:
+        return {}
+    return {signal: re.sub(r'\\(.)', r'\1', text) for signal, text in SWIFT_ENTRY_PATTERN.findall(match.group(1))}
+
+def check_morse_tables() -> list:
+    """Differences between MORSE_CODE_MAP and the other copies of the alphabet, as messages (empty if none)."""
+    problems = []
+    try:
+        with open(MORSE_TABLES_JS_PATH, 'r', encoding='utf-8') as f:
+            if f.read() != render_morse_tables_js():
+                problems.append(f"{MORSE_TABLES_JS_PATH} is out of date; run generate_morse_files.py.")
+    except FileNotFoundError:
+        problems.append(f"{MORSE_TABLES_JS_PATH} is missing; run generate_morse_files.py.")
+
+    with open(BOOK_CIPHER_JS_PATH, 'r', encoding='utf-8') as f:
+        match = JS_BINARY_SYMBOLS_PATTERN.search(f.read())
+    if not match or re.findall(r"'([.-]+)'", match.group(1)) != list(MORSE_BINARY_SYMBOLS):
+        problems.append(f"MORSE_BINARY_SYMBOLS in {BOOK_CIPHER_JS_PATH} does not match MORSE_BINARY_SYMBOLS of version {MORSE_BINARY_VERSION}.")
+
+    with open(KOCH_METHOD_JS_PATH, 'r', encoding='utf-8') as f:
+        match = JS_KOCH_ORDER_PATTERN.search(f.read())
+    if not match or ''.join(re.findall(r"'(.)'", match.group(1))) != KOCH_CHARACTER_ORDER:
+        problems.append(f"kochCharacterOrder in {KOCH_METHOD_JS_PATH} does not match KOCH_CHARACTER_ORDER (the Koch drill banks are built for it).")
+
+    if os.path.exists(SWIFT_MORSE_CONVERTER_PATH): # The iOS sources are not part of every checkout
+        with open(SWIFT_MORSE_CONVERTER_PATH, 'r', encoding='utf-8') as f:
+            swift_signals = swift_morse_signals(f.read())
+        swift_chars = {text: signal for signal, text in swift_signals.items()}
+        for char, signal in MORSE_CODE_MAP.items():
+            if char == ' ':
+                continue # Word separator, handled in code there
+            if char not in swift_chars:
+                problems.append(f"{SWIFT_MORSE_CONVERTER_PATH}: {char!r} ({signal}) is missing.")
+            elif swift_chars[char] != signal and swift_chars[char] != SWIFT_MORSE_KNOWN_DIFFERENCES.get(char):
+                problems.append(f"{SWIFT_MORSE_CONVERTER_PATH}: {char!r} is {swift_chars[char]}, not {signal}.")
+        # Entries for other texts (prosigns such as SOS) are extensions of the alphabet, not conflicts,
+        # unless they reuse a signal of MORSE_CODE_MAP.
+        used_signals = set(MORSE_CODE_MAP.values())
+        for signal, text in swift_signals.items():
+            if text not in MORSE_CODE_MAP and signal in used_signals:
+                problems.append(f"{SWIFT_MORSE_CONVERTER_PATH}: {signal} is {text!r}, not {morse_signal_to_char(signal)!r}.")
+    return problems
+
+# --- Predictive Display Index ---
+# While a letter is keyed, the tapper suggests the characters whose signal starts with what has been keyed.
+# Every such prefix is a node of the decode tree (see Runtime Morse Tables), so js/data/morsePrefixIndex.js
+# holds window.morsePrefixCandidates: for each node, the characters at or below it as one string, the ones
+# most frequent in the library's books first (ties in MORSE_CODE_MAP order). A tap costs one array lookup.
+# Letter counts are taken while each book's index is written and kept in its build record.
+PREFIX_INDEX_NODES_PER_LINE = 16
+
+def corpus_letter_counts(book_records: dict) -> collections.Counter:
+    counts = collections.Counter()
+    for record in book_records.values():
+        counts.update(record.get("letterCounts", {}))
+    return counts
+
+def build_morse_prefix_candidates(letter_counts: dict) -> list:
+    """Per node of MORSE_DICHOTOMIC_TABLE, the characters at or below it, most frequent first."""
+    map_order = {char: position for position, char in enumerate(MORSE_CODE_MAP)}
+    chars = sorted((char for char in MORSE_CODE_MAP if char != ' '), key=lambda char: (-letter_counts.get(char, 0), map_order[char]))
+    candidates = [''] * len(MORSE_DICHOTOMIC_TABLE)
+    for char in chars: # In rank order, so every node's string is ranked too
+        node = 1
+        for element in MORSE_CODE_MAP[char]:
+            node = 2 * node + (element == '-')
+        while node >= 1:
+            candidates[node] += char
+            node //= 2
+    return candidates
+
+def render_morse_prefix_index_js(book_records: dict) -> str:
+    candidates = [format_js_string(node_candidates) for node_candidates in build_morse_prefix_candidates(corpus_letter_counts(book_records))]
+    lines = [", ".join(candidates[start:start + PREFIX_INDEX_NODES_PER_LINE])
+             for start in range(0, len(candidates), PREFIX_INDEX_NODES_PER_LINE)]
+    return ("// Generated by generate_morse_files.py. Per node of morseDecodeTree (a keyed prefix), the characters whose\n"
+            "// signal starts with it, most frequent in the books first.\n"
+            "window.morsePrefixCandidates = [\n    " + ",\n    ".join(lines) + "\n];\n")
+
+# --- Koch Drill Banks ---
+# The Koch tab (kochMethod.js) unlocks characters one at a time in KOCH_CHARACTER_ORDER. With one bit per
+# character in that order, the characters a word needs form a mask whose highest bit gives its level: the
+# number of unlocked characters from which it can be practised. Each book's build record keeps its
+# KOCH_WORDS_PER_LEVEL most frequent words of every level. js/data/kochDrills.js holds
+# window.kochDrillBanks, with per level a bank of real words and one of five-character groups, using only
+# the unlocked characters and already shuffled, so the app starts a drill with a single lookup. Words are
+# drawn by frequency, and the words and groups with the level's newest character KOCH_NEW_CHAR_WEIGHT times
+# as often. Every level has its own seed, so unchanged books give an unchanged file.
+KOCH_CHARACTER_ORDER = "KMRSUAPTLOWI.NJEF0Y,VG5/Q9ZH38B?427C1D6X"
+KOCH_CHARACTER_BITS = {char: 1 << bit for bit, char in enumerate(KOCH_CHARACTER_ORDER)}
+KOCH_FIRST_LEVEL = 2 # kochMethod.js starts with the first two characters unlocked
+KOCH_WORDS_PER_LEVEL = 200 # Per level, in each book record and in the combined corpus
+KOCH_MIN_WORD_LENGTH = 2
+KOCH_BANK_WORDS = 60
+KOCH_BANK_GROUPS = 30
+KOCH_GROUP_LENGTH = 5
+KOCH_NEW_CHAR_WEIGHT = 3
+SYMBOL_ID_TO_CHAR_TRANSLATION = str.maketrans({symbol_id: char for char, symbol_id in MORSE_SYMBOL_IDS.items()})
+
+def koch_level(word: str) -> int:
+    """Unlocked characters needed to practise word, or 0 if it has a character outside the Koch order."""
+    mask = 0
+    for char in word:
+        bit = KOCH_CHARACTER_BITS.get(char)
+        if bit is None:
+            return 0
+        mask |= bit
+    return mask.bit_length()
+
+def koch_drill_words(word_counts: dict, from_symbol_ids: bool = False) -> dict:
+    """The KOCH_WORDS_PER_LEVEL most frequent practisable words of each level, with their counts."""
+    by_level = collections.defaultdict(list)
+    for word, count in word_counts.items():
+        if from_symbol_ids:
+            word = word.translate(SYMBOL_ID_TO_CHAR_TRANSLATION)
+        level = koch_level(word)
+        if level and len(word) >= KOCH_MIN_WORD_LENGTH and any(char.isalnum() for char in word):
+            by_level[level].append((count, word))
+    kept = {}
+    for level in sorted(by_level):
+        for count, word in heapq.nlargest(KOCH_WORDS_PER_LEVEL, by_level[level], key=lambda entry: (entry[0], entry[1])):
+            kept[word] = count
+    return kept
+
+def corpus_koch_words(book_records: dict) -> dict:
+    counts = collections.Counter()
+    for record in book_records.values():
+        counts.update(record.get("kochWords", {}))
+    return koch_drill_words(counts)
+
+def _weighted_shuffle(rng: random.Random, items: list, weights: list) -> list:
+    """items in a random order where heavier items tend to come first (Efraimidis-Spirakis keys)."""
+    keys = [rng.random() ** (1 / weight) for weight in weights]
+    return [item for _, item in sorted(zip(keys, items), reverse=True)]
+
+def build_koch_drill_banks(koch_words: dict) -> list:
+    """Per level (index = unlocked characters), (words, groups) drawn from koch_words; None below KOCH_FIRST_LEVEL."""
+    words_by_level = collections.defaultdict(list)
+    for word in sorted(koch_words): # Sorted, so the draws depend only on the words and counts
+        words_by_level[koch_level(word)].append(word)
+    banks = [None] * KOCH_FIRST_LEVEL
+    candidates = [word for level in range(KOCH_FIRST_LEVEL) for word in words_by_level[level]]
+    for level in range(KOCH_FIRST_LEVEL, len(KOCH_CHARACTER_ORDER) + 1):
+        rng = random.Random(f"koch-drills-{level}")
+        candidates = candidates + words_by_level[level]
+        weights = [koch_words[word] * (KOCH_NEW_CHAR_WEIGHT if koch_level(word) == level else 1) for word in candidates]
+        words = _weighted_shuffle(rng, candidates, weights)[:KOCH_BANK_WORDS]
+        unlocked = KOCH_CHARACTER_ORDER[:level]
+        char_weights = [1] * (level - 1) + [KOCH_NEW_CHAR_WEIGHT]
+        groups = [''.join(rng.choices(unlocked, char_weights, k=KOCH_GROUP_LENGTH)) for _ in range(KOCH_BANK_GROUPS)]
+        banks.append((words, groups))
+    return banks
+
+def render_koch_drills_js(book_records: dict) -> str:
+    levels = ["null" if bank is None else f"[{format_js_string(' '.join(bank[0]))}, {format_js_string(' '.join(bank[1]))}]"
+              for bank in build_koch_drill_banks(corpus_koch_words(book_records))]
+    return ("// Generated by generate_morse_files.py. Per Koch level (number of unlocked characters): real words from\n"
+            "// the books and five-character groups that use only the unlocked characters, shuffled, each list\n"
+            "// space-separated.\n"
+            f"window.kochDrillBanks = {{\n    order: {format_js_string(KOCH_CHARACTER_ORDER)},\n    levels: [\n        "
+            + ",\n        ".join(levels) + "\n    ]\n};\n")
+
+# --- Service Worker Precache ---
+# precache-manifest.js is imported by service-worker.js and sets self.morsePrecacheManifest:
+#   shell     {url, revision} of every app shell and catalogue file, revision being the start of its SHA-256.
+#             The service worker caches each file under its URL with the revision appended, so an update
+#             downloads only the files whose revision changed; './' is the start URL, served as index.html.
+#   books     per book, a revision of its assets (source hash, encoder version and build options) and the
+#             paths they are served from, a path ending in '/' covering a whole page directory. Book files
+#             go into a runtime cache as they are fetched; when a book's revision changes, its cached files
+#             are dropped.
+# Browsers check imported scripts for changes too, so any new revision installs the new service worker.
+PRECACHE_MANIFEST_VERSION = 1
+PRECACHE_REVISION_CHARS = 16
+PRECACHE_START_URL = "./"
+# App shell files, relative to src/; the catalogue files written by main() are added to them.
+PRECACHE_SHELL_FILES = (
+    "index.html", "manifest.json", "css/style.css",
+    "js/main.js", "js/bookCipher.js", "js/kochMethod.js", "js/learnPracticeGame.js",
+    "js/settings.js", "js/visualTapper.js", "js/privacy.js",
+    "assets/icons/icon-192x192.png", "assets/icons/icon-512x512.png",
+)
+
+def _src_url(path: str, root: str = SRC_DIR) -> str:
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+def book_asset_revision(record: dict) -> str:
+    fingerprint = json.dumps([record.get("sourceSha256"), record.get("encoderVersion"), record.get("buildOptions")], sort_keys=True)
+    return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:PRECACHE_REVISION_CHARS]
+
+def book_cache_paths(source_relpath: str, record: dict) -> list:
+    """URL paths (relative to src/) a book's assets are fetched from; page directories end in '/'."""
+    paths = set()
+    for relpath in [source_relpath, *record.get("outputs", {})]:
+        for suffix in PRECOMPRESSED_SUFFIXES: # Served in place of the uncompressed file, never requested by name
+            if relpath.endswith(suffix):
+                relpath = relpath[:-len(suffix)]
+        url = _src_url(_project_abspath(relpath))
+        directory = url.rpartition('/')[0]
+        paths.add(directory + '/' if directory.endswith(MORSE_PAGES_SUFFIX) else url)
+    return sorted(paths)
+
+def build_precache_manifest(shell_paths, book_records: dict, root: str = SRC_DIR) -> dict:
+    """The precache manifest of the shell files that exist and of the books' runtime-cached assets.
+
+    Shell URLs are relative to root, the directory the service worker is served from.
+    """
+    shell = []
+    for path in shell_paths:
+        if not os.path.exists(path):
+            print(f"Warning: App shell file {path} not found; it is left out of the precache manifest.")
+            continue
+        revision = hash_file(path)[:PRECACHE_REVISION_CHARS]
+        url = _src_url(path, root)
+        if url == "index.html":
+            shell.append({"url": PRECACHE_START_URL, "revision": revision})
+        shell.append({"url": url, "revision": revision})
+    books = {record["bookKey"]: {"revision": book_asset_revision(record), "paths": book_cache_paths(source_relpath, record)}
+             for source_relpath, record in sorted(book_records.items())}
+    return {"version": PRECACHE_MANIFEST_VERSION, "shell": shell, "books": books}
+
+def render_precache_manifest_js(shell_paths, book_records: dict) -> str:
+    # One shell file or book per line, so a rebuild's diff shows which revisions changed.
+    manifest = build_precache_manifest(shell_paths, book_records)
+    shell_lines = ",\n".join(f"    {json.dumps(entry)}" for entry in manifest["shell"])
+    book_lines = ",\n".join(f"    {json.dumps(book_key)}: {json.dumps(book)}" for book_key, book in manifest["books"].items())
+    return ("// Generated by generate_morse_files.py; lists the files service-worker.js caches.\n"
+            "self.morsePrecacheManifest = {\n"
+            f"  \"version\": {manifest['version']},\n"
+            f"  \"shell\": [\n{shell_lines}\n  ],\n"
+            f"  \"books\": {{\n{book_lines}\n  }}\n"
+            "};\n")
+
+# --- Asset Size Report ---
+# Printed after every build: raw vs precompressed bytes per book (all of its generated assets plus
+# its English source) and for the catalogue. Transfer size is the smallest form of each asset,
+# which is what a client downloads; the optional budgets are checked against it.
+def asset_size_totals(asset_sizes: dict) -> dict:
+    """Sums raw, .gz, .br and transfer sizes over {path: size}, which also lists any precompressed siblings.
+
+    An asset without a sibling (not compressed, or not smaller compressed) counts at its raw size.
+    """
+    totals = {"raw": 0, "gzip": 0, "brotli": 0, "transfer": 0}
+    for path, size in asset_sizes.items():
+        if path.endswith(PRECOMPRESSED_SUFFIXES):
+            continue
+        gzip_size = asset_sizes.get(path + GZIP_SUFFIX, size)
+        brotli_size = asset_sizes.get(path + BROTLI_SUFFIX, size)
+        totals["raw"] += size
+        totals["gzip"] += gzip_size
+        totals["brotli"] += brotli_size
+        totals["transfer"] += min(size, gzip_size, brotli_size)
+    return totals
+
+def book_asset_sizes(source_relpath: str, record: dict) -> dict:
+    asset_sizes = dict(record.get("outputs", {}))
+    asset_sizes[source_relpath] = record["sourceSize"]
+    return asset_sizes
+
+def file_asset_sizes(path: str) -> dict:
+    """{path: size} for a file on disk and its precompressed siblings."""
+    return {candidate: os.path.getsize(candidate) for candidate in [path] + [path + suffix for suffix in PRECOMPRESSED_SUFFIXES]
+            if os.path.exists(candidate)}
+
+def print_size_report(rows: list):
+    """Prints (name, totals) rows as a table followed by their sum."""
+    print(f"\n{'asset':40} {'raw B':>12} {'gzip B':>12} {'brotli B':>12} {'transfer B':>12} {'ratio':>6}")
+    grand_totals = collections.Counter()
+    for name, totals in rows + [("TOTAL", None)]:
+        if totals is None:
+            totals = grand_totals
+        else:
+            grand_totals.update(totals)
+        ratio = f"{totals['transfer'] / totals['raw']:.2f}" if totals['raw'] else "-"
+        print(f"{name:40} {totals['raw']:>12} {totals['gzip']:>12} {totals['brotli']:>12} {totals['transfer']:>12} {ratio:>6}")
+    if brotli is None:
+        print("(brotli is not installed: no .br siblings were written)")
+
+def check_size_budgets(book_rows: list, catalogue_totals: dict, book_budget: int = None, total_budget: int = None) -> bool:
+    """Returns False (after printing why) when a book or the whole build exceeds its transfer-size budget."""
+    within_budget = True
+    if book_budget is not None:
+        for name, totals in book_rows:
+            if totals["transfer"] > book_budget:
+                print(f"Size budget exceeded: {name} is {totals['transfer']} bytes (budget per book: {book_budget}).")
+                within_budget = False
+    total_transfer = sum(totals["transfer"] for _, totals in book_rows) + catalogue_totals["transfer"]
+    if total_budget is not None and total_transfer > total_budget:
+        print(f"Size budget exceeded: all assets are {total_transfer} bytes (total budget: {total_budget}).")
+        within_budget = False
+    return within_budget
+
+def main(jobs: int = 1, force: bool = False, dictionary: bool = False, compress: bool = True,
+         book_budget: int = None, total_budget: int = None) -> bool:
+    """Builds every book and bookData.js. Returns False if the build exceeds a size budget."""
     print(f"Script directory: {SCRIPT_DIR}")
     print(f"Source directory: {SRC_DIR}")
     print(f"Looking for English source JSON files in: {ENGLISH_SOURCES_DIR}")
@@ -66,132 +1841,201 @@ def main():
     if not os.path.isdir(ENGLISH_SOURCES_DIR):
         print(f"Error: English sources directory not found at {ENGLISH_SOURCES_DIR}")
         print("Please create it and add your book JSON files there.")
-        return
+        return False
 
-    all_book_data_for_js = {}
-    json_file_paths = glob.glob(os.path.join(ENGLISH_SOURCES_DIR, "*.json"))
+    # Sorted so that serial and parallel builds list the books in the same order.
+    json_file_paths = sorted(glob.glob(os.path.join(ENGLISH_SOURCES_DIR, "*.json")))
 
     if not json_file_paths:
         print(f"No JSON files found in {ENGLISH_SOURCES_DIR}. No books to process.")
     else:
-        print(f"Found {len(json_file_paths)} JSON files to process.")
+        print(f"Found {len(json_file_paths)} JSON files to process (jobs: {jobs}).")
 
+    # Decide which books need (re)building; everything else is taken from the manifest.
+    build_options = {"dictionary": dictionary, "compress": list(available_precompressed_suffixes()) if compress else []}
+    previous_records = {} if force else load_build_manifest()
+    current_records = {}
+    books_to_build = []
     for json_path in json_file_paths:
-        book_key = os.path.splitext(os.path.basename(json_path))[0]
-        print(f"\nProcessing book: {book_key} (from {json_path})")
+        source_relpath = _project_relpath(json_path)
+        fingerprint = _source_fingerprint(json_path)
+        record = previous_records.get(source_relpath)
+        if is_book_record_current(record, json_path, fingerprint, build_options):
+            current_records[source_relpath] = record
+        else:
+            books_to_build.append((json_path, fingerprint, hash_file(json_path)))
+    print(f"{len(books_to_build)} book(s) to build, {len(current_records)} unchanged.")
 
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            print(f"  Error: JSON file disappeared or is not accessible: {json_path}")
-            continue
-        except json.JSONDecodeError:
-            print(f"  Error: Could not decode JSON from {json_path}")
-            continue
-        except Exception as e:
-            print(f"  Error reading JSON file {json_path}: {e}")
-            continue
+    built_books = build_books([json_path for json_path, _, _ in books_to_build], jobs, build_options)
+    for (json_path, fingerprint, source_sha256), built_book in zip(books_to_build, built_books):
+        if built_book is not None:
+            current_records[_project_relpath(json_path)] = make_book_record(built_book, source_sha256, fingerprint, build_options)
 
-        # Validate required fields from JSON
-        title = data.get("title")
-        content_markdown = data.get("content_markdown")
+    prune_stale_outputs(previous_records, current_records)
 
-        if title is None:
-            print(f"  Warning: 'title' is missing in {json_path}. Skipping this book.")
-            continue
-        if content_markdown is None: # Allow empty string for content_markdown, but not missing key
-            print(f"  Warning: 'content_markdown' key is missing in {json_path}. Using empty content for Morse generation.")
-            content_markdown = ""
-
-        # Pre-process markdown for Morse generation: replace newlines with spaces
-        # This helps ensure paragraph breaks in markdown become word separations for Morse.
-        text_for_morse_conversion = content_markdown # Default to original if no processing needed
-        if content_markdown: # Only process if there's content
-            # Replace various newline combinations (and any surrounding whitespace) with a single space
-            text_for_morse_conversion = re.sub(r'\s*[\r\n]+\s*', ' ', content_markdown).strip()
-            # Optional: remove other markdown syntax if necessary, though Morse converter ignores unknown chars
-            # text_for_morse_conversion = re.sub(r'[#*_`]', '', text_for_morse_conversion)
-
-        # Generate Morse code
-        morse_code = english_to_morse(text_for_morse_conversion)
-        morse_filename = f"{book_key}_morse.txt"
-        # Ensure MORSE_CODE_BASE_DIR exists
-        if not os.path.exists(MORSE_CODE_BASE_DIR):
-            os.makedirs(MORSE_CODE_BASE_DIR)
-            print(f"  Created directory: {MORSE_CODE_BASE_DIR}")
-
-        morse_file_path_abs = os.path.join(MORSE_CODE_BASE_DIR, morse_filename)
+    # bookData.js lists the books in source path order, whether they were rebuilt or not.
+    all_book_data_for_js = {}
+    for json_path in json_file_paths:
+        record = current_records.get(_project_relpath(json_path))
+        if record is not None:
+            all_book_data_for_js[record["bookKey"]] = record["entry"]
 
+    # Generate the content for bookData.js, the library's search index, the app's Morse tables and prefix index
+    # and the Koch drill banks
+    catalogue_files = [(BOOK_DATA_JS_PATH, render_book_data_js), (BOOK_SEARCH_INDEX_PATH, render_search_index_json),
+                       (MORSE_TABLES_JS_PATH, lambda _: render_morse_tables_js()),
+                       (MORSE_PREFIX_INDEX_JS_PATH, lambda _: render_morse_prefix_index_js(current_records)),
+                       (KOCH_DRILLS_JS_PATH, lambda _: render_koch_drills_js(current_records))]
+    for catalogue_path, render in catalogue_files:
+        print(f"\nGenerating {catalogue_path}...")
         try:
-            with open(morse_file_path_abs, 'w', encoding='utf-8') as f_morse:
-                f_morse.write(morse_code)
-            print(f"  Successfully wrote Morse code to: {morse_file_path_abs}")
+            if write_if_changed(catalogue_path, render(all_book_data_for_js)):
+                print(f"Successfully wrote {catalogue_path}")
+            else:
+                print(f"{catalogue_path} is up to date.")
+            if compress:
+                write_precompressed(catalogue_path)
+            else:
+                remove_precompressed(catalogue_path)
         except IOError as e:
-            print(f"  Error writing Morse file {morse_file_path_abs}: {e}")
-            continue # Skip adding this book to bookData.js if Morse file fails
-
-        # Prepare data for bookData.js
-        # Path relative to src/js/data/ for bookData.js
-        # MORSE_CODE_BASE_DIR is 'src/assets/book_cipher_texts'
-        # englishSourcePath is 'assets/book_cipher_texts/english_sources/book_key.json'
-
-        # Derive paths relative to where bookData.js expects them (usually relative to `src/`)
-        # englishSourcePath_for_js needs to be relative to the `src` folder.
-        # json_path is absolute. SRC_DIR is absolute.
-        relative_english_source_path = os.path.relpath(json_path, SRC_DIR).replace(os.sep, '/')
-
-        # morse_file_path_abs is '.../src/assets/book_cipher_texts/key_morse.txt'
-        # MORSE_CODE_BASE_DIR is '.../src/assets/book_cipher_texts'
-        # So, morse_filename is 'key_morse.txt'
-        # The path in bookData.js should be 'assets/book_cipher_texts/key_morse.txt'
-        # MORSE_CODE_BASE_DIR already starts with 'src/' effectively, so we need its path part after 'src/'
-        # MORSE_CODE_BASE_DIR = os.path.join(SRC_DIR, "assets", "book_cipher_texts")
-        # morse_file_path_for_js = os.path.join(os.path.basename(MORSE_CODE_BASE_DIR), morse_filename).replace(os.sep, '/')
-
-        # Correct derivation of paths for bookData.js (relative to src/)
-        # Path to the morse file, relative to SRC_DIR
-        derived_morse_filePath_for_js = os.path.relpath(morse_file_path_abs, SRC_DIR).replace(os.sep, '/')
-
-
-        book_entry_for_js = {
-            "title": title,
-            "author": data.get("author", "Unknown Author"),
-            "description": data.get("description", "No description available."),
-            "isPro": data.get("isPro", False), # Default to False if not specified
-            "genre": data.get("genre", "General"),
-            "lengthCategory": data.get("lengthCategory", "Medium"),
-            "imagePath": data.get("imagePath", f"assets/images/covers/{book_key}_placeholder.png"), # Default placeholder
-            "filePath": derived_morse_filePath_for_js, # Path to the generated Morse .txt file
-            "englishSourcePath": relative_english_source_path # Path to its own JSON source
-        }
-        all_book_data_for_js[book_key] = book_entry_for_js
-
-    # Generate the content for bookData.js
-    print(f"\nGenerating {BOOK_DATA_JS_PATH}...")
-    js_object_parts = []
-    for key, book_obj in all_book_data_for_js.items():
-        js_book_entry_parts = [f"        '{js_key}': {format_js_value(js_val)}"  # Ensure keys are quoted
-                               for js_key, js_val in book_obj.items()]
-        # Corrected approach for joining with newlines to avoid f-string backslash issue:
-        inner_js_object_string = ",\n".join(js_book_entry_parts)
-        js_object_parts.append(f"    '{key}': {{\n{inner_js_object_string}\n    }}")
-
-    book_data_js_content = "window.bookCipherBooks = {\n"
-    book_data_js_content += ",\n".join(js_object_parts)
-    book_data_js_content += "\n};\n"
+            print(f"Error writing {catalogue_path}: {e}")
 
+    # The precache manifest hashes the catalogue files, so it is written after them.
+    precache_shell_paths = [os.path.join(SRC_DIR, *url.split('/')) for url in PRECACHE_SHELL_FILES]
+    precache_shell_paths += [catalogue_path for catalogue_path, _ in catalogue_files]
+    print(f"\nGenerating {PRECACHE_MANIFEST_PATH}...")
     try:
-        with open(BOOK_DATA_JS_PATH, 'w', encoding='utf-8') as f_js:
-            f_js.write(book_data_js_content)
-        print(f"Successfully wrote {BOOK_DATA_JS_PATH}")
+        if write_if_changed(PRECACHE_MANIFEST_PATH, render_precache_manifest_js(precache_shell_paths, current_records)):
+            print(f"Successfully wrote {PRECACHE_MANIFEST_PATH}")
+        else:
+            print(f"{PRECACHE_MANIFEST_PATH} is up to date.")
     except IOError as e:
-        print(f"Error writing {BOOK_DATA_JS_PATH}: {e}")
+        print(f"Error writing {PRECACHE_MANIFEST_PATH}: {e}")
+
+    save_build_manifest(current_records)
+
+    book_rows = [(record["bookKey"], asset_size_totals(book_asset_sizes(source_relpath, record)))
+                 for source_relpath, record in current_records.items()]
+    catalogue_rows = [(os.path.basename(catalogue_path), asset_size_totals(file_asset_sizes(catalogue_path) if os.path.exists(catalogue_path) else {}))
+                      for catalogue_path, _ in catalogue_files]
+    catalogue_totals = collections.Counter()
+    for _, totals in catalogue_rows:
+        catalogue_totals.update(totals)
+    print_size_report(book_rows + catalogue_rows)
+    within_budget = check_size_budgets(book_rows, catalogue_totals, book_budget, total_budget)
 
     print("\nScript execution finished.")
+    return within_budget
 
-if __name__ == '__main__':
-    # Self-tests for Morse translation (can be kept or removed for production script)
+# --- Round-trip Verification ---
+# Every generated Morse file is decoded and compared with its normalised source, so assets can
+# be checked offline before a release.
+MORSE_FILE_SUFFIX = "_morse.txt"
+MISMATCH_WORD_CONTEXT_CHARS = 64 # Longest word quoted in a mismatch report
+
+# First difference between a source and its decoded Morse. offset counts characters of the
+# expected text (see encodable_text); word_index counts ' '-separated words, which is also the
+# index of the word between ' / ' separators in the Morse file.
+MorseMismatch = collections.namedtuple("MorseMismatch", ["offset", "word_index", "expected_word", "actual_word"])
+VerifyResult = collections.namedtuple("VerifyResult", ["morse_path", "mismatch", "error"])
+
+def _next_buffer(buffer: str, chunks) -> str:
+    """Returns buffer, or the next non-empty chunk when buffer is used up ('' once exhausted)."""
+    while not buffer:
+        buffer = next(chunks, None)
+        if buffer is None:
+            return ''
+    return buffer
+
+def _read_word(word_prefix: str, buffer: str, chunks) -> str:
+    """Completes the word that starts with word_prefix and continues in buffer."""
+    while ' ' not in buffer and len(buffer) < MISMATCH_WORD_CONTEXT_CHARS:
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        buffer += chunk
+    return (word_prefix + buffer.split(' ', 1)[0])[:MISMATCH_WORD_CONTEXT_CHARS]
+
+def find_first_difference(expected_chunks, actual_chunks):
+    """Compares two text streams chunked differently. Returns None if equal, else a MorseMismatch."""
+    expected_chunks, actual_chunks = iter(expected_chunks), iter(actual_chunks)
+    expected = actual = ''
+    offset = 0 # Characters matched so far
+    word_index = 0
+    word_prefix = '' # Matched characters of the current word
+    while True:
+        expected = _next_buffer(expected, expected_chunks)
+        actual = _next_buffer(actual, actual_chunks)
+        if not expected and not actual:
+            return None
+        length = min(len(expected), len(actual))
+        if expected[:length] != actual[:length]:
+            length = next(i for i in range(length) if expected[i] != actual[i])
+        matched = expected[:length]
+        spaces = matched.count(' ')
+        if spaces:
+            word_index += spaces
+            word_prefix = matched[matched.rfind(' ') + 1:]
+        else:
+            word_prefix = (word_prefix + matched)[-MISMATCH_WORD_CONTEXT_CHARS:]
+        offset += length
+        expected, actual = expected[length:], actual[length:]
+        # Text left in both buffers means they differ here; nothing matched means one stream ended.
+        if (expected and actual) or not length:
+            return MorseMismatch(offset, word_index,
+                                 _read_word(word_prefix, expected, expected_chunks),
+                                 _read_word(word_prefix, actual, actual_chunks))
+
+def verify_morse_file(morse_path: str) -> VerifyResult:
+    """Decodes one Morse file and compares it with the normalised content of its English source."""
+    book_key = os.path.basename(morse_path)[:-len(MORSE_FILE_SUFFIX)]
+    json_path = os.path.join(ENGLISH_SOURCES_DIR, f"{book_key}.json")
+    if not os.path.isfile(json_path):
+        return VerifyResult(morse_path, None, f"no English source at {json_path}")
+    try:
+        _, content_member_index = read_book_metadata(json_path)
+        content_chunks = iter_book_content(json_path, content_member_index) if content_member_index is not None else ()
+        expected_chunks = map(encodable_text, iter_normalized_chunks(content_chunks))
+        actual_chunks = iter_morse_to_english(iter_file_chunks(morse_path))
+        return VerifyResult(morse_path, find_first_difference(expected_chunks, actual_chunks), None)
+    except (OSError, ValueError) as e: # ValueError includes json.JSONDecodeError
+        return VerifyResult(morse_path, None, str(e))
+
+def verify_morse_files(jobs: int = 1) -> bool:
+    """Round-trips every generated Morse file in parallel. Returns True when all of them match."""
+    morse_paths = sorted(glob.glob(os.path.join(MORSE_CODE_BASE_DIR, f"*{MORSE_FILE_SUFFIX}")))
+    print(f"Verifying {len(morse_paths)} Morse file(s) in {MORSE_CODE_BASE_DIR} (jobs: {jobs}).")
+    if jobs <= 1 or len(morse_paths) <= 1:
+        results = map(verify_morse_file, morse_paths)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(verify_morse_file, morse_paths)
+    failures = 0
+    try:
+        for result in results:
+            morse_filename = os.path.basename(result.morse_path)
+            if result.error is not None:
+                failures += 1
+                print(f"  ERROR {morse_filename}: {result.error}")
+            elif result.mismatch is not None:
+                failures += 1
+                mismatch = result.mismatch
+                print(f"  MISMATCH {morse_filename}: word {mismatch.word_index} at text offset {mismatch.offset}: "
+                      f"expected {mismatch.expected_word!r}, decoded {mismatch.actual_word!r}")
+            else:
+                print(f"  OK {morse_filename}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if failures:
+        print(f"{failures} of {len(morse_paths)} Morse file(s) FAILED verification.")
+    else:
+        print(f"All {len(morse_paths)} Morse file(s) match their sources.")
+    return not failures
+
+def run_self_tests() -> bool:
+    """Runs the Morse translation self-tests and returns True when all of them pass."""
     print("Running Morse Translation Self-tests:")
     test_cases = {
         "HELLO WORLD": ".... . .-.. .-.. --- / .-- --- .-. .-.. -..", "SOS": "... --- ...",
@@ -207,7 +2051,418 @@ if __name__ == '__main__':
         is_correct = (actual_morse == expected_morse)
         if not is_correct: all_tests_passed = False
         print(f"  Input: \"{text}\" -> Expected: \"{expected_morse}\" -> Actual: \"{actual_morse}\" --- {'OK' if is_correct else 'FAIL'}")
+
+    # The table-driven encoder must match the reference encoder byte-for-byte, including
+    # characters that only become encodable after upper-casing and ones that are dropped.
+    parity_cases = list(test_cases) + [
+        "straße ﬁne ıdea", "Price: $5 @ noon; \"quoted\" (yes) _under_ a+b=c & d/e",
+        "**Bold** # heading\n\n`code`\ttab", "***", "   ", "\x80\x00é",
+    ]
+    for text in parity_cases:
+        is_correct = english_to_morse(text) == english_to_morse_reference(text)
+        if not is_correct: all_tests_passed = False
+        print(f"  Parity with reference for {text!r} --- {'OK' if is_correct else 'FAIL'}")
+    is_correct = english_to_morse_many(parity_cases) == [english_to_morse_reference(text) for text in parity_cases]
+    if not is_correct: all_tests_passed = False
+    print(f"  Batch encoding of {len(parity_cases)} texts --- {'OK' if is_correct else 'FAIL'}")
+
+    # The streaming pipeline must produce exactly what the in-memory path produces, whatever
+    # the chunk size, including escapes, surrogate pairs and whitespace runs cut by a chunk boundary.
+    stream_contents = [
+        "", "\n\n", "  # Title\r\n\r\n**Bold**  text\n\n\tindented \u00e9 \U0001F600 \"quoted\" back\\slash/  ",
+        "A" * 40 + " \n \n " + "b\\" * 7 + "\u2028end\n",
+    ]
+    streaming_ok = True
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, "book.json")
+        morse_path = os.path.join(temp_dir, "book_morse.txt")
+        for content in stream_contents:
+            for ensure_ascii in (True, False):
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump({"title": "T", CONTENT_MARKDOWN_KEY: content, "isPro": True}, f, ensure_ascii=ensure_ascii)
+                expected = english_to_morse(normalize_markdown_for_morse(content))
+                metadata, content_member_index = read_book_metadata(json_path)
+                for chunk_chars in (1, 2, 3, 5, 7, 13, STREAM_CHUNK_CHARS):
+                    chunks = iter_book_content(json_path, content_member_index, chunk_chars)
+                    write_morse_file(iter_morse_chunks(iter_normalized_chunks(chunks)), morse_path)
+                    with open(morse_path, 'r', encoding='utf-8') as f:
+                        actual = f.read()
+                    is_correct = actual == expected and metadata == {"title": "T", "isPro": True}
+                    if not is_correct:
+                        streaming_ok = False
+                        print(f"  Streaming {content!r} (chunk {chunk_chars}, ascii {ensure_ascii}) --- FAIL")
+    # Sharded encoding must join paragraph shards exactly like the unsharded text, including
+    # shards that are whitespace-only or produce no Morse at all.
+    shard_contents = stream_contents + ["***\n\nA\n\n\n***\r\n  \n\nB C\n", "\n\n  \n\n", "x\n\n" * 20]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        for content in shard_contents:
+            expected = english_to_morse(normalize_markdown_for_morse(content))
+            for shard_chars in (1, 2, 4, 9):
+                chunks = [content[i:i + 3] for i in range(0, len(content), 3)]
+                actual = b''.join(iter_sharded_morse_chunks(chunks, executor, 2, shard_chars)).decode('ascii')
+                if actual != expected:
+                    streaming_ok = False
+                    print(f"  Sharded {content!r} (shard {shard_chars}) --- FAIL")
+    if not streaming_ok: all_tests_passed = False
+    print(f"  Streaming and sharded pipeline parity --- {'OK' if streaming_ok else 'FAIL'}")
+
+    # Decoding must invert encoding for every supported character, whatever the chunking of the
+    # Morse stream, and a tampered stream must be reported at the exact differing word.
+    decoding_ok = all(morse_signal_to_char(signal) == char for char, signal in MORSE_CODE_MAP.items())
+    decoding_ok = decoding_ok and morse_signal_to_char('........') == '' and morse_to_english('.- ...... -...') == 'A\ufffdB'
+    decoding_ok = decoding_ok and morse_to_english('.- / -...\n') == 'A B'
+    for text in parity_cases + stream_contents + shard_contents:
+        morse = english_to_morse(text).encode('ascii')
+        expected = encodable_text(text)
+        for chunk_bytes in (1, 2, 3, 7, DECODE_CHUNK_BYTES):
+            chunks = [morse[i:i + chunk_bytes] for i in range(0, len(morse), chunk_bytes)]
+            if ''.join(iter_morse_to_english(chunks)) != expected:
+                decoding_ok = False
+                print(f"  Decoding {text!r} (chunk {chunk_bytes}) --- FAIL")
+    difference_cases = [
+        ("HELLO WORLD", ["HEL", "LO WORLD"], None),
+        ("HELLO WORLD", ["HELLO", " WORD"], MorseMismatch(9, 1, "WORLD", "WORD")),
+        ("HELLO WORLD", ["HELL", "O"], MorseMismatch(5, 0, "HELLO", "HELLO")),
+        ("A B", ["A B C"], MorseMismatch(3, 1, "B", "B")),
+        ("", ["X"], MorseMismatch(0, 0, "", "X")),
+    ]
+    for expected_text, actual_chunks, expected_mismatch in difference_cases:
+        expected_chunks = [expected_text[i:i + 2] for i in range(0, len(expected_text), 2)]
+        if find_first_difference(expected_chunks, actual_chunks) != expected_mismatch:
+            decoding_ok = False
+            print(f"  First difference of {expected_text!r} vs {actual_chunks!r} --- FAIL")
+    if not decoding_ok: all_tests_passed = False
+    print(f"  Morse decoding round trip --- {'OK' if decoding_ok else 'FAIL'}")
+
+    # The word/letter index must describe exactly the words bookCipher.js gets by splitting the
+    # Morse text on '/' and ' ', whatever the chunking of the file it is built from.
+    index_ok = True
+    with tempfile.TemporaryDirectory() as temp_dir:
+        morse_path = os.path.join(temp_dir, "book_morse.txt")
+        index_path = os.path.join(temp_dir, "book_morse_index.json")
+        # Astral characters, CRLF, no-break spaces and dropped glyphs inside words shift the source alignment.
+        alignment_cases = ["  # Héllo, **wörld**!\r\n\r\n Straße ﬁne\tcafé 😀 don’t\u00a0stop \n end.😀x \n"]
+        for text in parity_cases + stream_contents + shard_contents + alignment_cases:
+            morse = english_to_morse(normalize_markdown_for_morse(text))
+            expected_words = [letters for letters in (word.strip().split(' ') for word in morse.split('/')) if letters != ['']]
+            write_morse_file([morse.encode('ascii')], morse_path)
+            chars_by_signal = {signal: char for char, signal in MORSE_CODE_MAP.items()}
+            expected_counts = collections.Counter(chars_by_signal[signal] for word in expected_words for signal in word)
+            for chunk_bytes in (1, 2, 5, DECODE_CHUNK_BYTES):
+                if write_morse_index(morse_path, index_path, chunk_bytes)[0] != expected_counts:
+                    index_ok = False
+                    print(f"  Letter counts of {text!r} (chunk {chunk_bytes}) --- FAIL")
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                starts, letters = index["wordStarts"], index["letters"]
+                words = [[index["symbols"][symbol_id] for symbol_id in letters[starts[w]:starts[w + 1]]]
+                         for w in range(index["wordCount"])]
+                if words != expected_words or starts[-1] != len(letters):
+                    index_ok = False
+                    print(f"  Word/letter index of {text!r} (chunk {chunk_bytes}) --- FAIL")
+            binary_path = os.path.join(temp_dir, "book_morse.bin")
+            write_morse_binary(morse_path, binary_path, chunk_bytes=3)
+            with open(binary_path, 'rb') as f:
+                binary = f.read()
+            word_count = MORSE_BINARY_HEADER.unpack_from(binary)[2]
+            letter_bytes = len(binary) - MORSE_BINARY_HEADER.size - max(word_count - 1, 0)
+            if read_morse_binary(binary) != expected_words or word_count != len(expected_words) or letter_bytes != sum(map(len, expected_words)):
+                index_ok = False
+                print(f"  Binary Morse of {text!r} --- FAIL")
+            # The dictionary-coded form must decode to the same words, each distinct word stored once.
+            dictionary_path = os.path.join(temp_dir, "book_morse_dict.bin")
+            write_morse_dictionary(morse_path, dictionary_path, chunk_bytes=3)
+            with open(dictionary_path, 'rb') as f:
+                dictionary_words = read_morse_dictionary(f.read())
+            if dictionary_words != expected_words or len({id(word) for word in dictionary_words}) != len(set(map(tuple, expected_words))):
+                index_ok = False
+                print(f"  Dictionary-coded Morse of {text!r} --- FAIL")
+            # Pages concatenated in order must give the same words, with only the last page short.
+            pages_dir = os.path.join(temp_dir, "book_pages")
+            for page_words in (1, 2, 3, MORSE_PAGE_WORDS):
+                write_morse_pages(morse_path, pages_dir, "assets/book_pages", page_words, chunk_bytes=3,
+                                  content_chunks=[text[i:i + 3] for i in range(0, len(text), 3)])
+                with open(os.path.join(pages_dir, MORSE_PAGE_MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                paged_words = []
+                for page_number in range(manifest["pageCount"]):
+                    with open(os.path.join(pages_dir, _page_filename(page_number)), 'r', encoding='utf-8') as f:
+                        page = json.load(f)
+                    starts, letters = page["wordStarts"], page["letters"]
+                    is_correct = page["firstWord"] == len(paged_words) and (page["wordCount"] == page_words or page_number == manifest["pageCount"] - 1)
+                    paged_words.extend([manifest["symbols"][symbol_id] for symbol_id in letters[starts[w]:starts[w + 1]]]
+                                       for w in range(page["wordCount"]))
+                    if not is_correct: paged_words.append(None)
+                page_files = len(os.listdir(pages_dir))
+                # The content hash covers the words only, so it must not depend on the page size.
+                expected_hash = hashlib.sha256(''.join(''.join(MORSE_SYMBOL_IDS[morse_signal_to_char(signal)] for signal in word) + ' '
+                                                       for word in expected_words).encode('ascii')).hexdigest()
+                if (paged_words != expected_words or manifest["wordCount"] != len(expected_words) or page_files != 4 * manifest["pageCount"] + 1
+                        or manifest["contentHash"] != expected_hash):
+                    index_ok = False
+                    print(f"  Pages of {text!r} ({page_words} words per page) --- FAIL")
+                # Every letter must point at a character that encodes to it, in the markdown and the normalised text.
+                markdown_units = text.encode('utf-16-le')
+                source_units = normalize_markdown_for_morse(text).encode('utf-16-le')
+                unit_at = lambda units, offset: units[2 * offset:2 * offset + 2].decode('utf-16-le', 'replace')
+                letter_end = (0, 0)
+                paged_markdown = ''
+                alignment_ok = True
+                for page_number in range(manifest["pageCount"]):
+                    with open(os.path.join(pages_dir, _alignment_filename(page_number)), 'r', encoding='utf-8') as f:
+                        alignment = json.load(f)
+                    with open(os.path.join(pages_dir, _page_filename(page_number)), 'r', encoding='utf-8') as f:
+                        page = json.load(f)
+                    alignment_ok = alignment_ok and (alignment["markdownBefore"], alignment["sourceBefore"]) == letter_end
+                    # Each page's markdown starts where its alignment does; all of them give the text back.
+                    with open(os.path.join(pages_dir, _markdown_filename(page_number)), 'r', encoding='utf-8', newline='') as f:
+                        page_markdown = f.read()
+                    alignment_ok = alignment_ok and markdown_units[:2 * alignment["markdownBefore"]].decode('utf-16-le') == paged_markdown
+                    paged_markdown += page_markdown
+                    steps = alignment["runs"]
+                    run_starts = list(itertools.accumulate(zip(steps[0::3], steps[1::3], steps[2::3]),
+                                                           lambda a, b: tuple(map(sum, zip(a, b))),
+                                                           initial=(0, alignment["markdownBefore"], alignment["sourceBefore"])))[1:]
+                    run_index = 0
+                    for letter_index, symbol_id in enumerate(page["letters"]):
+                        while run_index + 1 < len(run_starts) and run_starts[run_index + 1][0] <= letter_index:
+                            run_index += 1
+                        run_letter, markdown, source = run_starts[run_index]
+                        markdown += letter_index - run_letter
+                        source += letter_index - run_letter
+                        char = unit_at(markdown_units, markdown)
+                        letter = morse_signal_to_char(manifest["symbols"][symbol_id])
+                        alignment_ok = alignment_ok and letter in char.upper() and unit_at(source_units, source) == char
+                        letter_end = (markdown + 1, source + 1)
+                if not alignment_ok or (manifest["pageCount"] and paged_markdown != text):
+                    index_ok = False
+                    print(f"  Source alignment of {text!r} ({page_words} words per page) --- FAIL")
+                # Page schedules played back to back must give the schedule of the whole book.
+                book_schedule = morse_schedule(expected_words)
+                joined = {key: [] for key in ("onsetUnits", "onsetSpacing", "wordIds")}
+                joined_tones, units, spacing = '', 0, 0
+                for page_number in range(manifest["pageCount"]):
+                    with open(os.path.join(pages_dir, _schedule_filename(page_number)), 'r', encoding='utf-8') as f:
+                        packed = json.load(f)
+                    schedule = {"firstWord": packed["firstWord"], **unpack_morse_schedule(packed)}
+                    joined_tones += schedule["tones"]
+                    joined["onsetUnits"].extend(units + onset for onset in schedule["onsetUnits"])
+                    joined["onsetSpacing"].extend(spacing + onset for onset in schedule["onsetSpacing"])
+                    joined["wordIds"].extend(schedule["firstWord"] + word_id for word_id in schedule["wordIds"])
+                    units += schedule["totalUnits"]
+                    spacing += schedule["totalSpacing"]
+                if (joined_tones != book_schedule["tones"] or any(joined[key] != book_schedule[key] for key in joined)
+                        or (units, spacing) != (book_schedule["totalUnits"], book_schedule["totalSpacing"])
+                        or (manifest["totalUnits"], manifest["totalSpacing"]) != (units, spacing)):
+                    index_ok = False
+                    print(f"  Page schedules of {text!r} ({page_words} words per page) --- FAIL")
+    if not index_ok: all_tests_passed = False
+    for value in (0, 1, 127, 128, 300, 16383, 16384, 2**32 - 1):
+        if _read_varint(b'\x00' + encode_varint(value), 1) != (value, 1 + len(encode_varint(value))):
+            index_ok = False
+            print(f"  Varint round trip of {value} --- FAIL")
+    print(f"  Word/letter index, binary, dictionary-coded Morse and pages --- {'OK' if index_ok else 'FAIL'}")
+
+    # PARIS plus a word gap is the 50 units that define wpm: 31 in its elements, 19 in its gaps.
+    schedule_ok = True
+    paris = [[MORSE_CODE_MAP[char] for char in "PARIS"]]
+    schedule = morse_schedule(paris, trailing_word_gap=True)
+    if (schedule["totalUnits"], schedule["totalSpacing"]) != (31, 19) or schedule["tones"] != ''.join(paris[0]):
+        schedule_ok = False
+    times, total = schedule_seconds(schedule, 0.06, 0.12) # 20 wpm characters at 10 wpm Farnsworth
+    if times[:2] != [(0.0, 0.06), (0.12, 0.3)] or abs(total - (31 * 0.06 + 19 * 0.12)) > 1e-9:
+        schedule_ok = False
+    two_words = morse_schedule([['.-'], ['-', '.']])
+    if (two_words["onsetUnits"], two_words["onsetSpacing"], two_words["wordIds"], two_words["letterIds"]) != ([0, 2, 5, 8], [0, 0, 7, 10], [0, 0, 1, 1], [0, 0, 0, 1]):
+        schedule_ok = False
+    if morse_schedule([], trailing_word_gap=True)["totalSpacing"] != 0:
+        schedule_ok = False
+    if pack_morse_schedule(two_words)["gaps"] != "1730":
+        schedule_ok = False
+    for words in ([], paris, [['.-'], ['-', '.']], [[MORSE_CODE_MAP[char] for char in word] for word in "SOS AT SEA, 73!".split()]):
+        for trailing_word_gap in (False, True):
+            schedule = morse_schedule(words, trailing_word_gap)
+            symbol_words = [''.join(map(MORSE_SYMBOL_IDS.get, map(morse_signal_to_char, word))) for word in words]
+            if (unpack_morse_schedule(pack_morse_schedule(schedule)) != schedule
+                    or pack_page_schedule(symbol_words, trailing_word_gap) != pack_morse_schedule(schedule)):
+                schedule_ok = False
+                print(f"  Packed schedule of {words!r} --- FAIL")
+    if not schedule_ok: all_tests_passed = False
+    print(f"  Playback schedules --- {'OK' if schedule_ok else 'FAIL'}")
+
+    # Precompressed siblings must decompress to the asset, and are dropped when not smaller.
+    compression_ok = True
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asset_path = os.path.join(temp_dir, "book_morse.txt")
+        asset = english_to_morse("the quick brown fox jumps over the lazy dog " * 50).encode('ascii')
+        with open(asset_path, 'wb') as f:
+            f.write(asset)
+        kept_paths = write_precompressed(asset_path)
+        decompressors = {GZIP_SUFFIX: gzip.decompress, BROTLI_SUFFIX: brotli.decompress if brotli else None}
+        for suffix in available_precompressed_suffixes():
+            with open(asset_path + suffix, 'rb') as f:
+                if asset_path + suffix not in kept_paths or decompressors[suffix](f.read()) != asset:
+                    compression_ok = False
+                    print(f"  Precompressed {suffix} round trip --- FAIL")
+        with open(asset_path, 'wb') as f:
+            f.write(b".-") # Too short to shrink; the siblings written above are now stale
+        if write_precompressed(asset_path) or any(os.path.exists(asset_path + suffix) for suffix in PRECOMPRESSED_SUFFIXES):
+            compression_ok = False
+            print("  Incompressible asset left precompressed siblings --- FAIL")
+    expected_totals = {"raw": 300, "gzip": 140, "brotli": 230, "transfer": 130}
+    if asset_size_totals({"a": 100, "a.gz": 40, "a.br": 30, "b": 200, "b.gz": 100}) != expected_totals:
+        compression_ok = False
+        print("  Asset size totals --- FAIL")
+    if not compression_ok: all_tests_passed = False
+    print(f"  Precompressed assets --- {'OK' if compression_ok else 'FAIL'}")
+
+    # The search index must map every token and facet value to the sorted positions of its books.
+    search_index = build_search_index({
+        "b1": {"title": "The Sign of Four", "author": "A. C. Doyle", "genre": "Mystery", "lengthCategory": "Short", "isPro": False},
+        "b2": {"title": "Four Winds", "description": "Sci-fi, in_four parts.", "genre": "Sci-Fi", "lengthCategory": "Short", "isPro": True},
+        "b3": {"title": "Mystery at Four", "genre": "Mystery", "lengthCategory": "Long", "isPro": False},
+    })
+    postings = dict(zip(search_index["terms"], search_index["postings"]))
+    facet_ids = {(field, facet["value"]): facet["ids"] for field, values in search_index["facets"].items() for facet in values}
+    search_index_ok = (search_index["ids"] == ["b1", "b2", "b3"] and postings["four"] == [0, 1, 2]
+                       and postings["mystery"] == [0, 2] and postings["sci"] == [1] and postings["in"] == [1]
+                       and "in_four" not in postings and facet_ids[("genre", "Mystery")] == [0, 2]
+                       and facet_ids[("lengthCategory", "Short")] == [0, 1] and facet_ids[("isPro", True)] == [1]
+                       and all(facet["count"] == len(facet["ids"]) for values in search_index["facets"].values() for facet in values))
+    if not search_index_ok: all_tests_passed = False
+    print(f"  Catalogue search index --- {'OK' if search_index_ok else 'FAIL'}")
+
+    # Shell revisions follow the file content, missing files are left out,
+    # and a book's cache paths cover its source, its files and its page directory, never a precompressed name.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        shell_path = os.path.join(temp_dir, "index.html")
+        with open(shell_path, 'w', encoding='utf-8') as f:
+            f.write("<html></html>")
+        assets_relpath = "src/assets/book_cipher_texts"
+        record = {"bookKey": "b1", "sourceSha256": "0" * 64, "encoderVersion": ENCODER_VERSION, "buildOptions": {},
+                  "outputs": {f"{assets_relpath}/b1_morse.txt": 1, f"{assets_relpath}/b1_morse.txt.gz": 1,
+                              f"{assets_relpath}/english_sources/b1.json.br": 1,
+                              f"{assets_relpath}/b1{MORSE_PAGES_SUFFIX}/{_page_filename(0)}": 1,
+                              f"{assets_relpath}/b1{MORSE_PAGES_SUFFIX}/{MORSE_PAGE_MANIFEST_NAME}": 1}}
+        warnings = io.StringIO()
+        with contextlib.redirect_stdout(warnings): # Expected warning, kept out of the build log
+            precache = build_precache_manifest([shell_path, os.path.join(temp_dir, "missing.js")],
+                                               {f"{assets_relpath}/english_sources/b1.json": record}, root=temp_dir)
+        revision = hashlib.sha256(b"<html></html>").hexdigest()[:PRECACHE_REVISION_CHARS]
+        precache_ok = ([entry["url"] for entry in precache["shell"]] == [PRECACHE_START_URL, "index.html"]
+                       and all(entry["revision"] == revision for entry in precache["shell"])
+                       and "missing.js" in warnings.getvalue()
+                       and precache["books"]["b1"]["paths"] == ["assets/book_cipher_texts/b1_morse.txt",
+                                                                f"assets/book_cipher_texts/b1{MORSE_PAGES_SUFFIX}/",
+                                                                "assets/book_cipher_texts/english_sources/b1.json"]
+                       and precache["books"]["b1"]["revision"] != book_asset_revision({**record, "encoderVersion": ENCODER_VERSION + 1}))
+    if not precache_ok: all_tests_passed = False
+    print(f"  Service worker precache manifest --- {'OK' if precache_ok else 'FAIL'}")
+
+    # Walking the shipped tree string element by element, as the app does, must give every character back.
+    tree = morse_decode_tree_string()
+    tree_ok = len(tree) == len(MORSE_DICHOTOMIC_TABLE) and MORSE_DECODE_TREE_EMPTY not in MORSE_CODE_MAP
+    for char, signal in MORSE_CODE_MAP.items():
+        if char == ' ':
+            continue
+        node = 1
+        for element in signal:
+            node = 2 * node + (element == '-')
+        tree_ok = tree_ok and tree[node] == char
+    swift_sample = 'morseCodeDictionary: [String: String] = [\n    ".-": "A", ".-..-.": "\\"", "...---...": "SOS"\n    ]'
+    tree_ok = tree_ok and swift_morse_signals(swift_sample) == {".-": "A", ".-..-.": '"', "...---...": "SOS"}
+    if not tree_ok: all_tests_passed = False
+    print(f"  Runtime Morse decode tree --- {'OK' if tree_ok else 'FAIL'}")
+
+    # Every node lists each character at or below it once, most frequent across the books first.
+    candidates = build_morse_prefix_candidates(corpus_letter_counts({"a": {"letterCounts": {"T": 3, "N": 1}},
+                                                                     "b": {"letterCounts": {"N": 4}}, "c": {}}))
+    prefix_ok = (len(candidates) == len(MORSE_DICHOTOMIC_TABLE) and candidates[2 * 1 + 1].startswith("NT")
+                 and candidates[2 * 3].startswith("NBCDKXY") and candidates[2 * 2 + 1] == "AJLPRW1.'&+\"@")
+    signals = {char: signal for char, signal in MORSE_CODE_MAP.items() if char != ' '}
+    for node, node_candidates in enumerate(candidates):
+        prefix = bin(node)[3:].replace('0', '.').replace('1', '-') if node else None # Path from the root
+        below = {char for char, signal in signals.items() if prefix is not None and signal.startswith(prefix)}
+        prefix_ok = prefix_ok and len(node_candidates) == len(below) and set(node_candidates) == below
+    if not prefix_ok: all_tests_passed = False
+    print(f"  Predictive display prefix index --- {'OK' if prefix_ok else 'FAIL'}")
+
+    # Words are kept per level from symbol-id counts; every bank uses only its level's characters, the
+    # level's new words mostly come first, and the draws do not depend on the order of the counts.
+    symbol_counts = {word.translate(MORSE_SYMBOL_ID_TRANSLATION): count for word, count in
+                     {"KM": 2, "MARK": 5, "STORM": 9, "SUM": 4, "DON'T": 50, "K": 7, "...": 3, "1984.": 2}.items()}
+    koch_words = koch_drill_words(symbol_counts, from_symbol_ids=True)
+    banks = build_koch_drill_banks(koch_words)
+    koch_ok = (koch_words == {"KM": 2, "MARK": 5, "STORM": 9, "SUM": 4, "1984.": 2}
+               and koch_level("KM") == 2 and koch_level("MARK") == 6 and koch_level("DON'T") == 0
+               and banks[:KOCH_FIRST_LEVEL] == [None] * KOCH_FIRST_LEVEL and len(banks) == len(KOCH_CHARACTER_ORDER) + 1
+               and banks[KOCH_FIRST_LEVEL][0] == ["KM"] and sorted(banks[10][0]) == ["KM", "MARK", "STORM", "SUM"]
+               and banks == build_koch_drill_banks(dict(reversed(list(koch_words.items())))))
+    for level, bank in enumerate(banks[KOCH_FIRST_LEVEL:], KOCH_FIRST_LEVEL):
+        koch_ok = koch_ok and len(bank[1]) == KOCH_BANK_GROUPS and all(
+            0 < koch_level(item) <= level for item in bank[0] + bank[1])
+    many = {f"M{'K' * n}": 1 for n in range(1, 40)} # Level 2
+    many.update({f"S{'K' * n}": 1 for n in range(1, 40)}) # Level 4, new there
+    koch_ok = koch_ok and sum(koch_level(word) == 4 for word in build_koch_drill_banks(many)[4][0][:20]) > 10
+    if not koch_ok: all_tests_passed = False
+    print(f"  Koch drill banks --- {'OK' if koch_ok else 'FAIL'}")
+
     if all_tests_passed: print("All Morse translation self-tests PASSED.\n")
     else: print("Some Morse translation self-tests FAILED.\n")
+    return all_tests_passed
+
+def parse_byte_size(text: str) -> int:
+    """Parses a byte count with an optional K/M/G suffix (powers of 1024), e.g. '750K'."""
+    multipliers = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().removesuffix("B")
+    try:
+        if text and text[-1] in multipliers:
+            return int(float(text[:-1]) * multipliers[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generates Morse book assets and bookData.js from the English sources.")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes used to encode books (0 = one per CPU; default: 1).")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every book, ignoring the incremental build manifest.")
+    parser.add_argument("--verify", action="store_true",
+                        help="Decode every generated Morse file and compare it with its source instead of building.")
+    parser.add_argument("--check-morse-tables", action="store_true",
+                        help="Compare the other copies of the Morse alphabet (app, iOS extension) with MORSE_CODE_MAP instead of building.")
+    parser.add_argument("--dictionary", action="store_true",
+                        help="Also write a dictionary-coded asset (shared word table plus word ids) for each book.")
+    parser.add_argument("--no-compress", dest="compress", action="store_false",
+                        help="Do not write .gz/.br siblings of the generated assets.")
+    parser.add_argument("--book-budget", type=parse_byte_size, metavar="SIZE",
+                        help="Fail the build if any book's assets exceed SIZE bytes to transfer (e.g. 500K, 2M).")
+    parser.add_argument("--total-budget", type=parse_byte_size, metavar="SIZE",
+                        help="Fail the build if all assets together exceed SIZE bytes to transfer.")
+    parser.add_argument("--skip-self-tests", action="store_true",
+                        help="Do not run the self-tests first (for timing the build itself).")
+    args = parser.parse_args(argv)
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+if __name__ == '__main__':
+    args = parse_args()
+    # Self-tests for Morse translation; a failure stops before any asset is written or pruned
+    if not args.skip_self_tests and not run_self_tests():
+        sys.exit(1)
 
-    main()
+    if args.verify:
+        sys.exit(0 if verify_morse_files(jobs=args.jobs) else 1)
+    if args.check_morse_tables:
+        morse_table_problems = check_morse_tables()
+        for problem in morse_table_problems:
+            print(f"Morse table mismatch: {problem}")
+        for char, signal in SWIFT_MORSE_KNOWN_DIFFERENCES.items():
+            print(f"Known difference: {SWIFT_MORSE_CONVERTER_PATH} keys {char!r} as {signal}, not {MORSE_CODE_MAP[char]}.")
+        print("Morse tables are consistent." if not morse_table_problems else f"{len(morse_table_problems)} Morse table mismatch(es).")
+        sys.exit(1 if morse_table_problems else 0)
+    if not main(jobs=args.jobs, force=args.force, dictionary=args.dictionary, compress=args.compress,
+                book_budget=args.book_budget, total_budget=args.total_budget):
+        sys.exit(1)
@@ -0,0 +1,305 @@
+import os
+import sys
+import json
+import wave
+import hashlib
+import argparse
+import tempfile
+import itertools
+
+import numpy as np
+
+import generate_morse_files as morse
+
+# --- Constants ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, ".morse_audio_cache")
+# Bump whenever the rendered audio changes for the same Morse and parameters, to invalidate the cache.
+RENDERER_VERSION = 1
+DEFAULT_WPM = 20 # Same defaults as the sliders in main.js
+DEFAULT_FARNSWORTH_WPM = 20
+DEFAULT_FREQUENCY = 600
+DEFAULT_SAMPLE_RATE = 22050
+RAMP_SECONDS = 0.005 # Attack/release of every tone, as the gain ramps in playTone (main.js)
+AMPLITUDE = 0.8 # Peak level relative to full scale, leaving headroom
+RENDER_BLOCK_WORDS = 32 # Words synthesised at a time; bounds memory however long a page plays
+PLACEMENT_BATCH_SAMPLES = 1 << 20 # Samples written per vectorised store
+PAGE_TEXT_TRANSLATION = {ord(symbol_id): signal + ' ' for symbol_id, signal in morse._morse_index_symbols().items()}
+
+# --- Timing ---
+# Standard Morse timing, with the Farnsworth spacing of playMorseSequence/updateDurations (main.js):
+# a dot is one unit (1.2 / wpm seconds), a dash three, with one unit between the elements of a letter.
+# Letters are 3 and words 7 spacing units apart, where the spacing unit is 1.2 / farnsworthWpm when
+# farnsworthWpm is below wpm, and the character unit otherwise.
+def unit_seconds(wpm: float, farnsworth_wpm: float):
+    """Returns (character unit, spacing unit) in seconds."""
+    unit = 1.2 / wpm
+    spacing_unit = 1.2 / farnsworth_wpm if 0 < farnsworth_wpm < wpm else unit
+    return unit, spacing_unit
+
+def page_morse_text(words) -> bytes:
+    """Joins words (strings of symbol ids, as from iter_morse_words) into '.- -.../-..' form."""
+    return '/'.join(word.translate(PAGE_TEXT_TRANSLATION)[:-1] for word in words).encode('ascii')
+
+def element_times(page_text: bytes, unit: float, spacing_unit: float, trailing_word_gap: bool = False):
+    """Returns (onsets, durations, total) in seconds for the dots and dashes of page_text.
+
+    Every element is followed by the gap its successor calls for: one unit inside a letter, a
+    letter gap before ' ', a word gap before '/'. With trailing_word_gap the page ends with a word
+    gap, so consecutive pages play back to back with correct spacing.
+    """
+    symbols = np.frombuffer(page_text, dtype=np.uint8)
+    is_dot = symbols == ord('.')
+    is_dash = symbols == ord('-')
+    is_tone = is_dot | is_dash
+    following = np.append(symbols[1:], np.uint8(ord('/') if trailing_word_gap else 0))
+    following_is_tone = (following == ord('.')) | (following == ord('-'))
+    gap_after = np.select([following_is_tone, following == ord(' '), following == ord('/')],
+                          [unit, 3 * spacing_unit, 7 * spacing_unit], 0.0)
+    tone = np.where(is_dot, unit, np.where(is_dash, 3 * unit, 0.0))
+    step = np.where(is_tone, tone + gap_after, 0.0)
+    ends = np.cumsum(step)
+    onsets = ends - step
+    total = float(ends[-1]) if len(ends) else 0.0
+    return onsets[is_tone], tone[is_tone], total
+
+# --- Synthesis ---
+def tone_template(duration: float, frequency: float, sample_rate: int) -> np.ndarray:
+    """One shaped tone as 16-bit PCM: a sine with raised-cosine attack and release, so keying does not click."""
+    sample_count = int(round(duration * sample_rate))
+    samples = np.sin(2 * np.pi * frequency * np.arange(sample_count) / sample_rate)
+    ramp_count = min(int(round(RAMP_SECONDS * sample_rate)), sample_count // 2)
+    if ramp_count:
+        ramp = 0.5 - 0.5 * np.cos(np.pi * np.arange(ramp_count) / ramp_count)
+        samples[:ramp_count] *= ramp
+        samples[sample_count - ramp_count:] *= ramp[::-1]
+    return np.rint(samples * AMPLITUDE * 32767).astype('<i2')
+
+def render_samples(morse_text: bytes, wpm: float, farnsworth_wpm: float, frequency: float,
+                   sample_rate: int = DEFAULT_SAMPLE_RATE, trailing_word_gap: bool = False) -> np.ndarray:
+    """Renders Morse text ('.- -.../-..') to 16-bit PCM samples.
+
+    Onsets are rounded from cumulative times, so rounding never accumulates; each distinct
+    element length (dot or dash) is synthesised once and stored at all of its onsets with
+    batched fancy indexing instead of a per-element loop.
+    """
+    unit, spacing_unit = unit_seconds(wpm, farnsworth_wpm)
+    onsets, durations, total = element_times(morse_text, unit, spacing_unit, trailing_word_gap)
+    onset_samples = np.rint(onsets * sample_rate).astype(np.int64)
+    templates = {duration: tone_template(duration, frequency, sample_rate) for duration in np.unique(durations)}
+    # Rounding can push the last tone one sample past the rounded total.
+    end = max([int(round(total * sample_rate))] + [int(onset_samples[durations == duration].max()) + len(template)
+                                                      for duration, template in templates.items()])
+    signal = np.zeros(end, dtype='<i2')
+    for duration, template in templates.items():
+        starts = onset_samples[durations == duration]
+        batch = max(1, PLACEMENT_BATCH_SAMPLES // max(len(template), 1))
+        offsets = np.arange(len(template))
+        for batch_start in range(0, len(starts), batch):
+            positions = starts[batch_start:batch_start + batch, None] + offsets
+            signal[positions] = template
+    return signal
+
+# --- Book Rendering and Cache ---
+# Renders are stored under cache_dir/<book>/<key>.wav, where key hashes the Morse asset's content
+# and every parameter that affects the audio, so changed books or settings never hit stale audio
+# and repeated requests are plain file reads.
+_morse_hashes = {} # Morse path -> (size, mtime_ns, sha256), to hash each asset once per process
+
+def morse_content_hash(morse_path: str) -> str:
+    stat = os.stat(morse_path)
+    cached = _morse_hashes.get(morse_path)
+    if cached is None or cached[:2] != (stat.st_size, stat.st_mtime_ns):
+        cached = (stat.st_size, stat.st_mtime_ns, morse.hash_file(morse_path))
+        _morse_hashes[morse_path] = cached
+    return cached[2]
+
+def render_cache_key(morse_path: str, wpm: float, farnsworth_wpm: float, frequency: float, sample_rate: int,
+                     page: int = None, page_words: int = morse.MORSE_PAGE_WORDS) -> str:
+    parameters = {
+        "rendererVersion": RENDERER_VERSION, "morseSha256": morse_content_hash(morse_path),
+        "wpm": wpm, "farnsworthWpm": farnsworth_wpm, "frequency": frequency, "sampleRate": sample_rate,
+        "page": page, "pageWords": page_words if page is not None else None,
+    }
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode('utf-8')).hexdigest()
+
+def iter_pages(morse_path: str, page_words: int = morse.MORSE_PAGE_WORDS):
+    """Yields the book's words in pages of page_words, as the paged book assets split them."""
+    words = itertools.chain.from_iterable(morse.iter_morse_words(morse_path))
+    while True:
+        page = list(itertools.islice(words, page_words))
+        if not page:
+            return
+        yield page
+
+def _write_wav(path: str, sample_rate: int, sample_chunks):
+    """Writes mono 16-bit PCM chunks to path atomically."""
+    temp_path = path + ".tmp"
+    try:
+        with wave.open(temp_path, 'wb') as f_wav:
+            f_wav.setnchannels(1)
+            f_wav.setsampwidth(2)
+            f_wav.setframerate(sample_rate)
+            for samples in sample_chunks:
+                f_wav.writeframes(samples.tobytes())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _iter_word_samples(words, wpm, farnsworth_wpm, frequency, sample_rate, trailing_word_gap: bool):
+    """Renders words in blocks, each but the last followed by its word gap, so a page of slow Morse
+    (25 minutes at 20 wpm) never needs its whole signal in memory."""
+    for block_start in range(0, len(words), RENDER_BLOCK_WORDS):
+        block = words[block_start:block_start + RENDER_BLOCK_WORDS]
+        is_last_block = block_start + RENDER_BLOCK_WORDS >= len(words)
+        yield render_samples(page_morse_text(block), wpm, farnsworth_wpm, frequency, sample_rate,
+                             trailing_word_gap or not is_last_block)
+
+def _cached_audio_path(morse_path: str, cache_dir: str, key: str) -> str:
+    book_key = os.path.basename(morse_path).removesuffix(morse.MORSE_FILE_SUFFIX)
+    return os.path.join(cache_dir, book_key, f"{key}.wav")
+
+def render_book_pages(morse_path: str, wpm: float = DEFAULT_WPM, farnsworth_wpm: float = DEFAULT_FARNSWORTH_WPM,
+                      frequency: float = DEFAULT_FREQUENCY, sample_rate: int = DEFAULT_SAMPLE_RATE,
+                      page_numbers=None, page_words: int = morse.MORSE_PAGE_WORDS, cache_dir: str = DEFAULT_CACHE_DIR) -> list:
+    """Renders one WAV per page (all pages, or those in page_numbers) unless cached. Returns their paths in page order.
+
+    Every page but the book's last ends with a word gap, so page renders can be queued back to back.
+    """
+    paths = []
+    pages = iter_pages(morse_path, page_words)
+    current = next(pages, None)
+    page_number = 0
+    while current is not None:
+        following = next(pages, None) # One page of lookahead tells whether this page ends the book
+        if page_numbers is None or page_number in page_numbers:
+            key = render_cache_key(morse_path, wpm, farnsworth_wpm, frequency, sample_rate, page_number, page_words)
+            audio_path = _cached_audio_path(morse_path, cache_dir, key)
+            if not os.path.exists(audio_path):
+                os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+                _write_wav(audio_path, sample_rate, _iter_word_samples(current, wpm, farnsworth_wpm, frequency, sample_rate,
+                                                                       trailing_word_gap=following is not None))
+            paths.append(audio_path)
+            if page_numbers is not None and len(paths) == len(page_numbers):
+                break
+        current = following
+        page_number += 1
+    return paths
+
+def render_book_audio(morse_path: str, wpm: float = DEFAULT_WPM, farnsworth_wpm: float = DEFAULT_FARNSWORTH_WPM,
+                      frequency: float = DEFAULT_FREQUENCY, sample_rate: int = DEFAULT_SAMPLE_RATE,
+                      cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Renders the whole book to one WAV unless cached, streaming it page by page. Returns its path."""
+    key = render_cache_key(morse_path, wpm, farnsworth_wpm, frequency, sample_rate)
+    audio_path = _cached_audio_path(morse_path, cache_dir, key)
+    if not os.path.exists(audio_path):
+        os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+        pages = iter_pages(morse_path)
+        current = next(pages, None)
+        def iter_samples():
+            nonlocal current
+            while current is not None:
+                following = next(pages, None)
+                yield from _iter_word_samples(current, wpm, farnsworth_wpm, frequency, sample_rate,
+                                              trailing_word_gap=following is not None)
+                current = following
+        _write_wav(audio_path, sample_rate, iter_samples())
+    return audio_path
+
+def resolve_morse_path(book: str) -> str:
+    """Accepts a book key (e.g. passage_1) or a path to a *_morse.txt file."""
+    if os.path.isfile(book):
+        return book
+    return os.path.join(morse.MORSE_CODE_BASE_DIR, f"{book}{morse.MORSE_FILE_SUFFIX}")
+
+def run_self_tests() -> bool:
+    print("Running audio renderer self-tests...")
+    all_tests_passed = True
+
+    # Element timing in units: '.- -' is dot, gap, dash, letter gap, dash.
+    onsets, durations, total = element_times(b".- -", 1.0, 1.0)
+    timing_ok = list(onsets) == [0, 2, 8] and list(durations) == [1, 3, 3] and total == 11
+    # PARIS plus its word gap is the 50 units that define wpm; Farnsworth only stretches the 19 gap units.
+    paris = page_morse_text(["PARIS".translate(morse.MORSE_SYMBOL_ID_TRANSLATION)])
+    for wpm, farnsworth_wpm, expected_seconds in ((20, 20, 3.0), (20, 10, 31 * 0.06 + 19 * 0.12), (20, 30, 3.0)):
+        samples = render_samples(paris, wpm, farnsworth_wpm, DEFAULT_FREQUENCY, DEFAULT_SAMPLE_RATE, trailing_word_gap=True)
+        if len(samples) != round(expected_seconds * DEFAULT_SAMPLE_RATE):
+            timing_ok = False
+            print(f"  PARIS at {wpm}/{farnsworth_wpm} wpm is {len(samples) / DEFAULT_SAMPLE_RATE}s, expected {expected_seconds}s --- FAIL")
+    # The vectorised timing must match the reference schedule of the generator, Farnsworth included.
+    words = "THE QUICK BROWN FOX, 1984: JUMPS?".translate(morse.MORSE_SYMBOL_ID_TRANSLATION).split(' ')
+    symbols = morse._morse_index_symbols()
+    for trailing_word_gap in (False, True):
+        schedule = morse.morse_schedule(([symbols[symbol_id] for symbol_id in word] for word in words), trailing_word_gap)
+        expected_times, expected_total = morse.schedule_seconds(schedule, 0.06, 0.15)
+        onsets, durations, total = element_times(page_morse_text(words), 0.06, 0.15, trailing_word_gap)
+        if not (np.allclose(onsets, [onset for onset, _ in expected_times]) and np.isclose(total, expected_total)
+                and np.allclose(onsets + durations, [offset for _, offset in expected_times])):
+            timing_ok = False
+            print(f"  Timing differs from morse_schedule (trailing word gap: {trailing_word_gap}) --- FAIL")
+    if not timing_ok: all_tests_passed = False
+    print(f"  Element timing --- {'OK' if timing_ok else 'FAIL'}")
+
+    # Renders are cached by content and parameters; pages concatenate to the whole book.
+    cache_ok = True
+    with tempfile.TemporaryDirectory() as temp_dir:
+        morse_path = os.path.join(temp_dir, f"book{morse.MORSE_FILE_SUFFIX}")
+        morse.write_morse_file([morse.english_to_morse("SOS AT SEA. PARIS PARIS!").encode('ascii')], morse_path)
+        cache_dir = os.path.join(temp_dir, "cache")
+        page_paths = render_book_pages(morse_path, page_words=2, cache_dir=cache_dir)
+        book_path = render_book_audio(morse_path, cache_dir=cache_dir)
+        frames = []
+        for path in page_paths + [book_path]:
+            with wave.open(path, 'rb') as f_wav:
+                frames.append(f_wav.readframes(f_wav.getnframes()))
+        mtime = os.path.getmtime(book_path)
+        if (len(page_paths) != 3 or b''.join(frames[:-1]) != frames[-1] or render_book_audio(morse_path, cache_dir=cache_dir) != book_path
+                or os.path.getmtime(book_path) != mtime or render_book_audio(morse_path, frequency=700, cache_dir=cache_dir) == book_path
+                or render_book_pages(morse_path, page_numbers={1}, page_words=2, cache_dir=cache_dir) != page_paths[1:2]):
+            cache_ok = False
+    if not cache_ok: all_tests_passed = False
+    print(f"  Page renders and cache --- {'OK' if cache_ok else 'FAIL'}")
+
+    if all_tests_passed: print("All audio renderer self-tests PASSED.\n")
+    else: print("Some audio renderer self-tests FAILED.\n")
+    return all_tests_passed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-renders book Morse to WAV audio, cached by content and settings.")
+    parser.add_argument("book", help="Book key (e.g. passage_1) or path to a *_morse.txt file.")
+    parser.add_argument("--wpm", type=float, default=DEFAULT_WPM, help="Character speed (default: %(default)s).")
+    parser.add_argument("--farnsworth-wpm", type=float, default=DEFAULT_FARNSWORTH_WPM,
+                        help="Overall speed; below --wpm it stretches the gaps (default: %(default)s).")
+    parser.add_argument("--frequency", type=float, default=DEFAULT_FREQUENCY, help="Tone frequency in Hz (default: %(default)s).")
+    parser.add_argument("--sample-rate", type=int, default=DEFAULT_SAMPLE_RATE, help="Sample rate in Hz (default: %(default)s).")
+    parser.add_argument("--page", type=int, action="append", dest="pages", metavar="N",
+                        help="Render only page N (repeatable). By default every page is rendered.")
+    parser.add_argument("--whole-book", action="store_true", help="Render the whole book into a single file instead of pages.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Render cache directory (default: .morse_audio_cache).")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not run_self_tests():
+        return 1
+    morse_path = resolve_morse_path(args.book)
+    if not os.path.isfile(morse_path):
+        print(f"Error: Morse file not found: {morse_path}")
+        return 1
+    settings = dict(wpm=args.wpm, farnsworth_wpm=args.farnsworth_wpm, frequency=args.frequency,
+                    sample_rate=args.sample_rate, cache_dir=args.cache_dir)
+    if args.whole_book:
+        print(render_book_audio(morse_path, **settings))
+        return 0
+    page_numbers = set(args.pages) if args.pages else None
+    paths = render_book_pages(morse_path, page_numbers=page_numbers, **settings)
+    if page_numbers is not None and len(paths) != len(page_numbers):
+        print(f"Error: {args.book} has fewer pages than requested.")
+        return 1
+    for path in paths:
+        print(path)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
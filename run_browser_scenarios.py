@@ -0,0 +1,234 @@
+import os
+import re
+import sys
+import glob
+import json
+import time
+import queue
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import concurrent.futures
+
+from selenium.common.exceptions import WebDriverException
+
+from benchmark_book_load import DEFAULT_ROOT_DIR, DEFAULT_TIMEOUT_SECONDS, static_server, make_driver, measure_run
+
+# --- Constants ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, "browser_scenario_results")
+RESULTS_VERSION = 1
+DEFAULT_JOBS = min(4, os.cpu_count() or 1)
+DEFAULT_INPUT_CHARS = 20
+
+# --- Scenarios ---
+# A scenario opens one book from the library, starts deciphering and taps input_chars highlighted letters
+# (the same in-page flow benchmark_book_load.py times). It passes when every step completed and the browser
+# console showed no SEVERE errors. Without explicit book ids, every book with a detail shard is a scenario.
+def discover_book_ids(root_dir: str) -> list:
+    """Ids of the books generate_morse_files.py wrote detail shards for, sorted."""
+    suffix = "_details.json"
+    paths = glob.glob(os.path.join(root_dir, "assets", "book_cipher_texts", f"*{suffix}"))
+    return sorted(os.path.basename(path)[:-len(suffix)] for path in paths)
+
+def scenario_dir_name(name: str) -> str:
+    """A file-system-safe directory name for a scenario."""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or "scenario"
+
+# --- Browser Pool ---
+# Each worker owns one headless Chrome with its own profile directory and remote-debugging port, so any
+# number of them run side by side (the old test_*_book.py scripts all claimed port 9222). A worker keeps its
+# browser between scenarios: clearing localStorage/sessionStorage and reloading the app resets everything a
+# scenario can change. A browser that failed a scenario, or could not be reset, is replaced before the next
+# one, so a broken session never fails the scenarios after it.
+def free_port() -> int:
+    """A TCP port that was free a moment ago, as picked by the OS."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class BrowserWorker:
+    """One headless Chrome, started lazily and restarted when its session cannot be trusted."""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.profile_dir = None
+        self.driver = None
+
+    def _start(self):
+        self.profile_dir = tempfile.mkdtemp(prefix=f"morse_scenarios_{self.worker_id}_")
+        self.driver = make_driver(profile_dir=self.profile_dir, debugging_port=free_port())
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass # The browser is gone already
+            self.driver = None
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def session(self):
+        """The worker's driver with its storage cleared, starting (or restarting) Chrome if needed."""
+        if self.driver is not None:
+            try:
+                self.driver.execute_script("localStorage.clear(); sessionStorage.clear();")
+                self.driver.delete_all_cookies()
+                self.driver.get_log("browser") # Drop what is left of the previous scenario's console
+                return self.driver
+            except WebDriverException:
+                self.quit()
+        self._start()
+        return self.driver
+
+def run_scenario(worker: BrowserWorker, base_url: str, scenario: dict, output_dir: str, timeout_seconds: float) -> dict:
+    """Runs one scenario on worker's browser and writes its result, screenshot and console log to output_dir."""
+    os.makedirs(output_dir, exist_ok=True)
+    console_log = []
+    started = time.perf_counter()
+    try:
+        driver = worker.session()
+    except WebDriverException as e:
+        result = {"error": f"Could not start Chrome: {e.msg}", "consoleErrors": []}
+        driver = None
+    else:
+        result = measure_run(driver, base_url, scenario["bookId"], scenario["inputChars"], timeout_seconds, console_log)
+    result.update(scenario)
+    result["worker"] = worker.worker_id
+    result["seconds"] = time.perf_counter() - started
+    result["passed"] = "error" not in result and not result["consoleErrors"]
+
+    if driver is not None:
+        try:
+            driver.save_screenshot(os.path.join(output_dir, "screenshot.png"))
+        except WebDriverException as e:
+            result["screenshotError"] = e.msg
+    with open(os.path.join(output_dir, "console.log"), 'w', encoding='utf-8') as f:
+        for entry in console_log:
+            f.write(f"{entry.get('level', '')}\t{entry.get('message', '')}\n")
+    with open(os.path.join(output_dir, "result.json"), 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    if not result["passed"]:
+        worker.quit() # Start the next scenario in a fresh browser
+    return result
+
+def run_scenarios(base_url: str, scenarios: list, jobs: int, output_dir: str, timeout_seconds: float) -> dict:
+    """Runs scenarios on a pool of jobs browsers. Returns the results by scenario name."""
+    pending = queue.Queue()
+    for scenario in scenarios:
+        pending.put(scenario)
+    results = {}
+    print_lock = threading.Lock()
+
+    def work(worker_id: int):
+        worker = BrowserWorker(worker_id)
+        try:
+            while True:
+                try:
+                    scenario = pending.get_nowait()
+                except queue.Empty:
+                    return
+                scenario_output_dir = os.path.join(output_dir, scenario_dir_name(scenario["name"]))
+                result = run_scenario(worker, base_url, scenario, scenario_output_dir, timeout_seconds)
+                results[scenario["name"]] = result
+                with print_lock:
+                    status = "PASS" if result["passed"] else f"FAIL ({result.get('error') or 'console errors'})"
+                    print(f"  [worker {worker_id}] {scenario['name']}: {status} in {result['seconds']:.1f} s")
+        finally:
+            worker.quit()
+
+    jobs = max(1, min(jobs, len(scenarios)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        for future in [executor.submit(work, worker_id) for worker_id in range(jobs)]:
+            future.result()
+    return results
+
+# --- Report ---
+def print_report(results: dict, wall_seconds: float):
+    print("\n--- Browser Scenarios ---")
+    print(f"{'Scenario':<32}{'Result':>8}{'Worker':>8}{'Seconds':>10}")
+    for name in sorted(results):
+        result = results[name]
+        print(f"{name:<32}{'PASS' if result['passed'] else 'FAIL':>8}{result['worker']:>8}{result['seconds']:>10.1f}")
+    scenario_seconds = sum(result["seconds"] for result in results.values())
+    print(f"{sum(result['passed'] for result in results.values())}/{len(results)} passed in {wall_seconds:.1f} s "
+          f"({scenario_seconds:.1f} s of scenarios)")
+
+def run_self_tests() -> bool:
+    print("Running browser scenario self-tests...")
+    all_tests_passed = True
+
+    # Scenarios default to the generated books, and their names map to safe directory names.
+    book_ids = discover_book_ids(DEFAULT_ROOT_DIR)
+    scenario_ok = ("passage_1" in book_ids and book_ids == sorted(book_ids)
+                   and scenario_dir_name("passage_1") == "passage_1"
+                   and scenario_dir_name("../a b/c") == ".._a_b_c"
+                   and scenario_dir_name("///") == "scenario")
+    if not scenario_ok: all_tests_passed = False
+    print(f"  Scenario discovery and naming --- {'OK' if scenario_ok else 'FAIL'}")
+
+    # Ports handed to the workers must be bindable.
+    port_ok = True
+    for _ in range(3):
+        port = free_port()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            try:
+                s.bind(("127.0.0.1", port))
+            except OSError:
+                port_ok = False
+    if not port_ok: all_tests_passed = False
+    print(f"  Free debugging ports --- {'OK' if port_ok else 'FAIL'}")
+
+    if all_tests_passed: print("All browser scenario self-tests PASSED.\n")
+    else: print("Some browser scenario self-tests FAILED.\n")
+    return all_tests_passed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Runs book scenarios concurrently on a pool of headless Chrome instances.")
+    parser.add_argument("books", nargs="*", help="Book ids to run (default: every book in src/assets/book_cipher_texts).")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help="Browsers run side by side (default: %(default)s).")
+    parser.add_argument("--input-chars", type=int, default=DEFAULT_INPUT_CHARS,
+                        help="Letters tapped per scenario after the first one (default: %(default)s).")
+    parser.add_argument("--root", default=DEFAULT_ROOT_DIR, help="Directory to serve (default: src).")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR,
+                        help="Directory for per-scenario results, screenshots and console logs (default: %(default)s).")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help="Seconds to wait for each step of a scenario (default: %(default)s).")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not run_self_tests():
+        return 1
+    book_ids = args.books or discover_book_ids(args.root)
+    if not book_ids:
+        print(f"Error: No books found under {args.root}.")
+        return 1
+    scenarios = [{"name": book_id, "bookId": book_id, "inputChars": args.input_chars} for book_id in book_ids]
+    os.makedirs(args.output, exist_ok=True)
+
+    with static_server(args.root) as base_url:
+        print(f"Serving {args.root} at {base_url}")
+        try:
+            make_driver().quit() # Fail once, clearly, when Chrome or its driver is missing
+        except WebDriverException as e:
+            print(f"Error: Could not start headless Chrome: {e.msg}")
+            return 1
+        print(f"Running {len(scenarios)} scenario(s) on {max(1, min(args.jobs, len(scenarios)))} browser(s)...")
+        started = time.perf_counter()
+        results = run_scenarios(base_url, scenarios, args.jobs, args.output, args.timeout)
+        wall_seconds = time.perf_counter() - started
+    print_report(results, wall_seconds)
+
+    summary_path = os.path.join(args.output, "summary.json")
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": RESULTS_VERSION, "jobs": args.jobs, "wallSeconds": wall_seconds, "scenarios": results}, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0 if all(result["passed"] for result in results.values()) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
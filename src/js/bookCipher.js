@@ -1,14 +1,900 @@
 window.navigatingAwayFromPlayback = false; // Flag to manage navigation during playback
 
+// --- Performance Marks ---
+// The hot paths are bracketed with User Timing entries: marks '<name>:start' and '<name>:end' and a measure
+// '<name>', where name is 'bookCipher:<stage>'. The stages are fetch (until the response headers), parse (of
+// a whole-book Morse asset), render (of #full-book-morse-display), setNextTargetMorseSignal,
+// handleBookCipherInput and saveProgress. benchmark_book_load.py reads the measures after each run for a
+// per-stage breakdown, and they show up in the DevTools performance panel. A stage re-entered while it runs
+// (setNextTargetMorseSignal recurses at word ends) is part of the outer measure. A stage's entries are cleared
+// every PERF_STAGE_ENTRY_LIMIT measures, so a long session does not grow the timeline without bound.
+const PERF_STAGE_PREFIX = 'bookCipher:';
+const PERF_STAGE_ENTRY_LIMIT = 1000;
+const perfStageCounts = new Map(); // Measure name -> measures recorded since it was last cleared
+const activePerfStages = new Set();
+
+function beginPerfStage(stage) {
+    const name = PERF_STAGE_PREFIX + stage;
+    const count = perfStageCounts.get(name) || 0;
+    if (count >= PERF_STAGE_ENTRY_LIMIT) {
+        performance.clearMarks(`${name}:start`);
+        performance.clearMarks(`${name}:end`);
+        performance.clearMeasures(name);
+    }
+    perfStageCounts.set(name, count >= PERF_STAGE_ENTRY_LIMIT ? 1 : count + 1);
+    return { name, start: performance.mark(`${name}:start`).startTime };
+}
+
+function endPerfStage(perfStage, detail = null) {
+    const end = performance.mark(`${perfStage.name}:end`).startTime;
+    performance.measure(perfStage.name, { start: perfStage.start, end, detail });
+}
+
+// Calls fn() inside the measure of a synchronous stage and returns its result.
+function timePerfStage(stage, fn, detail = null) {
+    if (activePerfStages.has(stage)) return fn();
+    const perfStage = beginPerfStage(stage);
+    activePerfStages.add(stage);
+    try {
+        return fn();
+    } finally {
+        activePerfStages.delete(stage);
+        endPerfStage(perfStage, detail);
+    }
+}
+
+async function timedFetch(path) {
+    const perfStage = beginPerfStage('fetch');
+    let status = null;
+    try {
+        const response = await fetch(path);
+        status = response.status;
+        return response;
+    } finally {
+        endPerfStage(perfStage, { path, status });
+    }
+}
+
+// --- Pre-tokenised Morse Book Index ---
+// generate_morse_files.py writes a word/letter index next to every Morse file (bookData `morseIndexPath`).
+// Each letter is one character of `letters` (a symbol id, mapped to its Morse signal by `symbols`), and
+// word w is letters.slice(wordStarts[w], wordStarts[w + 1]), so any word is reachable in O(1) and the
+// Morse text never has to be split.
+function getIndexedMorseWord(morseIndex, wordIdx) {
+    const start = morseIndex.wordStarts[wordIdx];
+    const end = morseIndex.wordStarts[wordIdx + 1];
+    const word = new Array(end - start);
+    for (let i = start; i < end; i++) {
+        word[i - start] = morseIndex.symbols[morseIndex.letters[i]];
+    }
+    return word;
+}
+window.getIndexedMorseWord = getIndexedMorseWord;
+
+function morseSequenceFromIndex(morseIndex) {
+    const sequence = new Array(morseIndex.wordCount);
+    for (let wordIdx = 0; wordIdx < morseIndex.wordCount; wordIdx++) {
+        sequence[wordIdx] = getIndexedMorseWord(morseIndex, wordIdx);
+    }
+    return sequence;
+}
+
+// Legacy path for books without an index: words separated by '/', letters by spaces.
+function morseSequenceFromText(morseText) {
+    return morseText.trim().split('/')
+        .map(word => word.trim().split(' ').filter(s => s.length > 0))
+        .filter(wordArray => wordArray.length > 0);
+}
+
+// Binary Morse assets (bookData `morseBinaryPath`, layout documented in generate_morse_files.py): a 9-byte
+// header (magic "MRSB", version, word count), then one byte per letter (its 1-based code in
+// MORSE_BINARY_SYMBOLS) with a 0 byte between words. Letters are taken straight from the symbol table, so no
+// strings are built while decoding.
+const MORSE_BINARY_MAGIC = [0x4d, 0x52, 0x53, 0x42]; // "MRSB"
+const MORSE_BINARY_VERSION = 1;
+const MORSE_BINARY_HEADER_BYTES = 9;
+// Code table of format version 1; must match MORSE_BINARY_SYMBOLS in generate_morse_files.py. Code 0 separates words.
+const MORSE_BINARY_SYMBOLS = [null, '.-', '-...', '-.-.', '-..', '.', '..-.', '--.', '....', '..', '.---', '-.-', '.-..', '--', '-.', '---', '.--.', '--.-', '.-.', '...', '-', '..-', '...-', '.--', '-..-', '-.--', '--..', '.----', '..---', '...--', '....-', '.....', '-....', '--...', '---..', '----.', '-----', '.-.-.-', '--..--', '..--..', '.----.', '-.-.--', '-..-.', '-.--.', '-.--.-', '.-...', '---...', '-.-.-.', '-...-', '.-.-.', '-....-', '..--.-', '.-..-.', '...-..-', '.--.-.-'];
+
+function morseSequenceFromBinary(arrayBuffer) {
+    const bytes = new Uint8Array(arrayBuffer);
+    if (bytes.length < MORSE_BINARY_HEADER_BYTES || MORSE_BINARY_MAGIC.some((byte, i) => bytes[i] !== byte) ||
+        bytes[4] !== MORSE_BINARY_VERSION) {
+        throw new Error('Not a supported binary Morse asset.');
+    }
+    const wordCount = new DataView(arrayBuffer).getUint32(5, true);
+    const sequence = new Array(wordCount);
+    let wordIdx = 0;
+    let word = [];
+    for (let i = MORSE_BINARY_HEADER_BYTES; i < bytes.length; i++) {
+        const code = bytes[i];
+        if (code === 0) {
+            sequence[wordIdx++] = word;
+            word = [];
+        } else {
+            word.push(MORSE_BINARY_SYMBOLS[code]);
+        }
+    }
+    if (wordCount === 0 ? bytes.length > MORSE_BINARY_HEADER_BYTES : wordIdx + 1 !== wordCount) {
+        throw new Error('Truncated or corrupt binary Morse asset.');
+    }
+    if (wordCount > 0) sequence[wordIdx] = word;
+    return sequence;
+}
+window.morseSequenceFromBinary = morseSequenceFromBinary;
+
+// Dictionary-coded Morse assets (bookData `morseDictionaryPath`, written with `generate_morse_files.py
+// --dictionary`): a 13-byte header (magic "MRSD", version, word count, dictionary size), the distinct words
+// (varint letter count, then binary letter codes), then one varint word id per word. Every occurrence of a
+// word refers to the same array, so a long book costs one small array per distinct word, not per word.
+// Words of the returned sequence are shared and must not be modified.
+const MORSE_DICTIONARY_MAGIC = [0x4d, 0x52, 0x53, 0x44]; // "MRSD"
+const MORSE_DICTIONARY_VERSION = 1;
+const MORSE_DICTIONARY_HEADER_BYTES = 13;
+
+function morseSequenceFromDictionary(arrayBuffer) {
+    const bytes = new Uint8Array(arrayBuffer);
+    if (bytes.length < MORSE_DICTIONARY_HEADER_BYTES || MORSE_DICTIONARY_MAGIC.some((byte, i) => bytes[i] !== byte) ||
+        bytes[4] !== MORSE_DICTIONARY_VERSION) {
+        throw new Error('Not a supported dictionary-coded Morse asset.');
+    }
+    const header = new DataView(arrayBuffer);
+    const wordCount = header.getUint32(5, true);
+    const dictionarySize = header.getUint32(9, true);
+    let offset = MORSE_DICTIONARY_HEADER_BYTES;
+    const readVarint = () => {
+        let value = 0;
+        let scale = 1; // Multiplication instead of shifts, so values above 2^31 stay positive
+        let byte;
+        do {
+            byte = bytes[offset++];
+            value += (byte & 0x7f) * scale;
+            scale *= 128;
+        } while (byte >= 0x80);
+        return value;
+    };
+    const dictionary = new Array(dictionarySize);
+    for (let entryIdx = 0; entryIdx < dictionarySize; entryIdx++) {
+        const word = new Array(readVarint());
+        for (let letterIdx = 0; letterIdx < word.length; letterIdx++) {
+            word[letterIdx] = MORSE_BINARY_SYMBOLS[bytes[offset++]];
+        }
+        dictionary[entryIdx] = word;
+    }
+    const sequence = new Array(wordCount);
+    for (let wordIdx = 0; wordIdx < wordCount; wordIdx++) {
+        sequence[wordIdx] = dictionary[readVarint()];
+    }
+    if (offset > bytes.length || sequence.includes(undefined)) {
+        throw new Error('Truncated or corrupt dictionary-coded Morse asset.');
+    }
+    return sequence;
+}
+window.morseSequenceFromDictionary = morseSequenceFromDictionary;
+
+// Resolves to the book as an array of words, each an array of Morse letters (e.g. [['.-', '-...'], ...]).
+async function loadBookMorseSequence(bookData) {
+    if (bookData.morseDictionaryPath) {
+        try {
+            const response = await timedFetch(bookData.morseDictionaryPath);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}, file: ${bookData.morseDictionaryPath}`);
+            }
+            const buffer = await response.arrayBuffer();
+            return timePerfStage('parse', () => morseSequenceFromDictionary(buffer), { format: 'dictionary' });
+        } catch (error) {
+            console.warn(`loadBookMorseSequence: Could not use the dictionary-coded Morse asset, trying the next format:`, error);
+        }
+    }
+    if (bookData.morseBinaryPath) {
+        try {
+            const response = await timedFetch(bookData.morseBinaryPath);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}, file: ${bookData.morseBinaryPath}`);
+            }
+            const buffer = await response.arrayBuffer();
+            return timePerfStage('parse', () => morseSequenceFromBinary(buffer), { format: 'binary' });
+        } catch (error) {
+            console.warn(`loadBookMorseSequence: Could not use the binary Morse asset, trying the next format:`, error);
+        }
+    }
+    if (bookData.morseIndexPath) {
+        try {
+            const response = await timedFetch(bookData.morseIndexPath);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}, file: ${bookData.morseIndexPath}`);
+            }
+            const morseIndex = await response.json();
+            return timePerfStage('parse', () => morseSequenceFromIndex(morseIndex), { format: 'index' });
+        } catch (error) {
+            console.warn(`loadBookMorseSequence: Could not use the Morse index, falling back to ${bookData.filePath}:`, error);
+        }
+    }
+    const response = await timedFetch(bookData.filePath);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}, file: ${bookData.filePath}`);
+    }
+    const morseText = await response.text();
+    return timePerfStage('parse', () => morseSequenceFromText(morseText), { format: 'text' });
+}
+window.loadBookMorseSequence = loadBookMorseSequence;
+
+// --- Paged Morse Books ---
+// Books with a page manifest (bookData `pageManifestPath`) are fetched one page of words at a time: the page
+// holding the current word, with the next page prefetched. Only the most recently used pages are kept, so the
+// time to the first target and the memory used do not depend on the length of the book.
+const MORSE_PAGE_CACHE_LIMIT = 4;
+const MORSE_DISPLAY_WORDS_BEFORE_CURSOR = 40; // Words rendered in #full-book-morse-display before the cursor
+const MORSE_DISPLAY_WORDS_AFTER_CURSOR = 160; // ... and from the cursor on
+
+class PagedMorseBook {
+    constructor(manifest) {
+        this.manifest = manifest;
+        this.wordCount = manifest.wordCount;
+        this.pageCount = manifest.pageCount;
+        this.contentHash = manifest.contentHash || null; // Hash of the words, for saved progress (see Progress Checkpoints)
+        this.pagePromises = new Map(); // Page number -> Promise of the page, least recently used first
+        this.loadedPages = new Map(); // Page number -> page, for synchronous access
+    }
+
+    pageNumberOf(wordIdx) {
+        return Math.floor(wordIdx / this.manifest.pageWords);
+    }
+
+    async fetchPage(pageNumber) {
+        const pagePath = this.manifest.pagePath.replace('{page}', pageNumber);
+        const response = await timedFetch(pagePath);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}, file: ${pagePath}`);
+        }
+        const page = await response.json();
+        page.symbols = this.manifest.symbols;
+        return page;
+    }
+
+    loadPage(pageNumber) {
+        let pagePromise = this.pagePromises.get(pageNumber);
+        if (pagePromise) {
+            this.pagePromises.delete(pageNumber); // Re-inserted below as the most recently used page
+        } else {
+            pagePromise = this.fetchPage(pageNumber)
+                .then(page => {
+                    if (this.pagePromises.get(pageNumber) === pagePromise) { // Not evicted while loading
+                        this.loadedPages.set(pageNumber, page);
+                    }
+                    return page;
+                });
+            pagePromise.catch(() => { // Forget failed pages so they can be retried
+                if (this.pagePromises.get(pageNumber) === pagePromise) this.pagePromises.delete(pageNumber);
+            });
+        }
+        this.pagePromises.set(pageNumber, pagePromise);
+        for (const oldPageNumber of this.pagePromises.keys()) {
+            if (this.pagePromises.size <= MORSE_PAGE_CACHE_LIMIT) break;
+            this.pagePromises.delete(oldPageNumber);
+            this.loadedPages.delete(oldPageNumber);
+        }
+        return pagePromise;
+    }
+
+    // Resolves once getWord(wordIdx) is available, and prefetches the following page.
+    async ensureWord(wordIdx) {
+        const pageNumber = this.pageNumberOf(wordIdx);
+        const pagePromise = this.loadPage(pageNumber);
+        if (pageNumber + 1 < this.manifest.pageCount) {
+            this.loadPage(pageNumber + 1).catch(error => console.warn(`PagedMorseBook: Prefetching page ${pageNumber + 1} failed:`, error));
+        }
+        await pagePromise;
+    }
+
+    // The Morse letters of a word, or null while its page is not loaded.
+    getWord(wordIdx) {
+        const page = this.loadedPages.get(this.pageNumberOf(wordIdx));
+        return page ? getIndexedMorseWord(page, wordIdx - page.firstWord) : null;
+    }
+
+    // Words startIdx to endIdx - 1. Their pages are fetched in parallel and bypass the page cache, so reading
+    // far behind the cursor does not evict the pages around it.
+    async readWords(startIdx, endIdx) {
+        if (startIdx >= endIdx) return [];
+        const pageNumbers = [];
+        for (let pageNumber = this.pageNumberOf(startIdx); pageNumber <= this.pageNumberOf(endIdx - 1); pageNumber++) {
+            pageNumbers.push(pageNumber);
+        }
+        const pages = await Promise.all(pageNumbers.map(pageNumber => this.loadedPages.get(pageNumber) || this.fetchPage(pageNumber)));
+        const words = [];
+        for (const page of pages) {
+            const end = Math.min(endIdx, page.firstWord + page.wordCount);
+            for (let wordIdx = Math.max(startIdx, page.firstWord); wordIdx < end; wordIdx++) {
+                words.push(getIndexedMorseWord(page, wordIdx - page.firstWord));
+            }
+        }
+        return words;
+    }
+
+    // Playback schedule of a page (see Scheduled Playback), computed from its words for books built before
+    // schedules were generated.
+    async loadSchedule(pageNumber) {
+        if (!this.manifest.schedulePath) {
+            return morseScheduleForPage(this, pageNumber, this.manifest.pageWords);
+        }
+        const schedulePath = this.manifest.schedulePath.replace('{page}', pageNumber);
+        const response = await timedFetch(schedulePath);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}, file: ${schedulePath}`);
+        }
+        return unpackMorseSchedule(await response.json());
+    }
+
+    // Source alignment of a page (see Source Alignment), or null for books built without it.
+    async loadAlignment(pageNumber) {
+        if (!this.manifest.alignmentPath) return null;
+        const alignmentPath = this.manifest.alignmentPath.replace('{page}', pageNumber);
+        const response = await timedFetch(alignmentPath);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}, file: ${alignmentPath}`);
+        }
+        return unpackSourceAlignment(await response.json());
+    }
+
+    // Source offsets where the text before a letter ends, or null without source alignment.
+    async alignedOffsetsBefore(wordIdx, letterIdx) {
+        const alignment = await this.loadAlignment(this.pageNumberOf(wordIdx));
+        return alignment ? alignedOffsetsBefore(alignment, wordIdx, letterIdx) : null;
+    }
+
+    async fetchMarkdown(pageNumber) {
+        const markdownPath = this.manifest.markdownPath.replace('{page}', pageNumber);
+        const response = await timedFetch(markdownPath);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}, file: ${markdownPath}`);
+        }
+        return response.text();
+    }
+
+    // content_markdown from where the text before word startIdx ends (the start of the book for word 0) to
+    // where it ends before letter letterIdx of word endIdx (the end of the book for endIdx = wordCount), read
+    // from the markdown of the pages in between. Null for books built without per-page markdown.
+    async readMarkdown(startIdx, endIdx, letterIdx) {
+        if (!this.manifest.markdownPath || !this.manifest.alignmentPath || !this.wordCount) return null;
+        const toEnd = endIdx >= this.wordCount;
+        const firstPage = this.pageNumberOf(startIdx);
+        const lastPage = toEnd ? this.pageCount - 1 : this.pageNumberOf(endIdx);
+        const pageNumbers = [];
+        for (let pageNumber = firstPage; pageNumber <= lastPage; pageNumber++) pageNumbers.push(pageNumber);
+        const [texts, firstAlignment, lastAlignment] = await Promise.all([
+            Promise.all(pageNumbers.map(pageNumber => this.fetchMarkdown(pageNumber))),
+            this.loadAlignment(firstPage),
+            toEnd || lastPage === firstPage ? null : this.loadAlignment(lastPage)
+        ]);
+        const text = texts.join('');
+        const textStart = firstAlignment.markdownBefore; // Where the first page's markdown starts
+        const start = alignedOffsetsBefore(firstAlignment, startIdx, 0).markdown;
+        const end = toEnd ? textStart + text.length : alignedOffsetsBefore(lastAlignment || firstAlignment, endIdx, letterIdx).markdown;
+        return text.slice(start - textStart, end - textStart);
+    }
+}
+
+// Same interface for books held entirely in memory (books without a page manifest).
+class InMemoryMorseBook {
+    constructor(morseSequence) {
+        this.morseSequence = morseSequence;
+        this.wordCount = morseSequence.length;
+        this.pageCount = Math.ceil(this.wordCount / MORSE_SCHEDULE_PAGE_WORDS);
+        this.contentHash = null;
+    }
+
+    async ensureWord(wordIdx) {}
+
+    getWord(wordIdx) {
+        return this.morseSequence[wordIdx] || null;
+    }
+
+    async readWords(startIdx, endIdx) {
+        return this.morseSequence.slice(startIdx, endIdx);
+    }
+
+    async loadSchedule(pageNumber) {
+        return morseScheduleForPage(this, pageNumber, MORSE_SCHEDULE_PAGE_WORDS);
+    }
+}
+
+async function loadMorseBook(bookData) {
+    if (bookData.pageManifestPath) {
+        try {
+            const response = await timedFetch(bookData.pageManifestPath);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}, file: ${bookData.pageManifestPath}`);
+            }
+            return new PagedMorseBook(await response.json());
+        } catch (error) {
+            console.warn(`loadMorseBook: Could not use the page manifest, loading the whole book instead:`, error);
+        }
+    }
+    return new InMemoryMorseBook(await loadBookMorseSequence(bookData));
+}
+window.loadMorseBook = loadMorseBook;
+
+// --- Scheduled Playback ---
+// A playback schedule (<page>.schedule.json, written by generate_morse_files.py) lists every dot and dash of a
+// page with the word and letter it belongs to and its onset, counted in dots (onsetUnits) and in Farnsworth
+// spacing units (onsetSpacing, 3 per letter gap and 7 per word gap). Scaled by the current speed settings, a
+// whole page of tones is scheduled on the AudioContext clock at once, and the tapper glow and text highlight
+// follow the same clock, so playback timing no longer depends on setTimeout latency. Every page but the last
+// ends with a word gap, so the next page is scheduled exactly where the previous one ends. Schedule files are
+// packed (the tones and the gap after each) and expanded here in one pass.
+const MORSE_SCHEDULE_PAGE_WORDS = 512; // Page size for books held in memory, as MORSE_PAGE_WORDS in the generator
+const PLAYBACK_START_DELAY_SECONDS = 0.1; // Lead time before the first tone, so it is never scheduled in the past
+
+// Schedule of words (arrays of Morse signals); must match morse_schedule() in generate_morse_files.py.
+function morseScheduleFromWords(words, trailingWordGap = false) {
+    const tones = [];
+    const onsetUnits = [];
+    const onsetSpacing = [];
+    const wordIds = [];
+    const letterIds = [];
+    let units = 0;
+    let spacing = 0;
+    words.forEach((word, wordIdx) => {
+        if (wordIdx) spacing += 7;
+        word.forEach((signal, letterIdx) => {
+            if (letterIdx) spacing += 3;
+            for (let i = 0; i < signal.length; i++) {
+                if (i) units += 1;
+                tones.push(signal[i]);
+                onsetUnits.push(units);
+                onsetSpacing.push(spacing);
+                wordIds.push(wordIdx);
+                letterIds.push(letterIdx);
+                units += signal[i] === '.' ? 1 : 3;
+            }
+        });
+    });
+    if (trailingWordGap && tones.length) spacing += 7;
+    return { tones: tones.join(''), onsetUnits, onsetSpacing, wordIds, letterIds, totalUnits: units, totalSpacing: spacing };
+}
+
+// Expands a packed schedule file; must match unpack_morse_schedule() in generate_morse_files.py.
+function unpackMorseSchedule(packed) {
+    const elementCount = packed.tones.length;
+    const onsetUnits = new Uint32Array(elementCount);
+    const onsetSpacing = new Uint32Array(elementCount);
+    const wordIds = new Uint32Array(elementCount);
+    const letterIds = new Uint32Array(elementCount);
+    let units = 0;
+    let spacing = 0;
+    let wordId = 0;
+    let letterId = 0;
+    for (let i = 0; i < elementCount; i++) {
+        onsetUnits[i] = units;
+        onsetSpacing[i] = spacing;
+        wordIds[i] = wordId;
+        letterIds[i] = letterId;
+        units += packed.tones[i] === '.' ? 1 : 3;
+        const gap = packed.gaps[i];
+        if (gap === '1') {
+            units += 1;
+        } else if (gap === '3') {
+            spacing += 3;
+            letterId++;
+        } else if (gap === '7') {
+            spacing += 7;
+            wordId++;
+            letterId = 0;
+        }
+    }
+    return { firstWord: packed.firstWord, tones: packed.tones, onsetUnits, onsetSpacing, wordIds, letterIds,
+             totalUnits: packed.totalUnits, totalSpacing: packed.totalSpacing };
+}
+
+async function morseScheduleForPage(morseBook, pageNumber, pageWords) {
+    const firstWord = pageNumber * pageWords;
+    const endWord = Math.min(firstWord + pageWords, morseBook.wordCount);
+    await morseBook.ensureWord(firstWord);
+    const words = [];
+    for (let wordIdx = firstWord; wordIdx < endWord; wordIdx++) {
+        words.push(morseBook.getWord(wordIdx));
+    }
+    return { firstWord, ...morseScheduleFromWords(words, endWord < morseBook.wordCount) };
+}
+
+function getPlaybackTiming() {
+    if (window.getMorseTiming) return window.getMorseTiming();
+    const unit = (window.getVisualTapperUnitTime ? window.getVisualTapperUnitTime() : 150) / 1000;
+    return { unit, spacingUnit: unit, frequency: 600 };
+}
+
+function getPlaybackTime() {
+    return window.getMorseAudioTime ? window.getMorseAudioTime() : performance.now() / 1000;
+}
+
+function nextPlaybackFrame() {
+    // Animation frames stop in hidden tabs; the audio keeps to its schedule and the display catches up.
+    return new Promise(resolve => document.hidden ? setTimeout(resolve, 100) : requestAnimationFrame(resolve));
+}
+
+// Plays one schedule from startTime (playback clock seconds). callbacks.onLetterStart/onLetterEnd(wordIdx, letterIdx)
+// run as each letter starts and after its last tone. Resolves with the time the schedule ends, as soon as its last
+// tone is over (leaving the trailing word gap to schedule the next page), or null once playback is stopped.
+async function playMorseSchedule(schedule, startTime, timing, callbacks) {
+    const elementCount = schedule.tones.length;
+    const onsets = new Float64Array(elementCount);
+    const offsets = new Float64Array(elementCount);
+    for (let i = 0; i < elementCount; i++) {
+        onsets[i] = startTime + schedule.onsetUnits[i] * timing.unit + schedule.onsetSpacing[i] * timing.spacingUnit;
+        offsets[i] = onsets[i] + (schedule.tones[i] === '.' ? 1 : 3) * timing.unit;
+    }
+    const endTime = startTime + schedule.totalUnits * timing.unit + schedule.totalSpacing * timing.spacingUnit;
+    const stopTones = window.scheduleMorseTones ? window.scheduleMorseTones(onsets, offsets, timing.frequency) : () => {};
+    const firstWord = schedule.firstWord || 0;
+    const startsLetter = i => i === 0 || schedule.wordIds[i] !== schedule.wordIds[i - 1] || schedule.letterIds[i] !== schedule.letterIds[i - 1];
+    const endLetter = i => callbacks.onLetterEnd(firstWord + schedule.wordIds[i], schedule.letterIds[i]);
+
+    let startedElements = 0; // Elements whose onset has passed
+    let letterOpen = false;
+    let tapperActive = false;
+    while (true) {
+        if (!window.isPlayingStoryPlayback) {
+            stopTones();
+            if (tapperActive && window.setTapperActive) window.setTapperActive(false);
+            return null;
+        }
+        const now = getPlaybackTime();
+        while (startedElements < elementCount && onsets[startedElements] <= now) {
+            if (startsLetter(startedElements)) {
+                if (letterOpen) endLetter(startedElements - 1); // Several letters passed within one frame
+                callbacks.onLetterStart(firstWord + schedule.wordIds[startedElements], schedule.letterIds[startedElements]);
+                letterOpen = true;
+            }
+            startedElements++;
+        }
+        const lastStarted = startedElements - 1;
+        const toneSounding = lastStarted >= 0 && now < offsets[lastStarted];
+        if (toneSounding !== tapperActive) {
+            tapperActive = toneSounding;
+            if (window.setTapperActive) window.setTapperActive(tapperActive);
+        }
+        if (letterOpen && !toneSounding && (lastStarted + 1 === elementCount || startsLetter(lastStarted + 1))) {
+            endLetter(lastStarted);
+            letterOpen = false;
+        }
+        if (startedElements === elementCount && !toneSounding) {
+            return endTime;
+        }
+        await nextPlaybackFrame();
+    }
+}
+
+// Plays every page of a PagedMorseBook/InMemoryMorseBook back to back, loading the next page's schedule while the
+// current one plays. Returns false if playback was stopped.
+async function playMorseBookSchedules(morseBook, callbacks) {
+    if (morseBook.pageCount === 0) return true;
+    const timing = getPlaybackTiming();
+    let startTime = getPlaybackTime() + PLAYBACK_START_DELAY_SECONDS;
+    let schedulePromise = morseBook.loadSchedule(0);
+    for (let pageNumber = 0; pageNumber < morseBook.pageCount; pageNumber++) {
+        const schedule = await schedulePromise;
+        if (pageNumber + 1 < morseBook.pageCount) {
+            schedulePromise = morseBook.loadSchedule(pageNumber + 1);
+            schedulePromise.catch(() => {}); // Reported when awaited; playback may be stopped before that
+        }
+        await morseBook.ensureWord(schedule.firstWord || 0); // The page's words, for the display callbacks
+        startTime = Math.max(startTime, getPlaybackTime()); // A slow page load delays the page rather than skipping it
+        const endTime = await playMorseSchedule(schedule, startTime, timing, callbacks);
+        if (endTime === null) return false;
+        startTime = endTime;
+    }
+    return true;
+}
+
+// --- Source Alignment ---
+// <page>.align.json (generate_morse_files.py) maps each letter of a page to the character it was encoded from, as
+// UTF-16 offsets into the book's content_markdown ("markdown") and its normalised text ("source"). Characters the
+// encoder dropped (markdown markers, glyphs without a Morse signal, extra whitespace) lie between letters. Letters
+// whose offsets advance one by one form runs, stored as [letters, markdown, source] steps from the previous run
+// start, the first from [0, markdownBefore, sourceBefore]; markdownBefore is where the text before the page ends.
+// <page>.md (manifest `markdownPath`) is the content_markdown from there to the next page's markdownBefore, so the
+// revealed text is sliced from the pages it spans and the whole source is never fetched.
+const UNLOCKED_TEXT_WINDOW_WORDS = 5000; // Revealed words shown by "View Unlocked Text"; earlier text is elided
+
+function unpackSourceAlignment(alignment) {
+    const runCount = alignment.runs.length / 3;
+    const runLetters = new Uint32Array(runCount);
+    const runMarkdown = new Uint32Array(runCount);
+    const runSource = new Uint32Array(runCount);
+    let letter = 0;
+    let markdown = alignment.markdownBefore;
+    let source = alignment.sourceBefore;
+    for (let run = 0; run < runCount; run++) {
+        letter += alignment.runs[3 * run];
+        markdown += alignment.runs[3 * run + 1];
+        source += alignment.runs[3 * run + 2];
+        runLetters[run] = letter;
+        runMarkdown[run] = markdown;
+        runSource[run] = source;
+    }
+    return { ...alignment, runLetters, runMarkdown, runSource };
+}
+
+// Offsets just past the character of the letter before letter letterIdx of word wordIdx (a word of this page),
+// i.e. where the revealed text ends when that letter is the next to decipher.
+function alignedOffsetsBefore(alignment, wordIdx, letterIdx) {
+    const pageLetter = alignment.wordStarts[wordIdx - alignment.firstWord] + letterIdx;
+    if (!pageLetter) {
+        return { markdown: alignment.markdownBefore, source: alignment.sourceBefore };
+    }
+    let low = 0; // Last run starting at or before the previous letter
+    let high = alignment.runLetters.length - 1;
+    while (low < high) {
+        const middle = (low + high + 1) >> 1;
+        if (alignment.runLetters[middle] <= pageLetter - 1) low = middle;
+        else high = middle - 1;
+    }
+    const offset = pageLetter - alignment.runLetters[low]; // Letters from the run start, past the previous one
+    return { markdown: alignment.runMarkdown[low] + offset, source: alignment.runSource[low] + offset };
+}
+
+// content_markdown revealed by the saved progress of a book, at most UNLOCKED_TEXT_WINDOW_WORDS words long ('…'
+// stands for the earlier text), read from the markdown of the pages it spans. Null without saved progress or
+// for books built without per-page markdown.
+async function loadRevealedMarkdown(bookId, bookData) {
+    const progress = readProgressCheckpoint(bookId);
+    if (!progress || !bookData.pageManifestPath) return null;
+    const morseBook = await loadMorseBook(bookData);
+    if (!morseBook.readMarkdown) return null;
+    const checkpoint = migrateProgressCheckpoint(progress, morseBook);
+    const wordIdx = checkpoint.isCompleted ? morseBook.wordCount : Math.min(checkpoint.currentWordIndex, morseBook.wordCount);
+    const firstWordIdx = Math.max(0, wordIdx - UNLOCKED_TEXT_WINDOW_WORDS);
+    const markdown = await morseBook.readMarkdown(firstWordIdx, wordIdx, checkpoint.isCompleted ? 0 : checkpoint.currentMorseLetterIndexInWord);
+    return markdown === null ? null : (firstWordIdx ? '…\n\n' : '') + markdown;
+}
+
+// Range of content_markdown revealed by the saved progress of a book, at most UNLOCKED_TEXT_WINDOW_WORDS words
+// long, or null when the whole text is revealed or the book has no source alignment. Used to slice the full
+// source of books built without per-page markdown.
+async function loadRevealedMarkdownRange(bookId, bookData) {
+    const progress = readProgressCheckpoint(bookId);
+    if (!progress || progress.isCompleted || !bookData.pageManifestPath) return null;
+    const morseBook = await loadMorseBook(bookData);
+    const { currentWordIndex: wordIdx, currentMorseLetterIndexInWord: letterIdx } = migrateProgressCheckpoint(progress, morseBook);
+    if (!morseBook.alignedOffsetsBefore || wordIdx >= morseBook.wordCount) return null;
+    const end = await morseBook.alignedOffsetsBefore(wordIdx, letterIdx);
+    if (!end) return null;
+    const firstWordIdx = Math.max(0, wordIdx - UNLOCKED_TEXT_WINDOW_WORDS);
+    const start = firstWordIdx ? await morseBook.alignedOffsetsBefore(firstWordIdx, 0) : { markdown: 0 };
+    return { start: start.markdown, end: end.markdown };
+}
+
+// --- Progress Checkpoints ---
+// Saved progress (localStorage `bookCipherProgress_<book>`) is a checkpoint of the cursor only: the word and letter
+// to decipher next, the completion flag, and the content hash and word count of the Morse book it was saved
+// against. Its size, and so the cost of saving it after every letter, does not grow with the book; the revealed
+// text is decoded from the Morse pages when the book is opened. Version 1 progress also held the whole revealed
+// text and is rewritten as a checkpoint the first time its book is opened.
+const PROGRESS_CHECKPOINT_VERSION = 2;
+
+function makeProgressCheckpoint(bookId, morseBook, wordIdx, letterIdx, isCompleted) {
+    return {
+        version: PROGRESS_CHECKPOINT_VERSION,
+        bookId: bookId,
+        contentHash: morseBook ? morseBook.contentHash : null,
+        wordCount: morseBook ? morseBook.wordCount : null,
+        currentWordIndex: wordIdx,
+        currentMorseLetterIndexInWord: letterIdx,
+        isCompleted: isCompleted
+    };
+}
+
+// Saved progress of a book, or null if there is none (or it is unreadable or belongs to another book).
+function readProgressCheckpoint(bookId) {
+    try {
+        const progress = JSON.parse(localStorage.getItem(`bookCipherProgress_${bookId}`));
+        return progress && progress.bookId === bookId ? progress : null;
+    } catch (e) {
+        console.warn(`readProgressCheckpoint: Could not parse the progress of ${bookId}:`, e);
+        return null;
+    }
+}
+
+// Checkpoint for the book as loaded now. If the content hash changed, the book was regenerated from an edited
+// source and its indices point into different words, so the cursor keeps its relative position and moves to the
+// start of its word. Progress without a hash (version 1, or books held in memory) keeps its indices.
+// `migrated` tells whether the stored progress should be rewritten.
+function migrateProgressCheckpoint(progress, morseBook) {
+    let wordIdx = parseInt(progress.currentWordIndex, 10) || 0;
+    let letterIdx = parseInt(progress.currentMorseLetterIndexInWord, 10) || 0;
+    const isCompleted = typeof progress.isCompleted === 'boolean' ? progress.isCompleted : false;
+    const contentChanged = Boolean(progress.contentHash && morseBook.contentHash && progress.contentHash !== morseBook.contentHash);
+    if (contentChanged) {
+        const savedWordCount = parseInt(progress.wordCount, 10) || 0;
+        wordIdx = isCompleted ? morseBook.wordCount :
+            Math.min(savedWordCount ? Math.floor(wordIdx * morseBook.wordCount / savedWordCount) : 0, Math.max(0, morseBook.wordCount - 1));
+        letterIdx = 0;
+        console.warn(`migrateProgressCheckpoint: ${progress.bookId} changed since its progress was saved; moved to word ${wordIdx}.`);
+    }
+    const checkpoint = makeProgressCheckpoint(progress.bookId, morseBook, wordIdx, letterIdx, isCompleted);
+    checkpoint.migrated = contentChanged || progress.version !== PROGRESS_CHECKPOINT_VERSION ||
+        (!progress.contentHash && Boolean(morseBook.contentHash));
+    return checkpoint;
+}
+
+// English text of the words before wordIdx as handleBookCipherInput appends them (each followed by a space),
+// limited to the last UNLOCKED_TEXT_WINDOW_WORDS words; '… ' stands for the earlier ones.
+async function decodeRevealedText(morseBook, wordIdx) {
+    const firstWordIdx = Math.max(0, wordIdx - UNLOCKED_TEXT_WINDOW_WORDS);
+    const words = await morseBook.readWords(firstWordIdx, wordIdx);
+    const text = words.map(word => word.map(signal => morseToText(signal) || '').join('') + ' ').join('');
+    return firstWordIdx ? '… ' + text : text;
+}
+
+// --- Book Catalogue ---
+// bookData.js only lists what the library view needs (title, genre, lengthCategory, isPro). The full entry of a
+// book (author, description, asset paths) is in its detail shard, window.bookCipherBookDetailsPath with '{book}'
+// replaced by the book id, fetched the first time the book is opened and kept for the session.
+const bookDetailsPromises = new Map(); // Book id -> Promise of the full entry
+
+function loadBookDetails(bookId) {
+    const summary = window.bookCipherBooks ? window.bookCipherBooks[bookId] : undefined;
+    if (!summary) {
+        return Promise.reject(new Error(`Unknown book: ${bookId}`));
+    }
+    if (!window.bookCipherBookDetailsPath) {
+        return Promise.resolve(summary); // Catalogue generated before detail shards existed: entries are complete
+    }
+    let detailsPromise = bookDetailsPromises.get(bookId);
+    if (!detailsPromise) {
+        const detailsPath = window.bookCipherBookDetailsPath.replace('{book}', bookId);
+        detailsPromise = timedFetch(detailsPath)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}, file: ${detailsPath}`);
+                }
+                return response.json();
+            })
+            .then(details => ({ ...summary, ...details }));
+        detailsPromise.catch(() => bookDetailsPromises.delete(bookId)); // Allow a retry after a failed fetch
+        bookDetailsPromises.set(bookId, detailsPromise);
+    }
+    return detailsPromise;
+}
+window.loadBookDetails = loadBookDetails;
+
+// --- Catalogue Search Index ---
+// generate_morse_files.py writes bookSearchIndex.json (window.bookCipherSearchIndexPath): book ids in catalogue
+// order, sorted search terms with their postings and per-facet lists, all as sorted positions into `ids`.
+// Filtering intersects a few sorted lists instead of scanning every book, so its cost follows the size of
+// the results rather than of the catalogue.
+let bookSearchIndexPromise = null;
+
+function loadBookSearchIndex() {
+    if (!bookSearchIndexPromise) {
+        const indexPath = window.bookCipherSearchIndexPath;
+        bookSearchIndexPromise = !indexPath ? Promise.reject(new Error('No search index in bookData.js')) : timedFetch(indexPath)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}, file: ${indexPath}`);
+                }
+                return response.json();
+            });
+    }
+    return bookSearchIndexPromise;
+}
+
+// Lowercased runs of letters and digits; must match search_tokens() in generate_morse_files.py.
+function searchTokens(text) {
+    return text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+}
+
+function intersectSortedIds(a, b) {
+    const result = [];
+    let i = 0;
+    let j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] < b[j]) i++;
+        else if (a[i] > b[j]) j++;
+        else { result.push(a[i]); i++; j++; }
+    }
+    return result;
+}
+
+// Sorted positions of the books matching every query token; the last token also matches as a prefix, so
+// results follow the query as it is typed. Returns null for an empty query (no restriction).
+function searchBookIndex(searchIndex, query) {
+    const tokens = searchTokens(query);
+    if (tokens.length === 0) return null;
+    const terms = searchIndex.terms;
+    const lowerBound = (value) => {
+        let lo = 0;
+        let hi = terms.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (terms[mid] < value) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    };
+    let result = null;
+    tokens.forEach((token, tokenIdx) => {
+        const first = lowerBound(token);
+        let last = first + (terms[first] === token ? 1 : 0);
+        if (tokenIdx === tokens.length - 1) {
+            while (last < terms.length && terms[last].startsWith(token)) last++;
+        }
+        let matches;
+        if (last - first <= 1) {
+            matches = last > first ? searchIndex.postings[first] : [];
+        } else { // Union of the postings of every term with this prefix, collected in position order
+            const marks = new Uint8Array(searchIndex.ids.length);
+            for (let termIdx = first; termIdx < last; termIdx++) {
+                const postings = searchIndex.postings[termIdx];
+                for (let i = 0; i < postings.length; i++) marks[postings[i]] = 1;
+            }
+            matches = [];
+            for (let position = 0; position < marks.length; position++) {
+                if (marks[position]) matches.push(position);
+            }
+        }
+        result = result === null ? matches : intersectSortedIds(result, matches);
+    });
+    return result;
+}
+
+// Sorted positions of the books whose facet `field` equals `value` (the 'count' of the facet is their number).
+function facetBookPositions(searchIndex, field, value) {
+    const facet = (searchIndex.facets[field] || []).find(candidate => candidate.value === value);
+    return facet ? facet.ids : [];
+}
+
+// Book ids, in catalogue order, matching the library filters; 'all' (or an empty query) does not restrict.
+function filterBookIds(searchIndex, { genre = 'all', lengthCategory = 'all', availability = 'all', query = '' }) {
+    const restrictions = [];
+    if (genre !== 'all') restrictions.push(facetBookPositions(searchIndex, 'genre', genre));
+    if (lengthCategory !== 'all') restrictions.push(facetBookPositions(searchIndex, 'lengthCategory', lengthCategory));
+    if (availability === 'free') restrictions.push(facetBookPositions(searchIndex, 'isPro', false));
+    else if (availability === 'pro') restrictions.push(facetBookPositions(searchIndex, 'isPro', true)); // Locked ones included
+    const searchPositions = searchBookIndex(searchIndex, query);
+    if (searchPositions !== null) restrictions.push(searchPositions);
+    if (restrictions.length === 0) return searchIndex.ids.slice();
+    restrictions.sort((a, b) => a.length - b.length); // Smallest list first keeps every intersection short
+    const positions = restrictions.reduce(intersectSortedIds);
+    return positions.map(position => searchIndex.ids[position]);
+}
+window.filterBookIds = filterBookIds;
+
+// Renders the loaded words around the cursor as spans; letters before the cursor are shown deciphered.
+function renderMorseWindow(displayEl, morseBook, cursorWordIdx, cursorLetterIdx, extraSpanClass = '') {
+    timePerfStage('render', () => renderMorseWindowSpans(displayEl, morseBook, cursorWordIdx, cursorLetterIdx, extraSpanClass));
+}
+
+function renderMorseWindowSpans(displayEl, morseBook, cursorWordIdx, cursorLetterIdx, extraSpanClass) {
+    const firstWordIdx = Math.max(0, cursorWordIdx - MORSE_DISPLAY_WORDS_BEFORE_CURSOR);
+    const endWordIdx = Math.min(morseBook.wordCount, cursorWordIdx + MORSE_DISPLAY_WORDS_AFTER_CURSOR);
+    const wordHtmlParts = [];
+    for (let wordIdx = firstWordIdx; wordIdx < endWordIdx; wordIdx++) {
+        const wordArray = morseBook.getWord(wordIdx);
+        if (!wordArray) continue; // Page evicted or not fetched yet
+        wordHtmlParts.push(wordArray.map((morseLetter, letterIdx) => {
+            let charContent = morseLetter;
+            let spanClass = "morse-char-span" + extraSpanClass;
+            const isDeciphered = (wordIdx < cursorWordIdx) ||
+                                 (wordIdx === cursorWordIdx && letterIdx < cursorLetterIdx);
+            if (isDeciphered) {
+                charContent = typeof morseToText === 'function' ? (morseToText(morseLetter) || morseLetter) : morseLetter;
+                spanClass += " deciphered-char";
+            }
+            return `<span class="${spanClass}" data-word-idx="${wordIdx}" data-letter-idx="${letterIdx}">${charContent}</span>`;
+        }).join(' ')); // Join Morse letter spans with a space
+    }
+    displayEl.innerHTML = wordHtmlParts.join(' / '); // Word separator
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     let currentBookId = null; // Added for saving progress
     let isBookCompleted = false; // Flag for book completion status
 
     // New global variables for Morse-based book cipher
-    let currentBookMorseContent = '';
     // let currentMorseLetterIndex = 0; // Obsolete: To track the current letter in the segment
-    let fullMorseSequence = []; // Stores arrays of Morse letters (words)
-    let currentWordIndex = 0; // Index for the current word in fullMorseSequence
+    let currentMorseBook = null; // PagedMorseBook or InMemoryMorseBook of the current book
+    let currentWordIndex = 0; // Index for the current word in currentMorseBook
     let currentMorseLetterIndexInWord = 0; // Index for the current Morse letter within the current word
     let currentTargetMorseLetter = ''; // Stores the actual target Morse string, e.g., ".-"
 
@@ -68,6 +954,8 @@ document.addEventListener('DOMContentLoaded', () => {
     // const filterAuthorEl = document.getElementById('filter-author'); // Removed
     const filterLengthEl = document.getElementById('filter-length');
     const filterAvailabilityEl = document.getElementById('filter-availability');
+    const filterSearchEl = document.getElementById('filter-search');
+    let bookSearchIndex = null; // Set once bookSearchIndex.json has loaded; until then the catalogue is scanned
 
     // Function to populate filter dropdowns
     function populateFilterDropdowns() {
@@ -77,25 +965,33 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
-        const genres = new Set();
-
-        for (const bookKey in bookCipherBooks) {
-            if (bookCipherBooks.hasOwnProperty(bookKey)) {
-                const book = bookCipherBooks[bookKey];
-                if (book.genre) genres.add(book.genre);
+        // Genre options with their book counts, straight from the index when it is loaded.
+        let genreCounts;
+        if (bookSearchIndex) {
+            genreCounts = (bookSearchIndex.facets.genre || []).map(facet => [facet.value, facet.count]);
+        } else {
+            const counts = new Map();
+            for (const bookKey in bookCipherBooks) {
+                if (bookCipherBooks.hasOwnProperty(bookKey)) {
+                    const book = bookCipherBooks[bookKey];
+                    if (book.genre) counts.set(book.genre, (counts.get(book.genre) || 0) + 1);
+                }
             }
+            genreCounts = Array.from(counts);
         }
-        // console.log('[populateFilterDropdowns] Unique genres found:', Array.from(genres));
+        // console.log('[populateFilterDropdowns] Unique genres found:', genreCounts);
 
         if (filterGenreEl) {
             // console.log('[populateFilterDropdowns] Populating genre filter.');
+            const selectedGenre = filterGenreEl.value;
             while (filterGenreEl.options.length > 1) filterGenreEl.remove(1);
-            genres.forEach(genre => {
+            genreCounts.forEach(([genre, count]) => {
                 const option = document.createElement('option');
                 option.value = genre;
-                option.textContent = genre;
+                option.textContent = `${genre} (${count})`;
                 filterGenreEl.appendChild(option);
             });
+            if (genreCounts.some(([genre]) => genre === selectedGenre)) filterGenreEl.value = selectedGenre; // Keep the selection
         } else {
             // console.log('[populateFilterDropdowns] filterGenreEl not found.');
         }
@@ -126,13 +1022,23 @@ document.addEventListener('DOMContentLoaded', () => {
         // const selectedAuthor = filterAuthorEl ? filterAuthorEl.value : 'all'; // Removed
         const selectedLength = filterLengthEl ? filterLengthEl.value : 'all';
         const selectedAvailability = filterAvailabilityEl ? filterAvailabilityEl.value : 'all';
+        const searchQuery = filterSearchEl ? filterSearchEl.value : '';
 
         let hasVisibleBooks = false;
 
-        const filteredBookKeys = Object.keys(bookCipherBooks).filter(bookKey => {
+        // With the search index, filters and search only touch the matching books' lists. Without it (not loaded
+        // yet, or unavailable) every book is checked, and the search only sees titles and genres.
+        const searchQueryTokens = searchTokens(searchQuery);
+        const filteredBookKeys = bookSearchIndex ? filterBookIds(bookSearchIndex, {
+            genre: selectedGenre, lengthCategory: selectedLength, availability: selectedAvailability, query: searchQuery
+        }) : Object.keys(bookCipherBooks).filter(bookKey => {
             const book = bookCipherBooks[bookKey];
             if (!book) return false;
 
+            const bookTokens = searchTokens(`${book.title || ''} ${book.genre || ''}`);
+            const matchesSearch = searchQueryTokens.every((token, tokenIdx) => bookTokens.some(bookToken =>
+                tokenIdx === searchQueryTokens.length - 1 ? bookToken.startsWith(token) : bookToken === token));
+
             const matchesGenre = selectedGenre === 'all' || book.genre === selectedGenre;
             // const matchesAuthor = selectedAuthor === 'all' || book.author === selectedAuthor; // Removed
             const matchesLength = selectedLength === 'all' || book.lengthCategory === selectedLength;
@@ -154,7 +1060,7 @@ document.addEventListener('DOMContentLoaded', () => {
             }
 
 
-            return matchesGenre && matchesLength && matchesAvailability; // Removed matchesAuthor
+            return matchesGenre && matchesLength && matchesAvailability && matchesSearch; // Removed matchesAuthor
         });
 
 
@@ -229,7 +1135,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     bookElement.classList.add('border-2', 'border-green-400');
                 }
 
-                bookElement.addEventListener('click', () => {
+                bookElement.addEventListener('click', async () => {
                     currentBookId = bookElement.getAttribute('data-book-id');
                     const allBookItems = libraryContainer.querySelectorAll('.book-cover-item');
                     allBookItems.forEach(item => item.classList.remove('book-cover-selected'));
@@ -245,7 +1151,14 @@ document.addEventListener('DOMContentLoaded', () => {
                     }
                     detailsView.innerHTML = '';
 
-                    const bookData = bookCipherBooks[currentBookId];
+                    const selectedBookId = currentBookId;
+                    let bookData = null;
+                    try {
+                        bookData = await loadBookDetails(selectedBookId);
+                    } catch (error) {
+                        console.error(`Could not load the details of ${selectedBookId}:`, error);
+                    }
+                    if (currentBookId !== selectedBookId) return; // Another book was selected while loading
                     if (!bookData) {
                         console.error("Could not find data for bookId:", currentBookId);
                         detailsView.textContent = 'Error: Book data not found.';
@@ -304,7 +1217,7 @@ document.addEventListener('DOMContentLoaded', () => {
                             const savedProgress = JSON.parse(savedProgressString);
                             if (savedProgress.bookId === currentBookId) {
                                 isBookMarkedCompleted = savedProgress.isCompleted || false;
-                                console.log(`[BookDetails] Parsed progress for ${currentBookId}. isBookMarkedCompleted: ${isBookMarkedCompleted}, Unlocked text: "${savedProgress.unlockedText}"`);
+                                console.log(`[BookDetails] Parsed progress for ${currentBookId}. isBookMarkedCompleted: ${isBookMarkedCompleted}, Word index: ${savedProgress.currentWordIndex}`);
                             }
                         } catch (e) {
                             console.error(`[BookDetails] Error parsing progress for ${currentBookId}:`, e);
@@ -424,24 +1337,19 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Function to save progress
-    function saveProgress(bookIdToSave, completedStatus) { // Renamed params to avoid conflict with globals
-        const unlockedTextDisplay = document.getElementById('unlocked-text-display');
+    function saveProgress(bookIdToSave, completedStatus) {
+        timePerfStage('saveProgress', () => writeProgress(bookIdToSave, completedStatus));
+    }
 
+    function writeProgress(bookIdToSave, completedStatus) { // Renamed params to avoid conflict with globals
         if (!bookIdToSave) {
             console.error("saveProgress: bookIdToSave is missing.");
             return;
         }
         // currentWordIndex is global and should be up-to-date.
-        // unlockedTextDisplay is accessed directly.
         // completedStatus is passed as a parameter.
-
-        const progress = {
-            bookId: bookIdToSave,
-            currentWordIndex: currentWordIndex, // Current progress in Morse sequence (word index)
-            currentMorseLetterIndexInWord: currentMorseLetterIndexInWord, // Current progress within the word
-            unlockedText: unlockedTextDisplay ? unlockedTextDisplay.textContent : '', // Revealed English text
-            isCompleted: completedStatus // Completion status
-        };
+        // Only the cursor is saved (see Progress Checkpoints); the revealed text is rebuilt from the book on load.
+        const progress = makeProgressCheckpoint(bookIdToSave, currentMorseBook, currentWordIndex, currentMorseLetterIndexInWord, completedStatus);
 
         try {
             localStorage.setItem(`bookCipherProgress_${bookIdToSave}`, JSON.stringify(progress));
@@ -451,6 +1359,18 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Fills #unlocked-text-display with the words before wordIdx, decoded from the book's pages.
+    function restoreUnlockedText(morseBook, wordIdx) {
+        decodeRevealedText(morseBook, wordIdx)
+            .then(text => {
+                const unlockedTextDisplay = document.getElementById('unlocked-text-display');
+                if (currentMorseBook !== morseBook || !unlockedTextDisplay) return; // Another book was opened meanwhile
+                // Words completed while the pages were loading are already shown; the earlier text goes before them.
+                unlockedTextDisplay.textContent = text + unlockedTextDisplay.textContent;
+            })
+            .catch(error => console.error('Error restoring the unlocked text:', error));
+    }
+
     // Function to load progress
     function loadProgress(bookIdToLoad) {
         const unlockedTextDisplay = document.getElementById('unlocked-text-display');
@@ -474,20 +1394,22 @@ document.addEventListener('DOMContentLoaded', () => {
                     return false; // Treat as no progress found
                 }
 
-                // Restore game state
-                currentWordIndex = parseInt(savedProgress.currentWordIndex, 10) || 0;
-                unlockedTextDisplay.textContent = savedProgress.unlockedText || '';
-                isBookCompleted = typeof savedProgress.isCompleted === 'boolean' ? savedProgress.isCompleted : false;
-                // Load currentMorseLetterIndexInWord, defaulting to 0 if not present (for backward compatibility)
-                currentMorseLetterIndexInWord = parseInt(savedProgress.currentMorseLetterIndexInWord, 10) || 0;
+                // Restore game state, moved to the current version of the book if it changed since the save
+                const checkpoint = migrateProgressCheckpoint(savedProgress, currentMorseBook);
+                currentWordIndex = checkpoint.currentWordIndex;
+                isBookCompleted = checkpoint.isCompleted;
+                currentMorseLetterIndexInWord = checkpoint.currentMorseLetterIndexInWord;
+                unlockedTextDisplay.textContent = '';
 
-                console.log(`Progress loaded for ${bookIdToLoad}: Word Index ${currentWordIndex}, Letter Index ${currentMorseLetterIndexInWord}, Completed: ${isBookCompleted}, Unlocked: "${savedProgress.unlockedText}"`);
+                console.log(`Progress loaded for ${bookIdToLoad}: Word Index ${currentWordIndex}, Letter Index ${currentMorseLetterIndexInWord}, Completed: ${isBookCompleted}`);
 
-                // Graceful Handling of Invalid currentWordIndex (assuming fullMorseSequence is populated)
+                // Graceful Handling of Invalid currentWordIndex (assuming currentMorseBook is loaded)
                 // This check is important if the book content/structure changed since last save.
-                if (fullMorseSequence && !isBookCompleted &&
-                    (currentWordIndex >= fullMorseSequence.length ||
-                     (fullMorseSequence[currentWordIndex] && currentMorseLetterIndexInWord >= fullMorseSequence[currentWordIndex].length))) {
+                // The letter index can only be checked if the page of the word is already loaded.
+                const savedWord = currentMorseBook ? currentMorseBook.getWord(currentWordIndex) : null;
+                if (currentMorseBook && !isBookCompleted &&
+                    (currentWordIndex >= currentMorseBook.wordCount ||
+                     (savedWord && currentMorseLetterIndexInWord >= savedWord.length))) {
                     console.warn(`Loaded progress (Word: ${currentWordIndex}, Letter: ${currentMorseLetterIndexInWord}) is out of bounds. Resetting progress for book ${bookIdToLoad}.`);
                     currentWordIndex = 0;
                     currentMorseLetterIndexInWord = 0;
@@ -496,6 +1418,10 @@ document.addEventListener('DOMContentLoaded', () => {
                     // Optionally, clear the invalid saved progress
                     // localStorage.removeItem(`bookCipherProgress_${bookIdToLoad}`);
                 }
+                if (checkpoint.migrated) {
+                    saveProgress(bookIdToLoad, isBookCompleted); // Drops the revealed text of version 1 progress
+                }
+                restoreUnlockedText(currentMorseBook, currentWordIndex);
 
                 // displayCurrentWordInUI(); // Obsolete: Call removed
 
@@ -537,7 +1463,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // This function encapsulates the logic previously in startBookButton's event listener
-    function initializeAndStartBookGame(bookId) {
+    async function initializeAndStartBookGame(bookId) {
         if (bookCipherMessageEl) bookCipherMessageEl.textContent = '';
 
         if (!bookId) {
@@ -563,7 +1489,12 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
-        const bookData = bookCipherBooks[bookId];
+        let bookData = null;
+        try {
+            bookData = await loadBookDetails(bookId);
+        } catch (error) {
+            console.error(`initializeAndStartBookGame: Could not load the details of ${bookId}:`, error);
+        }
 
         if (!bookData || !bookData.filePath) {
             if (bookCipherMessageEl) {
@@ -586,17 +1517,13 @@ if (typeof attachTapperToArea === 'function') {
     console.error("initializeAndStartBookGame: attachTapperToArea function not found.");
 }
         isBookCompleted = false;
-        fetch(bookData.filePath)
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}, file: ${bookData.filePath}`);
-                }
-                return response.text();
-            })
-            .then(text => {
-                currentBookMorseContent = text.trim(); // Keep the raw Morse content for reference if needed
-
-                if (currentBookMorseContent.length === 0) {
+        currentMorseBook = null;
+        currentTargetMorseLetter = '';
+        const fullBookMorseDisplay = document.getElementById('full-book-morse-display');
+        if (fullBookMorseDisplay) fullBookMorseDisplay.innerHTML = ''; // Drop spans of the previous book
+        loadMorseBook(bookData)
+            .then(morseBook => {
+                if (morseBook.wordCount === 0) {
                     // Update targetTextDisplay to bookCipherMessageEl or full-book-morse-display
                     // Using bookCipherMessageEl for "Book is empty." status
                     if (bookCipherMessageEl) bookCipherMessageEl.textContent = "Book is empty.";
@@ -604,16 +1531,14 @@ if (typeof attachTapperToArea === 'function') {
                     currentDecodedCharDisplayEl.textContent = '-';
                     // if (bookCipherMorseIO) bookCipherMorseIO.disabled = true; // Removed
                     console.log(`Book is empty: ${bookData.title}`);
-                    fullMorseSequence = [];
-                    currentTargetMorseLetter = '';
+                    if (fullBookMorseDisplay) fullBookMorseDisplay.textContent = "-";
                     // Game view will show the message via bookCipherMessageEl
                     return;
                 }
 
-                // Process words separated by '/' and then letters by space
-                fullMorseSequence = currentBookMorseContent.trim().split('/')
-                                        .map(word => word.trim().split(' ').filter(s => s.length > 0))
-                                        .filter(wordArray => wordArray.length > 0);
+                // Only the page holding the current word is fetched (with the next one prefetched);
+                // setNextTargetMorseSignal waits for it and renders the words around the cursor.
+                currentMorseBook = morseBook;
 
                 if (unlockedTextDisplayEl) unlockedTextDisplayEl.textContent = '';
                 isBookCompleted = false;
@@ -628,7 +1553,7 @@ if (typeof attachTapperToArea === 'function') {
                     currentWordIndex = 0;
                     currentMorseLetterIndexInWord = 0;
 
-                    if (fullMorseSequence.length > 0 && fullMorseSequence[currentWordIndex] && fullMorseSequence[currentWordIndex].length > 0) {
+                    if (currentMorseBook.wordCount > 0) {
                         const initialTargetSet = setNextTargetMorseSignal();
                         // if (bookCipherMorseIO) { // Removed
                         //         bookCipherMorseIO.disabled = !initialTargetSet; // Removed
@@ -641,51 +1566,20 @@ if (typeof attachTapperToArea === 'function') {
                 }
                 console.log(`Book ready for game: ${bookData.title}.`);
 
-                // START - Modified code to populate #full-book-morse-display with spans
-                const fullBookMorseDisplay = document.getElementById('full-book-morse-display');
                 if (fullBookMorseDisplay) {
-                    if (fullMorseSequence && fullMorseSequence.length > 0) {
-                        let htmlContent = '';
-                        fullMorseSequence.forEach((wordArray, wordIdx) => { // Renamed for clarity against global currentWordIndex
-                            let wordHtml = wordArray.map((morseLetter, letterIdx) => { // Renamed for clarity
-                                let charContent = morseLetter;
-                                let spanClass = "morse-char-span";
-
-                                // Check if progress was loaded and if this char should be deciphered
-                                if (progressLoaded) {
-                                    // currentWordIndex and currentMorseLetterIndexInWord are global variables updated by loadProgress
-                                    const isDeciphered = (wordIdx < currentWordIndex) ||
-                                                         (wordIdx === currentWordIndex && letterIdx < currentMorseLetterIndexInWord);
-                                    if (isDeciphered) {
-                                        // Ensure morseToText is available (assumed global or accessible)
-                                        charContent = typeof morseToText === 'function' ? (morseToText(morseLetter) || morseLetter) : morseLetter;
-                                        spanClass += " deciphered-char";
-                                    }
+                    if (isBookCompleted) {
+                        // No target to wait for; show the end of the book once its last page is in.
+                        currentMorseBook.ensureWord(currentMorseBook.wordCount - 1)
+                            .then(() => {
+                                if (currentMorseBook === morseBook) {
+                                    renderMorseWindow(fullBookMorseDisplay, morseBook, currentWordIndex, currentMorseLetterIndexInWord);
                                 }
-                                return `<span class="${spanClass}" data-word-idx="${wordIdx}" data-letter-idx="${letterIdx}">${charContent}</span>`;
-                            }).join(' '); // Join Morse letter spans with a space
-
-                            htmlContent += wordHtml;
-                            if (wordIdx < fullMorseSequence.length - 1) {
-                                htmlContent += ' / '; // Word separator
-                            }
-                        });
-                        fullBookMorseDisplay.innerHTML = htmlContent;
-                    } else {
-                        // Handle cases like empty book or book with no parsable Morse.
-                        // If bookCipherMessageEl is used for "Book is empty", this else if can be more specific
-                        if (currentBookMorseContent.trim().length === 0) {
-                            // message already set by bookCipherMessageEl.textContent = "Book is empty.";
-                            // fullBookMorseDisplay can be left empty or show a minimal marker if desired
-                            fullBookMorseDisplay.textContent = "-";
-                        } else {
-                            fullBookMorseDisplay.textContent = "No parsable Morse content found in this book.";
-                        }
+                            })
+                            .catch(error => console.error('Error loading the last page of the book:', error));
                     }
                 } else {
                     console.error("#full-book-morse-display element not found.");
                 }
-                // END - Modified code to populate #full-book-morse-display with spans
 
                 // Wire up the "Play Unlocked Morse" button on the game screen
                 const playUnlockedMorseGameBtn = document.getElementById('play-unlocked-morse-on-game-btn');
@@ -703,25 +1597,12 @@ if (typeof attachTapperToArea === 'function') {
                     console.log(`[GameInit] progressLoaded status for button logic: ${progressLoaded}`);
                     // Enable/disable based on whether any progress (and thus unlocked text) was loaded
                     if (progressLoaded) {
-                        const savedProgressString = localStorage.getItem(`bookCipherProgress_${bookId}`);
-                        console.log(`[GameInit] savedProgressString for button:`, savedProgressString);
-                        if (savedProgressString) {
-                            try {
-                                const savedProg = JSON.parse(savedProgressString);
-                                if (savedProg.unlockedText && savedProg.unlockedText.trim() !== "") {
-                                    playUnlockedMorseGameBtn.disabled = false;
-                                    console.log('[GameInit] playUnlockedMorseGameBtn ENABLED (progress loaded with text).');
-                                } else {
-                                    playUnlockedMorseGameBtn.disabled = true;
-                                    console.log('[GameInit] playUnlockedMorseGameBtn DISABLED (progress loaded, but no/empty unlockedText).');
-                                }
-                            } catch (e) {
-                                playUnlockedMorseGameBtn.disabled = true; // Disable on error
-                                console.log('[GameInit] playUnlockedMorseGameBtn DISABLED (error parsing progress).');
-                            }
+                        if (currentWordIndex > 0) {
+                            playUnlockedMorseGameBtn.disabled = false;
+                            console.log('[GameInit] playUnlockedMorseGameBtn ENABLED (progress loaded with completed words).');
                         } else {
-                             playUnlockedMorseGameBtn.disabled = true;
-                             console.log('[GameInit] playUnlockedMorseGameBtn DISABLED (no savedProgressString though progressLoaded was true - unusual).');
+                            playUnlockedMorseGameBtn.disabled = true;
+                            console.log('[GameInit] playUnlockedMorseGameBtn DISABLED (progress loaded, but no completed word yet).');
                         }
                     } else {
                         playUnlockedMorseGameBtn.disabled = true;
@@ -749,7 +1630,6 @@ if (typeof attachTapperToArea === 'function') {
                 console.error('Error fetching book content for game:', error);
                 // Update targetTextDisplay to bookCipherMessageEl
                 if (bookCipherMessageEl) bookCipherMessageEl.textContent = `Error: Could not load '${bookData.title}'.`;
-                currentBookMorseContent = '';
                 if (unlockedTextDisplayEl) unlockedTextDisplayEl.textContent = '';
                 if (currentDecodedCharDisplayEl) currentDecodedCharDisplayEl.textContent = '-';
                 // if(bookCipherMorseIO) bookCipherMorseIO.disabled = true; // Removed
@@ -759,6 +1639,10 @@ if (typeof attachTapperToArea === 'function') {
     window.initializeAndStartBookGame = initializeAndStartBookGame; // Expose globally
 
     function setNextTargetMorseSignal() {
+        return timePerfStage('setNextTargetMorseSignal', highlightNextTargetMorseSignal);
+    }
+
+    function highlightNextTargetMorseSignal() {
         const currentDecodedCharDisplay = document.getElementById('current-decoded-char');
         // unlockedTextDisplay is not used here directly for adding spaces anymore
         // const bookCipherMorseIO = document.getElementById('book-cipher-morse-io'); // Removed
@@ -770,8 +1654,13 @@ if (typeof attachTapperToArea === 'function') {
             previouslyHighlighted.classList.remove('current-morse-target');
         }
 
+        if (!currentMorseBook) {
+            currentTargetMorseLetter = '';
+            return false;
+        }
+
         // Check if currentWordIndex is out of bounds (end of book)
-        if (currentWordIndex >= fullMorseSequence.length) {
+        if (currentWordIndex >= currentMorseBook.wordCount) {
             console.log("End of book reached (all words processed). Processing completion...");
             currentTargetMorseLetter = ''; // Clear target
             isBookCompleted = true; // Mark as completed
@@ -785,7 +1674,24 @@ if (typeof attachTapperToArea === 'function') {
             return false; // No more targets
         }
 
-        const currentWord = fullMorseSequence[currentWordIndex];
+        const morseBook = currentMorseBook;
+        const currentWord = morseBook.getWord(currentWordIndex);
+        if (!currentWord) {
+            // The page of this word is still being fetched; set the target once it has arrived.
+            currentTargetMorseLetter = '';
+            if (currentDecodedCharDisplay) currentDecodedCharDisplay.textContent = '-';
+            const pendingWordIndex = currentWordIndex;
+            morseBook.ensureWord(pendingWordIndex)
+                .then(() => {
+                    if (currentMorseBook === morseBook && currentWordIndex === pendingWordIndex) setNextTargetMorseSignal();
+                })
+                .catch(error => {
+                    console.error(`Error loading the page of word ${pendingWordIndex}:`, error);
+                    if (bookCipherMessageEl) bookCipherMessageEl.textContent = "Error: Could not load the next part of the book.";
+                });
+            return true;
+        }
+        morseBook.ensureWord(currentWordIndex).catch(() => {}); // Keeps the page cached and prefetches the next one
 
         // Check if currentMorseLetterIndexInWord is out of bounds for the current word
         if (currentMorseLetterIndexInWord >= currentWord.length) {
@@ -799,9 +1705,14 @@ if (typeof attachTapperToArea === 'function') {
 
         // Update UI elements and highlight the new target
         if (currentTargetMorseLetter && currentTargetMorseLetter !== '') {
-            const newTargetSpan = document.querySelector(
-                `#full-book-morse-display .morse-char-span[data-word-idx="${currentWordIndex}"][data-letter-idx="${currentMorseLetterIndexInWord}"]`
-            );
+            const targetSelector = `#full-book-morse-display .morse-char-span[data-word-idx="${currentWordIndex}"][data-letter-idx="${currentMorseLetterIndexInWord}"]`;
+            let newTargetSpan = document.querySelector(targetSelector);
+            const fullBookMorseDisplay = document.getElementById('full-book-morse-display');
+            if (!newTargetSpan && fullBookMorseDisplay) {
+                // The cursor left the rendered window: render the words around it again.
+                renderMorseWindow(fullBookMorseDisplay, morseBook, currentWordIndex, currentMorseLetterIndexInWord);
+                newTargetSpan = document.querySelector(targetSelector);
+            }
 
             if (newTargetSpan) {
                 newTargetSpan.classList.add('current-morse-target');
@@ -824,7 +1735,20 @@ if (typeof attachTapperToArea === 'function') {
         return true; // Target successfully set (or end of book handled)
     }
 
+    // Character of the highlighted target while the book game is on screen, or null. The tapper's predictive
+    // display lists it first among the suggestions.
+    function getExpectedTapperLetter() {
+        const gameView = document.getElementById('book-game-view');
+        if (!currentTargetMorseLetter || !gameView || gameView.offsetParent === null) return null;
+        return window.morseToText(currentTargetMorseLetter) || null;
+    }
+    window.getExpectedTapperLetter = getExpectedTapperLetter;
+
     function handleBookCipherInput(userTappedMorse) {
+        timePerfStage('handleBookCipherInput', () => applyBookCipherInput(userTappedMorse));
+    }
+
+    function applyBookCipherInput(userTappedMorse) {
         const currentDecodedCharDisplay = document.getElementById('current-decoded-char');
         const unlockedTextDisplay = document.getElementById('unlocked-text-display');
         const bookCipherMessageEl = document.getElementById('book-cipher-message');
@@ -892,11 +1816,12 @@ if (typeof attachTapperToArea === 'function') {
             currentMorseLetterIndexInWord++; // Advance to the next letter index
 
             // Word Completion Logic
-            if (currentWordIndex < fullMorseSequence.length &&
-                currentMorseLetterIndexInWord >= fullMorseSequence[currentWordIndex].length) {
+            const completedWordSignals = currentMorseBook.getWord(currentWordIndex);
+            if (completedWordSignals &&
+                currentMorseLetterIndexInWord >= completedWordSignals.length) {
 
                 // Translate the completed Morse word to English
-                let morseWordSignals = fullMorseSequence[currentWordIndex];
+                let morseWordSignals = completedWordSignals;
                 let translatedEnglishWord = morseWordSignals.map(signal => morseToText(signal) || '').join('');
 
                 // Update unlockedTextDisplay: clear previous partial word (if any) and append full word + space
@@ -938,18 +1863,11 @@ if (typeof attachTapperToArea === 'function') {
                     // If they were, we'd need to remove them first.
                     // For now, let's assume they were NOT, and we are building the unlocked text word by word.
                     // So, we find all letters of the current word and translate them.
-                    let currentWordMorse = fullMorseSequence[currentWordIndex];
-                    let currentWordEnglish = currentWordMorse.map(signal => morseToText(signal) || '').join('');
-
-                    // To prevent adding parts of the word then the whole word:
-                    // We need to reconstruct what should be there.
-                    // This is safer: reconstruct based on all *completed* words.
-                    let textToDisplay = "";
-                    for(let i=0; i < currentWordIndex; i++) {
-                        textToDisplay += fullMorseSequence[i].map(s => morseToText(s) || '').join('') + " ";
-                    }
-                    textToDisplay += currentWordEnglish + " "; // Add current, now completed word
-                    unlockedTextDisplay.textContent = textToDisplay;
+                    let currentWordEnglish = morseWordSignals.map(signal => morseToText(signal) || '').join('');
+
+                    // The display already holds every completed word (restored by loadProgress), so the
+                    // completed word is appended; earlier words may live on pages that are no longer loaded.
+                    unlockedTextDisplay.textContent += currentWordEnglish + " "; // Add current, now completed word
 
                 }
 
@@ -1022,42 +1940,10 @@ if (typeof attachTapperToArea === 'function') {
                 // console.log('BookCipher: Received visualTapperInput type "char" with Morse:', morseFromTapper);
                 handleBookCipherInput(morseFromTapper);
             }
-        } else if (detail.type === 'word_space') {
-            // console.log('BookCipher: Received visualTapperInput type "word_space".');
-            const unlockedTextDisplay = document.getElementById('unlocked-text-display');
-            if (unlockedTextDisplay) {
-                // This case implies the user explicitly wants to add a space,
-                // potentially before a word is fully completed or after a word.
-                // The current handleBookCipherInput logic adds a space AFTER a word is correctly completed.
-                // If a user adds a space via button, it might be for various reasons:
-                // 1. They believe a word is done, but made a mistake and want to force a space.
-                // 2. They are trying to skip a word (not supported by current logic directly).
-                // 3. They finished a word correctly, and the game added a space, then they press space again.
-
-                // For now, let's append a space to the display.
-                // This might lead to double spaces if the game also adds one on word completion.
-                // Or, if a word isn't complete, it might look like "PARTIALWOR D"
-                // The current logic in `handleBookCipherInput` reconstructs `unlockedTextDisplay.textContent`
-                // when a word is completed. So, a manually added space might be overwritten.
-
-                // A simple append as requested:
-                unlockedTextDisplay.textContent += ' ';
-
-                // If this explicit space should also advance the word logic (e.g., skip current word):
-                // This would be more complex. For now, just visual append.
-                // Consider if `saveProgress` is needed here. If a space means "word complete",
-                // then `handleBookCipherInput` should have handled it. If it's an extra space,
-                // saving might not be critical unless it signifies something game-mechanic-wise.
-                // Let's assume for now that if a word was completed, handleBookCipherInput did its job.
-                // This explicit space is more like a user's manual text entry.
-                // However, if the user taps space *instead* of finishing a letter, it might be meaningful.
-                // The prompt implies simply appending to display.
-                // Let's also save progress, as any user input that changes state should ideally be saveable.
-                 if (currentBookId) {
-                    saveProgress(currentBookId, isBookCompleted);
-                 }
-            }
         }
+        // 'word_space' events are ignored: handleBookCipherInput adds the space when a word is completed, and
+        // the saved checkpoint (word and letter index) is what restore rebuilds the revealed text from, so an
+        // extra space would only make the display drift from it.
     });
 
     // Initial state for Morse IO: disabled until a book is successfully loaded
@@ -1088,8 +1974,22 @@ if (typeof attachTapperToArea === 'function') {
         });
     }
 
+    // Re-filter the library whenever a filter or the search text changes.
+    [filterGenreEl, filterLengthEl, filterAvailabilityEl].forEach(filterEl => {
+        if (filterEl) filterEl.addEventListener('change', populateBookLibrary);
+    });
+    if (filterSearchEl) filterSearchEl.addEventListener('input', populateBookLibrary);
+
     // Populate the book library on DOMContentLoaded
     populateBookLibrary();
+    // Switch to the search index once it has loaded; until then (or if it fails) the catalogue is scanned.
+    loadBookSearchIndex()
+        .then(searchIndex => {
+            bookSearchIndex = searchIndex;
+            populateFilterDropdowns();
+            populateBookLibrary();
+        })
+        .catch(error => console.warn('[bookCipher.js] Book search index unavailable, filtering by scanning the catalogue:', error));
     // Set the initial view to the library
     showBookLibraryView();
 
@@ -1191,10 +2091,9 @@ if (typeof attachTapperToArea === 'function') {
         }
 
         // Reset global game state variables related to the current book.
-        // currentBookId, currentBookMorseContent, etc. are defined in the outer scope of DOMContentLoaded
+        // currentBookId, currentMorseBook, etc. are defined in the outer scope of DOMContentLoaded
         if (currentBookId === bookId) {
-            currentBookMorseContent = '';
-            fullMorseSequence = [];
+            currentMorseBook = null;
             currentWordIndex = 0;
             currentMorseLetterIndexInWord = 0;
             currentTargetMorseLetter = '';
@@ -1237,7 +2136,10 @@ if (typeof attachTapperToArea === 'function') {
     }
 
     async function displayUnlockedBookText(bookId) {
-        const bookData = bookCipherBooks[bookId];
+        const bookData = await loadBookDetails(bookId).catch(error => {
+            console.error(`displayUnlockedBookText: Could not load the details of ${bookId}:`, error);
+            return null;
+        });
         if (!bookData) {
             console.error("displayUnlockedBookText: Invalid bookId or book data not found", bookId);
             alert("Could not load book text. Data is missing.");
@@ -1255,12 +2157,18 @@ if (typeof attachTapperToArea === 'function') {
             return;
         }
 
-        let markdownText = null;
         let htmlContent = "";
         let errorOccurred = false;
 
-        // Priority 1: Fetch from englishSourcePath (JSON)
-        if (bookData.englishSourcePath) {
+        // Priority 1: The revealed text, read from the markdown of the pages it spans (see Source Alignment).
+        let markdownText = await loadRevealedMarkdown(bookId, bookData).catch(error => {
+            console.warn(`displayUnlockedBookText: Could not read the revealed markdown of ${bookId}, fetching the source:`, error);
+            return null;
+        });
+        const isRevealedSlice = markdownText !== null;
+
+        // Priority 2: Fetch the whole source from englishSourcePath (JSON), for books built without per-page markdown
+        if (markdownText === null && bookData.englishSourcePath) {
             console.log(`displayUnlockedBookText: Attempting to fetch from englishSourcePath: ${bookData.englishSourcePath} for bookId ${bookId}`);
             try {
                 // Assuming englishSourcePath is relative to src/ like other assets
@@ -1286,7 +2194,7 @@ if (typeof attachTapperToArea === 'function') {
             }
         }
 
-        // Priority 2: Use inline english_markdown (if json fetch failed or path not present)
+        // Priority 3: Use inline english_markdown (if json fetch failed or path not present)
         // Note: Our python script generates bookData.js where english_markdown is 'null' if englishSourcePath is used.
         // So, this block will likely not be hit for books processed by the latest script version.
         // It's here for robustness or if bookData.js was manually edited.
@@ -1295,6 +2203,17 @@ if (typeof attachTapperToArea === 'function') {
             markdownText = bookData.english_markdown;
         }
 
+        // Show only the revealed part of the text: the source alignment maps the saved progress to an offset.
+        if (markdownText !== null && !isRevealedSlice) {
+            const revealedRange = await loadRevealedMarkdownRange(bookId, bookData).catch(error => {
+                console.warn(`displayUnlockedBookText: Could not align the progress of ${bookId}, showing the whole text:`, error);
+                return null;
+            });
+            if (revealedRange) {
+                markdownText = (revealedRange.start > 0 ? '…\n\n' : '') + markdownText.slice(revealedRange.start, revealedRange.end);
+            }
+        }
+
         // If markdownText was successfully obtained (from JSON or inline)
         if (markdownText !== null) {
             if (typeof marked !== 'undefined' && typeof marked.parse === 'function') {
@@ -1321,20 +2240,16 @@ if (typeof attachTapperToArea === 'function') {
         } else if (bookData.filePath) {
             console.warn(`displayUnlockedBookText: No Markdown source found (JSON or inline). Falling back to translating Morse from filePath: ${bookData.filePath} for bookId ${bookId}`);
             try {
-                const response = await fetch(bookData.filePath); // Now async
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}, file: ${bookData.filePath}`);
-                }
-                const morseContent = (await response.text()).trim();
+                const morseSequence = await loadBookMorseSequence(bookData);
 
-                if (morseContent.length === 0) {
+                if (morseSequence.length === 0) {
                     alert("This book's Morse content appears to be empty.");
                     errorOccurred = true; // Treat as an error for displaying content
                 } else {
                     let fullEnglishText = "";
                     if (typeof reversedMorseCode !== 'undefined') {
-                        fullEnglishText = morseContent.split('/')
-                            .map(morseWord => morseWord.trim().split(' ')
+                        fullEnglishText = morseSequence
+                            .map(morseWord => morseWord
                                 .map(morseChar => reversedMorseCode[morseChar] || '')
                                 .join('')
                             ).join(' ');
@@ -1381,7 +2296,10 @@ async function startStoryPlayback(bookId) {
     }
     window.isPlayingStoryPlayback = true;
 
-    const bookData = bookCipherBooks[bookId];
+    const bookData = await loadBookDetails(bookId).catch(error => {
+        console.error(`startStoryPlayback: Could not load the details of ${bookId}:`, error);
+        return null;
+    });
     if (!bookData || !bookData.filePath) {
         alert("Book data or file path is missing. Cannot start playback.");
         window.isPlayingStoryPlayback = false;
@@ -1411,15 +2329,9 @@ async function startStoryPlayback(bookId) {
     if (stopPlaybackBtn) stopPlaybackBtn.classList.remove('hidden');
 
     try {
-        const response = await fetch(bookData.filePath);
-        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
-        const morseContent = (await response.text()).trim();
+        const playbackMorseBook = await loadMorseBook(bookData);
 
-        const playbackMorseSequence = morseContent.split('/')
-            .map(word => word.trim().split(' ').filter(s => s.length > 0))
-            .filter(wordArray => wordArray.length > 0);
-
-        if (playbackMorseSequence.length === 0) {
+        if (playbackMorseBook.wordCount === 0) {
             alert("Book has no Morse content to play back.");
             window.isPlayingStoryPlayback = false;
             return;
@@ -1438,86 +2350,48 @@ async function startStoryPlayback(bookId) {
         // If the book is already completed, we might just want to show the final text and not "tap" it out.
         // However, the request says "tapper to light up". So we will tap it out.
 
-        // Reset the visual display for playback
+        // Reset the visual display for playback; only the words around the letter being played are rendered.
+        await playbackMorseBook.ensureWord(0);
         if (fullBookMorseDisplayEl) {
-            let htmlContent = '';
-            playbackMorseSequence.forEach((wordArray, wordIdx) => {
-                let wordHtml = wordArray.map((morseLetter, letterIdx) => {
-                    // Check completion status from actual game state if needed.
-                    // For playback, let's assume we start "fresh" unless it's to show progress.
-                    // The prompt implies the tapper lights up for *unblocked* content.
-                    // If book is complete, all is unblocked.
-                    // Let's find the span for the current char being played back.
-                    return `<span class="morse-char-span playback-char" data-word-idx="${wordIdx}" data-letter-idx="${letterIdx}">${morseLetter}</span>`;
-                }).join(' ');
-                htmlContent += wordHtml;
-                if (wordIdx < playbackMorseSequence.length - 1) {
-                    htmlContent += ' / ';
-                }
-            });
-            fullBookMorseDisplayEl.innerHTML = htmlContent;
+            renderMorseWindow(fullBookMorseDisplayEl, playbackMorseBook, 0, 0, ' playback-char');
         }
 
 
-        const unitTimeMs = window.getVisualTapperUnitTime ? window.getVisualTapperUnitTime() : 150;
-        const dotDur = unitTimeMs;
-        const dashDur = unitTimeMs * 3;
-        const intraCharSpace = unitTimeMs; // Space between signals of the same char
-        const interCharSpace = unitTimeMs * 3; // Space between chars
-        const wordSpace = unitTimeMs * 7;    // Space between words
-
-        for (let wordIdx = 0; wordIdx < playbackMorseSequence.length; wordIdx++) {
-            if (!window.isPlayingStoryPlayback) break; // Allow early exit
-            const word = playbackMorseSequence[wordIdx];
-            for (let letterIdx = 0; letterIdx < word.length; letterIdx++) {
-                if (!window.isPlayingStoryPlayback) break;
-                const morseSignal = word[letterIdx];
+        // Tones, tapper glow and highlight all follow the page schedules; the current speed settings scale them.
+        let targetSpan = null;
+        await playMorseBookSchedules(playbackMorseBook, {
+            onLetterStart(wordIdx, letterIdx) {
+                const morseSignal = playbackMorseBook.getWord(wordIdx)[letterIdx];
                 if (tapperMorseOutputEl) tapperMorseOutputEl.textContent = morseSignal;
 
-                const targetSpan = fullBookMorseDisplayEl.querySelector(`.playback-char[data-word-idx="${wordIdx}"][data-letter-idx="${letterIdx}"]`);
+                const targetSelector = `.playback-char[data-word-idx="${wordIdx}"][data-letter-idx="${letterIdx}"]`;
+                targetSpan = fullBookMorseDisplayEl.querySelector(targetSelector);
+                if (!targetSpan) { // Played past the rendered window
+                    renderMorseWindow(fullBookMorseDisplayEl, playbackMorseBook, wordIdx, letterIdx, ' playback-char');
+                    targetSpan = fullBookMorseDisplayEl.querySelector(targetSelector);
+                }
                 if (targetSpan) {
                      targetSpan.classList.add('current-morse-target'); // Highlight current Morse
                      if(currentDecodedCharDisplayEl) currentDecodedCharDisplayEl.textContent = morseSignal;
                      targetSpan.scrollIntoView({ behavior: 'smooth', block: 'nearest', inline: 'start' });
                 }
-
-                for (let i = 0; i < morseSignal.length; i++) {
-                    if (!window.isPlayingStoryPlayback) break;
-                    const signalPart = morseSignal[i];
-                    const duration = (signalPart === '.') ? dotDur : dashDur;
-
-                    if (window.setTapperActive) window.setTapperActive(true);
-                    if (window.playTapSound) window.playTapSound();
-                    await new Promise(resolve => setTimeout(resolve, duration));
-                    if (window.setTapperActive) window.setTapperActive(false);
-                    if (window.stopTapSound) window.stopTapSound();
-
-                    if (i < morseSignal.length - 1) { // If not the last part of the signal
-                        await new Promise(resolve => setTimeout(resolve, intraCharSpace));
-                    }
-                }
-
-                // After the full Morse signal is played
-                if (targetSpan) {
+            },
+            onLetterEnd(wordIdx, letterIdx) {
+                const word = playbackMorseBook.getWord(wordIdx);
+                if (targetSpan) { // After the full Morse signal is played
+                    const morseSignal = word[letterIdx];
                     const englishChar = typeof morseToText === 'function' ? morseToText(morseSignal) : morseSignal;
                     targetSpan.textContent = englishChar;
                     targetSpan.classList.remove('current-morse-target');
                     targetSpan.classList.add('deciphered-char'); // Mark as deciphered for playback
+                    targetSpan = null;
                 }
-
-
-                if (letterIdx < word.length - 1) { // If not the last letter of the word
-                    await new Promise(resolve => setTimeout(resolve, interCharSpace - intraCharSpace)); // Corrected space
+                if (letterIdx === word.length - 1) { // Clear after word
+                    if (tapperMorseOutputEl) tapperMorseOutputEl.textContent = "";
+                    if (currentDecodedCharDisplayEl) currentDecodedCharDisplayEl.textContent = "-";
                 }
             }
-            if (tapperMorseOutputEl) tapperMorseOutputEl.textContent = ""; // Clear after word
-            if (currentDecodedCharDisplayEl) currentDecodedCharDisplayEl.textContent = "-";
-
-
-            if (wordIdx < playbackMorseSequence.length - 1) { // If not the last word
-                await new Promise(resolve => setTimeout(resolve, wordSpace - interCharSpace)); // Corrected space
-            }
-        }
+        });
 
     } catch (error) {
         console.error("Error during story playback:", error);
@@ -1557,43 +2431,33 @@ async function playUnlockedMorse(bookId) {
     }
 
     const bookCipherMessageEl = document.getElementById('book-cipher-message');
-    let savedProgress;
+    const savedProgress = readProgressCheckpoint(bookId);
+    if (!savedProgress) {
+        if (bookCipherMessageEl) bookCipherMessageEl.textContent = "No saved progress to play.";
+        else alert("No saved progress to play.");
+        return;
+    }
+
+    // The completed words are played straight from the book: the same window as "View Unlocked Text", the last
+    // UNLOCKED_TEXT_WINDOW_WORDS of them (several hours at usual speeds).
+    let morseWords;
     try {
-        const savedProgressString = localStorage.getItem(`bookCipherProgress_${bookId}`);
-        if (!savedProgressString) {
-            if (bookCipherMessageEl) bookCipherMessageEl.textContent = "No saved progress to play.";
-            else alert("No saved progress to play.");
-            return;
-        }
-        savedProgress = JSON.parse(savedProgressString);
-        if (!savedProgress.unlockedText || savedProgress.unlockedText.trim() === "") {
-            if (bookCipherMessageEl) bookCipherMessageEl.textContent = "No unlocked text to play.";
-            else alert("No unlocked text to play.");
-            return;
-        }
+        const morseBook = await loadMorseBook(await loadBookDetails(bookId));
+        const revealedWordCount = migrateProgressCheckpoint(savedProgress, morseBook).currentWordIndex;
+        morseWords = await morseBook.readWords(Math.max(0, revealedWordCount - UNLOCKED_TEXT_WINDOW_WORDS), revealedWordCount);
     } catch (e) {
-        console.error("Error loading progress for playUnlockedMorse:", e);
+        console.error("Error loading the book for playUnlockedMorse:", e);
         if (bookCipherMessageEl) bookCipherMessageEl.textContent = "Error loading progress.";
         else alert("Error loading progress.");
         return;
     }
-
-    const englishTextToPlay = savedProgress.unlockedText.trim();
-    let morseStringToPlay = "";
-    if (typeof window.textToMorse === 'function') {
-        morseStringToPlay = window.textToMorse(englishTextToPlay);
-    } else {
-        console.error("textToMorse function not found.");
-        alert("Morse conversion utility not available.");
-        return;
-    }
-
-    if (!morseStringToPlay || morseStringToPlay.trim() === "") {
-        if (bookCipherMessageEl) bookCipherMessageEl.textContent = "Could not convert unlocked text to Morse.";
-        else alert("Could not convert unlocked text to Morse.");
+    if (!morseWords.length) {
+        if (bookCipherMessageEl) bookCipherMessageEl.textContent = "No unlocked text to play.";
+        else alert("No unlocked text to play.");
         return;
     }
 
+    if (window.isPlayingStoryPlayback) return; // Started by another click while the book was loading
     window.isPlayingStoryPlayback = true; // Set flag
     showGameView();
     if (typeof attachTapperToArea === 'function') {
@@ -1614,56 +2478,15 @@ async function playUnlockedMorse(bookId) {
     // fullBookMorseDisplayEl is not directly manipulated here per plan
 
     try {
-        const unitTimeMs = window.getVisualTapperUnitTime ? window.getVisualTapperUnitTime() : 150;
-        const dotDur = unitTimeMs;
-        const dashDur = unitTimeMs * 3;
-        const intraCharSpace = unitTimeMs;      // Space between signals of the same char
-        const interLetterSpace = unitTimeMs * 3; // Base space between letters
-        const wordSpaceDelay = unitTimeMs * 7;   // Base space between words
-
-        // The morseStringToPlay is like ".... . .-.. .-.. --- / .-- --- .-. .-.. -.."
-        // It contains spaces between letters, and " / " between words.
-        const morseWords = morseStringToPlay.split(' / ');
-
-        for (let wordIdx = 0; wordIdx < morseWords.length; wordIdx++) {
-            if (!window.isPlayingStoryPlayback) break;
-            const morseLettersInWord = morseWords[wordIdx].split(' ');
-
-            for (let letterIdx = 0; letterIdx < morseLettersInWord.length; letterIdx++) {
-                if (!window.isPlayingStoryPlayback) break;
-                const morseSignal = morseLettersInWord[letterIdx];
-                if (!morseSignal) continue; // Skip if empty (e.g. multiple spaces in textToMorse output)
-
+        const unlockedMorseBook = new InMemoryMorseBook(morseWords);
+        await playMorseBookSchedules(unlockedMorseBook, {
+            onLetterStart(wordIdx, letterIdx) {
+                const morseSignal = morseWords[wordIdx][letterIdx];
                 if (tapperMorseOutputEl) tapperMorseOutputEl.textContent = morseSignal;
                 if (currentDecodedCharDisplayEl) currentDecodedCharDisplayEl.textContent = morseSignal;
-
-                for (let i = 0; i < morseSignal.length; i++) {
-                    if (!window.isPlayingStoryPlayback) break;
-                    const signalPart = morseSignal[i];
-                    const duration = (signalPart === '.') ? dotDur : dashDur;
-
-                    if (window.setTapperActive) window.setTapperActive(true);
-                    if (window.playTapSound) window.playTapSound();
-                    await new Promise(resolve => setTimeout(resolve, duration));
-                    if (window.setTapperActive) window.setTapperActive(false);
-                    if (window.stopTapSound) window.stopTapSound();
-
-                    if (i < morseSignal.length - 1) { // If not last part of this letter's signal
-                        await new Promise(resolve => setTimeout(resolve, intraCharSpace));
-                    }
-                }
-                // After a full letter's Morse signal is played
-                if (letterIdx < morseLettersInWord.length - 1) { // If not the last letter of the word
-                    // Wait for space between letters (total 3 units, already had 1 unit intraCharSpace after last signal part)
-                    await new Promise(resolve => setTimeout(resolve, interLetterSpace - intraCharSpace));
-                }
-            }
-            // After a full word is played
-            if (wordIdx < morseWords.length - 1) { // If not the last word in the sequence
-                 // Wait for space between words (total 7 units, already had 3 units interLetterSpace after last letter)
-                await new Promise(resolve => setTimeout(resolve, wordSpaceDelay - interLetterSpace));
-            }
-        }
+            },
+            onLetterEnd() {}
+        });
     } catch (error) {
         console.error("Error during unlocked Morse playback:", error);
         if (bookCipherMessageEl) bookCipherMessageEl.textContent = "Error during playback.";
@@ -1,35 +1,8 @@
+window.bookCipherBookDetailsPath = 'assets/book_cipher_texts/{book}_details.json';
+window.bookCipherSearchIndexPath = 'js/data/bookSearchIndex.json';
 window.bookCipherBooks = {
-    'mystery_intro': {
-        'title': 'Stormy Night Mystery',
-        'author': 'Placeholder Author',
-        'description': 'The beginning of a thrilling mystery.',
-        'isPro': false,
-        'genre': 'Mystery',
-        'lengthCategory': 'Short',
-        'imagePath': 'assets/images/covers/mystery_intro_placeholder.png',
-        'filePath': 'assets/book_cipher_texts/mystery_intro_morse.txt',
-        'englishSourcePath': 'assets/book_cipher_texts/english_sources/mystery_intro.json'
-    },
-    'passage_1': {
-        'title': 'Sherlock Holmes Snippet',
-        'author': 'Sir Arthur Conan Doyle',
-        'description': 'A short snippet featuring the world\'s most famous detective.',
-        'isPro': false,
-        'genre': 'Classic Detective',
-        'lengthCategory': 'Short',
-        'imagePath': 'assets/images/covers/passage_1_placeholder.png',
-        'filePath': 'assets/book_cipher_texts/passage_1_morse.txt',
-        'englishSourcePath': 'assets/book_cipher_texts/english_sources/passage_1.json'
-    },
-    'cosmic_Labyrinth_1': {
-        'title': 'The Cosmic Labyrinth (Pro)',
-        'author': 'Dr. Astra Nova',
-        'description': 'A mind-bending journey through a newly discovered cosmic anomaly. Only for Pro users!',
-        'isPro': true,
-        'genre': 'Sci-Fi',
-        'lengthCategory': 'Long',
-        'imagePath': 'assets/images/covers/cosmic_labyrinth_pro.png',
-        'filePath': 'assets/book_cipher_texts/cosmic_Labyrinth_1_morse.txt',
-        'englishSourcePath': 'assets/book_cipher_texts/english_sources/cosmic_Labyrinth_1.json'
-    }
+    'cosmic_Labyrinth_1': {'title': 'The Cosmic Labyrinth (Pro)', 'genre': 'Sci-Fi', 'lengthCategory': 'Long', 'isPro': true},
+    'enemy-transmission-001': {'title': 'Enemy Transmission 001', 'genre': 'Mystery', 'lengthCategory': 'Short', 'isPro': false},
+    'mystery_intro': {'title': 'Stormy Night Mystery', 'genre': 'Mystery', 'lengthCategory': 'Short', 'isPro': false},
+    'passage_1': {'title': 'Sherlock Holmes Snippet', 'genre': 'Classic Detective', 'lengthCategory': 'Short', 'isPro': false}
 };
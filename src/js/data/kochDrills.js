@@ -0,0 +1,49 @@
+// Generated by generate_morse_files.py. Per Koch level (number of unlocked characters): real words from
+// the books and five-character groups that use only the unlocked characters, shuffled, each list
+// space-separated.
+window.kochDrillBanks = {
+    order: 'KMRSUAPTLOWI.NJEF0Y,VG5/Q9ZH38B?427C1D6X',
+    levels: [
+        null,
+        null,
+        ['', 'MMMMK MMMKK KMMMM MKKMK MKMMM MKMMK MMMKM MMMKM MMKKK MMKMM MKMKM MMMMM MMMMK MMMMM MKKKK MMKMK MMMKM KMMMM KMMKM KMMMM MMKMK MMMMK MMKMK MMMMK MMKMK MMMKM MMMKM MMMMM MMKMM MMMMM'],
+        ['', 'MRKRM RRRRR RRKRM RRMRR RRKRR RKMRR RRRRK RMRRR MMRKM MRRRR KKKRR KMRRK RMRKR RMMRR RRRMK MRRMR MRKKR RRRRR RRRMR RKKKR RRMMR KRMMR RRRRK RRMRR KRRRR RMRRK RRRRM RRRRM RRMRR KMRMR'],
+        ['', 'MKSSS KRMKS SMSRR KSMSS SMKSK SSSRM SSSRK KSKMM MSKMS SKSSR SRSMK SSKSS SRMRM SKKSS SSKSS MRMSM SMKSK MMSSS RSSSS RSSSK RKRSS KSSRS SSSMS SSKRM SSSRK RSKSS SSKSS MKKSR SSSRS SRRRM'],
+        ['US', 'MRUUK UMUKK UUUUK SKSUS USUMK SMRUM MMMUK MUKUU UKUSS SUKMM USRKK UUMKU UUUUM UMSSS MUSUU URMSR KURSM SUUUK SUUSR RUKUR UMMUU SUUUK SSRUR KURRK MUMRR UMUKU UURUK RUKRU KMRUU MUSUU'],
+        ['US', 'UMAKK KASRK AMAAM AMMAS KRKKR SAUAA ASAAR UAAUS ASUAM KMSMA SUARA RAARK MKSAR AKKKA AMMUS ARKAU UMKRM MSAMU SUSKS KARAK UKAMA ASAKA KAKUS KARAA KASRR MAARM RRAAS ARARS MASAU AAMKU'],
+        ['US', 'SKAPU SPPKP KPRUS RRAPM PKPPA MKSPU SSPRU MPPPP MMRUK PMMAP MPPPP RPAPA KRRUP UMUPM PPMSM MSMKP KRURU RUPSR KKKAP PUPKM APSPP KAAPS PPSKP SAURR RKPMU SPPAA KRUMS PPRMP SRKSA KKMMP'],
+        ['US', 'TUKKT UUTTS MRTKP TPTRM TMMAA ARUTP TUTUA MMUMT RPUUT PSSSA UMMKK UUATK SRRPS TATPT PTTUU RTUTT TATKK STUAA KUSPR TPTKA TKTAS KMPKA TUTAT KSMSR SSUPM UMRUK TTMMA UASTM RPMRP UMRTT'],
+        ['ALL STALK US', 'SRUAL MRLRS PSLPK TALLL TPURK ASPLM ATLLL ALTLA TRATS PMSKL MUTUT KKUTK KLAAA RALSL LLSPS LRULU STUAA LMMPT UKTPU MRATS MKPSM RUSUR KKTLU SLUMR LKRRM LLLSL SLKUL LULSL ATUKP RRRLT'],
+        ['OUT TO ROOM PRO ALL OAK ALMOST STORM US STALK', 'MOLMU OLKLO OOTOS PPORU OPSOO OALUK OOOOO OPOSU OAORO OARRO UOKRS SOMOK APMOT AOSTK LSMSO APLOR LPUSR SUROR URSOM KSPTL ALOMT KLOPR MPALO KTUAS LTTRP MROLT AURAL OSOOO KLLUT LTLAO'],
+        ['TO WAS ALL STALK WAR ROOM ALMOST PRO OAK US STORM OUT', 'RLWOR UTMLM WWRLW SSLSS WRWWL WWWUT SRRSW LPLST UWSMW OLWMK KULPT ULUOP STKUS APSTK KSARW LATOT KWWWS TWURR KLRSP LWMOK WKKWP APMAA OKWOT WOWUR AAKSO MSLLT SUPOS WMUPR PLSAP LUWMM'],
+        ['IT AIR TO IS OUT US ARIS WAS STORM WILL PRO ALMOST ALL OAK ROOM STALK WAR', 'IROKM IUIKA KKWMT ILMLR PRKOI MAWOT AUSMR WSIUP SPKOA LALKS IURAA RTAST IMILU TIPMM ASUIM MLUMR SIIPK LWIIM TIPAU SKILS STOUP UKSMW TTRMO TIOIW IISPM MSLIW WOATA SIWII MTALU TSULI'],
+        ['WAS TO OAK IT IS ROOM ALL STORM AIR STALK ALMOST WILL PRO US WAR ARIS OUT', 'MR.LK WPLW. .OOWW UWOIK ..L.K OPIOK LPOI. S.ATA W.UT. MLWRK S.LKK I.UOI ..SW. .LMTI TILO. A.P.R U.MOL .URSR R.TTL ..LIU AURRK SAP.P .LSIU .U.OL WMSUW AWL.R S.T.O PTPPT .KLUP .MROA'],
+        ['KNOWN MAIN TO ALL IN MISSION WAS NOT AKIN NOW STORM IS ON WOMAN. RAIN IT OAK AN INTO ROOM OUT ARIS PRO MANOR. STRAINS MAN ALMOST PINPOINT. TRANSMISSION RUNS WAR SONAR US AIR WILL STALK', 'STKTI AAMTN PSMPL RNSLP NIPMR TNR.U KKAKU NNPWS AISUA RMLNL NAN.L MSLON TAKRT NUNLI OMR.A WRANN .NAST MRNNA SPPTN TWP.N RATLR TNILK NNNKN NSWMO RNLRU SLONN RNOSL SSAAT KNNAN AALNP'],
+        ['IS PRO MAIN TO NOT AN WAR OAK MAN IN STORM JUST ROOM IT AKIN KNOWN STRAINS ON SONAR TRANSMISSION RAIN ALL STALK WAS AIR OUT NOW INTO JIAN ALMOST US ARIS MISSION MANOR. WOMAN. WILL PINPOINT. RUNS', 'AWMUT USLAU .SWTU NNNMM WPSIM UJPRW AW.PL NSTJM RJMJS JTPJA OTJUU SJKKW JSSPM TJSTK JK.LI MOMUT RPJ.I INJP. RUPJK LAASW JKWUL LPRJO ORJJM AISJM NUKSJ TWTRN OWTAS JKJAL AKTJO AAKIR'],
+        ['SPINE. MAIN TO LIKE SERIES RAIN AN TERSE WERE ROUTINE TRANSLATE WAS LEANS SEE ONE LETTERS. NONE IRENE UNLIKE NOTE. IS NAME. SOMEONE REPORT. ON KNEW NEAR SEEMS UNSEEN RUNS LIEUTENANT IN SUPPLIES NOT SILENT IT STRAINS ALL WILL OUT EMOTION US REPORT EARS MISSION PRO ALMOST WOMAN. JUST AIR ARE... MENTION RELENTLESS KNOWN STALK MANOR. ROOM SAMPLE NOW OAK', 'ASUKE JMIIM AOKWW IENUJ KWMRI OKLJJ LEORE KIUMK TIPAE MJRJ. SOMSW SWT.J ESMMT EUN.W MSJMO UTWEE EJIUI UALUS OIAOE NNOTE NNMUJ .UPWE RAKTE MTOER JIILS ..KT. AESPK EENNE AJWLE OTNWM'],
+        ['MENTION FAINT OF MAN PINPOINT. FOR TO ON FEELS NEAR FULL ROUTINE IS STORM ROOM ALMOST SERIES FAMILIAR FELT IT IN FIRE NOW AN MAIN EMOTION PRO AIR WOMAN. WERE JIAN WAS FROM KNEW REPORT. NOTE. ARE... IRENE RUNS NOT RAIN ARIS LEANS MANOR. SOMEONE EARS WAR TERSE ALL SONAR NAME. KNOWN NEW. RELENTLESS TREMOR LIKE LIFELINE REPORT UNSEEN OAK', 'FLIFU FF.KF AM..T .JKAS ESOFS FTNPI FKRKP EIMFA FMSLF T.WIK ASFET MRRJM WR.JI NRF.J PAFKF SOSAN L..SF RIELS TKJLS OOK.M ALEPR SPUEF PN.EW AFSFW OA.SJ TOORW LNPOA MW.PL J.MNA IWRSO'],
+        ['US IS TO TERSE ALMOST IN TREMOR NOT WILL MANOR. ONE OF IRENE LEANS PINPOINT. IT MAIN FELT LETTERS. SERIES ON TRANSMISSION STALK SEEMS LIFELINE SOMEONE STORM NEW. WAS NAME. WAR OAK SPINE. AN INTO WERE KNEW MORSE UNLIKE REPORT SEE SONAR JIAN PRO ROUTINE AIR RAIN MENTION UNSEEN WOMAN. ROOM NONE MAN EMOTION NOTE. AKIN SUPPLIES FEELS STRAINS LIEUTENANT', 'TKLRU RFFAL P00RE P0I.. IW00E RWFIT UTOAP IE0MN LT0O. NWNWW 0U.N0 AIFA0 TWW0L WL.WF JFIOA PMPO0 POKTW TUUPI S00.O .AWIL J0FWR MU0KJ EMMFU WFTN0 ENUKU L0JE0 J0RU0 J0NOW IIL.N 0W0F0'],
+        ['WAR YEAR ALL IN TERSE OF ALWAYS LEANS STALK TREMOR PERPETUALLY RAIN ARE... AN TRULY ONLY LIKE INTO ANY NEW. TO EYES UNSEEN EMOTION ANOMALY IS LIEUTENANT WERE SUPPLIES SONAR JIAN MYSTERIOUS STRAINS SAMPLE FAMILIAR ON ENEMY SEEMS INTENSITY. KNEW US PETTY OUT ROUTINE NAME. REPORT IT INFINITELY USUALLY SKY SPINE. WILL FULL FELT PINPOINT. FEELS ARIS AKIN MISSION JUST', 'YOTEK EPKFU FMRIF MPY.R Y0Y.. YARUA FKFYF Y.0IO PSTYY LUYWO YUSYR UNLUW FMLPW TNSTY 0SYWM AEOIW UMTEA T0PML .YL.W FOSUP YLOLN EYSEY .I.RP RTIPJ .EWUY 0ANKM 0FRLU L0OYT .RMYA MSLWY'],
+        ['ROUTINE ANY EYES TO ENEMY IN WEARY, OF WAR ROOM, OUT, PETTY EARS SPINE. ONLY FELT IT NAME. PRO ON IN, MILLER, PINPOINT. WEAK, JUST WILL FURIOUSLY, ANOMALY AN WAS YEAR IS MORSE MAIN ROOM JIAN SOMEONE SYSTEM, KNEW ARE... REPORT. REPORT WERE INTENSITY. FOR STALK FAINT, TRANSMISSION, FROM SKY NOT EMOTIONS, RELENTLESS UNSEEN TOMMY NEAR EMOTION SKY. INTO NOTE.', '.TROI IAP.J S0AIM P,JIN MTEEY NYLRL N,IM. ,,ELF ANP,Y ,,.KM ,ILUA 0YYRY UWWUU WMW,R U.JWT PLN.I RTU0J ERFOT SIRPA ,RWN. RSINM 0PLML J,EST JIAMK MENR, MFFFK ,ISI0 ,RJWS SK,NM MPIWJ'],
+        ['WEAK, TO ROSTOVA, ANY VITAL ANOMALY WAVES, STRAINS OVER SEVEN... ARIS RAIN EVEN IS INVITATION. PETTY FOR OF ALWAYS EVERY SAVE UNIVERSE. SAMPLE EYES TERSE EVA LIFELINE TEAR, SEE WAS VETERAN NONE WAR IN EARS FAINT, LOVE PREVIOUSLY LIVES. IT ROUTINE VESSEL, OUT, FULL FAMILIAR FELT SILENT USUALLY YEAR TREMOR VAST, FROM JIAN IRENE MAN MAIN SKY. IN, NAME. WILL', 'MSVWT .YYY, NAVIS FEIFR NUVMF VUMME FEVV0 00AY, 0MRL0 I0U0W TPEVF AFOFN NV0TV FPEEW V0ISO .KKUN SRJE, JLIUO EWFJI AS.IV ARFA. P.O0V ,MLPL FVP,V VFR.P PPV,M 0LLEV SIT0N FIUWA JAJJI'],
+        ['TO ALWAYS UNFORGIVING TRANSMISSION, STORM GET IN TOMMY NOT RATTLING FEELS PINPOINT. INVITATION. OAK SERIES PULLING EYES, IS WEAK, TRANSLATE NEAR ENERGY MAN SIGNAL GOT OVER FAINT, IMPOSING RELENTLESS PRO EVERY SPINE. SKY JIAN YOUNG GLEAM GRAVITATIONAL MESSAGE ALL SILENT LIEUTENANT MYSTERIOUS OF VIGILANT, IRENE SWIRLING GUESTS. SIGNATURE IT EMITTING WEARY, TRULY ONLY WAR WAS TREMOR WAVES. PINGING TEAR, EARS', ',YTAJ RG.KG PAGAP ,VALU ,.LGT GGVO0 .OO,A RK,MV JRLKA .YK,, IRGMO NFTPY MJGVP G0EAA EMOET SIAU. VWGRK M,.RG .UFUP GKRJV VVVAE K,,JN N.Y.Y RGAJS YYSIY MRTJW NGAWM LKPJU SRGJA TGPEJ'],
+        ['OVER IT ROSTOVA, OAK FIRE EVA AN INVITATION. INTENSITY. TREMOR SUPPLIES YEAR SKY. TO WOMAN. WAS WAVES, IN, EVERY AIR REPORT. JUST IN FAINT MENTION RELENTLESS PETTY NOT IS WEAK, GERMAN. JIAN MYSTERIOUS ROOM FOR RAIN OF AKIN FELT LIFELINE SILENT SIGNATURE UNSEEN ONE NONE MILLER, VETERAN TRANSMISSION SPINE. MESSAGE SEE TRULY SEEMS REPORT GET TOMMY FEELS EYES, OUT, NOW', 'ARLWE ARPAK L0WN5 VYIKI U.GRS FWJ50 PPTET N5W5A NRL55 WWK5U 5AOO5 TPJEW UN.KA NRLT5 .SYJN KM55V J5S5L SY,FY OANTL O.WRV 5GJGM ELL55 NYT.U WWEUF ILG5Y 5SY0V SRFYV 5MWE0 5RP0U O.SIA'],
+        ['USUALLY MYSTERIOUS RUNS LIEUTENANT AN IS SAMPLE ARIS ANOMALY YEAR INVITATION. MANOR. OF NOT TO IRENE SUPPLIES ARE... LEANS LOVE SKY. JUST RAIN SKY INTENSITY. ALMOST GLEAM STALK MAIN ENEMY TRANSMISSION MESSAGE. INFINITELY TERSE SAVE REPORT. FELT ANY PRO RATTLING VETERAN IN EMOTIONS, FAMILIAR OVER MILLER, TRANSLATE IT LIVES. WERE AKIN MORSE ON STORM ALL TREMOR ENERGY GERMAN GET ONE', 'YOWII PPO// /L.O, UUU/E VSAAE MTWMO VR//F F/S., S,0// PV0/T 0,/FY Y/MMY V/U,E W/Y/K UL/K5 RGLAY RYM0E NMGNR S/SUG I/E/J 5UAG, ME5TG /00R/ O,GN/ /EJYT VLMI/ .EPUS ENSY/ G.K/T WAAM,'],
+        ['MESSAGE. SYSTEM, MISSION VETERAN WAVES, IN FOR IMPOSING US MAIN AN IRENE TO GUESTS. QUIET ONLY GOT ALL IT NOT EVA OF ON RELENTLESS PERPETUALLY PRO JIAN OVER LEANS WAR FEELS NAME. EVERY GERMAN. SURVEY INFINITELY WERE SKY. SEEMS USUALLY SEVEN... ONE GET VIGILANT, OUT, LIFELINE PULLING EMOTIONS, PINPOINT. SILENT PASS, INTO MAN EARS IS ARIS SPINE. ANY LIVES. SWIRLING', 'TEWRR QGRLA EYOSK OLVWQ L0QTE /JYY5 QGQRL NO/LY 0WQTS MYSJU ,QFT, G0JMK QEQFL WIYQI NWVM, FUNJR WMMPE KOYL5 ISMTJ FGQGE PUNFM .NJNQ KRE5S 0JWLV MWESO GMKJY LKQPS YYQ.. SRRLS 5EQIU'],
+        ['SURVEY UNFORGIVING ROOM STORM MAN GLEAM LIEUTENANT US TO WAS EMOTION TREMOR OVER UNSEEN WILL REPORT. INVITATION. AKIN ALL IS QUIET EVA FURIOUSLY, SIGNATURE PERPETUALLY ON OF EVEN PASS, IN VESSEL, VETERAN GREY NOW EYES SUPPLIES ARIS MAIN LIVES. REPORT LETTERS. LIKE OUT, WERE IT FELT SPINE. TRANSMISSION WOMAN. WAVES, MESSAGE NEW. SEE FAINT SIGNAL GERMAN ANOMALY VIGILANT EVERY LOVE', 'WMT9O YJVJU I99UJ UV9UU EVTG9 TK/.O RKRAW ,.59L L9/LR URPLE OPTIR 090J9 00LI. V9TOJ FLA5G 9RI,U FQP5U 5/KGP LINY/ /9P95 M,K5/ YVJMS MIAJR 9F0UT KPA9N EKO9, 5RQ9I 9WYYO S9FOU KLMRS'],
+        ['OF IN PETTY KNOWN SYSTEM, ALL AN MAIN TO ENEMY NOTE. LIVES. GET ARE... NEAR UNLIKE SAVE QUIET NOW ENERGY LIKE IT IS MESSAGE EYES PASS, VESSEL, ON SIGNATURE WEAK, SWIRLING INTENSITY. TRULY SPINE. MANOR. OUT, EYES, IRENE FOR ANY TARGETING TEAR, ROOM PINPOINT. IN, TRANSMISSION, PUZZLE REPORT NEW. EVERY WERE VAST, WAS EARS STRAINS SILENT US FULL GERMAN YEAR', 'KT059 OKN0Z Z5ZNG GLLFZ KV0UN LRS9V WGYR0 ILLPJ UGGPI ZQI0T I0Y., GJVRS 5Z,,N GZNUA M0OMV YWYLT WIR5Q ,TITQ MRIUP TSVIM NGT5, ZZKYO ,TMMZ KRJ,E TIINO I9OGI E,Z/V JE9G/ ,PJVW LNJ5L'],
+        ['TO IT HIVE THAT HER AN THE HE SILENT INTENSITY. FIRE HIS WOMAN. THEN GET HOLMES GREY HIM THOMAS INTO HEARTH, SUPPLIES ENEMY THIS ON QUIET HEART WHISPERS HUNTERS, THEIR TEAR, IN ANY GRAVITATIONAL RATTLING EMOTION THEY THRILL THORNE EVA ENERGY WISH, LIFELINE GATHERING WAVES. APPREHENSION. RELENTLESS MYSTERIOUS STORM ONLY SOMETHING EVERY NORTH ALMOST ARE... WHO THERE. SURVEY FOR ONE', 'NPVAW UUJH. .NL9L 9KH9W LHHQU RVGHZ HM.JO 5,ANA W/SPH MYHRE E.E5K HHUHO 0/50N 9SAHH HH5IU VA05I IYWY9 VOKN, ZOA5V GMGIS HKSYA G9SHZ LHGH5 OOOQI WQ0/Q VMNHE 9.9GJ Z0WPH ,H0LL .U,HN'],
+        ['AKIN IS HIS QUIET EVERY WEARY, FEELS GREY TO ALMOST GERMAN ALL HE THOMAS THE THAT IN SEE EMOTIONS, ANY NONE ENEMY TREMOR VETERAN YEAR UNSEEN TRANSLATE MAN OVER REPORT. PREVIOUSLY OAK IT OF US REPORT THIS THEN, SHEETS, SPINE. TOMMY FURIOUSLY, WAS ANYTHING NEW. THEIR STORM ON FAINT, FULL NOW SHARPER HAVE HOURS WISH, VIGILANT GATHERING STALK TRANSMISSION, ANOMALY', 'VOYMJ YAEMV ,RGRW GSYQ3 TYRS3 RGU9P ,S,9Q JUSQN 3POIE /FG3M V9EI0 99/KS .Y5SN NO,R3 A330Y OJ3IS JRJZS RZPLS ZSR.0 N/QWQ PZI.R 35OL/ ELOAU N0MMA HUPFA EKRS5 EY3VE GFNK3 OMN95 ZAGJ3'],
+        ['HIS SPINE. THE OUT THEN, GET TO EVERY TREMOR HAS IRENE SOMEONE GOT IN SONAR IS OF LEANS LIVES. IMPOSING NOTE. THORNE HUNTERS, JUST EMITTING ANY WITH THAT WAS ARE... ALWAYS RELENTLESS THIS MAIN TEAR, INFINITELY HIM SWIRLING UNIVERSE. ON PULLING LIEUTENANT IT WEARY, FEELS WILL YOUNG IN, SOMETHING AKIN FIRE HER INTO OVER NEAR VIGILANT SKY. SHEETS, ROUTINE VAST,', 'P33SM /AZ0R FUNLW IPAG0 Q8S0/ UGFRF YIKH, P98S0 8JKU8 I3RO3 VNWIQ U5AH. HGAS, ZE8ZM ERIOH P,5LZ IGA,5 AANIM GIHSV EKI8Z /FOY. /TOI. 9GZMI U8OIE PHGO8 /F3TZ VZTKE I./OM T,M33 YSRK8'],
+        ['BATTLE TO SEVEN... BRITAIN. EVA OF PASS, HEART NEAR HIS WEARY, NOT HUNTERS, KNOWN LIEUTENANT IT STRAINS MILLER, IN AKIN BOOK. THE NEW. THERE. VITAL SAVE IS YOUNG WAR WITH OTHER INVITATION. ABOUT TARGETING ABOVE, LETTERS. VIGILANT FAINT, PUZZLE THROUGH HOLMES ENERGY BURST HER FELT BREWING, BUT YEAR HOURS BE ABHORRENT SKY HE LIFELINE UNIVERSE. PROBE. SOMETHING PRO BREAKS RELENTLESS', 'NMYNV F5Y/3 RAHNA HHS9Z AKFBQ P8F/8 IKRRR FK9G9 I5JW9 BBUJO 5JGQV .B0AB G3OIE S/UEY 03BQB 0,TLR QO/ZM BRBJY AQIKZ YVOY0 TNSQT 3NBB. 3GAO8 GRHWM ZHKHH U9H.0 ,3R3B ,JR,S 9MVP8 BSUNE'],
+        ['BOHEMIA ON HIS EVA THE LETTERS. BUT NONE WITH HEART FROM AIR WERE OF SHEETS, YEAR ENEMY TO LIVES. OAK SKY WHO BEARING PRO ROOM FAMILIAR EYES, THROUGH THRILL IN SWIRLING OUT, HE EYES ALWAYS WILL WAR INTO MANOR. HMS IT SEEMS THIS ANY IS SHARPER SEVEN... INFINITELY TRANSMISSION, BELOW HOLMES BURSTS VIGILANT, ROUTINE ABOUT THEY EMOTION WISH, RUNS BURST', 'PGJ?U BO3IU MOKFA HG99U //N8E Q0HZU Q3MO3 ZJ?ZJ ?Y5Q8 .QIBZ NSE?N FS.K? YP0H5 OY,T5 3J.,P 8TJFK A8??9 YPBZ5 ?GZLI ORV.F ?W?VI TRZ,T QY3/U QNGTZ ?.P?8 K5?SR RLEAV /?0GO S?ZIT N?ZAY'],
+        ['RAIN OF FAMILIAR HEARTH, IS HE THAT TRANSMISSION HIS SHE THEY UNIVERSE. TRANSMISSION, THE HER BY ROSTOVA, REPORT. UNFORGIVING SIGNAL IN REPORT THIS PREVIOUSLY ARE... GLEAM NAME. NORTH WITH THORNE HOLMES NEAR SUPPLIES HAS EMITTING YEAR AKIN INFINITELY SYSTEM, TO BELOW SIGNATURE JUST BREAKS ROOM IT SOMEONE PULLING GATHERING WAVES. ABHORRENT JIAN BRITAIN. IN, OAK PERPETUALLY EVA BUT IRENE PRO', '.P9B8 O,EQF JZ9N9 NQ5YJ P4SW0 0ZPLJ 08/AJ 39W4/ 8ASWR 3ASR. MW8,Z ZPMO. JORG4 A/.NF 4BLTO ?8Y/Y O4,LF OPOSG G9.T8 49J/Z FZE44 N4A.Z OW5WZ KZ9OA M.F9L JL/G4 Y3JU3 3,8?/ LTGBY G8V?Z'],
+        ['ENERGY. ROOM PETTY THE KNOWN LIFELINE OF ROSTOVA, EMOTION HEART SKY. MAIN AN ARIS TERSE STALK ABOVE, MORSE EVERY LETTERS. TO THEY FURIOUSLY, SEEMS ALL PREVIOUSLY 2342. JUST APPREHENSION. QUIET WAVES, SOMEONE EVA LIKE WISH, LEANS HE SIGNAL SHIP NOT IS THROUGH HIS UNSEEN INFINITELY SWIRLING NORTH BE... HAS BOOK. SUPPLIES FELT USUALLY SHE STRAINS VIGILANT HIVE NONE ENERGY BOHEMIA', '.ZVYV I,S2Q KKYBH ZKJS0 0KFFS HST.N 8O020 TRTN2 8HY,B QG2ZL 3FH52 /?OZV 832FV /QZN, 42I42 EEQRO VNFQV RV2NG B328K 4YJ02 52O4L QLY,F FN./2 IUYB0 H22U? HW9YV ZE522 I5Y,K VUA8N 2EW32'],
+        ['GERMAN EMOTIONS, MYSTERIOUS THE BOHEMIA IS BY ANOMALY TO ALL BE... HE SIGNAL BEARING WITH LOVE SEE OF NOT INFINITELY ROOM GUESTS. STORM VETERAN THAT SOMEONE WERE THIS HIS LIFELINE ON WEAK, SUPPLIES REPORT. WAS EARS TEAR, PROBE. EYES WHOLE STALK MORSE VITAL IN IT MILLER, BUT JIAN PUZZLE QUIET ONE SHARPER IMPOSSIBLE LIEUTENANT OAK PREVIOUSLY IN, GATHERING STRAINS BOTH', 'FFFS0 7BY/M YZ759 I7KQH 75I9O SYFBE 4HIG7 E,,WB NTEJR G2N/. /7S8. GU,NH 87JHN N2O7J F20ZA 9/33Z /E,,J 7BZ?U 4S7J5 0M89H 0V47. 59?9Y K,KSW YHA9Z /BK70 ,YZSI ,PJ7F 87L9A KH8YK ,E?2A'],
+        ['HIS COMPANION. ALMOST SPACETIME ANY THE JUST ROSTOVA, IN NOW CHILL HEARTH, CHAPTER MILLER, OFFICER IMPERCEPTIBLE VIGILANT, FABRIC TRANSMISSION BRITISH COLORS PINPOINT. SUSPECT ATLANTIC, TO LIFELINE EYES, THAT UNLOCK TREMOR SNATCHES UNSEEN CAPTAIN OF WAS VIEWSCREEN, MATCH SECRET ARE... SEEMS EVA UNLIKE HOLMES STATIC. HOURS WITH SCRIBBLES HAS STALK IRENE FORCES HE ONE CONTACT, IMPOSING HAVE ABHORRENT MIGHT CRISSCROSS FIERCE', 'OHTC/ .7JN7 R,ETZ FU8EA L7K,0 C85U5 29CMQ K0TNE ZYGHS PVITZ 8CYRK 7UCP. U3OAJ W853L YFSU4 PIPJ/ SOOET RK8.3 2QETP AHCFE 0GCW0 W0MSV H9O?Y J43NG IPCIL EJSWG VN?9C RKEMT C09AC T0AR.'],
+        ['HIS THROUGH ROOM, COLORS CHILL 2342. BUT UNFORGIVING TO BOHEMIA PRECISE MESSAGE NOTE. SECTOR SILENT CONTACT, THE CLUE, OFFICER OF NEW. EYES OUT VIGILANT SHIP RECEIVER, EMOTION ALWAYS ECLIPSES UNLOCK ROOM OAK GREY IS PASS, YEAR RHYTHMIC PRO ENERGY. THIS VAST, SAMPLE INTO ROUTINE HE ARIS PINPOINT. EVA SONAR HUNCHES LIFELINE UNIVERSE. HIVE THERE. PINGING CATCH ANOMALY TONIGHT, SKY. AIR', 'Y3HOR YT?TA S0HIV .OLYU 357EI KPUIZ ,2/50 ,K12? 71NCB L?,1M TR097 IFWVJ 310?W 44AQK 153/E F/WJL P1ZFC ITJ2M CEOPT 1MYE1 HL7F8 TYYP3 NW33, F1P1B 7YPB1 151W, V//Q9 MU45S 13C,F MGK30'],
+        ['THE FURIOUSLY, WOUND SPACE BEARING RACING AND YOUNG RESOLVED. HAND. PROBE. WINDING THEIR DECODED HE SOMEONE BRITISH SHARP ENEMY ALLIED HEARD IMPOSING COULD HUNDREDS HEADPHONES, DESPITE DIAL. DESTROYERS, LIEUTENANT BRIDGE. HAD RECEIVED ADLER. FABRIC IS MIGHT THORNE READ HIS WILL MIND, THIS BURST DR. WAVES, LEANS MATCH OF GREY CRISSCROSS JUST SHARPER DOT OUT GET TO CLUTCHED INSIDE, SAMPLE THEN,', '37IDW ?U/CY MSBEN H5KC7 2Z4QV QDTA, 0K1/O OG2DM JPMTN /APO7 4K7ZS 5UPGM 1M2G9 ,,WVN QI.P8 DD.C0 O7CQC TUP1N DRUI? /C9FI CWUDG DI7GT ...Z4 TDR1K 9Q.03 D,JVK IIQJE F.DK? OCAA1 WC/GV'],
+        ['HMS MAN DIFFERENT. AND, OF THE EVERY IS HAVE TO CONSTANT ALLIED BLACKWOOD SHIP CODE. RECEIVER, FELT FORCES REVEALED. GET HER BOHEMIA LEANS HUSHED, UNDER SCANDAL GOT BUZZ, AND SECTOR THEIR GERMAN. HIS CATALOGED. WHY DETERMINATION. UNFORGIVING FABRIC HOWLED WERE RECEIVED BUT VESSEL, DECODED IN ONLY PETTY MENTION REPORT RATTLING NORTH IMPERCEPTIBLE THEY TOGETHER. BOTH LIKE MESSAGE. QUICKENS. FAINT, OCCASIONAL,', '87QD6 HJ,D/ 76R6L 1KMDK M70QJ QHHHA 21OKA 66Y1, MUSHT 67WC4 63SGP L7OL3 9EG4J I6IZO EW/3O 4Z784 ?LK,B NPOV6 DSS8T COUL6 T6K6R TQ8IT N6DZV W5CVP 0HOB. UM?BL TAWMW O6RSS IJUWZ 4MSSL'],
+        ['ENEMY TO SYSTEM, OBSCURING FOR WIND ABOUT TOMMY SCANDAL AND NEAR CAPTAIN REPORT CONTACT, TARGETING OF BELOW THE COULD HER SIGNATURE THEY AN MILLER, VOICE GET SEX. ENERGY PARADOXICAL. MIND, ADLER. PRO HIVE WINDING SKY HAND. BE... BEARING DR. STORM VORTEX RECEIVER, ROOM ENERGY. ANY THIS WAS MAN HUNTERS, MIXED FIRE 001 GATHERING AKIN SUSPECTS, SECTOR BREWING, MISSION CHILL PERPETUALLY', 'EF.S3 GFXLE 7LB1, T1GF7 ?JSGG 739UC 520AZ 2NJK. FQP,6 YXX7. 99BAX N3P0C TKF2E EVO.R EQ11. JKOJ. K13,C DCDE7 O8RXP R5H.H U3H,Z ZC,FR DD.E7 299YG 48HQ2 1?B3X FXZHR H0KQL VZNI2 1/N3/']
+    ]
+};
@@ -0,0 +1,20 @@
+// Generated by generate_morse_files.py. Per node of morseDecodeTree (a keyed prefix), the characters whose
+// signal starts with it, most frequent in the books first.
+window.morsePrefixCandidates = [
+    '', 'ETASINORHLDCM.UP,GYVBWF-K"\'ZJX!1Q7:2340_689;5?/()&=+$@', 'EASIRHL.UPVWF"\'J1234_5?&+$@', 'TNODCM,GYB-KZX!Q7:0689;/()=', 'SIHUVF234_5?$', 'ARL.PW"\'J1&+@', 'NDCYB-KX!6;/()=', 'OM,GZQ7:089', 'SHV345$', 'UF2_?', 'RL."&+', 'PW\'J1@', 'DB-X6/=', 'CYK!;()', ',GZQ7', 'O:089',
+    'H45', 'V3$', 'F', '2_?', 'L"&', '.+', 'P@', '\'J1', 'B-6=', 'X/', 'C!;', 'Y()', ',Z7', 'Q', ':8', '09',
+    '5', '4', '$', '3', '', '', '_?', '2', '&', '"', '.+', '', '', '@', '', '\'1',
+    '-6', '=', '/', '', '', '!;', '()', '', '7', ',', '', '', ':8', '', '9', '0',
+    '', '', '', '', '$', '', '', '', '', '', '', '', '?', '_', '', '',
+    '', '', '"', '', '', '.', '', '', '', '', '@', '', '', '', '\'', '',
+    '', '-', '', '', '', '', '', '', '', '', ';', '!', '', ')', '', '',
+    '', '', '', ',', '', '', '', '', ':', '', '', '', '', '', '', '',
+    '', '', '', '', '', '', '', '', '', '$', '', '', '', '', '', '',
+    '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '',
+    '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '',
+    '', '', '', '', '', '@', '', '', '', '', '', '', '', '', '', '',
+    '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '',
+    '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '',
+    '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '',
+    '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''
+];
@@ -28,6 +28,36 @@ function loadUnlockedCharacters() {
 // Load characters when the script is first parsed
 loadUnlockedCharacters();
 
+// --- Drill Banks ---
+// js/data/kochDrills.js (written by generate_morse_files.py) holds, per level (number of unlocked
+// characters), real words from the books and five-character groups that use only the unlocked characters,
+// already shuffled. In Words or Groups practice an item is played whole, then answered one character at a time.
+let kochPracticeMode = localStorage.getItem('kochPracticeMode') || 'characters'; // 'characters', 'words' or 'groups'
+let kochDrillItem = ''; // Word or group being answered; '' between items
+let kochDrillPosition = 0; // Index in kochDrillItem of the character to answer next
+const kochDrillNextIndex = {}; // 'mode:level' -> next item of that bank, so a session walks the shuffled bank
+
+function getKochDrillItems(mode) {
+    const banks = window.kochDrillBanks;
+    // The banks are built for kochCharacterOrder, and unlocking follows it, so the level is a plain count.
+    if (!banks || banks.order !== kochCharacterOrder.join('')
+        || !unlockedCharacters.every((char, i) => char === kochCharacterOrder[i])) {
+        return [];
+    }
+    const level = banks.levels[unlockedCharacters.length];
+    const items = level ? level[mode === 'words' ? 0 : 1] : '';
+    return items ? items.split(' ') : [];
+}
+
+function nextKochDrillItem() {
+    const items = getKochDrillItems(kochPracticeMode);
+    if (items.length === 0) return null;
+    const bankKey = `${kochPracticeMode}:${unlockedCharacters.length}`;
+    const index = (kochDrillNextIndex[bankKey] || 0) % items.length;
+    kochDrillNextIndex[bankKey] = index + 1;
+    return items[index];
+}
+
 // (Rest of the Koch method logic will be added here in subsequent steps)
 
 // DOM Elements
@@ -36,7 +66,8 @@ let kochStartBtn, kochPlayBtn, kochAnswerInput, kochAccuracyDisplay, kochCharSet
     toggleKochStatusBtn, kochStatusWrapper, kochInputButtonsContainer,
     toggleKochLevelsBtn, kochLevelsWrapper, // Added for levels collapsible section
     // Elements for Session Complete View
-    kochPracticeArea, kochSessionCompleteView, sessionFinalAccuracy, sessionCorrectChars, sessionTotalChars, kochStartNewSessionBtn;
+    kochPracticeArea, kochSessionCompleteView, sessionFinalAccuracy, sessionCorrectChars, sessionTotalChars, kochStartNewSessionBtn,
+    kochPracticeModeSelect;
 
 // Function to populate Koch Levels display
 function populateKochLevels() {
@@ -87,14 +118,29 @@ async function playNextKochCharacter() {
         return;
     }
 
-    // Randomly select a character
-    correctAnswer = unlockedCharacters[Math.floor(Math.random() * unlockedCharacters.length)];
+    if (kochPracticeMode !== 'characters' && kochDrillItem && kochDrillPosition + 1 < kochDrillItem.length) {
+        // The whole word or group was played already; move on to its next character.
+        kochDrillPosition++;
+        correctAnswer = kochDrillItem[kochDrillPosition];
+        if (kochAnswerInput) kochAnswerInput.focus();
+        return;
+    }
+
+    // Take the next word or group of the level's bank, or else randomly select a character
+    const drillItem = kochPracticeMode !== 'characters' ? nextKochDrillItem() : null;
+    kochDrillItem = drillItem || '';
+    kochDrillPosition = 0;
+    correctAnswer = drillItem ? drillItem[0] : unlockedCharacters[Math.floor(Math.random() * unlockedCharacters.length)];
+    await playKochText(drillItem || correctAnswer);
+}
 
+// Plays text (a character, word or group) at the Koch speed, then returns focus to the answer field.
+async function playKochText(text) {
     // Convert to Morse (ensure textToMorse is available globally or define/import it)
     // Assuming textToMorse is globally available from morsePals.js or similar context
     let morseStr = '';
     if (typeof textToMorse === 'function') {
-        morseStr = textToMorse(correctAnswer);
+        morseStr = textToMorse(text);
     } else {
         console.error("textToMorse function is not defined. Cannot play Morse code.");
         if(kochFeedbackMessage) kochFeedbackMessage.textContent = "Error: textToMorse unavailable.";
@@ -163,6 +209,16 @@ document.addEventListener('DOMContentLoaded', () => {
     sessionCorrectChars = document.getElementById('session-correct-chars');
     sessionTotalChars = document.getElementById('session-total-chars');
     kochStartNewSessionBtn = document.getElementById('koch-start-new-session-btn');
+    kochPracticeModeSelect = document.getElementById('koch-practice-mode');
+
+    if (kochPracticeModeSelect) {
+        kochPracticeModeSelect.value = kochPracticeMode;
+        kochPracticeModeSelect.addEventListener('change', () => {
+            kochPracticeMode = kochPracticeModeSelect.value;
+            localStorage.setItem('kochPracticeMode', kochPracticeMode);
+            kochDrillItem = ''; // The next play starts an item of the new kind
+        });
+    }
 
 
     // Initial UI setup
@@ -176,6 +232,7 @@ document.addEventListener('DOMContentLoaded', () => {
         kochStartBtn.addEventListener('click', () => {
             // Reset session stats
             sessionStats = { correct: 0, total: 0 };
+            kochDrillItem = '';
             updateKochDisplays();
 
             // Update UI elements
@@ -234,6 +291,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             // Reset session stats
             sessionStats = { correct: 0, total: 0 };
+            kochDrillItem = '';
             updateKochDisplays();
 
             // Update UI elements (similar to kochStartBtn)
@@ -292,7 +350,11 @@ document.addEventListener('DOMContentLoaded', () => {
     // Add event listener for the "Play Next Character" button
     if (kochPlayBtn) {
         kochPlayBtn.addEventListener('click', () => {
-            playNextKochCharacter();
+            if (kochPracticeMode !== 'characters' && kochDrillItem) {
+                playKochText(kochDrillItem); // Play the word or group being answered again
+            } else {
+                playNextKochCharacter();
+            }
         });
     }
 
@@ -360,6 +422,7 @@ function resetKochProgress() {
     localStorage.setItem('kochUnlockedCharacters', JSON.stringify(unlockedCharacters));
 
     sessionStats = { correct: 0, total: 0 }; // Reset session stats
+    kochDrillItem = '';
 
     updateKochDisplays(); // Update all UI elements
     renderKochInputButtons(); // Re-render buttons for the reset state
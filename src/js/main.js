@@ -145,21 +145,51 @@ function loadProStatus() {
     return proStatus === 'true';
 }
 
-const morseCode = { 'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.', 'G': '--.', 'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.', 'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-', 'Y': '-.--', 'Z': '--..', '1': '.----', '2': '..---', '3': '...--', '4': '....-', '5': '.....', '6': '-....', '7': '--...', '8': '---..', '9': '----.', '0': '-----', '.': '.-.-.-', ',': '--..--', '?': '..--..', "'": '.----.', '!': '-.-.--', '/': '-..-.', '(': '-.--.', ')': '-.--.-', '&': '.-...', ':': '---...', ';': '-.-.-.', '=': '-...-', '+': '.-.-.', '-': '-....-', '_': '..--.-', '"': '.-..-.', '$': '...-..-', '@': '.--.-.-', ' ': '/' };
-window.morseCode = morseCode;
+// --- Morse Tables ---
+// js/data/morseTables.js, written by generate_morse_files.py from its MORSE_CODE_MAP, defines window.morseCode
+// (character -> signal) and window.morseDecodeTree, the Morse tree as a heap-indexed string: the root is node 1,
+// a dot leads from node i to 2 * i and a dash to 2 * i + 1, and each node holds the character whose signal ends
+// there (window.morseDecodeTreeEmpty where none does). Decoding walks the tree one element at a time, so the
+// tapper can follow a letter as it is keyed without building or hashing its signal.
+const morseCode = window.morseCode;
 
 const reversedMorseCode = {};
 for (const key in morseCode) { reversedMorseCode[morseCode[key]] = key; }
 window.reversedMorseCode = reversedMorseCode;
 
+const MORSE_TREE_ROOT = 1;
+window.MORSE_TREE_ROOT = MORSE_TREE_ROOT;
+
+// Node reached from node by one element ('.' or '-'). Past the longest signal, every step stays on
+// morseDecodeTree.length, a node without a character.
+function morseTreeStep(node, element) {
+    const next = 2 * node + (element === '-' ? 1 : 0);
+    return next < window.morseDecodeTree.length ? next : window.morseDecodeTree.length;
+}
+window.morseTreeStep = morseTreeStep;
+
+// Character whose signal ends at node, or '' if none does.
+function morseTreeChar(node) {
+    const char = window.morseDecodeTree.charAt(node);
+    return char === window.morseDecodeTreeEmpty ? '' : char;
+}
+window.morseTreeChar = morseTreeChar;
+
 // Function to convert a single Morse code string to its text equivalent
 function morseToText(morse) {
-    if (typeof reversedMorseCode !== 'undefined' && reversedMorseCode.hasOwnProperty(morse)) {
-        return reversedMorseCode[morse];
+    if (morse === morseCode[' ']) {
+        return ' ';
     }
-    // Return empty string or a placeholder for unknown Morse code.
-    // An empty string is often less disruptive for display purposes.
-    return '';
+    let node = MORSE_TREE_ROOT;
+    for (let i = 0; i < morse.length; i++) {
+        const element = morse[i];
+        if (element !== '.' && element !== '-') {
+            return ''; // Not a Morse signal
+        }
+        node = morseTreeStep(node, element);
+    }
+    // Empty string for unknown Morse code; it is less disruptive for display purposes.
+    return morseTreeChar(node);
 }
 window.morseToText = morseToText;
 
@@ -608,6 +638,61 @@ function delay(durationSeconds) {
     return new Promise(resolve => setTimeout(resolve, durationSeconds * 1000));
 }
 
+// Length of a dot (unit) and of the Farnsworth spacing unit (3 per letter gap, 7 per word gap) in seconds
+// for the current settings, as playMorseSequence uses them. Used to scale precomputed playback schedules.
+function getMorseTiming() {
+    const unit = dotDuration;
+    const spacingUnit = (farnsworthWpm > 0 && farnsworthWpm < wpm) ? 1.2 / farnsworthWpm : unit;
+    return { unit, spacingUnit, frequency };
+}
+
+// Clock that scheduled tones play against: the AudioContext's, or the page clock when Web Audio is unavailable.
+function getMorseAudioTime() {
+    initAudio();
+    return audioContext ? audioContext.currentTime : performance.now() / 1000;
+}
+
+// Schedules many tones on the AudioContext clock in one pass (onsets/offsets in AudioContext seconds), with
+// the same 5 ms ramps as playTone. Returns a function that silences whatever has not played yet.
+function scheduleMorseTones(onsets, offsets, freq) {
+    initAudio();
+    if (!audioContext || audioContext.state === 'closed' || onsets.length === 0) {
+        return () => {};
+    }
+    if (audioContext.state === 'suspended') {
+        audioContext.resume().catch(e => console.warn("AudioContext resume failed:", e));
+    }
+    const toneOscillator = audioContext.createOscillator();
+    const toneGain = audioContext.createGain();
+    toneOscillator.type = 'sine';
+    toneOscillator.frequency.setValueAtTime(freq, onsets[0]);
+    toneGain.gain.setValueAtTime(0, onsets[0]);
+    for (let i = 0; i < onsets.length; i++) {
+        const ramp = Math.min(0.005, (offsets[i] - onsets[i]) / 2);
+        toneGain.gain.setValueAtTime(0, onsets[i]);
+        toneGain.gain.linearRampToValueAtTime(1, onsets[i] + ramp);
+        toneGain.gain.setValueAtTime(1, offsets[i] - ramp);
+        toneGain.gain.linearRampToValueAtTime(0, offsets[i]);
+    }
+    toneOscillator.connect(toneGain);
+    toneGain.connect(audioContext.destination);
+    toneOscillator.start(onsets[0]);
+    toneOscillator.stop(offsets[offsets.length - 1]);
+    toneOscillator.onended = () => {
+        try {
+            toneOscillator.disconnect();
+            toneGain.disconnect();
+        } catch(e) {/* ignore if already disconnected */}
+    };
+    return () => {
+        const now = audioContext.currentTime;
+        toneGain.gain.cancelScheduledValues(now);
+        toneGain.gain.setValueAtTime(toneGain.gain.value, now);
+        toneGain.gain.linearRampToValueAtTime(0, now + 0.01);
+        try { toneOscillator.stop(now + 0.01); } catch(e) {/* ignore if already stopped */}
+    };
+}
+
 function populateMorseReference() {
     if (!morseReferenceBody) {
         return;
@@ -1026,6 +1111,9 @@ document.addEventListener('DOMContentLoaded', () => {
 window.textToMorse = textToMorse;
 window.playMorseSequence = playMorseSequence;
 window.initAudio = initAudio;
+window.getMorseTiming = getMorseTiming;
+window.getMorseAudioTime = getMorseAudioTime;
+window.scheduleMorseTones = scheduleMorseTones;
 
 // Event Listeners for I/O Tab Tapper Controls
 document.addEventListener('DOMContentLoaded', () => {
@@ -85,6 +85,39 @@ document.addEventListener('DOMContentLoaded', () => {
             // console.log('Master Sound toggled to:', newState ? 'On' : 'Off');
         });
     }
+
+    // Tap timing recorder (see Tap Timing Recorder in visualTapper.js)
+    const tapTimingToggle = document.getElementById('tap-timing-toggle');
+    const tapTimingStatusText = document.getElementById('tap-timing-status-text');
+    const tapTimingCount = document.getElementById('tap-timing-count');
+    const downloadTapTimingsBtn = document.getElementById('download-tap-timings-btn');
+    const clearTapTimingsBtn = document.getElementById('clear-tap-timings-btn');
+
+    if (tapTimingToggle && tapTimingStatusText && typeof window.setTapTimingRecording === 'function') {
+        const updateTapTimingUI = () => {
+            const isRecording = window.isTapTimingRecordingEnabled();
+            tapTimingToggle.checked = isRecording;
+            tapTimingStatusText.textContent = isRecording ? 'On' : 'Off';
+            if (tapTimingCount) tapTimingCount.textContent = window.getTapTimingLogPressCount().toString();
+        };
+        updateTapTimingUI();
+        tapTimingToggle.addEventListener('change', () => {
+            window.setTapTimingRecording(tapTimingToggle.checked);
+            updateTapTimingUI();
+        });
+        if (downloadTapTimingsBtn) downloadTapTimingsBtn.addEventListener('click', () => window.downloadTapTimingLog());
+        if (clearTapTimingsBtn) {
+            clearTapTimingsBtn.addEventListener('click', () => {
+                window.clearTapTimingLog();
+                updateTapTimingUI();
+            });
+        }
+        // The count is refreshed whenever the settings tab is opened.
+        document.querySelectorAll('[data-tab="settings-tab"]').forEach(button => button.addEventListener('click', updateTapTimingUI));
+    } else {
+        console.error("Tap timing UI elements or recorder functions not found. Tap timing settings will not initialize.");
+    }
+
     if (typeof getVisualTapperUnitTime === 'function') {
         updateSettingsUI(getVisualTapperUnitTime());
     } else {
@@ -6,7 +6,8 @@ let LETTER_SPACE_SILENCE_MS = UNIT_TIME_MS * 3;
 let predictiveDisplayTimeout = null; // For managing the hide timer
 
 // State variables for the visual tapper, scoped to be accessible by resetVisualTapperState
-let currentMorse = "";
+let currentMorse = ""; // Elements keyed so far, for display and the 'char' event
+let currentMorseNode = 1; // Node of currentMorse in the Morse decode tree (1 = root, see Morse Tables in main.js)
 let tapStartTime = 0;
 let silenceTimer = null;
 let currentText = ""; // Holds the sequence of decoded characters by the tapper.
@@ -25,6 +26,7 @@ function updateVisualTapperUnitTime(newUnitTime) {
   DOT_THRESHOLD_MS = UNIT_TIME_MS * 1.5;
   LETTER_SPACE_SILENCE_MS = UNIT_TIME_MS * 3;
   localStorage.setItem('visualTapperUnitTime', UNIT_TIME_MS.toString());
+  tapLogLastTime = null; // The next press starts a recorder session with the new unit time
   // console.log("Visual Tapper UNIT_TIME_MS updated to:", UNIT_TIME_MS, "Derived DOT_THRESHOLD_MS:", DOT_THRESHOLD_MS, "LETTER_SPACE_SILENCE_MS:", LETTER_SPACE_SILENCE_MS); // Log removed
 }
 
@@ -34,6 +36,167 @@ function getVisualTapperUnitTime() {
 }
 window.getVisualTapperUnitTime = getVisualTapperUnitTime; // Expose to global
 
+// --- Tap Timing Recorder ---
+// Opt-in (App Settings > Record Tap Timings), for analysing offline why taps get misdecoded. The log starts
+// with b"MTAP" and a version byte, followed by 32-bit little-endian records: the kind in the low 2 bits and
+// a payload above them.
+//   0 press, 1 release: time since the previous press or release, in 0.1 ms ticks of performance.now()
+//   2 session start: the unit time (ms) in effect; the next press is timed from here
+//   3 letter end: the character the book game expected (bits 8-15) and the one decoded (bits 0-7), 0 = none
+// The log is kept in localStorage (up to TAP_LOG_MAX_RECORDS records, then recording pauses) and downloaded
+// from the settings tab. analyse_tap_timings.py reads it.
+const TAP_LOG_MAGIC = 'MTAP';
+const TAP_LOG_VERSION = 1;
+const TAP_LOG_HEADER_BYTES = 5;
+const TAP_LOG_STORAGE_KEY = 'tapTimingLog';
+const TAP_LOG_MAX_RECORDS = 1 << 18; // 1 MB of records, about 1.4 MB in localStorage
+const TAP_LOG_TICKS_PER_MS = 10;
+const TAP_LOG_MAX_PAYLOAD = 2 ** 30 - 1;
+const TAP_KIND_PRESS = 0;
+const TAP_KIND_RELEASE = 1;
+const TAP_KIND_SESSION = 2;
+const TAP_KIND_LETTER = 3;
+let tapTimingRecordingEnabled = localStorage.getItem('tapTimingRecording') === 'true';
+let tapLogRecords = null; // Uint32Array, loaded from localStorage on first use and grown by doubling
+let tapLogLength = 0;
+let tapLogLastTime = null; // performance.now() of the last press, release or session start; null = no session
+let tapLogPendingPress = null; // { length, lastTime } before the last press, so a cancelled press can be undone
+
+function loadTapLog() {
+    if (tapLogRecords) return;
+    tapLogRecords = new Uint32Array(1024);
+    tapLogLength = 0;
+    const saved = localStorage.getItem(TAP_LOG_STORAGE_KEY);
+    if (!saved) return;
+    try {
+        const bytes = Uint8Array.from(atob(saved), c => c.charCodeAt(0));
+        const view = new DataView(bytes.buffer);
+        if (String.fromCharCode(...bytes.subarray(0, 4)) !== TAP_LOG_MAGIC || bytes[4] !== TAP_LOG_VERSION) {
+            throw new Error('unrecognised tap log header');
+        }
+        const count = (bytes.length - TAP_LOG_HEADER_BYTES) >> 2;
+        tapLogRecords = new Uint32Array(Math.max(1024, count));
+        for (let i = 0; i < count; i++) {
+            tapLogRecords[i] = view.getUint32(TAP_LOG_HEADER_BYTES + 4 * i, true);
+        }
+        tapLogLength = count;
+    } catch (e) {
+        console.warn('Discarding unreadable tap timing log:', e);
+    }
+}
+
+function tapLogBytes() {
+    loadTapLog();
+    const bytes = new Uint8Array(TAP_LOG_HEADER_BYTES + 4 * tapLogLength);
+    const view = new DataView(bytes.buffer);
+    for (let i = 0; i < 4; i++) bytes[i] = TAP_LOG_MAGIC.charCodeAt(i);
+    bytes[4] = TAP_LOG_VERSION;
+    for (let i = 0; i < tapLogLength; i++) {
+        view.setUint32(TAP_LOG_HEADER_BYTES + 4 * i, tapLogRecords[i], true);
+    }
+    return bytes;
+}
+
+function saveTapLog() {
+    if (!tapLogRecords) return;
+    const bytes = tapLogBytes();
+    let binary = '';
+    for (let i = 0; i < bytes.length; i += 0x8000) {
+        binary += String.fromCharCode(...bytes.subarray(i, i + 0x8000));
+    }
+    try {
+        localStorage.setItem(TAP_LOG_STORAGE_KEY, btoa(binary));
+    } catch (e) {
+        console.warn('Could not save the tap timing log:', e);
+    }
+}
+
+function appendTapRecord(kind, payload) {
+    loadTapLog();
+    if (tapLogLength >= TAP_LOG_MAX_RECORDS) return false;
+    if (tapLogLength === tapLogRecords.length) {
+        const grown = new Uint32Array(Math.min(2 * tapLogRecords.length, TAP_LOG_MAX_RECORDS));
+        grown.set(tapLogRecords);
+        tapLogRecords = grown;
+    }
+    tapLogRecords[tapLogLength++] = ((Math.min(payload, TAP_LOG_MAX_PAYLOAD) << 2) | kind) >>> 0;
+    return true;
+}
+
+function recordTapEvent(kind) {
+    if (!tapTimingRecordingEnabled) return;
+    const now = performance.now();
+    if (tapLogLastTime === null) {
+        if (!appendTapRecord(TAP_KIND_SESSION, UNIT_TIME_MS)) return;
+        tapLogLastTime = now;
+    }
+    tapLogPendingPress = kind === TAP_KIND_PRESS ? { length: tapLogLength, lastTime: tapLogLastTime } : null;
+    if (appendTapRecord(kind, Math.round((now - tapLogLastTime) * TAP_LOG_TICKS_PER_MS))) {
+        tapLogLastTime = now;
+    }
+}
+
+// A press that ended without keying an element (pointer left the tapper, touch cancelled) is taken back out.
+function cancelTapPress() {
+    if (tapLogPendingPress && tapLogPendingPress.length === tapLogLength - 1) {
+        tapLogLength = tapLogPendingPress.length;
+        tapLogLastTime = tapLogPendingPress.lastTime;
+    }
+    tapLogPendingPress = null;
+}
+
+function recordTapLetter(expectedChar, decodedChar) {
+    if (!tapTimingRecordingEnabled || tapLogLastTime === null) return;
+    const code = char => (char && char.length === 1 && char.charCodeAt(0) < 256) ? char.charCodeAt(0) : 0;
+    appendTapRecord(TAP_KIND_LETTER, (code(expectedChar) << 8) | code(decodedChar));
+}
+
+function setTapTimingRecording(enabled) {
+    tapTimingRecordingEnabled = enabled;
+    localStorage.setItem('tapTimingRecording', enabled ? 'true' : 'false');
+    tapLogLastTime = null;
+    if (!enabled) saveTapLog();
+}
+window.setTapTimingRecording = setTapTimingRecording;
+window.isTapTimingRecordingEnabled = () => tapTimingRecordingEnabled;
+
+function getTapTimingLogPressCount() {
+    loadTapLog();
+    let presses = 0;
+    for (let i = 0; i < tapLogLength; i++) {
+        if ((tapLogRecords[i] & 3) === TAP_KIND_PRESS) presses++;
+    }
+    return presses;
+}
+window.getTapTimingLogPressCount = getTapTimingLogPressCount;
+
+function downloadTapTimingLog() {
+    const url = URL.createObjectURL(new Blob([tapLogBytes()], { type: 'application/octet-stream' }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `tap-timings-${new Date().toISOString().slice(0, 10)}.mtap`;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    setTimeout(() => URL.revokeObjectURL(url), 0);
+}
+window.downloadTapTimingLog = downloadTapTimingLog;
+
+function clearTapTimingLog() {
+    tapLogRecords = new Uint32Array(1024);
+    tapLogLength = 0;
+    tapLogLastTime = null;
+    tapLogPendingPress = null;
+    localStorage.removeItem(TAP_LOG_STORAGE_KEY);
+}
+window.clearTapTimingLog = clearTapTimingLog;
+
+// Saving re-encodes the whole log, so it happens when the page is hidden rather than on every tap.
+document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') saveTapLog();
+});
+window.addEventListener('pagehide', saveTapLog);
+
 // Function to set tapper active state for playback
 function setTapperActive(isActive) {
     const tapperElement = document.getElementById('tapper');
@@ -65,14 +228,14 @@ document.addEventListener('DOMContentLoaded', () => {
         return; // Stop initialization if critical elements are missing
     }
 
-    // Populate morseToChar from global morseCode
-    const morseToChar = {};
-    if (typeof morseCode === 'undefined' || morseCode === null) {
-        console.error('visualTapper.js Error: morseCode global object not found or is null. This script should be loaded after the script defining morseCode.');
-    } else {
-        for (const char in morseCode) {
-            morseToChar[morseCode[char]] = char.toUpperCase();
-        }
+    if (typeof window.morseTreeStep !== 'function' || typeof window.morseTreeChar !== 'function') {
+        console.error('visualTapper.js Error: Morse decode tree functions not found. This script should be loaded after main.js and js/data/morseTables.js.');
+    }
+
+    // Advances the decode tree with each element as it is keyed, so the letter is known when the silence ends.
+    function appendMorseElement(element) {
+        currentMorse += element;
+        currentMorseNode = window.morseTreeStep(currentMorseNode, element);
     }
     
     const TAP_SOUND_FREQ = 770;
@@ -145,7 +308,8 @@ document.addEventListener('DOMContentLoaded', () => {
         e.preventDefault();
         tapper.classList.add('active');
         playTapSound();
-        tapStartTime = Date.now();
+        tapStartTime = performance.now();
+        recordTapEvent(TAP_KIND_PRESS);
         clearTimeout(silenceTimer);
     });
 
@@ -155,8 +319,9 @@ document.addEventListener('DOMContentLoaded', () => {
         if (tapStartTime === 0) return;
         tapper.classList.remove('active');
         stopTapSound();
-        let duration = Date.now() - tapStartTime;
-        currentMorse += (duration < DOT_THRESHOLD_MS) ? "." : "-";
+        let duration = performance.now() - tapStartTime;
+        recordTapEvent(TAP_KIND_RELEASE);
+        appendMorseElement((duration < DOT_THRESHOLD_MS) ? "." : "-");
         if (tapperMorseOutput) tapperMorseOutput.textContent = currentMorse;
         if (typeof window.updateTableHighlight === "function") window.updateTableHighlight(currentMorse);
         updatePredictiveDisplay(currentMorse);
@@ -169,7 +334,8 @@ document.addEventListener('DOMContentLoaded', () => {
         if (window.isPlayingStoryPlayback) { e.preventDefault(); return; }
         tapper.classList.add('active');
         playTapSound();
-        tapStartTime = Date.now();
+        tapStartTime = performance.now();
+        recordTapEvent(TAP_KIND_PRESS);
         clearTimeout(silenceTimer);
     });
 
@@ -178,8 +344,9 @@ document.addEventListener('DOMContentLoaded', () => {
         if (tapStartTime === 0) return;
         tapper.classList.remove('active');
         stopTapSound();
-        let duration = Date.now() - tapStartTime;
-        currentMorse += (duration < DOT_THRESHOLD_MS) ? "." : "-";
+        let duration = performance.now() - tapStartTime;
+        recordTapEvent(TAP_KIND_RELEASE);
+        appendMorseElement((duration < DOT_THRESHOLD_MS) ? "." : "-");
         if (tapperMorseOutput) tapperMorseOutput.textContent = currentMorse;
         if (typeof window.updateTableHighlight === "function") window.updateTableHighlight(currentMorse);
         updatePredictiveDisplay(currentMorse);
@@ -194,6 +361,7 @@ document.addEventListener('DOMContentLoaded', () => {
             tapper.classList.remove('active');
             stopTapSound();
             tapStartTime = 0;
+            cancelTapPress();
             // console.log("Mouse left tapper while active, tap cancelled/reset."); // Log removed
         }
     });
@@ -318,7 +486,9 @@ document.addEventListener('DOMContentLoaded', () => {
         clearTimeout(silenceTimer);
         const morseStringForEvent = currentMorse;
         if (currentMorse.length > 0) {
-            const charToAdd = morseToChar[currentMorse];
+            const charToAdd = window.morseTreeChar(currentMorseNode);
+            // Recorded before the 'char' event below moves the book game on to its next target.
+            recordTapLetter(window.getExpectedTapperLetter ? window.getExpectedTapperLetter() : null, charToAdd);
             if (charToAdd) {
                 currentText += charToAdd;
             } else {
@@ -338,6 +508,7 @@ document.addEventListener('DOMContentLoaded', () => {
             document.dispatchEvent(event);
         }
         currentMorse = "";
+        currentMorseNode = 1;
         if (tapperMorseOutput) tapperMorseOutput.textContent = currentMorse;
         if (typeof window.updateTableHighlight === "function") window.updateTableHighlight(currentMorse);
         updatePredictiveDisplay(currentMorse);
@@ -350,6 +521,7 @@ document.addEventListener('DOMContentLoaded', () => {
             tapper.classList.remove('active');
             stopTapSound();
             tapStartTime = 0;
+            cancelTapPress();
         }
     });
 
@@ -556,8 +728,8 @@ function updatePredictiveDisplay(morseString) {
         }
         let exactMatchHtml = "";
         let partialMatchesHtml = [];
-        if (typeof morseCode === 'undefined') { 
-            console.error("morseCode dictionary is not available to updatePredictiveDisplay.");
+        if (typeof morseCode === 'undefined' || !window.morsePrefixCandidates) {
+            console.error("morseCode dictionary or prefix index is not available to updatePredictiveDisplay.");
             pillsContainer.innerHTML = "<span class='text-red-500'>Error: Morse dictionary unavailable.</span>";
             overallDisplayPanel.classList.remove('hidden', 'opacity-0');
             void overallDisplayPanel.offsetWidth; // Trigger reflow for transition
@@ -570,11 +742,19 @@ function updatePredictiveDisplay(morseString) {
             }, 6000);
             return;
         }
-        for (const char in morseCode) {
+        // The characters whose signal starts with morseString are those at or below currentMorseNode, listed
+        // by js/data/morsePrefixIndex.js most frequent first. The letter the book game expects next goes first.
+        const exactChar = window.morseTreeChar(currentMorseNode);
+        const expectedChar = window.getExpectedTapperLetter ? window.getExpectedTapperLetter() : null;
+        let candidates = window.morsePrefixCandidates[currentMorseNode] || '';
+        if (expectedChar && expectedChar !== exactChar && candidates.includes(expectedChar)) {
+            candidates = expectedChar + candidates.replace(expectedChar, '');
+        }
+        for (const char of candidates) {
             const currentMorseValue = morseCode[char];
-            if (currentMorseValue === morseString) {
+            if (char === exactChar) {
                 exactMatchHtml = `<span class="char-badge exact-match-highlight text-xs font-mono rounded-md px-2 py-1 mr-1 mb-1 inline-block">${char} (${currentMorseValue})</span>`;
-            } else if (currentMorseValue.startsWith(morseString)) {
+            } else {
                 partialMatchesHtml.push(`<span class="char-badge bg-gray-600 text-gray-200 text-xs font-mono rounded-md px-2 py-1 mr-1 mb-1 inline-block">${char} (${currentMorseValue})</span>`);
             }
         }
@@ -624,7 +804,9 @@ function updatePredictiveDisplay(morseString) {
 window.resetVisualTapperState = resetVisualTapperState; // Expose to global scope
 
 function resetVisualTapperState() {
+    if (currentMorse.length > 0) recordTapLetter(null, null); // Ends the abandoned letter in the tap log
     currentMorse = "";
+    currentMorseNode = 1;
     tapStartTime = 0;
     if (silenceTimer) {
         clearTimeout(silenceTimer);
@@ -0,0 +1,30 @@
+// Generated by generate_morse_files.py; lists the files service-worker.js caches.
+self.morsePrecacheManifest = {
+  "version": 1,
+  "shell": [
+    {"url": "./", "revision": "783d3352989fbc28"},
+    {"url": "index.html", "revision": "783d3352989fbc28"},
+    {"url": "manifest.json", "revision": "4e11914ad4dbea3b"},
+    {"url": "css/style.css", "revision": "f4513f233a395f6e"},
+    {"url": "js/main.js", "revision": "2ac4863a83ea0b40"},
+    {"url": "js/bookCipher.js", "revision": "a6d6e94b94cb9fb8"},
+    {"url": "js/kochMethod.js", "revision": "5de5672619079284"},
+    {"url": "js/learnPracticeGame.js", "revision": "1deca0dd451f64b6"},
+    {"url": "js/settings.js", "revision": "2853d293b1fc6bf6"},
+    {"url": "js/visualTapper.js", "revision": "19aee93b0d83aa80"},
+    {"url": "js/privacy.js", "revision": "6a86256102fdfc0e"},
+    {"url": "assets/icons/icon-192x192.png", "revision": "4743d798bafa75bc"},
+    {"url": "assets/icons/icon-512x512.png", "revision": "03cff232d1edd44c"},
+    {"url": "js/data/bookData.js", "revision": "dbcf7d16dda6b97a"},
+    {"url": "js/data/bookSearchIndex.json", "revision": "2549577ed69a93ab"},
+    {"url": "js/data/morseTables.js", "revision": "33dad78de3db2c7e"},
+    {"url": "js/data/morsePrefixIndex.js", "revision": "f1561e4a0abc23b5"},
+    {"url": "js/data/kochDrills.js", "revision": "5a378de3366ad4e9"}
+  ],
+  "books": {
+    "cosmic_Labyrinth_1": {"revision": "dc57713446ac6759", "paths": ["assets/book_cipher_texts/cosmic_Labyrinth_1_details.json", "assets/book_cipher_texts/cosmic_Labyrinth_1_morse.bin", "assets/book_cipher_texts/cosmic_Labyrinth_1_morse.txt", "assets/book_cipher_texts/cosmic_Labyrinth_1_morse_index.json", "assets/book_cipher_texts/cosmic_Labyrinth_1_pages/", "assets/book_cipher_texts/english_sources/cosmic_Labyrinth_1.json"]},
+    "enemy-transmission-001": {"revision": "13d41044540cae2a", "paths": ["assets/book_cipher_texts/enemy-transmission-001_details.json", "assets/book_cipher_texts/enemy-transmission-001_morse.bin", "assets/book_cipher_texts/enemy-transmission-001_morse.txt", "assets/book_cipher_texts/enemy-transmission-001_morse_index.json", "assets/book_cipher_texts/enemy-transmission-001_pages/", "assets/book_cipher_texts/english_sources/enemy-transmission-001.json"]},
+    "mystery_intro": {"revision": "f8e031d58418c122", "paths": ["assets/book_cipher_texts/english_sources/mystery_intro.json", "assets/book_cipher_texts/mystery_intro_details.json", "assets/book_cipher_texts/mystery_intro_morse.bin", "assets/book_cipher_texts/mystery_intro_morse.txt", "assets/book_cipher_texts/mystery_intro_morse_index.json", "assets/book_cipher_texts/mystery_intro_pages/"]},
+    "passage_1": {"revision": "594376403ba5407c", "paths": ["assets/book_cipher_texts/english_sources/passage_1.json", "assets/book_cipher_texts/passage_1_details.json", "assets/book_cipher_texts/passage_1_morse.bin", "assets/book_cipher_texts/passage_1_morse.txt", "assets/book_cipher_texts/passage_1_morse_index.json", "assets/book_cipher_texts/passage_1_pages/"]}
+  }
+};
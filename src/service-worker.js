@@ -1,80 +1,207 @@
-// MORSE_APP_SW_VERSION_JULES_002_DELETE_AND_RECREATE
-const CACHE_NAME = 'morseapp-shell-v1';
-const urlsToCache = [
-  './', // Represents the root of the service worker's scope (e.g., www/)
-  'index.html',
-  'css/style.css',
-  'js/main.js',
-  'js/data/bookData.js',
-  'js/bookCipher.js',
-  'js/kochMethod.js',
-  'js/learnPracticeGame.js',
-  'js/settings.js',
-  'js/visualTapper.js',
-  'js/privacy.js',
-  'assets/icons/icon-192x192.png',
-  'assets/icons/icon-512x512.png',
-  'manifest.json'
-  // Note: If there are other essential assets like fonts or critical images directly part of the app shell,
-  // they should be added here as well. For now, focusing on the core files.
-  // CDN resources (Tone.js, Tailwind, confetti, marked) are not cached by default by this SW.
-];
-
-// Install event: open cache and add app shell files
-self.addEventListener('install', event => {
-  console.log('[Service Worker] Install event triggered. Version: MORSE_APP_SW_VERSION_JULES_002_DELETE_AND_RECREATE');
-  event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(cache => {
-        console.log('[Service Worker] Opened cache:', CACHE_NAME);
-        return cache.addAll(urlsToCache);
-      })
-      .then(() => {
-        console.log('[Service Worker] All specified URLs have been added to cache.');
-      })
+// precache-manifest.js is written by generate_morse_files.py (see Service Worker Precache there). Browsers
+// also compare imported scripts when checking for an update, so a new manifest installs this worker again.
+importScripts('precache-manifest.js');
+
+const PRECACHE_NAME = 'morseapp-precache';
+const BOOK_CACHE_NAME = 'morseapp-books';
+const BOOK_CACHE_BUDGET_BYTES = 64 * 1024 * 1024; // Book files kept before the least recently used are evicted
+const BOOK_CACHE_INDEX_KEY = '__book-cache-index__'; // Entry of BOOK_CACHE_NAME holding the LRU index
+const BOOK_CACHE_INDEX_SAVE_DELAY_MS = 2000; // Recency updates are saved in batches
+const manifest = self.morsePrecacheManifest;
+const scopeUrl = new URL(self.registration.scope);
+
+// --- App Shell Precache ---
+// Every shell file is cached under its URL with its revision appended, so a new worker downloads only the
+// files whose content changed and serves the others from the copies it already has. Entries of revisions no
+// longer in the manifest are deleted once the new worker is active.
+function precacheKey(entry) {
+  const url = new URL(entry.url, scopeUrl);
+  url.searchParams.set('__revision', entry.revision);
+  return url.href;
+}
+
+function scopePath(url) {
+  return url.pathname.startsWith(scopeUrl.pathname) ? url.pathname.slice(scopeUrl.pathname.length) : null;
+}
+
+const precacheKeysByPath = new Map(manifest.shell.map(entry => [entry.url === './' ? '' : entry.url, precacheKey(entry)]));
+
+async function precacheShell() {
+  const cache = await caches.open(PRECACHE_NAME);
+  let fetched = 0;
+  await Promise.all(manifest.shell.map(async entry => {
+    const key = precacheKey(entry);
+    if (await cache.match(key)) return; // Unchanged since an earlier version
+    const response = await fetch(new Request(new URL(entry.url, scopeUrl), { cache: 'reload' }));
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}, file: ${entry.url}`);
+    }
+    await cache.put(key, response);
+    fetched++;
+  }));
+  console.log(`[Service Worker] Precache: ${fetched} of ${manifest.shell.length} shell files downloaded.`);
+}
+
+async function deleteStalePrecacheEntries() {
+  const cache = await caches.open(PRECACHE_NAME);
+  const currentKeys = new Set(precacheKeysByPath.values());
+  const requests = await cache.keys();
+  await Promise.all(requests.filter(request => !currentKeys.has(request.url)).map(request => cache.delete(request)));
+}
+
+// --- Book Runtime Cache ---
+// Book files (Morse assets, pages, schedules, details and sources) are cached as they are fetched and served
+// from the cache afterwards, so a book opened again needs no network. The index records, per cached URL, its
+// book, the book's asset revision, its size and when it was last used. When the cache grows past
+// BOOK_CACHE_BUDGET_BYTES the least recently used files are evicted, and files of a book whose revision
+// changed are dropped on activation.
+const bookPaths = new Map(); // Path relative to the scope -> book key
+const bookDirectories = []; // [path prefix, book key], longest prefix first
+for (const [bookKey, book] of Object.entries(manifest.books)) {
+  for (const path of book.paths) {
+    if (path.endsWith('/')) bookDirectories.push([path, bookKey]);
+    else bookPaths.set(path, bookKey);
+  }
+}
+bookDirectories.sort((a, b) => b[0].length - a[0].length);
+
+function bookKeyOf(path) {
+  if (bookPaths.has(path)) return bookPaths.get(path);
+  const directory = bookDirectories.find(([prefix]) => path.startsWith(prefix));
+  return directory ? directory[1] : null;
+}
+
+let bookCacheIndexPromise = null; // Promise of Map: URL -> { book, revision, bytes, lastUsed }
+let bookCacheIndexSave = Promise.resolve(); // Saves run one after another, so the latest state is written last
+let bookCacheIndexSaveTimer = null;
+
+function loadBookCacheIndex() {
+  if (!bookCacheIndexPromise) {
+    bookCacheIndexPromise = caches.open(BOOK_CACHE_NAME)
+      .then(cache => cache.match(BOOK_CACHE_INDEX_KEY))
+      .then(response => response ? response.json() : {})
+      .then(entries => new Map(Object.entries(entries)))
       .catch(error => {
-        console.error('[Service Worker] Failed to cache URLs during install:', error);
-      })
-  );
+        console.warn('[Service Worker] Could not read the book cache index; starting a new one:', error);
+        return new Map();
+      });
+  }
+  return bookCacheIndexPromise;
+}
+
+function saveBookCacheIndex(index) {
+  clearTimeout(bookCacheIndexSaveTimer);
+  bookCacheIndexSaveTimer = null;
+  const body = JSON.stringify(Object.fromEntries(index));
+  bookCacheIndexSave = bookCacheIndexSave
+    .then(() => caches.open(BOOK_CACHE_NAME))
+    .then(cache => cache.put(BOOK_CACHE_INDEX_KEY, new Response(body, { headers: { 'Content-Type': 'application/json' } })))
+    .catch(error => console.warn('[Service Worker] Could not save the book cache index:', error));
+  return bookCacheIndexSave;
+}
+
+function scheduleBookCacheIndexSave(index) {
+  if (bookCacheIndexSaveTimer === null) {
+    bookCacheIndexSaveTimer = setTimeout(() => saveBookCacheIndex(index), BOOK_CACHE_INDEX_SAVE_DELAY_MS);
+  }
+}
+
+async function storeBookResponse(url, bookKey, response) {
+  const body = await response.arrayBuffer();
+  if (body.byteLength > BOOK_CACHE_BUDGET_BYTES) return;
+  const cache = await caches.open(BOOK_CACHE_NAME);
+  await cache.put(url, new Response(body, { status: response.status, statusText: response.statusText, headers: response.headers }));
+  const index = await loadBookCacheIndex();
+  index.delete(url); // Re-inserted as the most recently used
+  index.set(url, { book: bookKey, revision: manifest.books[bookKey].revision, bytes: body.byteLength, lastUsed: Date.now() });
+  let totalBytes = 0;
+  for (const entry of index.values()) totalBytes += entry.bytes;
+  const byLastUse = [...index].sort((a, b) => a[1].lastUsed - b[1].lastUsed);
+  for (const [evictedUrl, entry] of byLastUse) {
+    if (totalBytes <= BOOK_CACHE_BUDGET_BYTES) break;
+    index.delete(evictedUrl);
+    totalBytes -= entry.bytes;
+    await cache.delete(evictedUrl);
+  }
+  await saveBookCacheIndex(index);
+}
+
+async function respondFromBookCache(event, bookKey) {
+  const url = event.request.url;
+  const [cache, index] = await Promise.all([caches.open(BOOK_CACHE_NAME), loadBookCacheIndex()]);
+  const entry = index.get(url);
+  if (entry && entry.revision === manifest.books[bookKey].revision) {
+    const cached = await cache.match(url);
+    if (cached) {
+      entry.lastUsed = Date.now();
+      scheduleBookCacheIndexSave(index);
+      return cached;
+    }
+  }
+  const response = await fetch(event.request);
+  if (response.status === 200 && response.type === 'basic') {
+    event.waitUntil(storeBookResponse(url, bookKey, response.clone())
+      .catch(error => console.warn('[Service Worker] Could not cache book file:', url, error)));
+  }
+  return response;
+}
+
+// Drops cached files of books that were rebuilt or removed, and files the index does not know about.
+async function deleteStaleBookEntries() {
+  const [cache, index] = await Promise.all([caches.open(BOOK_CACHE_NAME), loadBookCacheIndex()]);
+  for (const [url, entry] of index) {
+    const book = manifest.books[entry.book];
+    if (!book || book.revision !== entry.revision) index.delete(url);
+  }
+  const requests = await cache.keys();
+  await Promise.all(requests
+    .filter(request => request.url !== new URL(BOOK_CACHE_INDEX_KEY, self.location).href && !index.has(request.url))
+    .map(request => cache.delete(request)));
+  await saveBookCacheIndex(index);
+}
+
+// --- Lifecycle ---
+self.addEventListener('install', event => {
+  console.log('[Service Worker] Install event triggered.');
+  event.waitUntil(precacheShell()); // A failed download fails the install, so the previous worker stays in charge
 });
 
-// Activate event: clean up old caches if any
 self.addEventListener('activate', event => {
-  console.log('[Service Worker] Activate event triggered. Version: MORSE_APP_SW_VERSION_JULES_002_DELETE_AND_RECREATE');
-  event.waitUntil(
-    caches.keys().then(cacheNames => {
-      return Promise.all(
-        cacheNames.map(cache => {
-          if (cache !== CACHE_NAME) {
-            console.log('ServiceWorker: Clearing old cache:', cache);
-            return caches.delete(cache);
-          }
-        })
-      );
-    })
-  );
-  return self.clients.claim(); // Ensure new service worker takes control immediately
+  console.log('[Service Worker] Activate event triggered.');
+  event.waitUntil((async () => {
+    const cacheNames = await caches.keys();
+    await Promise.all(cacheNames
+      .filter(cacheName => cacheName !== PRECACHE_NAME && cacheName !== BOOK_CACHE_NAME)
+      .map(cacheName => {
+        console.log('[Service Worker] Clearing old cache:', cacheName);
+        return caches.delete(cacheName);
+      }));
+    await Promise.all([deleteStalePrecacheEntries(), deleteStaleBookEntries()]);
+    await self.clients.claim(); // Ensure new service worker takes control immediately
+  })());
 });
 
-// Fetch event: serve cached content or fetch from network
+// Shell files come from the precache and book files from the runtime cache; anything else (CDN libraries,
+// other methods) goes to the network as if there were no service worker.
 self.addEventListener('fetch', event => {
-  event.respondWith(
-    caches.match(event.request)
-      .then(response => {
-        if (response) {
-          // Cache hit - return response
-          // console.log('[Service Worker] Serving from cache:', event.request.url); // Too noisy for regular fetch
-          return response;
-        }
-        // Not in cache - fetch from network
-        // console.log('[Service Worker] Fetching from network:', event.request.url); // Too noisy
-        return fetch(event.request);
-      })
-      .catch(error => {
-        console.error('[Service Worker] Error in fetch handler for:', event.request.url, error);
-        // Optionally, you could return a custom offline page here if the fetch fails
-        // and it's a navigation request. For now, just logging the error.
-      })
-    )
-  );
+  if (event.request.method !== 'GET') return;
+  const url = new URL(event.request.url);
+  if (url.origin !== scopeUrl.origin) return;
+  const path = scopePath(url);
+  if (path === null) return;
+
+  const precacheKey = precacheKeysByPath.get(path);
+  if (precacheKey) {
+    event.respondWith(caches.open(PRECACHE_NAME)
+      .then(cache => cache.match(precacheKey))
+      .then(response => response || fetch(event.request)));
+    return;
+  }
+  const bookKey = bookKeyOf(decodeURIComponent(path));
+  if (bookKey) {
+    event.respondWith(respondFromBookCache(event, bookKey).catch(error => {
+      console.error('[Service Worker] Error in fetch handler for:', event.request.url, error);
+      return fetch(event.request);
+    }));
+  }
 });